@@ -0,0 +1,384 @@
+"""
+Compute Pool for CPU-bound ML and Analytics Work
+
+pandas/TA-Lib/sklearn/scipy calls hold the GIL for hundreds of milliseconds, so
+running them inside an async route stalls every other request and SSE stream on
+that worker. The compute pool runs them in a managed process pool instead:
+
+- Zero-copy arguments: once a task's numpy array arguments add up to
+  SHARE_MIN_BYTES, they are copied once into a single shared memory block and
+  re-attached in the worker as read-only views, instead of being pickled
+  through the worker pipe
+- Per-task timeouts: a task that is still queued when its timeout expires is
+  cancelled; a task already running keeps its worker (and its admission slot)
+  until it finishes, but the caller gets ComputeTimeoutError immediately
+- Admission control: once max_pending tasks are queued or running, new work is
+  refused with ComputePoolSaturatedError, which routes turn into 503 + Retry-After
+- Metrics: in-flight and queued task counts, outcome counters and task latency
+  percentiles, exported by GET /health/compute-pool
+
+Task functions must be importable module-level functions and should return new
+objects rather than views of their array arguments.
+
+Usage:
+    from app.core.compute_pool import get_compute_pool
+
+    result = await get_compute_pool().run(run_backtest_task, symbol, closes, timeout=20)
+"""
+
+import asyncio
+import logging
+import multiprocessing
+import os
+import threading
+import time
+from collections.abc import Callable
+from concurrent.futures import Executor, Future, ProcessPoolExecutor, ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from multiprocessing import shared_memory
+from typing import Any, NamedTuple
+
+import numpy as np
+
+from .resilience import LatencyWindow
+
+
+logger = logging.getLogger(__name__)
+
+# Task arguments whose arrays total less than this are cheaper to pickle than to
+# place in shared memory (a year of daily OHLCV float64 bars is ~10KB)
+SHARE_MIN_BYTES = 8 * 1024
+
+# Byte alignment of each array within a task's shared memory block
+SHARE_ALIGNMENT = 64
+
+# Suggested client back-off when the pool refuses work
+SATURATED_RETRY_AFTER = 5
+
+
+class ComputePoolSaturatedError(Exception):
+    """Raised when the compute pool has max_pending tasks queued or running"""
+
+    def __init__(self, in_flight: int, retry_after: int = SATURATED_RETRY_AFTER):
+        self.in_flight = in_flight
+        self.retry_after = retry_after
+        super().__init__(f"Compute pool saturated ({in_flight} tasks in flight)")
+
+
+class ComputeTimeoutError(TimeoutError):
+    """Raised when a compute task does not finish within its timeout"""
+
+
+class SharedArray(NamedTuple):
+    """Picklable handle to a numpy array held in a shared memory block"""
+
+    name: str
+    shape: tuple[int, ...]
+    dtype: str
+    offset: int = 0
+
+    @classmethod
+    def create_batch(
+        cls, arrays: list[np.ndarray]
+    ) -> tuple[list["SharedArray"], shared_memory.SharedMemory]:
+        """Copy arrays into one new shared memory block (caller must unlink it)"""
+        arrays = [np.ascontiguousarray(array) for array in arrays]
+        offsets, size = [], 0
+        for array in arrays:
+            offsets.append(size)
+            size += -(-array.nbytes // SHARE_ALIGNMENT) * SHARE_ALIGNMENT
+
+        block = shared_memory.SharedMemory(create=True, size=max(size, 1))
+        handles = []
+        for array, offset in zip(arrays, offsets, strict=True):
+            view = np.ndarray(array.shape, dtype=array.dtype, buffer=block.buf, offset=offset)
+            view[...] = array
+            del view
+            handles.append(cls(block.name, array.shape, array.dtype.str, offset))
+        return handles, block
+
+    @classmethod
+    def create(cls, array: np.ndarray) -> tuple["SharedArray", shared_memory.SharedMemory]:
+        """Copy one array into a new shared memory block (caller must unlink it)"""
+        [handle], block = cls.create_batch([array])
+        return handle, block
+
+    def view(self, block: shared_memory.SharedMemory) -> np.ndarray:
+        """Read-only view of the array in an attached block"""
+        view = np.ndarray(
+            self.shape, dtype=np.dtype(self.dtype), buffer=block.buf, offset=self.offset
+        )
+        view.flags.writeable = False
+        return view
+
+    def attach(self) -> tuple[np.ndarray, shared_memory.SharedMemory]:
+        """Map the block and return a read-only view of the array"""
+        block = shared_memory.SharedMemory(name=self.name)
+        return self.view(block), block
+
+
+def _run_in_worker(
+    func: Callable[..., Any], args: tuple[Any, ...], kwargs: dict[str, Any]
+) -> Any:
+    """Worker-side trampoline: attach shared arrays, call the task, detach"""
+    blocks: dict[str, shared_memory.SharedMemory] = {}
+
+    def materialize(value):
+        if isinstance(value, SharedArray):
+            if value.name not in blocks:
+                blocks[value.name] = shared_memory.SharedMemory(name=value.name)
+            return value.view(blocks[value.name])
+        return value
+
+    args = tuple(materialize(a) for a in args)
+    kwargs = {k: materialize(v) for k, v in kwargs.items()}
+    try:
+        return func(*args, **kwargs)
+    finally:
+        del args, kwargs
+        for block in blocks.values():
+            try:
+                block.close()
+            except BufferError:
+                # The result still references the array; the mapping is
+                # released when the result is garbage collected
+                pass
+
+
+class ComputePool:
+    """Bounded process pool with shared-memory arguments and per-task timeouts"""
+
+    def __init__(
+        self,
+        max_workers: int | None = None,
+        max_pending: int | None = None,
+        default_timeout: float = 30.0,
+        start_method: str = "spawn",
+        inline: bool = False,
+    ):
+        """
+        Args:
+            max_workers: Worker processes (default: CPU count - 1, at least 1)
+            max_pending: Queued + running tasks before new work is refused
+                (default: 4 per worker)
+            default_timeout: Seconds a task may take when run() gets no timeout
+            start_method: multiprocessing start method; "spawn" avoids forking
+                a process that is already running threads
+            inline: Run tasks on threads in this process instead (tests, where
+                patched functions must stay visible to the task)
+        """
+        self.max_workers = max_workers or max(1, (os.cpu_count() or 2) - 1)
+        self.max_pending = max_pending or self.max_workers * 4
+        self.default_timeout = default_timeout
+        self.inline = inline
+        self._context = multiprocessing.get_context(start_method)
+        self._executor: Executor | None = None
+        self._lock = threading.Lock()
+        self._in_flight = 0
+        self._latency = LatencyWindow()
+        self.total_submitted = 0
+        self.total_completed = 0
+        self.total_failed = 0
+        self.total_timeouts = 0
+        self.total_rejected = 0
+        self.total_shared_bytes = 0
+
+    @property
+    def in_flight(self) -> int:
+        """Tasks queued or running"""
+        return self._in_flight
+
+    @property
+    def queue_depth(self) -> int:
+        """Tasks waiting for a free worker"""
+        return max(0, self._in_flight - self.max_workers)
+
+    def _get_executor(self) -> Executor:
+        if self._executor is None:
+            if self.inline:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.max_workers, thread_name_prefix="compute"
+                )
+            else:
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.max_workers, mp_context=self._context
+                )
+            logger.info(
+                f"✅ Compute pool started with {self.max_workers} "
+                f"{'threads' if self.inline else 'worker processes'}"
+            )
+        return self._executor
+
+    def _admit(self):
+        with self._lock:
+            if self._in_flight >= self.max_pending:
+                self.total_rejected += 1
+                raise ComputePoolSaturatedError(self._in_flight)
+            self._in_flight += 1
+            self.total_submitted += 1
+
+    def _share(
+        self,
+        args: tuple[Any, ...],
+        kwargs: dict[str, Any],
+        blocks: list[shared_memory.SharedMemory],
+    ) -> tuple[tuple[Any, ...], dict[str, Any]]:
+        """Move a task's array arguments into one shared memory block"""
+        if self.inline:
+            return args, kwargs
+
+        values = [*args, *kwargs.values()]
+        positions = [i for i, value in enumerate(values) if isinstance(value, np.ndarray)]
+        nbytes = sum(values[i].nbytes for i in positions)
+        if nbytes < SHARE_MIN_BYTES:
+            return args, kwargs
+
+        handles, block = SharedArray.create_batch([values[i] for i in positions])
+        blocks.append(block)
+        self.total_shared_bytes += nbytes
+        for i, handle in zip(positions, handles, strict=True):
+            values[i] = handle
+        return tuple(values[: len(args)]), dict(zip(kwargs, values[len(args) :], strict=True))
+
+    def _finish(self, future: Future, blocks: list[shared_memory.SharedMemory], start: float):
+        """Done callback: release the admission slot and the shared memory"""
+        for block in blocks:
+            block.close()
+            block.unlink()
+
+        with self._lock:
+            self._in_flight -= 1
+            if future.cancelled():
+                return
+            error = future.exception()
+            if error is None:
+                self.total_completed += 1
+                self._latency.record(time.perf_counter() - start)
+            else:
+                self.total_failed += 1
+
+        self._reset_if_broken(error)
+
+    def _reset_if_broken(self, error: BaseException | None):
+        if isinstance(error, BrokenProcessPool):
+            # A worker died (e.g. OOM-killed); start a fresh pool on next submit
+            logger.error("❌ Compute pool worker died - restarting pool")
+            with self._lock:
+                self._executor = None
+
+    async def run(
+        self, func: Callable[..., Any], *args: Any, timeout: float | None = None, **kwargs: Any
+    ) -> Any:
+        """
+        Run func(*args, **kwargs) in a worker process
+
+        Raises:
+            ComputePoolSaturatedError: max_pending tasks are already queued or running
+            ComputeTimeoutError: the task did not finish within timeout seconds
+        """
+        self._admit()
+        blocks: list[shared_memory.SharedMemory] = []
+        start = time.perf_counter()
+        try:
+            shared_args, shared_kwargs = self._share(args, kwargs, blocks)
+            future = self._get_executor().submit(
+                _run_in_worker, func, shared_args, shared_kwargs
+            )
+        except Exception as e:
+            for block in blocks:
+                block.close()
+                block.unlink()
+            with self._lock:
+                self._in_flight -= 1
+                self.total_failed += 1
+            self._reset_if_broken(e)
+            raise
+
+        future.add_done_callback(lambda f: self._finish(f, blocks, start))
+
+        timeout = self.default_timeout if timeout is None else timeout
+        try:
+            return await asyncio.wait_for(asyncio.wrap_future(future), timeout)
+        except TimeoutError:
+            if future.done() and not future.cancelled():
+                # The task itself raised TimeoutError
+                raise
+            # Cancels the task if it is still queued; a running task cannot be interrupted
+            future.cancel()
+            with self._lock:
+                self.total_timeouts += 1
+            raise ComputeTimeoutError(
+                f"{getattr(func, '__name__', 'task')} did not finish within {timeout}s"
+            ) from None
+
+    def stats(self) -> dict[str, Any]:
+        """Queue depth, outcome counters and task latency"""
+
+        def ms(value: float | None) -> float | None:
+            return round(value * 1000, 1) if value is not None else None
+
+        return {
+            "workers": self.max_workers,
+            "inline": self.inline,
+            "started": self._executor is not None,
+            "max_pending": self.max_pending,
+            "in_flight": self.in_flight,
+            "queue_depth": self.queue_depth,
+            "submitted": self.total_submitted,
+            "completed": self.total_completed,
+            "failed": self.total_failed,
+            "timeouts": self.total_timeouts,
+            "rejected": self.total_rejected,
+            "shared_bytes": self.total_shared_bytes,
+            "latency_ms": {
+                "p50": ms(self._latency.percentile(50)),
+                "p95": ms(self._latency.percentile(95)),
+                "p99": ms(self._latency.percentile(99)),
+            },
+        }
+
+    def shutdown(self, wait: bool = True):
+        """Stop the worker processes; queued tasks are cancelled"""
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=wait, cancel_futures=True)
+            logger.info("Compute pool shut down")
+
+
+# Singleton instance
+_compute_pool: ComputePool | None = None
+
+
+def _inline_mode() -> bool:
+    """Whether to run tasks on threads, resolved when the pool is first created"""
+    from .config import settings
+
+    return settings.TESTING or os.getenv("TESTING", "").lower() == "true"
+
+
+def get_compute_pool() -> ComputePool:
+    """Get or create compute pool singleton"""
+    global _compute_pool
+    if _compute_pool is None:
+        from .config import settings
+
+        _compute_pool = ComputePool(
+            max_workers=settings.COMPUTE_POOL_WORKERS or None,
+            max_pending=settings.COMPUTE_POOL_MAX_PENDING or None,
+            default_timeout=settings.COMPUTE_TASK_TIMEOUT,
+            inline=_inline_mode(),
+        )
+    return _compute_pool
+
+
+def set_compute_pool(pool: ComputePool | None) -> ComputePool | None:
+    """
+    Replace the compute pool singleton (e.g. with ComputePool(inline=True) in tests)
+
+    Returns:
+        The previous pool, which the caller is responsible for shutting down
+    """
+    global _compute_pool
+    previous, _compute_pool = _compute_pool, pool
+    return previous
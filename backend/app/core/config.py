@@ -69,6 +69,18 @@ class Settings(BaseModel):
         default_factory=lambda: os.getenv("DATABASE_URL", ""),
         description="PostgreSQL database URL (REQUIRED for production)",
     )
+    DATABASE_ASYNC_ENABLED: bool = Field(
+        default_factory=lambda: os.getenv("DATABASE_ASYNC_ENABLED", "true").lower() == "true",
+        description="Serve async handlers from an asyncpg engine when DATABASE_URL is PostgreSQL",
+    )
+    DATABASE_ASYNC_POOL_SIZE: int = Field(
+        default_factory=lambda: int(os.getenv("DATABASE_ASYNC_POOL_SIZE", "10")),
+        description="Base connection pool size of the asyncpg engine",
+    )
+    DATABASE_ASYNC_MAX_OVERFLOW: int = Field(
+        default_factory=lambda: int(os.getenv("DATABASE_ASYNC_MAX_OVERFLOW", "20")),
+        description="Connections the asyncpg engine may open beyond its base pool",
+    )
 
     # JWT Authentication Secret (REQUIRED for multi-user system)
     # CRITICAL: Must be cryptographically secure in production
@@ -95,6 +107,16 @@ class Settings(BaseModel):
         default_factory=lambda: os.getenv("ANTHROPIC_API_KEY", ""),
         description="Anthropic API key for AI features (optional)",
     )
+    ANTHROPIC_BASE_URL: str | None = Field(
+        default_factory=lambda: os.getenv("ANTHROPIC_BASE_URL"),
+        description="Override Anthropic API base URL, e.g. a local stub server (optional)",
+    )
+
+    # Alpha Vantage (first quote source of the legacy market data service)
+    ALPHA_VANTAGE_API_KEY: str = Field(
+        default_factory=lambda: os.getenv("ALPHA_VANTAGE_API_KEY", ""),
+        description="Alpha Vantage API key for market data fallback (optional)",
+    )
 
     # GitHub Webhook Secret (Repository Monitor)
     GITHUB_WEBHOOK_SECRET: str = Field(
@@ -179,6 +201,16 @@ class Settings(BaseModel):
         description="Options expiration dates cache TTL in seconds (default: 5 minutes)",
     )
 
+    # Volatility surface builds (app/services/vol_surface.py)
+    OPTIONS_SURFACE_CONCURRENCY: int = Field(
+        default_factory=lambda: int(os.getenv("OPTIONS_SURFACE_CONCURRENCY", "4")),
+        description="Option chains fetched at once per volatility surface build",
+    )
+    OPTIONS_SURFACE_MAX_DTE: int = Field(
+        default_factory=lambda: int(os.getenv("OPTIONS_SURFACE_MAX_DTE", "180")),
+        description="Default days-to-expiry bound of the volatility surface",
+    )
+
     # Historical data (long TTL, static past data)
     CACHE_TTL_HISTORICAL_BARS: int = Field(
         default_factory=lambda: int(os.getenv("CACHE_TTL_HISTORICAL_BARS", "3600")),
@@ -203,6 +235,81 @@ class Settings(BaseModel):
         description="Market scanner cache TTL in seconds (default: 3 minutes)",
     )
 
+    # Stale-while-revalidate window for coalesced endpoints (app/core/single_flight.py)
+    CACHE_STALE_TTL: int = Field(
+        default_factory=lambda: int(os.getenv("CACHE_STALE_TTL", "30")),
+        description="Seconds an expired value is still served while one refresh runs",
+    )
+
+    # =====================================
+    # CACHE WARMING (app/services/cache_warmer.py)
+    # =====================================
+
+    CACHE_WARM_ENABLED: bool = Field(
+        default_factory=lambda: os.getenv("CACHE_WARM_ENABLED", "true").lower() == "true",
+        description="Refresh hot cache keys ahead of expiry and warm them before the open",
+    )
+    CACHE_WARM_INTERVAL: int = Field(
+        default_factory=lambda: int(os.getenv("CACHE_WARM_INTERVAL", "5")),
+        description="Seconds between cache warming cycles",
+    )
+    CACHE_WARM_BUDGET_PER_MINUTE: int = Field(
+        default_factory=lambda: int(os.getenv("CACHE_WARM_BUDGET_PER_MINUTE", "30")),
+        description="Tradier calls cache warming may spend per minute",
+    )
+
+    # =====================================
+    # STARTUP (app/core/startup_validator.py)
+    # =====================================
+
+    STARTUP_VALIDATION_DEADLINE: float = Field(
+        default_factory=lambda: float(os.getenv("STARTUP_VALIDATION_DEADLINE", "12")),
+        description="Seconds all concurrent startup connectivity checks may take together",
+    )
+
+    # =====================================
+    # MARKET RECORDING (app/runtime/market_replay.py)
+    # =====================================
+
+    MARKET_RECORDING_ENABLED: bool = Field(
+        default_factory=lambda: os.getenv("MARKET_RECORDING_ENABLED", "false").lower() == "true",
+        description="Record the Tradier stream and strategy snapshots for replay",
+    )
+    MARKET_RECORDING_SEGMENT_EVENTS: int = Field(
+        default_factory=lambda: int(os.getenv("MARKET_RECORDING_SEGMENT_EVENTS", "100000")),
+        description="Events per compressed recording segment before rotating",
+    )
+
+    # =====================================
+    # COMPUTE POOL (CPU-bound ML/analytics)
+    # =====================================
+
+    COMPUTE_POOL_WORKERS: int = Field(
+        default_factory=lambda: int(os.getenv("COMPUTE_POOL_WORKERS", "0")),
+        description="Compute pool worker processes (default: 0 = CPU count - 1)",
+    )
+    COMPUTE_POOL_MAX_PENDING: int = Field(
+        default_factory=lambda: int(os.getenv("COMPUTE_POOL_MAX_PENDING", "0")),
+        description="Queued + running tasks before new work is refused (default: 0 = 4x workers)",
+    )
+    COMPUTE_TASK_TIMEOUT: float = Field(
+        default_factory=lambda: float(os.getenv("COMPUTE_TASK_TIMEOUT", "30")),
+        description="Default compute task timeout in seconds (default: 30s)",
+    )
+
+    # =====================================
+    # ML FEATURE STORE / INTRADAY BAR STORE
+    # =====================================
+
+    FEATURE_STORE_DIR: str = Field(
+        default_factory=lambda: os.getenv("FEATURE_STORE_DIR", "feature_store"),
+        description="Directory for persisted ML feature sets (default: ./feature_store)",
+    )
+    BAR_STORE_DIR: str = Field(
+        default_factory=lambda: os.getenv("BAR_STORE_DIR", "bar_store"),
+        description="Directory for intraday bars built from the stream (default: ./bar_store)",
+    )
+
     @field_validator("API_TOKEN")
     @classmethod
     def validate_api_token(cls, v: str) -> str:
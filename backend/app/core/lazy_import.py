@@ -0,0 +1,91 @@
+"""
+Lazy Imports for Heavy Optional Dependencies
+
+scikit-learn, scipy.stats, TA-Lib, anthropic and web3 each take hundreds of
+milliseconds to import. Most processes never touch them (a worker serving
+quotes imports the ML routers but never fits a model), so modules bind them
+through a proxy that imports on first attribute access or call:
+
+    from app.core.lazy_import import is_available, lazy_import
+
+    norm = lazy_import("scipy.stats", "norm")
+    StandardScaler = lazy_import("sklearn.preprocessing", "StandardScaler")
+
+    norm.cdf(0.5)              # scipy.stats is imported here
+    scaler = StandardScaler()  # ...and sklearn here
+
+    WEB3_AVAILABLE = is_available("web3")  # no import at all
+
+The first-use import time is recorded in the startup monitor's import report.
+A missing package raises ImportError at first use instead of at module load.
+"""
+
+import importlib
+import importlib.util
+import logging
+import time
+from typing import Any
+
+
+logger = logging.getLogger(__name__)
+
+
+class LazyImport:
+    """Proxy for a module (or one of its attributes) imported on first use"""
+
+    __slots__ = ("_attribute", "_module", "_target")
+
+    def __init__(self, module: str, attribute: str | None = None):
+        self._module = module
+        self._attribute = attribute
+        self._target: Any = None
+
+    def _load(self) -> Any:
+        if self._target is None:
+            started = time.perf_counter()
+            module = importlib.import_module(self._module)
+            target = getattr(module, self._attribute) if self._attribute else module
+            elapsed = time.perf_counter() - started
+
+            from .startup_monitor import get_startup_monitor
+
+            get_startup_monitor().record_lazy_import(self._module, elapsed)
+            logger.info(f"✅ Lazily imported {self!r} in {elapsed * 1000:.0f}ms")
+            self._target = target
+        return self._target
+
+    def __getattr__(self, name: str) -> Any:
+        if name in LazyImport.__slots__:
+            # Unset slot (e.g. during copy) - don't import to answer it
+            raise AttributeError(name)
+        return getattr(self._load(), name)
+
+    def __call__(self, *args, **kwargs) -> Any:
+        return self._load()(*args, **kwargs)
+
+    def __repr__(self) -> str:
+        if self._attribute:
+            return f"{self._module}.{self._attribute}"
+        return self._module
+
+
+def lazy_import(module: str, attribute: str | None = None) -> Any:
+    """
+    Bind a module, or an attribute of it, without importing it yet
+
+    Args:
+        module: Absolute module name (e.g. "sklearn.preprocessing")
+        attribute: Optional attribute of the module (e.g. "StandardScaler")
+
+    Returns:
+        Proxy forwarding attribute access and calls to the imported object
+    """
+    return LazyImport(module, attribute)
+
+
+def is_available(module: str) -> bool:
+    """Whether a module can be imported, without importing it"""
+    try:
+        return importlib.util.find_spec(module) is not None
+    except (ImportError, ValueError):
+        return False
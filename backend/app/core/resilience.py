@@ -0,0 +1,526 @@
+"""
+Shared Circuit Breaker, Retry and Hedging for Upstream Clients
+
+One implementation used by every upstream client (Tradier REST and streaming,
+Alpaca orders, news providers):
+
+- CircuitBreaker: CLOSED/OPEN/HALF_OPEN state held in a single immutable
+  snapshot that is swapped atomically, so no lock is taken on the request path
+  while the circuit is closed; HALF_OPEN admits a single probe request
+- BreakerGroup: per-endpoint breakers created on first use
+- Adaptive timeouts derived from each endpoint's observed latency percentiles
+- call / call_async: retries with exponential backoff and jitter, gated by a breaker
+- Hedged requests for idempotent reads: a second attempt starts once the first
+  exceeds the endpoint's p95 latency, and the first success wins
+- get_breaker_states(): state and latency metrics for every registered breaker
+
+Usage:
+    from app.core.resilience import BreakerGroup, call
+
+    breakers = BreakerGroup("alpaca", failure_threshold=3, cooldown_seconds=60)
+    order = call(breakers.get("orders"), lambda: submit(payload), attempts=3)
+"""
+
+import asyncio
+import logging
+import math
+import random
+import threading
+import time
+import weakref
+from collections import deque
+from collections.abc import Awaitable, Callable
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from datetime import UTC, datetime
+from typing import Any, NamedTuple
+
+
+logger = logging.getLogger(__name__)
+
+CLOSED = "CLOSED"
+OPEN = "OPEN"
+HALF_OPEN = "HALF_OPEN"
+
+# Latency samples kept per endpoint, and how many are needed before adapting
+LATENCY_WINDOW_SIZE = 256
+MIN_LATENCY_SAMPLES = 20
+
+# Hedge no sooner than this, even for very fast endpoints
+MIN_HEDGE_DELAY = 0.01
+
+# Worker threads shared by all synchronous hedged requests
+HEDGE_POOL_WORKERS = 8
+
+
+class CircuitOpenError(Exception):
+    """Raised when a call is refused because the breaker is open"""
+
+    def __init__(self, name: str, retry_after: float = 0.0):
+        super().__init__(f"{name} temporarily unavailable (circuit open)")
+        self.name = name
+        self.retry_after = retry_after
+
+
+def calculate_backoff(
+    attempt: int, base_delay: float = 1.0, max_delay: float = 60.0, jitter: bool = True
+) -> float:
+    """
+    Calculate exponential backoff delay with optional jitter.
+
+    Args:
+        attempt: Current attempt number (0-indexed)
+        base_delay: Base delay in seconds
+        max_delay: Maximum delay in seconds
+        jitter: Whether to add random jitter
+
+    Returns:
+        Delay in seconds
+    """
+    # Exponential backoff: base_delay * (2 ^ attempt)
+    delay = min(base_delay * (2**attempt), max_delay)
+
+    # Randomize between 50% and 100% of the delay to prevent thundering herd
+    if jitter:
+        delay = delay * (0.5 + random.random() * 0.5)
+
+    return delay
+
+
+class LatencyWindow:
+    """Fixed-size ring of recent latencies in seconds"""
+
+    def __init__(self, size: int = LATENCY_WINDOW_SIZE):
+        self._samples: deque[float] = deque(maxlen=size)
+
+    def record(self, seconds: float):
+        self._samples.append(seconds)
+
+    def __len__(self) -> int:
+        return len(self._samples)
+
+    def percentile(self, pct: float) -> float | None:
+        """Nearest-rank percentile, or None when no samples exist"""
+        samples = sorted(self._samples)
+        if not samples:
+            return None
+        rank = max(0, math.ceil(pct / 100 * len(samples)) - 1)
+        return samples[rank]
+
+
+class _Snapshot(NamedTuple):
+    state: str
+    failures: int
+    last_failure_at: float | None  # epoch seconds
+    probe_started_at: float | None = None  # HALF_OPEN probe in flight since
+
+
+class CircuitBreaker:
+    """
+    Circuit breaker with latency tracking for a single upstream endpoint.
+
+    States:
+    - CLOSED: Normal operation, allows requests
+    - OPEN: Upstream is failing, blocks requests for the cooldown period
+    - HALF_OPEN: Cooldown elapsed, a single probe request is let through to
+      test recovery while the others are rejected; a success closes the circuit
+      and a failure reopens it. A probe that never reports back is replaced
+      after another cooldown period.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        failure_threshold: int = 3,
+        cooldown_seconds: float = 30.0,
+        min_timeout: float = 1.0,
+        timeout_multiplier: float = 2.0,
+    ):
+        """
+        Initialize circuit breaker
+
+        Args:
+            name: Name used in logs and metrics
+            failure_threshold: Consecutive failures before opening the circuit
+            cooldown_seconds: How long to block requests before testing again
+            min_timeout: Lower bound for adaptive timeouts
+            timeout_multiplier: Adaptive timeout as a multiple of observed p99
+        """
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.cooldown_seconds = cooldown_seconds
+        self.min_timeout = min_timeout
+        self.timeout_multiplier = timeout_multiplier
+        self.latency = LatencyWindow()
+
+        # Transitions replace the whole snapshot in one assignment
+        self._snapshot = _Snapshot(CLOSED, 0, None)
+
+        # Serializes leaving OPEN so only one caller becomes the probe
+        self._probe_lock = threading.Lock()
+
+        # Lifetime counters (metrics only, approximate under contention)
+        self.total_successes = 0
+        self.total_failures = 0
+        self.total_rejections = 0
+        self.total_hedges = 0
+
+    @property
+    def state(self) -> str:
+        return self._snapshot.state
+
+    @state.setter
+    def state(self, value: str):
+        """Force a state (e.g. manually opening a circuit during an incident)"""
+        self._snapshot = self._snapshot._replace(state=value)
+
+    @property
+    def failure_count(self) -> int:
+        return self._snapshot.failures
+
+    @property
+    def last_failure_time(self) -> datetime | None:
+        last = self._snapshot.last_failure_at
+        return datetime.fromtimestamp(last, UTC) if last is not None else None
+
+    @last_failure_time.setter
+    def last_failure_time(self, value: datetime | None):
+        self._snapshot = self._snapshot._replace(
+            last_failure_at=value.timestamp() if value is not None else None
+        )
+
+    def retry_after(self) -> float:
+        """Seconds left in the cooldown (0 unless the circuit is open)"""
+        snap = self._snapshot
+        if snap.state != OPEN or snap.last_failure_at is None:
+            return 0.0
+        return max(0.0, snap.last_failure_at + self.cooldown_seconds - time.time())
+
+    def allow_request(self) -> bool:
+        """Check if requests should be allowed"""
+        if self._snapshot.state == CLOSED:
+            return True
+
+        with self._probe_lock:
+            snap = self._snapshot
+            now = time.time()
+            if snap.state == CLOSED:
+                return True
+
+            if snap.state == OPEN:
+                ready = snap.last_failure_at is not None and (
+                    now - snap.last_failure_at >= self.cooldown_seconds
+                )
+            else:
+                ready = snap.probe_started_at is None or (
+                    now - snap.probe_started_at >= self.cooldown_seconds
+                )
+            if ready:
+                self._snapshot = snap._replace(state=HALF_OPEN, probe_started_at=now)
+                logger.info(f"[Circuit {self.name}] HALF_OPEN - testing upstream")
+                return True
+
+        self.total_rejections += 1
+        return False
+
+    # Name used by the pre-existing breakers
+    is_available = allow_request
+
+    def release_probe(self):
+        """Give back a HALF_OPEN probe that allow_request() admitted but was never sent"""
+        with self._probe_lock:
+            snap = self._snapshot
+            if snap.state == HALF_OPEN and snap.probe_started_at is not None:
+                self._snapshot = snap._replace(probe_started_at=None)
+
+    def record_success(self, latency: float | None = None):
+        """Record successful call - reset circuit"""
+        if latency is not None:
+            self.latency.record(latency)
+        self.total_successes += 1
+
+        snap = self._snapshot
+        if snap.state != CLOSED or snap.failures:
+            self._snapshot = _Snapshot(CLOSED, 0, None)
+            if snap.state != CLOSED:
+                logger.info(f"[Circuit {self.name}] CLOSED - normal operation")
+
+    def record_failure(self):
+        """Record failed call - increment counter and potentially open circuit"""
+        self.total_failures += 1
+        snap = self._snapshot
+
+        # A failed recovery test reopens immediately
+        failures = self.failure_threshold if snap.state == HALF_OPEN else snap.failures + 1
+        state = OPEN if failures >= self.failure_threshold else snap.state
+        self._snapshot = _Snapshot(state, failures, time.time())
+
+        if state == OPEN and snap.state != OPEN:
+            logger.warning(
+                f"[Circuit {self.name}] OPENED after {failures} failures. "
+                f"Cooldown: {self.cooldown_seconds}s"
+            )
+
+    def timeout(self, default: float) -> float:
+        """
+        Adaptive request timeout: a multiple of the observed p99 latency,
+        never above the caller's configured default
+        """
+        if len(self.latency) < MIN_LATENCY_SAMPLES:
+            return default
+        p99 = self.latency.percentile(99)
+        return min(default, max(self.min_timeout, p99 * self.timeout_multiplier))
+
+    def hedge_delay(self) -> float | None:
+        """Delay before a hedged attempt (observed p95), or None until enough samples"""
+        if len(self.latency) < MIN_LATENCY_SAMPLES:
+            return None
+        return max(MIN_HEDGE_DELAY, self.latency.percentile(95))
+
+    def get_state(self) -> dict[str, Any]:
+        """Get circuit breaker status and latency metrics"""
+        last_failure = self.last_failure_time
+
+        def _ms(pct: float) -> float | None:
+            value = self.latency.percentile(pct)
+            return round(value * 1000, 2) if value is not None else None
+
+        return {
+            "state": self.state,
+            "failure_count": self.failure_count,
+            "last_failure": last_failure.isoformat() if last_failure else None,
+            "retry_after_seconds": round(self.retry_after(), 1),
+            "successes": self.total_successes,
+            "failures": self.total_failures,
+            "rejections": self.total_rejections,
+            "hedges": self.total_hedges,
+            "latency_ms": {"p50": _ms(50), "p95": _ms(95), "p99": _ms(99)},
+        }
+
+
+# Live breaker groups by name, for metrics export
+_groups: "weakref.WeakValueDictionary[str, BreakerGroup]" = weakref.WeakValueDictionary()
+
+
+class BreakerGroup:
+    """Per-endpoint circuit breakers for one upstream service"""
+
+    def __init__(self, name: str, **breaker_options: Any):
+        """
+        Args:
+            name: Upstream service name (e.g. "tradier")
+            **breaker_options: CircuitBreaker settings shared by every endpoint
+        """
+        self.name = name
+        self._options = breaker_options
+        self._breakers: dict[str, CircuitBreaker] = {}
+        _groups[name] = self
+
+    def get(self, endpoint: str = "default") -> CircuitBreaker:
+        """Get (or create) the breaker for an endpoint"""
+        breaker = self._breakers.get(endpoint)
+        if breaker is None:
+            # setdefault keeps the first breaker if two threads race here
+            breaker = self._breakers.setdefault(
+                endpoint, CircuitBreaker(f"{self.name}:{endpoint}", **self._options)
+            )
+        return breaker
+
+    def get_state(self) -> dict[str, dict[str, Any]]:
+        return {endpoint: b.get_state() for endpoint, b in list(self._breakers.items())}
+
+
+def get_breaker_states() -> dict[str, dict[str, Any]]:
+    """State and latency metrics for every registered breaker, by service and endpoint"""
+    return {name: group.get_state() for name, group in list(_groups.items())}
+
+
+_hedge_pool: ThreadPoolExecutor | None = None
+
+
+def _get_hedge_pool() -> ThreadPoolExecutor:
+    global _hedge_pool
+    if _hedge_pool is None:
+        _hedge_pool = ThreadPoolExecutor(
+            max_workers=HEDGE_POOL_WORKERS, thread_name_prefix="hedge"
+        )
+    return _hedge_pool
+
+
+def hedged(breaker: CircuitBreaker, func: Callable[[], Any]) -> Any:
+    """
+    Run an idempotent read, starting a second attempt if the first is slower
+    than the endpoint's p95 latency. The first successful result wins.
+    """
+    delay = breaker.hedge_delay()
+    if delay is None:
+        return func()
+
+    pool = _get_hedge_pool()
+    primary = pool.submit(func)
+    done, _ = wait([primary], timeout=delay)
+    if done:
+        return primary.result()
+
+    breaker.total_hedges += 1
+    pending = {primary, pool.submit(func)}
+    error: BaseException | None = None
+    while pending:
+        done, pending = wait(pending, return_when=FIRST_COMPLETED)
+        for future in done:
+            if future.exception() is None:
+                # The slower attempt cannot be interrupted; it finishes in the pool
+                return future.result()
+            error = future.exception()
+    raise error
+
+
+async def hedged_async(breaker: CircuitBreaker, func: Callable[[], Awaitable[Any]]) -> Any:
+    """Async variant of hedged(); the losing attempt is cancelled"""
+    delay = breaker.hedge_delay()
+    if delay is None:
+        return await func()
+
+    primary = asyncio.ensure_future(func())
+    done, _ = await asyncio.wait({primary}, timeout=delay)
+    if done:
+        return primary.result()
+
+    breaker.total_hedges += 1
+    pending = {primary, asyncio.ensure_future(func())}
+    error: BaseException | None = None
+    try:
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                if task.exception() is None:
+                    return task.result()
+                error = task.exception()
+        raise error
+    finally:
+        for task in pending:
+            task.cancel()
+
+
+def _on_error(
+    breaker: CircuitBreaker | None,
+    error: Exception,
+    is_failure: Callable[[Exception], bool] | None,
+):
+    """Count upstream faults against the breaker; other errors prove it is reachable"""
+    if breaker is None or isinstance(error, CircuitOpenError):
+        return
+    if is_failure is None or is_failure(error):
+        breaker.record_failure()
+    else:
+        breaker.record_success()
+
+
+def call(
+    breaker: CircuitBreaker | None,
+    func: Callable[[], Any],
+    *,
+    attempts: int = 1,
+    base_delay: float = 1.0,
+    max_delay: float = 60.0,
+    jitter: bool = True,
+    retry_on: tuple[type[Exception], ...] = (Exception,),
+    is_failure: Callable[[Exception], bool] | None = None,
+    hedge: bool = False,
+    name: str | None = None,
+) -> Any:
+    """
+    Call func through a breaker with retries (synchronous).
+
+    Args:
+        breaker: Breaker guarding the endpoint (None to only retry)
+        func: Zero-argument callable performing the request
+        attempts: Maximum number of attempts
+        base_delay: Base backoff delay in seconds
+        max_delay: Maximum backoff delay in seconds
+        jitter: Whether to add random jitter to the backoff
+        retry_on: Exception types that are retried
+        is_failure: Decides whether an exception counts against the breaker
+            (default: every exception does)
+        hedge: Hedge each attempt (only for idempotent reads)
+        name: Label for log messages
+
+    Raises:
+        CircuitOpenError: If the breaker refuses the call
+    """
+    label = name or (breaker.name if breaker else getattr(func, "__name__", "call"))
+
+    for attempt in range(attempts):
+        if breaker is not None and not breaker.allow_request():
+            raise CircuitOpenError(breaker.name, breaker.retry_after())
+
+        start = time.perf_counter()
+        try:
+            result = hedged(breaker, func) if hedge and breaker else func()
+        except Exception as e:
+            _on_error(breaker, e, is_failure)
+            if attempt == attempts - 1 or not isinstance(e, retry_on):
+                if attempts > 1 and isinstance(e, retry_on):
+                    logger.error(f"❌ {label} failed after {attempts} attempts: {e!s}")
+                raise
+
+            delay = calculate_backoff(attempt, base_delay, max_delay, jitter)
+            logger.warning(
+                f"⚠️ {label} failed on attempt {attempt + 1}/{attempts}. "
+                f"Retrying in {delay:.2f}s... Error: {e!s}"
+            )
+            time.sleep(delay)
+            continue
+
+        if breaker is not None:
+            breaker.record_success(time.perf_counter() - start)
+        if attempt > 0:
+            logger.info(f"✅ {label} succeeded on attempt {attempt + 1}/{attempts}")
+        return result
+
+
+async def call_async(
+    breaker: CircuitBreaker | None,
+    func: Callable[[], Awaitable[Any]],
+    *,
+    attempts: int = 1,
+    base_delay: float = 1.0,
+    max_delay: float = 60.0,
+    jitter: bool = True,
+    retry_on: tuple[type[Exception], ...] = (Exception,),
+    is_failure: Callable[[Exception], bool] | None = None,
+    hedge: bool = False,
+    name: str | None = None,
+) -> Any:
+    """Async variant of call(); func returns a new awaitable on each invocation"""
+    label = name or (breaker.name if breaker else getattr(func, "__name__", "call"))
+
+    for attempt in range(attempts):
+        if breaker is not None and not breaker.allow_request():
+            raise CircuitOpenError(breaker.name, breaker.retry_after())
+
+        start = time.perf_counter()
+        try:
+            if hedge and breaker:
+                result = await hedged_async(breaker, func)
+            else:
+                result = await func()
+        except Exception as e:
+            _on_error(breaker, e, is_failure)
+            if attempt == attempts - 1 or not isinstance(e, retry_on):
+                if attempts > 1 and isinstance(e, retry_on):
+                    logger.error(f"❌ {label} failed after {attempts} attempts: {e!s}")
+                raise
+
+            delay = calculate_backoff(attempt, base_delay, max_delay, jitter)
+            logger.warning(
+                f"⚠️ {label} failed on attempt {attempt + 1}/{attempts}. "
+                f"Retrying in {delay:.2f}s... Error: {e!s}"
+            )
+            await asyncio.sleep(delay)
+            continue
+
+        if breaker is not None:
+            breaker.record_success(time.perf_counter() - start)
+        if attempt > 0:
+            logger.info(f"✅ {label} succeeded on attempt {attempt + 1}/{attempts}")
+        return result
@@ -6,6 +6,7 @@ This module provides robust retry mechanisms for external API calls with:
 - Random jitter to prevent thundering herd
 - Configurable max attempts and delays
 - Proper exception handling
+- Optional circuit breaker (see app.core.resilience, which implements the retries)
 
 Usage:
     from app.core.retry import retry_with_backoff
@@ -16,37 +17,22 @@ Usage:
         pass
 """
 
-import asyncio
-import random
 from functools import wraps
 from typing import Any, Callable, Type, Tuple
 import logging
 
-logger = logging.getLogger(__name__)
+from .resilience import CircuitBreaker, calculate_backoff, call, call_async
 
+logger = logging.getLogger(__name__)
 
-def calculate_backoff(attempt: int, base_delay: float = 1.0, max_delay: float = 60.0, jitter: bool = True) -> float:
-    """
-    Calculate exponential backoff delay with optional jitter.
-    
-    Args:
-        attempt: Current attempt number (0-indexed)
-        base_delay: Base delay in seconds
-        max_delay: Maximum delay in seconds
-        jitter: Whether to add random jitter
-        
-    Returns:
-        Delay in seconds
-    """
-    # Exponential backoff: base_delay * (2 ^ attempt)
-    delay = min(base_delay * (2 ** attempt), max_delay)
-    
-    # Add jitter: randomize delay between 50% and 100% of calculated delay
-    # This prevents thundering herd problem
-    if jitter:
-        delay = delay * (0.5 + random.random() * 0.5)
-    
-    return delay
+__all__ = [
+    "calculate_backoff",
+    "retry_with_backoff",
+    "retry_sync_with_backoff",
+    "retry_api_call",
+    "retry_database_call",
+    "retry_critical_call",
+]
 
 
 def retry_with_backoff(
@@ -54,7 +40,8 @@ def retry_with_backoff(
     base_delay: float = 1.0,
     max_delay: float = 60.0,
     jitter: bool = True,
-    exceptions: Tuple[Type[Exception], ...] = (Exception,)
+    exceptions: Tuple[Type[Exception], ...] = (Exception,),
+    breaker: CircuitBreaker | None = None,
 ):
     """
     Decorator for retrying async functions with exponential backoff and jitter.
@@ -65,6 +52,7 @@ def retry_with_backoff(
         max_delay: Maximum delay cap in seconds
         jitter: Whether to add random jitter
         exceptions: Tuple of exception types to catch and retry
+        breaker: Optional circuit breaker guarding every attempt
         
     Example:
         @retry_with_backoff(max_attempts=3, base_delay=1.0)
@@ -75,44 +63,16 @@ def retry_with_backoff(
     def decorator(func: Callable) -> Callable:
         @wraps(func)
         async def wrapper(*args: Any, **kwargs: Any) -> Any:
-            last_exception = None
-            
-            for attempt in range(max_attempts):
-                try:
-                    result = await func(*args, **kwargs)
-                    
-                    # Log successful retry
-                    if attempt > 0:
-                        logger.info(
-                            f"✅ {func.__name__} succeeded on attempt {attempt + 1}/{max_attempts}"
-                        )
-                    
-                    return result
-                    
-                except exceptions as e:
-                    last_exception = e
-                    
-                    # Check if this was the last attempt
-                    if attempt == max_attempts - 1:
-                        logger.error(
-                            f"❌ {func.__name__} failed after {max_attempts} attempts: {str(e)}"
-                        )
-                        raise
-                    
-                    # Calculate backoff delay
-                    delay = calculate_backoff(attempt, base_delay, max_delay, jitter)
-                    
-                    logger.warning(
-                        f"⚠️ {func.__name__} failed on attempt {attempt + 1}/{max_attempts}. "
-                        f"Retrying in {delay:.2f}s... Error: {str(e)}"
-                    )
-                    
-                    # Wait before retrying
-                    await asyncio.sleep(delay)
-            
-            # This should never be reached due to raise in loop, but just in case
-            if last_exception:
-                raise last_exception
+            return await call_async(
+                breaker,
+                lambda: func(*args, **kwargs),
+                attempts=max_attempts,
+                base_delay=base_delay,
+                max_delay=max_delay,
+                jitter=jitter,
+                retry_on=exceptions,
+                name=func.__name__,
+            )
                 
         return wrapper
     return decorator
@@ -123,7 +83,8 @@ def retry_sync_with_backoff(
     base_delay: float = 1.0,
     max_delay: float = 60.0,
     jitter: bool = True,
-    exceptions: Tuple[Type[Exception], ...] = (Exception,)
+    exceptions: Tuple[Type[Exception], ...] = (Exception,),
+    breaker: CircuitBreaker | None = None,
 ):
     """
     Decorator for retrying synchronous functions with exponential backoff and jitter.
@@ -139,45 +100,16 @@ def retry_sync_with_backoff(
     def decorator(func: Callable) -> Callable:
         @wraps(func)
         def wrapper(*args: Any, **kwargs: Any) -> Any:
-            import time
-            last_exception = None
-            
-            for attempt in range(max_attempts):
-                try:
-                    result = func(*args, **kwargs)
-                    
-                    # Log successful retry
-                    if attempt > 0:
-                        logger.info(
-                            f"✅ {func.__name__} succeeded on attempt {attempt + 1}/{max_attempts}"
-                        )
-                    
-                    return result
-                    
-                except exceptions as e:
-                    last_exception = e
-                    
-                    # Check if this was the last attempt
-                    if attempt == max_attempts - 1:
-                        logger.error(
-                            f"❌ {func.__name__} failed after {max_attempts} attempts: {str(e)}"
-                        )
-                        raise
-                    
-                    # Calculate backoff delay
-                    delay = calculate_backoff(attempt, base_delay, max_delay, jitter)
-                    
-                    logger.warning(
-                        f"⚠️ {func.__name__} failed on attempt {attempt + 1}/{max_attempts}. "
-                        f"Retrying in {delay:.2f}s... Error: {str(e)}"
-                    )
-                    
-                    # Wait before retrying
-                    time.sleep(delay)
-            
-            # This should never be reached due to raise in loop, but just in case
-            if last_exception:
-                raise last_exception
+            return call(
+                breaker,
+                lambda: func(*args, **kwargs),
+                attempts=max_attempts,
+                base_delay=base_delay,
+                max_delay=max_delay,
+                jitter=jitter,
+                retry_on=exceptions,
+                name=func.__name__,
+            )
                 
         return wrapper
     return decorator
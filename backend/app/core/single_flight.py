@@ -0,0 +1,241 @@
+"""
+Request Coalescing (Single-Flight) for Expensive Cached Endpoints
+
+When a popular cache key expires (market:sectors, market:indices, an options
+chain, the under-$4 scanner), every concurrent request used to miss at once and
+call Tradier independently. The single-flight group prevents that herd:
+
+- Concurrent misses for the same key await one in-flight computation instead of
+  starting their own; a caller that disconnects does not cancel it for the rest
+- Stale-while-revalidate: for stale_ttl seconds after a value expires it is
+  still served immediately while exactly one background refresh runs
+- Failed computations are not cached; every waiter gets the exception, and a
+  failed background refresh keeps serving the stale value until it ages out
+- Values live in process memory and sit in front of the Redis cache the
+  handlers already use, which stays the cross-worker layer
+
+Usage:
+    from app.core.single_flight import single_flight
+
+    @router.get("/market/sectors")
+    @single_flight("market:sectors", ttl=60)
+    async def get_sector_performance(...):
+        ...
+"""
+
+import asyncio
+import functools
+import inspect
+import logging
+import time
+from collections.abc import Awaitable, Callable
+from typing import Any
+
+
+logger = logging.getLogger(__name__)
+
+# In-memory entries kept before expired ones are evicted
+MAX_ENTRIES = 1024
+
+
+class _Entry:
+    """Last computed value for a key with its fresh/stale deadlines (monotonic)"""
+
+    __slots__ = ("fresh_until", "stale_until", "value")
+
+    def __init__(self, value: Any, fresh_until: float, stale_until: float):
+        self.value = value
+        self.fresh_until = fresh_until
+        self.stale_until = stale_until
+
+
+class SingleFlight:
+    """Coalesces concurrent computations per key and serves stale values while refreshing"""
+
+    def __init__(self, max_entries: int = MAX_ENTRIES):
+        """
+        Args:
+            max_entries: In-memory values kept before expired ones are evicted
+        """
+        self.max_entries = max_entries
+        self._entries: dict[str, _Entry] = {}
+        self._inflight: dict[str, asyncio.Future] = {}
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.coalesced = 0
+        self.refreshes = 0
+        self.errors = 0
+
+    def _store(self, key: str, value: Any, ttl: float, stale_ttl: float):
+        now = time.monotonic()
+        if key not in self._entries and len(self._entries) >= self.max_entries:
+            self._entries = {k: e for k, e in self._entries.items() if e.stale_until > now}
+        self._entries[key] = _Entry(value, now + ttl, now + ttl + stale_ttl)
+
+    def _start(
+        self,
+        key: str,
+        compute: Callable[[], Awaitable[Any]],
+        ttl: float,
+        stale_ttl: float,
+        cache_if: Callable[[Any], bool] | None,
+    ) -> asyncio.Future:
+        """Start the computation for key, or return the one already in flight"""
+        inflight = self._inflight.get(key)
+        if inflight is not None:
+            self.coalesced += 1
+            return inflight
+
+        async def run():
+            try:
+                value = await compute()
+            except Exception:
+                self.errors += 1
+                raise
+            if cache_if is None or cache_if(value):
+                self._store(key, value, ttl, stale_ttl)
+            return value
+
+        inflight = asyncio.ensure_future(run())
+        self._inflight[key] = inflight
+        inflight.add_done_callback(lambda _f: self._inflight.pop(key, None))
+        return inflight
+
+    def _refresh(
+        self,
+        key: str,
+        compute: Callable[[], Awaitable[Any]],
+        ttl: float,
+        stale_ttl: float,
+        cache_if: Callable[[Any], bool] | None,
+    ):
+        """Refresh key in the background unless a computation is already running"""
+        if key in self._inflight:
+            return
+        self.refreshes += 1
+        task = self._start(key, compute, ttl, stale_ttl, cache_if)
+
+        def done(f: asyncio.Future):
+            if not f.cancelled() and f.exception() is not None:
+                logger.warning(f"⚠️ Background refresh of {key} failed: {f.exception()}")
+
+        task.add_done_callback(done)
+
+    async def get(
+        self,
+        key: str,
+        compute: Callable[[], Awaitable[Any]],
+        ttl: float,
+        stale_ttl: float = 0,
+        cache_if: Callable[[Any], bool] | None = None,
+    ) -> Any:
+        """
+        Get the value for key, computing it at most once across concurrent callers
+
+        Args:
+            key: Cache key
+            compute: Coroutine function producing the value
+            ttl: Seconds a computed value is served as fresh
+            stale_ttl: Seconds after ttl the value is still served while one
+                background refresh runs (0 = no stale serving)
+            cache_if: Predicate deciding whether a value is kept (e.g. skip fallbacks)
+
+        Returns:
+            Fresh, stale or newly computed value
+        """
+        now = time.monotonic()
+        entry = self._entries.get(key)
+        if entry is not None:
+            if entry.fresh_until > now:
+                self.hits += 1
+                return entry.value
+            if entry.stale_until > now:
+                self.stale_hits += 1
+                self._refresh(key, compute, ttl, stale_ttl, cache_if)
+                return entry.value
+
+        self.misses += 1
+        return await asyncio.shield(self._start(key, compute, ttl, stale_ttl, cache_if))
+
+    def invalidate(self, key: str):
+        """Drop the stored value for key (an in-flight computation still completes)"""
+        self._entries.pop(key, None)
+
+    def clear(self):
+        """Drop all stored values"""
+        self._entries.clear()
+
+    def cached(
+        self,
+        key: str | Callable[..., str],
+        ttl: float,
+        stale_ttl: float | None = None,
+        cache_if: Callable[[Any], bool] | None = None,
+    ):
+        """
+        Decorator coalescing calls of an async function (e.g. a route handler)
+
+        Args:
+            key: Format string filled from the call's arguments by name
+                (e.g. "options:chain:{symbol}:{expiration}"), or a function of them
+            ttl: Seconds a result is served as fresh
+            stale_ttl: Stale-while-revalidate window (default: settings.CACHE_STALE_TTL)
+            cache_if: Predicate deciding whether a result is kept
+        """
+
+        def decorator(func: Callable[..., Awaitable[Any]]):
+            signature = inspect.signature(func)
+
+            @functools.wraps(func)
+            async def wrapper(*args, **kwargs):
+                bound = signature.bind(*args, **kwargs)
+                bound.apply_defaults()
+                arguments = bound.arguments
+                cache_key = key(**arguments) if callable(key) else key.format(**arguments)
+
+                window = stale_ttl
+                if window is None:
+                    from .config import settings
+
+                    window = settings.CACHE_STALE_TTL
+
+                return await self.get(
+                    cache_key, lambda: func(*args, **kwargs), ttl, window, cache_if
+                )
+
+            return wrapper
+
+        return decorator
+
+    def stats(self) -> dict[str, Any]:
+        """Entry, in-flight and outcome counters"""
+        return {
+            "entries": len(self._entries),
+            "in_flight": len(self._inflight),
+            "hits": self.hits,
+            "stale_hits": self.stale_hits,
+            "misses": self.misses,
+            "coalesced": self.coalesced,
+            "refreshes": self.refreshes,
+            "errors": self.errors,
+        }
+
+
+# Singleton instance
+_single_flight = SingleFlight()
+
+
+def get_single_flight() -> SingleFlight:
+    """Get the shared single-flight group"""
+    return _single_flight
+
+
+def single_flight(
+    key: str | Callable[..., str],
+    ttl: float,
+    stale_ttl: float | None = None,
+    cache_if: Callable[[Any], bool] | None = None,
+):
+    """Decorator coalescing calls through the shared single-flight group (SingleFlight.cached)"""
+    return _single_flight.cached(key, ttl, stale_ttl, cache_if)
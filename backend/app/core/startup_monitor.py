@@ -3,12 +3,21 @@ Startup Performance Monitor
 
 Tracks startup timing and detects hanging operations to prevent production issues.
 Learned from: 2025-10-17 - Tradier stream blocking startup for 360s causing 500 errors.
+
+Also reports where import time goes (like `python -X importtime`): modules
+imported inside time_imports() are timed with their cumulative and self time,
+and lazily imported heavy dependencies (app/core/lazy_import.py) record their
+first-use import time.
 """
 
 import asyncio
+import builtins
+import importlib.util
 import logging
+import sys
+import threading
 import time
-from contextlib import asynccontextmanager
+from contextlib import asynccontextmanager, contextmanager
 
 
 logger = logging.getLogger(__name__)
@@ -30,6 +39,10 @@ class StartupMonitor:
         self.start_time: float | None = None
         self.warnings: list = []
 
+        # Import-time report: module -> (cumulative, self) seconds, and lazy first-use imports
+        self.imports: dict[str, tuple[float, float]] = {}
+        self.lazy_imports: dict[str, float] = {}
+
         # Timeout thresholds (seconds)
         self.PHASE_TIMEOUT = 10.0  # Warn if any phase takes > 10s
         self.TOTAL_TIMEOUT = 30.0  # Warn if total startup > 30s
@@ -82,6 +95,82 @@ class StartupMonitor:
             logger.error(error)
             raise
 
+    @contextmanager
+    def time_imports(self):
+        """
+        Time every module first imported inside the block (per-module cumulative
+        and self time, as `python -X importtime` reports them).
+
+        Usage:
+            with startup_monitor.time_imports():
+                from .routers import market_data, options
+        """
+        original_import = builtins.__import__
+        stack: list[list[float]] = []  # per in-flight import: [time spent in nested imports]
+        owner = threading.get_ident()
+
+        def timed_import(name, globals=None, locals=None, fromlist=(), level=0):
+            if threading.get_ident() != owner:
+                return original_import(name, globals, locals, fromlist, level)
+            try:
+                package = (globals or {}).get("__package__") if level else None
+                module = importlib.util.resolve_name("." * level + name, package)
+            except (ImportError, ValueError):
+                module = name
+            if module not in sys.modules:
+                targets = [module]
+            else:
+                # "from package import submodule" loads the submodules
+                targets = [
+                    f"{module}.{item}"
+                    for item in fromlist or ()
+                    if item != "*" and f"{module}.{item}" not in sys.modules
+                ]
+            if not targets:
+                return original_import(name, globals, locals, fromlist, level)
+
+            stack.append([0.0])
+            started = time.perf_counter()
+            try:
+                return original_import(name, globals, locals, fromlist, level)
+            finally:
+                cumulative = time.perf_counter() - started
+                nested = stack.pop()[0]
+                loaded = [target for target in targets if target in sys.modules]
+                if loaded:
+                    self.imports[", ".join(loaded)] = (cumulative, cumulative - nested)
+                    if stack:
+                        stack[-1][0] += cumulative
+
+        builtins.__import__ = timed_import
+        try:
+            yield
+        finally:
+            builtins.__import__ = original_import
+
+    def record_lazy_import(self, module: str, seconds: float):
+        """Record the first-use import time of a lazily imported module"""
+        self.lazy_imports[module] = seconds
+
+    def import_report(self, limit: int = 20) -> dict:
+        """Slowest imports by cumulative time, plus lazy first-use imports"""
+        slowest = sorted(self.imports.items(), key=lambda item: item[1][0], reverse=True)
+        return {
+            "total_seconds": round(sum(own for _, own in self.imports.values()), 3),
+            "modules": len(self.imports),
+            "slowest": [
+                {
+                    "module": module,
+                    "cumulative_ms": round(cumulative * 1000, 1),
+                    "self_ms": round(own * 1000, 1),
+                }
+                for module, (cumulative, own) in slowest[:limit]
+            ],
+            "lazy": {
+                module: round(seconds * 1000, 1) for module, seconds in self.lazy_imports.items()
+            },
+        }
+
     def finish(self):
         """Mark application startup complete and log summary"""
         if not self.start_time:
@@ -99,6 +188,14 @@ class StartupMonitor:
             for phase, duration in sorted(self.phases.items(), key=lambda x: x[1], reverse=True):
                 logger.info(f"     • {phase}: {duration:.2f}s")
 
+        if self.imports:
+            report = self.import_report(limit=5)
+            logger.info(
+                f"   Imports: {report['modules']} modules in {report['total_seconds']:.2f}s"
+            )
+            for entry in report["slowest"]:
+                logger.info(f"     • {entry['module']}: {entry['cumulative_ms']:.0f}ms")
+
         if self.warnings:
             logger.warning(f"   ⚠️  {len(self.warnings)} warnings detected:")
             for warning in self.warnings:
@@ -122,6 +219,7 @@ class StartupMonitor:
             "slow_phases": [
                 name for name, duration in self.phases.items() if duration > self.PHASE_TIMEOUT
             ],
+            "imports": self.import_report(),
         }
 
 
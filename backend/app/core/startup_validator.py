@@ -8,6 +8,10 @@ Purpose:
 - Validate Tradier account ID configuration (Wave 4 finding)
 - Test external API connectivity before accepting requests
 
+The Tradier, Alpaca and database checks run concurrently under one overall
+deadline (STARTUP_VALIDATION_DEADLINE), so a cold start waits for the slowest
+check rather than the sum of all network timeouts.
+
 Usage:
     from app.core.startup_validator import validate_startup
 
@@ -19,8 +23,9 @@ Usage:
 
 import logging
 import sys
+from concurrent.futures import ThreadPoolExecutor, wait
 from datetime import datetime, timezone
-from typing import Dict, List, Tuple
+from typing import Callable, Dict, List, Optional, Tuple
 
 import httpx
 from app.core.config import settings
@@ -32,10 +37,11 @@ logger = logging.getLogger(__name__)
 class StartupValidator:
     """Validates application configuration and dependencies on startup."""
 
-    def __init__(self):
+    def __init__(self, deadline: Optional[float] = None):
         self.errors: List[str] = []
         self.warnings: List[str] = []
         self.validations: Dict[str, Tuple[bool, str]] = {}
+        self.deadline = deadline if deadline is not None else settings.STARTUP_VALIDATION_DEADLINE
 
     def validate_all(self) -> bool:
         """
@@ -48,14 +54,18 @@ class StartupValidator:
         logger.info("🔍 Running startup validation...")
         logger.info("=" * 70)
 
-        # Critical validations (must pass)
+        # Configuration checks (instant)
         self._validate_required_env_vars()
-        self._validate_tradier_connection()
-        self._validate_alpaca_connection()
-
-        # Non-critical validations (warnings only)
         self._validate_optional_env_vars()
-        self._validate_database_connection()
+
+        # Connectivity checks, concurrently: (check, name, critical)
+        self._run_concurrently(
+            [
+                (self._validate_tradier_connection, "tradier_connection", True),
+                (self._validate_alpaca_connection, "alpaca_connection", True),
+                (self._validate_database_connection, "database", False),
+            ]
+        )
 
         # Log results
         self._log_results()
@@ -63,6 +73,29 @@ class StartupValidator:
         # Return True only if no critical errors
         return len(self.errors) == 0
 
+    def _run_concurrently(self, checks: List[Tuple[Callable[[], None], str, bool]]):
+        """
+        Run connectivity checks in parallel threads under one overall deadline.
+
+        A check still running at the deadline is recorded as failed: an error if
+        critical, a warning otherwise. Its thread is abandoned, not joined.
+        """
+        executor = ThreadPoolExecutor(max_workers=len(checks), thread_name_prefix="startup-check")
+        futures = {executor.submit(check): (name, critical) for check, name, critical in checks}
+        _, pending = wait(futures, timeout=self.deadline)
+        executor.shutdown(wait=False, cancel_futures=True)
+
+        for future in pending:
+            name, critical = futures[future]
+            message = f"{name} check did not finish within {self.deadline:.0f}s"
+            self.validations[name] = (False, "Deadline exceeded")
+            if critical:
+                self.errors.append(f"❌ {message}")
+                logger.error(f"❌ {message}")
+            else:
+                self.warnings.append(f"⚠️ {message}")
+                logger.warning(f"⚠️ {message}")
+
     def _validate_required_env_vars(self):
         """Validate required environment variables are set."""
         required_vars = {
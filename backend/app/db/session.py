@@ -3,13 +3,34 @@ Database Session Management
 
 Provides SQLAlchemy engine, session, and base for models.
 Falls back to SQLite in-memory if DATABASE_URL not configured.
+
+Async handlers use get_async_db() instead of get_db(). On PostgreSQL it yields
+an AsyncSession on a separate asyncpg engine; without an async driver (SQLite,
+or asyncpg/greenlet not installed) it yields a ThreadedSession, which runs the
+same calls on a sync session in the threadpool. Either way the event loop never
+blocks on the database:
+
+    @router.get("/endpoint")
+    async def endpoint(db: AsyncDBSession = Depends(get_async_db)):
+        rows = (await db.execute(select(Model).limit(10))).scalars().all()
 """
 
+import asyncio
+from collections.abc import AsyncIterator, Callable
+from typing import TYPE_CHECKING, Any, TypeVar
+
 from sqlalchemy import create_engine
-from sqlalchemy.orm import declarative_base, sessionmaker
-from sqlalchemy.pool import StaticPool
+from sqlalchemy.engine import URL, make_url
+from sqlalchemy.orm import Session, declarative_base, sessionmaker
 
 from ..core.config import settings
+from ..core.lazy_import import is_available
+
+
+if TYPE_CHECKING:
+    from sqlalchemy.ext.asyncio import AsyncEngine, async_sessionmaker
+
+T = TypeVar("T")
 
 
 # Create engine based on configuration
@@ -65,3 +86,212 @@ def init_db():
 
     Base.metadata.create_all(bind=engine)
     print("[OK] Database tables initialized", flush=True)
+
+
+# ========================================
+# ASYNC ENGINE
+# ========================================
+
+ASYNC_DRIVER_MODULES = ("asyncpg", "greenlet")
+
+
+def async_database_url(url: str) -> URL | None:
+    """
+    asyncpg URL for a PostgreSQL DATABASE_URL
+
+    Returns None for other backends. libpq's sslmode query parameter is
+    renamed to asyncpg's ssl.
+    """
+    try:
+        parsed = make_url(url)
+    except Exception:
+        return None
+    if parsed.get_backend_name() not in ("postgresql", "postgres"):
+        return None
+
+    query = dict(parsed.query)
+    if "sslmode" in query:
+        query["ssl"] = query.pop("sslmode")
+    return parsed.set(drivername="postgresql+asyncpg", query=query)
+
+
+def _create_async_engine() -> tuple["AsyncEngine | None", "async_sessionmaker | None", str]:
+    """Build the asyncpg engine, or explain why handlers fall back to threads"""
+    if not settings.DATABASE_ASYNC_ENABLED:
+        return None, None, "disabled by DATABASE_ASYNC_ENABLED"
+
+    url = async_database_url(settings.DATABASE_URL)
+    if url is None:
+        return None, None, "DATABASE_URL is not PostgreSQL"
+
+    missing = [module for module in ASYNC_DRIVER_MODULES if not is_available(module)]
+    if missing:
+        return None, None, f"{', '.join(missing)} not installed"
+
+    from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+
+    async_engine = create_async_engine(
+        url,
+        pool_size=settings.DATABASE_ASYNC_POOL_SIZE,
+        max_overflow=settings.DATABASE_ASYNC_MAX_OVERFLOW,
+        pool_recycle=3600,
+        pool_timeout=60,
+        pool_pre_ping=True,
+        echo=False,
+    )
+    factory = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+    return async_engine, factory, "asyncpg"
+
+
+async_engine, AsyncSessionLocal, ASYNC_ENGINE_STATUS = _create_async_engine()
+if async_engine is not None:
+    print(
+        f"[OK] Async database engine created: asyncpg "
+        f"(pool={settings.DATABASE_ASYNC_POOL_SIZE}, "
+        f"overflow={settings.DATABASE_ASYNC_MAX_OVERFLOW})",
+        flush=True,
+    )
+else:
+    print(
+        f"[INFO] Async database engine unavailable ({ASYNC_ENGINE_STATUS}): "
+        "async handlers use the sync pool via the threadpool",
+        flush=True,
+    )
+
+
+class ThreadedSession:
+    """
+    AsyncSession-compatible facade over a sync Session
+
+    Each call runs in the threadpool, so handlers written against AsyncSession
+    keep working where no async driver is available. Results are prebuffered
+    like AsyncSession's, so reading rows afterwards does no I/O on the loop.
+    """
+
+    def __init__(self, session: Session):
+        self.sync_session = session
+
+    async def _run(self, fn: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+        return await asyncio.to_thread(fn, *args, **kwargs)
+
+    async def execute(self, statement, params=None, *, execution_options=None, **kwargs):
+        options = {**(execution_options or {}), "prebuffer_rows": True}
+        return await self._run(
+            self.sync_session.execute, statement, params, execution_options=options, **kwargs
+        )
+
+    async def scalar(self, statement, params=None, **kwargs):
+        return await self._run(self.sync_session.scalar, statement, params, **kwargs)
+
+    async def scalars(self, statement, params=None, **kwargs):
+        result = await self.execute(statement, params, **kwargs)
+        return result.scalars()
+
+    async def get(self, entity, ident, **kwargs):
+        return await self._run(self.sync_session.get, entity, ident, **kwargs)
+
+    def add(self, instance) -> None:
+        self.sync_session.add(instance)
+
+    async def delete(self, instance) -> None:
+        await self._run(self.sync_session.delete, instance)
+
+    async def flush(self) -> None:
+        await self._run(self.sync_session.flush)
+
+    async def commit(self) -> None:
+        await self._run(self.sync_session.commit)
+
+    async def rollback(self) -> None:
+        await self._run(self.sync_session.rollback)
+
+    async def refresh(self, instance) -> None:
+        await self._run(self.sync_session.refresh, instance)
+
+    async def run_sync(self, fn: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+        """Call fn(sync_session, *args) in the threadpool, like AsyncSession.run_sync"""
+        return await self._run(fn, self.sync_session, *args, **kwargs)
+
+    async def close(self) -> None:
+        await self._run(self.sync_session.close)
+
+
+try:
+    from sqlalchemy.ext.asyncio import AsyncSession
+
+    AsyncDBSession = AsyncSession | ThreadedSession
+except ImportError:  # greenlet missing: get_async_db() only yields ThreadedSession
+    AsyncDBSession = ThreadedSession
+
+
+async def get_async_db() -> AsyncIterator[AsyncDBSession]:
+    """
+    Async dependency for FastAPI routes
+
+    Yields an AsyncSession on the asyncpg engine, or a ThreadedSession over
+    SessionLocal when the async engine is unavailable.
+
+    Usage:
+        @router.get("/endpoint")
+        async def endpoint(db: AsyncDBSession = Depends(get_async_db)):
+            result = await db.execute(select(User).where(User.id == 1))
+    """
+    if AsyncSessionLocal is not None:
+        async with AsyncSessionLocal() as session:
+            yield session
+        return
+
+    session = ThreadedSession(SessionLocal())
+    try:
+        yield session
+    finally:
+        await session.close()
+
+
+# ========================================
+# POOL METRICS
+# ========================================
+
+
+def pool_metrics(pool) -> dict[str, Any]:
+    """
+    Sizing and utilisation of one connection pool
+
+    QueuePool-style pools report size, checked in/out connections, overflow
+    and utilisation of size + max_overflow; others (e.g. SQLite's StaticPool)
+    only report their class.
+    """
+    metrics: dict[str, Any] = {"pool": type(pool).__name__}
+    if not callable(getattr(pool, "checkedout", None)):
+        return metrics
+
+    size = pool.size()
+    max_overflow = max(getattr(pool, "_max_overflow", 0), 0)
+    checked_out = pool.checkedout()
+    metrics.update(
+        size=size,
+        max_overflow=max_overflow,
+        capacity=size + max_overflow,
+        checked_in=pool.checkedin(),
+        checked_out=checked_out,
+        overflow=max(pool.overflow(), 0),
+        timeout=getattr(pool, "_timeout", None),
+        utilization=round(checked_out / (size + max_overflow), 4)
+        if size + max_overflow
+        else 0.0,
+    )
+    return metrics
+
+
+def get_pool_metrics() -> dict[str, Any]:
+    """Pool metrics for the sync engine and, when enabled, the asyncpg engine"""
+    async_metrics: dict[str, Any] = {"enabled": async_engine is not None}
+    if async_engine is not None:
+        async_metrics.update(pool_metrics(async_engine.sync_engine.pool))
+    else:
+        async_metrics["reason"] = ASYNC_ENGINE_STATUS
+
+    return {
+        "sync": {"enabled": True, **pool_metrics(engine.pool)},
+        "async": async_metrics,
+    }
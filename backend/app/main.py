@@ -11,13 +11,18 @@ Zero-cost architecture using free-tier APIs.
 import logging
 import os
 
-import sentry_sdk
-from dotenv import load_dotenv
-from fastapi import FastAPI
-from fastapi.middleware.cors import CORSMiddleware
-from starlette.middleware.gzip import GZipMiddleware
+from .core.startup_monitor import get_startup_monitor
 
 
+# Every module loaded at startup is imported inside time_imports() (per-module
+# cumulative and self time, see get_startup_monitor().import_report())
+with get_startup_monitor().time_imports():
+    import sentry_sdk
+    from dotenv import load_dotenv
+    from fastapi import FastAPI
+    from fastapi.middleware.cors import CORSMiddleware
+    from starlette.middleware.gzip import GZipMiddleware
+
 # Load environment variables
 load_dotenv()
 
@@ -68,8 +73,9 @@ app.add_middleware(
 app.add_middleware(GZipMiddleware, minimum_size=1000, compresslevel=6)
 logger.info("✅ GZIP compression enabled for responses >1KB")
 
-# Import routers
-from .routers import dex
+# Import routers (after load_dotenv, still timed)
+with get_startup_monitor().time_imports():
+    from .routers import dex
 
 
 # Initialize DEX aggregator
@@ -119,3 +125,4 @@ async def startup_event():
 async def shutdown_event():
     """Application shutdown"""
     logger.info("PaiiD-2mx Backend shutting down...")
+    await dex.close_dex_aggregator()
@@ -9,6 +9,12 @@ from fastapi import Request
 from app.services.health_monitor import health_monitor
 
 
+def _route_key(request: Request) -> str:
+    """Matched route template, falling back to the raw path"""
+    route = request.scope.get("route")
+    return getattr(route, "path", None) or request.url.path
+
+
 async def metrics_middleware(request: Request, call_next):
     """Track request metrics"""
     start_time = time.time()
@@ -17,9 +23,9 @@ async def metrics_middleware(request: Request, call_next):
         response = await call_next(request)
         response_time = time.time() - start_time
 
-        # Record metrics
+        # Record metrics (keyed by route template, e.g. /quote/{symbol})
         is_error = response.status_code >= 400
-        health_monitor.record_request(response_time, is_error)
+        health_monitor.record_request(response_time, is_error, route=_route_key(request))
 
         # Add metrics headers
         response.headers["X-Response-Time"] = f"{response_time:.3f}s"
@@ -28,5 +34,5 @@ async def metrics_middleware(request: Request, call_next):
 
     except Exception:
         response_time = time.time() - start_time
-        health_monitor.record_request(response_time, is_error=True)
+        health_monitor.record_request(response_time, is_error=True, route=_route_key(request))
         raise
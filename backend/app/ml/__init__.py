@@ -5,22 +5,48 @@ Provides intelligent strategy recommendations, pattern recognition,
 and market regime detection using scikit-learn and technical analysis.
 
 Phase 2: ML Strategy Engine
+
+Exports are resolved on first access, so importing one submodule (e.g.
+app.ml.pattern_backtest) does not import every model and its dependencies.
 """
 
-from .data_pipeline import MLDataPipeline, get_data_pipeline
-from .feature_engineering import FeatureEngineer
-from .market_regime import MarketRegimeDetector, get_regime_detector
-from .pattern_recognition import PatternDetector, get_pattern_detector
-from .strategy_selector import StrategySelector, get_strategy_selector
+import importlib
+from typing import Any
+
+
+# Export -> submodule defining it
+_EXPORTS = {
+    "MLDataPipeline": "data_pipeline",
+    "get_data_pipeline": "data_pipeline",
+    "FeatureEngineer": "feature_engineering",
+    "FeatureStore": "feature_store",
+    "get_feature_store": "feature_store",
+    "MarketRegimeDetector": "market_regime",
+    "get_regime_detector": "market_regime",
+    "PatternDetector": "pattern_recognition",
+    "get_pattern_detector": "pattern_recognition",
+    "StrategySelector": "strategy_selector",
+    "get_strategy_selector": "strategy_selector",
+}
+
+
+def __getattr__(name: str) -> Any:
+    if name not in _EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(f".{_EXPORTS[name]}", __name__), name)
+    globals()[name] = value
+    return value
 
 
 __all__ = [
     "FeatureEngineer",
+    "FeatureStore",
     "MLDataPipeline",
     "MarketRegimeDetector",
     "PatternDetector",
     "StrategySelector",
     "get_data_pipeline",
+    "get_feature_store",
     "get_pattern_detector",
     "get_regime_detector",
     "get_strategy_selector",
@@ -9,8 +9,12 @@ from enum import Enum
 
 import numpy as np
 import pandas as pd
-import talib
-from scipy.signal import find_peaks
+
+from ..core.lazy_import import lazy_import
+
+
+talib = lazy_import("talib")
+find_peaks = lazy_import("scipy.signal", "find_peaks")
 
 
 logger = logging.getLogger(__name__)
@@ -9,15 +9,23 @@ import logging
 from datetime import datetime, timedelta
 
 import pandas as pd
-from sklearn.model_selection import train_test_split
-from sklearn.preprocessing import StandardScaler
 
+from ..core.lazy_import import lazy_import
+from ..services.bar_builder import PERSISTED_INTERVALS, get_bar_store
 from ..services.tradier_client import get_tradier_client
 from .feature_engineering import FeatureEngineer
+from .feature_store import get_feature_store
 
 
 logger = logging.getLogger(__name__)
 
+train_test_split = lazy_import("sklearn.model_selection", "train_test_split")
+StandardScaler = lazy_import("sklearn.preprocessing", "StandardScaler")
+
+# Extra calendar days fetched before a requested window on the first fetch, so
+# its first rows already have enough history for the 200-day indicators
+WARMUP_CALENDAR_DAYS = 300
+
 
 class MLDataPipeline:
     """
@@ -28,6 +36,7 @@ class MLDataPipeline:
         """Initialize data pipeline"""
         self.tradier_client = get_tradier_client()
         self.feature_engineer = FeatureEngineer()
+        self.feature_store = get_feature_store()
         self.scaler = StandardScaler()
         self.feature_columns = None
 
@@ -41,11 +50,14 @@ class MLDataPipeline:
         """
         Fetch historical OHLCV data from Tradier
 
+        Intraday intervals ("1min", "5min") are read from the local bar store,
+        which the Tradier stream fills, since Tradier history has no intraday bars.
+
         Args:
             symbol: Stock symbol (e.g., "AAPL")
             start_date: Start date (default: 2 years ago)
             end_date: End date (default: today)
-            interval: Data interval ("daily", "weekly")
+            interval: Data interval ("daily", "weekly", "1min", "5min")
 
         Returns:
             DataFrame with columns: date, open, high, low, close, volume
@@ -61,13 +73,16 @@ class MLDataPipeline:
                 f"Fetching historical data for {symbol} ({start_date.date()} to {end_date.date()})"
             )
 
-            # Fetch from Tradier
-            data = self.tradier_client.get_historical_quotes(
-                symbol=symbol,
-                start=start_date.strftime("%Y-%m-%d"),
-                end=end_date.strftime("%Y-%m-%d"),
-                interval=interval,
-            )
+            if interval in PERSISTED_INTERVALS:
+                data = get_bar_store().load(symbol, interval, start=start_date, end=end_date)
+            else:
+                # Fetch from Tradier: list of {date, open, high, low, close, volume} bars
+                data = self.tradier_client.get_historical_bars(
+                    symbol,
+                    interval=interval,
+                    start_date=start_date.strftime("%Y-%m-%d"),
+                    end_date=end_date.strftime("%Y-%m-%d"),
+                )
 
             if not data or len(data) == 0:
                 logger.warning(f"No historical data returned for {symbol}")
@@ -107,29 +122,37 @@ class MLDataPipeline:
             logger.error(f"❌ Failed to fetch historical data for {symbol}: {e}")
             return pd.DataFrame()
 
-    def prepare_features(self, symbol: str, lookback_days: int = 730) -> pd.DataFrame | None:
+    def prepare_features(
+        self, symbol: str, lookback_days: int = 730, interval: str = "daily"
+    ) -> pd.DataFrame | None:
         """
         Fetch data and extract features for a symbol
 
+        Features come from the feature store: only bars newer than the latest
+        stored bar are fetched and featurized, and the requested window is then
+        sliced from the stored history.
+
         Args:
             symbol: Stock symbol
             lookback_days: Days of history to fetch (default: 2 years)
+            interval: Data interval ("daily", "weekly", "1min", "5min")
 
         Returns:
             DataFrame with features, or None if failed
         """
         try:
-            # Fetch historical data
             end_date = datetime.now()
             start_date = end_date - timedelta(days=lookback_days)
 
-            df = self.fetch_historical_data(symbol, start_date, end_date)
-
-            if df.empty:
-                return None
-
-            # Extract features
-            features_df = self.feature_engineer.extract_features(df, symbol)
+            try:
+                self._sync_feature_store(symbol, start_date, end_date, interval)
+                features_df = self.feature_store.load(symbol, interval, start=start_date)
+            except OSError as e:
+                logger.warning(f"Feature store unavailable for {symbol}, computing directly: {e}")
+                df = self.fetch_historical_data(symbol, start_date, end_date, interval)
+                if df.empty:
+                    return None
+                features_df = self.feature_engineer.extract_features(df, symbol)
 
             if features_df.empty:
                 logger.warning(f"Feature extraction returned empty for {symbol}")
@@ -146,6 +169,24 @@ class MLDataPipeline:
             logger.error(f"❌ Feature preparation failed for {symbol}: {e}")
             return None
 
+    def _sync_feature_store(
+        self, symbol: str, start_date: datetime, end_date: datetime, interval: str
+    ):
+        """Bring stored features for symbol up to end_date, fetching only missing bars"""
+        fetch_start = start_date - timedelta(days=WARMUP_CALENDAR_DAYS)
+        last = self.feature_store.last_timestamp(symbol, interval)
+
+        if last is None or not self.feature_store.covers(symbol, interval, fetch_start):
+            df = self.fetch_historical_data(symbol, fetch_start, end_date, interval)
+            if not df.empty:
+                self.feature_store.write(symbol, interval, df, covers_from=fetch_start)
+            return
+
+        # Re-fetch from the last stored bar: it may have been partial when stored
+        df = self.fetch_historical_data(symbol, last.to_pydatetime(), end_date, interval)
+        if not df.empty:
+            self.feature_store.append(symbol, interval, df)
+
     def create_training_dataset(
         self,
         symbols: list[str],
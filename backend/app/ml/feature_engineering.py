@@ -7,6 +7,7 @@ to create feature vectors for machine learning models.
 Uses TA-Lib for technical analysis calculations.
 """
 
+import hashlib
 import logging
 
 import numpy as np
@@ -25,6 +26,18 @@ except ImportError:
 
 logger = logging.getLogger(__name__)
 
+# Bump when an indicator's definition or parameters change, so stored feature
+# sets computed with the old definition are not reused
+FEATURE_SET_VERSION = "1"
+
+# Bars of history an indicator needs before its value no longer depends on where
+# the series started (sma_200 plus decay time for the EMA/Wilder smoothers)
+WARMUP_BARS = 400
+
+# Running totals: recomputing them over a tail of history gives the right
+# increments but the wrong level, so they are re-based onto the stored value
+CUMULATIVE_FEATURES = ("obv", "price_volume_trend")
+
 
 class FeatureEngineer:
     """
@@ -59,18 +72,7 @@ class FeatureEngineer:
         logger.info(f"Extracting features for {symbol} ({len(df)} data points)")
 
         try:
-            # Create copy to avoid modifying original
-            features_df = df.copy()
-
-            # Ensure column names are lowercase
-            features_df.columns = features_df.columns.str.lower()
-
-            # Extract each feature group
-            features_df = self._add_trend_features(features_df)
-            features_df = self._add_momentum_features(features_df)
-            features_df = self._add_volatility_features(features_df)
-            features_df = self._add_volume_features(features_df)
-            features_df = self._add_price_features(features_df)
+            features_df = self.compute_features(df)
 
             # Drop rows with NaN (from indicator warmup periods)
             features_df = features_df.dropna()
@@ -85,6 +87,29 @@ class FeatureEngineer:
             logger.error(f"❌ Feature extraction failed for {symbol}: {e}")
             return df
 
+    def compute_features(self, df: pd.DataFrame) -> pd.DataFrame:
+        """
+        Compute all features, keeping the indicator warmup rows (as NaN)
+
+        Args:
+            df: DataFrame with columns: open, high, low, close, volume
+
+        Returns:
+            DataFrame with original data + extracted features
+        """
+        # Create copy to avoid modifying original
+        features_df = df.copy()
+
+        # Ensure column names are lowercase
+        features_df.columns = features_df.columns.str.lower()
+
+        # Extract each feature group
+        features_df = self._add_trend_features(features_df)
+        features_df = self._add_momentum_features(features_df)
+        features_df = self._add_volatility_features(features_df)
+        features_df = self._add_volume_features(features_df)
+        return self._add_price_features(features_df)
+
     def _add_trend_features(self, df: pd.DataFrame) -> pd.DataFrame:
         """Add trend indicators (moving averages, MACD, ADX)"""
         try:
@@ -290,6 +315,16 @@ class FeatureEngineer:
             "trend_direction",
         ]
 
+    def feature_set_hash(self) -> str:
+        """
+        Short hash identifying this feature set (names + definition version)
+
+        Returns:
+            12-character hex digest, used to key stored features
+        """
+        spec = f"{FEATURE_SET_VERSION}:{','.join(self.get_feature_names())}"
+        return hashlib.sha256(spec.encode()).hexdigest()[:12]
+
 
 # Convenience function for quick feature extraction
 def extract_features_from_dict(data: list[dict]) -> pd.DataFrame:
@@ -0,0 +1,294 @@
+"""
+Persistent Feature Store for ML Models
+
+FeatureEngineer recomputes every indicator over the full price history, which
+made each retrain and batch prediction pay the whole featurization cost again.
+The feature store keeps computed features on disk instead:
+
+- Keyed by (symbol, interval, feature-set hash), so changing an indicator
+  definition starts a new feature set rather than mixing old and new values
+- Columnar: one uncompressed .npz file per key holding the index and one array
+  per column, written to a temporary file and atomically renamed into place
+- Incremental: new bars are featurized together with the last WARMUP_BARS of
+  stored history only, and running totals (OBV, price-volume trend) are
+  re-based onto their stored values
+- Warmup rows are kept (as NaN) rather than dropped, so a later request for a
+  shorter window is served with complete rows from the start of the window
+
+Usage:
+    from app.ml.feature_store import get_feature_store
+
+    store = get_feature_store()
+    store.append("SPY", "daily", new_bars)
+    features = store.load("SPY", "daily", start=datetime(2024, 1, 1))
+"""
+
+import json
+import logging
+import os
+import tempfile
+import threading
+import zipfile
+from datetime import datetime
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+import pandas as pd
+
+from .feature_engineering import CUMULATIVE_FEATURES, WARMUP_BARS, FeatureEngineer
+
+
+logger = logging.getLogger(__name__)
+
+OHLCV_COLUMNS = ["open", "high", "low", "close", "volume"]
+
+
+class FeatureStore:
+    """Versioned, columnar on-disk store of engineered features"""
+
+    def __init__(self, root: str | Path, engineer: FeatureEngineer | None = None):
+        """
+        Args:
+            root: Directory holding one sub-directory per symbol
+            engineer: Feature engineer used to compute features
+        """
+        self.root = Path(root)
+        self.engineer = engineer or FeatureEngineer()
+        self.feature_set = self.engineer.feature_set_hash()
+        self._lock = threading.Lock()
+        # path -> (file mtime_ns, frame, metadata), so repeat reads skip the disk
+        self._cache: dict[Path, tuple[int, pd.DataFrame, dict[str, Any]]] = {}
+        self.rows_computed = 0
+        self.rows_served = 0
+
+    def _path(self, symbol: str, interval: str) -> Path:
+        return self.root / symbol.upper() / interval / f"{self.feature_set}.npz"
+
+    @staticmethod
+    def _normalize(bars: pd.DataFrame) -> pd.DataFrame:
+        """OHLCV columns only, as floats, sorted by a unique timestamp index"""
+        bars = bars.rename(columns=str.lower)[OHLCV_COLUMNS].astype(float)
+        bars.index = pd.DatetimeIndex(bars.index)
+        bars = bars[~bars.index.duplicated(keep="last")]
+        return bars.sort_index()
+
+    def _read(self, path: Path) -> tuple[pd.DataFrame, dict[str, Any]] | None:
+        try:
+            mtime = path.stat().st_mtime_ns
+        except FileNotFoundError:
+            return None
+
+        cached = self._cache.get(path)
+        if cached is not None and cached[0] == mtime:
+            return cached[1], cached[2]
+
+        try:
+            with np.load(path, allow_pickle=False) as data:
+                meta = json.loads(str(data["__meta__"]))
+                index = pd.DatetimeIndex(data["__index__"].astype("datetime64[ns]"))
+                if meta.get("tz"):
+                    index = index.tz_localize("UTC").tz_convert(meta["tz"])
+                frame = pd.DataFrame(
+                    {name: data[f"col_{name}"] for name in meta["columns"]}, index=index
+                )
+        except (OSError, EOFError, ValueError, KeyError, zipfile.BadZipFile) as e:
+            # Truncated or corrupt file: treat as missing so it is recomputed
+            logger.warning(f"⚠️ Unreadable feature file {path}, recomputing: {e}")
+            return None
+
+        self._cache[path] = (mtime, frame, meta)
+        return frame, meta
+
+    def _write(self, path: Path, frame: pd.DataFrame, meta: dict[str, Any]):
+        index = frame.index
+        meta = {
+            **meta,
+            "feature_set": self.feature_set,
+            "columns": list(frame.columns),
+            "tz": str(index.tz) if index.tz is not None else None,
+            "rows": len(frame),
+            "updated_at": datetime.now().isoformat(),
+        }
+        if index.tz is not None:
+            index = index.tz_convert("UTC").tz_localize(None)
+
+        arrays = {f"col_{name}": frame[name].to_numpy(dtype=float) for name in frame.columns}
+        arrays["__index__"] = index.to_numpy(dtype="datetime64[ns]").view("int64")
+        arrays["__meta__"] = np.array(json.dumps(meta))
+
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # Unique temp file per writer so concurrent workers never share one
+        with tempfile.NamedTemporaryFile(
+            dir=path.parent, prefix=f".{path.name}.", suffix=".tmp", delete=False
+        ) as f:
+            tmp_path = f.name
+            try:
+                np.savez(f, **arrays)
+            except BaseException:
+                f.close()
+                os.unlink(tmp_path)
+                raise
+        os.replace(tmp_path, path)
+        self._cache[path] = (path.stat().st_mtime_ns, frame, meta)
+
+    def write(
+        self,
+        symbol: str,
+        interval: str,
+        bars: pd.DataFrame,
+        covers_from: datetime | None = None,
+    ) -> int:
+        """
+        Featurize a full history and replace the stored feature set
+
+        Args:
+            symbol: Stock symbol
+            interval: Bar interval (e.g., "daily")
+            bars: OHLCV DataFrame indexed by timestamp
+            covers_from: Start of the range the bars were requested for
+                (default: first bar), so shorter requests know no history is missing
+
+        Returns:
+            Number of rows stored
+        """
+        bars = self._normalize(bars)
+        if bars.empty:
+            return 0
+
+        frame = self.engineer.compute_features(bars)
+        start = pd.Timestamp(covers_from) if covers_from is not None else bars.index[0]
+        with self._lock:
+            self._write(self._path(symbol, interval), frame, {"covers_from": start.isoformat()})
+            self.rows_computed += len(frame)
+
+        logger.info(f"✅ Stored {len(frame)} feature rows for {symbol} ({interval})")
+        return len(frame)
+
+    def append(self, symbol: str, interval: str, bars: pd.DataFrame) -> int:
+        """
+        Featurize new bars incrementally and add them to the stored feature set
+
+        Bars at or after the first new timestamp replace stored rows, so a
+        re-fetched (previously partial) last bar is updated in place.
+
+        Args:
+            symbol: Stock symbol
+            interval: Bar interval (e.g., "daily")
+            bars: OHLCV DataFrame indexed by timestamp
+
+        Returns:
+            Number of rows computed
+        """
+        bars = self._normalize(bars)
+        if bars.empty:
+            return 0
+
+        path = self._path(symbol, interval)
+        with self._lock:
+            stored = self._read(path)
+
+        if stored is None or bars.index[0] <= stored[0].index[0]:
+            covers_from = stored[1]["covers_from"] if stored is not None else None
+            if covers_from is not None:
+                covers_from = min(pd.Timestamp(covers_from), bars.index[0])
+            return self.write(symbol, interval, bars, covers_from=covers_from)
+
+        frame, meta = stored
+        kept = frame[frame.index < bars.index[0]]
+        if len(kept) <= WARMUP_BARS:
+            # Short history: a full recomputation is as cheap and exact
+            return self.write(
+                symbol,
+                interval,
+                pd.concat([kept[OHLCV_COLUMNS], bars]),
+                covers_from=pd.Timestamp(meta["covers_from"]),
+            )
+
+        history = kept[OHLCV_COLUMNS].iloc[-WARMUP_BARS:]
+        computed = self.engineer.compute_features(pd.concat([history, bars]))
+        fresh = computed.iloc[len(history) :].reindex(columns=frame.columns)
+
+        # Re-base running totals: the tail computation starts them from zero
+        anchor = computed.iloc[len(history) - 1]
+        for name in CUMULATIVE_FEATURES:
+            if name in fresh.columns:
+                fresh[name] += kept[name].iloc[-1] - anchor[name]
+
+        with self._lock:
+            self._write(path, pd.concat([kept, fresh]), {"covers_from": meta["covers_from"]})
+            self.rows_computed += len(fresh)
+
+        logger.info(f"✅ Appended {len(fresh)} feature rows for {symbol} ({interval})")
+        return len(fresh)
+
+    def load(
+        self,
+        symbol: str,
+        interval: str,
+        start: datetime | None = None,
+        end: datetime | None = None,
+        complete: bool = True,
+    ) -> pd.DataFrame:
+        """
+        Read a slice of stored features
+
+        Args:
+            symbol: Stock symbol
+            interval: Bar interval (e.g., "daily")
+            start: First timestamp to include (default: all history)
+            end: Last timestamp to include (default: latest)
+            complete: Drop rows still in an indicator warmup period
+
+        Returns:
+            DataFrame with OHLCV + feature columns (empty if nothing is stored)
+        """
+        with self._lock:
+            stored = self._read(self._path(symbol, interval))
+        if stored is None:
+            return pd.DataFrame()
+
+        frame = stored[0].loc[start:end]
+        if complete:
+            frame = frame.dropna()
+        self.rows_served += len(frame)
+        return frame.copy()
+
+    def last_timestamp(self, symbol: str, interval: str) -> pd.Timestamp | None:
+        """Timestamp of the latest stored bar, or None if nothing is stored"""
+        with self._lock:
+            stored = self._read(self._path(symbol, interval))
+        if stored is None or stored[0].empty:
+            return None
+        return stored[0].index[-1]
+
+    def covers(self, symbol: str, interval: str, start: datetime) -> bool:
+        """Whether the stored history was fetched from start or earlier"""
+        with self._lock:
+            stored = self._read(self._path(symbol, interval))
+        return stored is not None and pd.Timestamp(stored[1]["covers_from"]) <= pd.Timestamp(
+            start
+        )
+
+    def stats(self) -> dict[str, Any]:
+        """Feature set in use and row counters"""
+        return {
+            "root": str(self.root),
+            "feature_set": self.feature_set,
+            "rows_computed": self.rows_computed,
+            "rows_served": self.rows_served,
+        }
+
+
+# Singleton instance
+_feature_store = None
+
+
+def get_feature_store() -> FeatureStore:
+    """Get or create feature store singleton"""
+    global _feature_store
+    if _feature_store is None:
+        from ..core.config import settings
+
+        _feature_store = FeatureStore(settings.FEATURE_STORE_DIR)
+    return _feature_store
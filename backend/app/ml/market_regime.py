@@ -11,20 +11,26 @@ based on the current market regime.
 import logging
 from typing import Literal
 
-import joblib
 import numpy as np
 import pandas as pd
-from sklearn.cluster import KMeans
-from sklearn.preprocessing import StandardScaler
 
+from ..core.lazy_import import lazy_import
+from ..services.model_registry import get_model_registry
 from .data_pipeline import get_data_pipeline
 
 
 logger = logging.getLogger(__name__)
 
+joblib = lazy_import("joblib")
+KMeans = lazy_import("sklearn.cluster", "KMeans")
+StandardScaler = lazy_import("sklearn.preprocessing", "StandardScaler")
+
 # Market regime types
 MarketRegime = Literal["trending_bullish", "trending_bearish", "ranging", "high_volatility"]
 
+# Model registry ID
+REGIME_MODEL_ID = "regime_detector"
+
 
 class MarketRegimeDetector:
     """
@@ -245,8 +251,15 @@ class MarketRegimeDetector:
         """
         try:
             if not self.is_fitted:
-                logger.warning("Model not trained yet, training on SPY first...")
-                self.train()
+                # Never train on the request path - the registry trains in the background
+                logger.warning("Regime model not ready yet, training in background...")
+                _registry().train(REGIME_MODEL_ID)
+                return {
+                    "regime": "unknown",
+                    "confidence": 0.0,
+                    "error": "Model not trained yet - training in background",
+                    "model_status": "training",
+                }
 
             # Get recent data
             pipeline = get_data_pipeline()
@@ -400,13 +413,48 @@ class MarketRegimeDetector:
             return False
 
 
-# Singleton instance
+def _train_regime_detector(
+    symbol: str = "SPY", lookback_days: int = 730
+) -> tuple[MarketRegimeDetector, dict] | None:
+    """Registry trainer: fit a fresh detector (runs in the background worker)"""
+    detector = MarketRegimeDetector()
+    if not detector.train(symbol, lookback_days):
+        return None
+    metadata = {
+        "symbol": symbol,
+        "lookback_days": lookback_days,
+        "regime_labels": {str(k): v for k, v in detector.regime_labels.items()},
+    }
+    return detector, metadata
+
+
+def _registry():
+    """Model registry with the regime detector trainer registered"""
+    registry = get_model_registry()
+    registry.register(REGIME_MODEL_ID, _train_regime_detector)
+    return registry
+
+
+# Unfitted placeholder served until a trained version is published
 _regime_detector = None
 
 
 def get_regime_detector() -> MarketRegimeDetector:
-    """Get or create market regime detector singleton"""
+    """
+    Get the active market regime detector
+
+    Returns the registry's published (warm-loaded) version. On first use the
+    latest saved version is preloaded; if none exists an unfitted detector is
+    returned while training runs in the background.
+    """
     global _regime_detector
+    active = get_model_registry().get(REGIME_MODEL_ID)
+    if active is not None:
+        return active.model
+
     if _regime_detector is None:
         _regime_detector = MarketRegimeDetector()
+        active = _registry().preload(REGIME_MODEL_ID)
+        if active is not None:
+            return active.model
     return _regime_detector
@@ -0,0 +1,274 @@
+"""
+Pattern Outcome Backtesting (Event Study)
+
+Measures how detected chart patterns actually played out on the bars that
+followed them:
+
+- Every occurrence the detector finds in the lookback window (at the lowest
+  confidence the API accepts) becomes an event, entered at the close
+  CONFIRMATION_BARS after the pattern completes
+- Forward returns, target/stop hits and hold days are computed for all events
+  at once from (events x MAX_HOLD_DAYS) index matrices - no per-bar loop
+- A stop and target touched on the same bar count as a stop; events still
+  inside their holding window are reported as open, not scored
+
+The event table is independent of the confidence threshold, so callers cache
+it per (symbol, lookback, DETECTOR_VERSION) and summarize() any min_confidence
+from the cached table.
+
+Usage:
+    from app.ml.pattern_backtest import backtest_patterns_task, summarize
+
+    table = backtest_patterns_task("SPY", lookback_days=365)
+    summary = summarize(table["events"], min_confidence=0.7)
+"""
+
+import logging
+from datetime import datetime, timedelta
+from typing import Any
+
+import numpy as np
+import pandas as pd
+
+from ..services.tradier_client import get_tradier_client
+from .pattern_recognition import Pattern, PatternDetector
+
+
+logger = logging.getLogger(__name__)
+
+# Lowest min_confidence accepted by /api/ml/backtest-patterns
+DETECTION_FLOOR = 0.5
+
+# Peaks are only confirmed once later bars exist (find_peaks distance=5)
+CONFIRMATION_BARS = 5
+
+# Trades still open after this many bars exit at the close
+MAX_HOLD_DAYS = 20
+
+# Forward return horizons (bars after entry)
+FORWARD_HORIZONS = (5, 10, 20)
+
+# Fewest bars worth backtesting
+MIN_BARS = 50
+
+
+def simulate_outcomes(
+    close: np.ndarray,
+    high: np.ndarray,
+    low: np.ndarray,
+    entry_idx: np.ndarray,
+    direction: np.ndarray,
+    target: np.ndarray,
+    stop: np.ndarray,
+    max_hold: int = MAX_HOLD_DAYS,
+) -> dict[str, np.ndarray]:
+    """
+    Trade outcome of every event, vectorized over events and holding days
+
+    Args:
+        close, high, low: Bar prices
+        entry_idx: Entry bar per event (entries at or past the last bar stay open)
+        direction: +1 long / -1 short per event
+        target: Target price per event
+        stop: Stop price per event
+        max_hold: Bars an event is held before exiting at the close
+
+    Returns:
+        roi (%), hold_days and outcome ("target", "stop", "expiry" or "open") per
+        event, plus fwd_{h}d forward returns (%) for FORWARD_HORIZONS; open
+        events have NaN roi and hold_days
+    """
+    n = len(close)
+    entry_idx = np.asarray(entry_idx, dtype=int)
+    events = np.arange(len(entry_idx))
+    entry = close[np.minimum(entry_idx, n - 1)]
+    direction = np.asarray(direction, dtype=float)
+    is_long = (direction > 0)[:, None]
+
+    # (events, max_hold) bar indexes after entry; bars past the end are masked
+    idx = entry_idx[:, None] + np.arange(1, max_hold + 1)
+    in_range = idx < n
+    idx = np.minimum(idx, n - 1)
+    bar_high, bar_low = high[idx], low[idx]
+
+    target_hit = in_range & np.where(
+        is_long, bar_high >= target[:, None], bar_low <= target[:, None]
+    )
+    stop_hit = in_range & np.where(is_long, bar_low <= stop[:, None], bar_high >= stop[:, None])
+    first_target = np.where(target_hit.any(axis=1), target_hit.argmax(axis=1), max_hold)
+    first_stop = np.where(stop_hit.any(axis=1), stop_hit.argmax(axis=1), max_hold)
+
+    available = in_range.sum(axis=1)
+    last = np.maximum(available - 1, 0)
+    stopped = (first_stop < max_hold) & (first_stop <= first_target)
+    targeted = ~stopped & (first_target < max_hold)
+    expired = ~stopped & ~targeted & (available == max_hold)
+    resolved = stopped | targeted | expired
+
+    exit_step = np.where(stopped, first_stop, np.where(targeted, first_target, last))
+    exit_price = np.where(stopped, stop, np.where(targeted, target, close[idx[events, last]]))
+    with np.errstate(invalid="ignore", divide="ignore"):
+        roi = direction * (exit_price / entry - 1) * 100
+
+    result = {
+        "roi": np.where(resolved, roi, np.nan),
+        "hold_days": np.where(resolved, exit_step + 1.0, np.nan),
+        "outcome": np.select(
+            [stopped, targeted, expired], ["stop", "target", "expiry"], default="open"
+        ),
+    }
+    for horizon in FORWARD_HORIZONS:
+        forward = entry_idx + horizon
+        price = close[np.minimum(forward, n - 1)]
+        with np.errstate(invalid="ignore", divide="ignore"):
+            returns = direction * (price / entry - 1) * 100
+        result[f"fwd_{horizon}d"] = np.where(forward < n, returns, np.nan)
+    return result
+
+
+def pattern_events(df: pd.DataFrame, patterns: list[Pattern]) -> dict[str, np.ndarray]:
+    """
+    Event table (one row per pattern occurrence) with its simulated outcome
+
+    Args:
+        df: Bars the patterns were detected in (close/high/low, date index)
+        patterns: Detected patterns
+
+    Returns:
+        Columns: pattern_type, signal, confidence, entry_date, plus the
+        simulate_outcomes columns
+    """
+    close = df["close"].to_numpy(dtype=float)
+    high = df["high"].to_numpy(dtype=float)
+    low = df["low"].to_numpy(dtype=float)
+
+    end_idx = df.index.get_indexer([p.end_date for p in patterns]).astype(int)
+    known = end_idx >= 0
+    patterns = [p for p, ok in zip(patterns, known) if ok]
+    end_idx = end_idx[known]
+
+    entry_idx = end_idx + CONFIRMATION_BARS
+    entry = close[np.minimum(entry_idx, len(close) - 1)]
+    target = np.array([np.nan if p.target_price is None else p.target_price for p in patterns])
+    stop = np.array([np.nan if p.stop_loss is None else p.stop_loss for p in patterns])
+    signal = np.array([p.signal for p in patterns], dtype=str)
+    # Neutral patterns trade towards their target
+    direction = np.select(
+        [signal == "bullish", signal == "bearish"], [1.0, -1.0], np.where(target < entry, -1.0, 1.0)
+    )
+
+    dates = np.array([d.isoformat() for d in df.index], dtype=str)
+    return {
+        "pattern_type": np.array([p.pattern_type for p in patterns], dtype=str),
+        "signal": signal,
+        "confidence": np.array([p.confidence for p in patterns], dtype=float),
+        "entry_date": dates[np.minimum(entry_idx, len(dates) - 1)],
+        **simulate_outcomes(close, high, low, entry_idx, direction, target, stop),
+    }
+
+
+def load_bars(symbol: str, lookback_days: int) -> pd.DataFrame:
+    """
+    Daily bars for the lookback window, straight from Tradier
+
+    Returns:
+        DataFrame with close/high/low columns and a date index (empty if no data)
+    """
+    end = datetime.now()
+    bars = get_tradier_client().get_historical_bars(
+        symbol,
+        interval="daily",
+        start_date=(end - timedelta(days=lookback_days)).strftime("%Y-%m-%d"),
+        end_date=end.strftime("%Y-%m-%d"),
+    )
+    if not bars:
+        return pd.DataFrame(columns=["close", "high", "low"])
+
+    df = pd.DataFrame(bars)
+    df.index = pd.DatetimeIndex(pd.to_datetime(df["date"]))
+    df = df[["close", "high", "low"]].apply(pd.to_numeric, errors="coerce").dropna()
+    return df[~df.index.duplicated(keep="last")].sort_index()
+
+
+def backtest_patterns_task(symbol: str, lookback_days: int) -> dict[str, Any]:
+    """
+    Compute pool entry point: detect every pattern in the window and score it
+
+    Raises:
+        ValueError: Fewer than MIN_BARS bars available
+    """
+    df = load_bars(symbol, lookback_days)
+    if len(df) < MIN_BARS:
+        raise ValueError(f"Insufficient historical data for {symbol}")
+
+    patterns = PatternDetector(min_confidence=DETECTION_FLOOR).detect_in_frame(df)
+    events = pattern_events(df, patterns)
+    logger.info(f"✅ Pattern backtest {symbol}: {len(patterns)} events over {len(df)} bars")
+    return {
+        "symbol": symbol,
+        "start_date": df.index[0].isoformat(),
+        "end_date": df.index[-1].isoformat(),
+        "events": events,
+    }
+
+
+def _mean(values: np.ndarray) -> float:
+    return round(float(values.mean()), 2) if len(values) else 0.0
+
+
+def summarize(events: dict[str, np.ndarray], min_confidence: float) -> dict[str, Any]:
+    """
+    Per-pattern-type performance of the events at or above min_confidence
+
+    Returns:
+        patterns (per-type metrics), total_patterns, open_patterns,
+        overall_win_rate and overall_avg_roi
+    """
+    selected = events["confidence"] >= min_confidence
+    resolved = selected & np.isfinite(events["roi"])
+    types = events["pattern_type"]
+
+    performance = []
+    for pattern_type in np.unique(types[selected]):
+        of_type = selected & (types == pattern_type)
+        scored = resolved & (types == pattern_type)
+        rois = events["roi"][scored]
+        outcomes = events["outcome"][scored]
+        wins = int((rois > 0).sum())
+        performance.append(
+            {
+                "pattern_type": str(pattern_type),
+                "total_occurrences": int(of_type.sum()),
+                "successful_trades": wins,
+                "failed_trades": len(rois) - wins,
+                "open_trades": int(of_type.sum()) - len(rois),
+                "win_rate": round(wins / len(rois) * 100, 2) if len(rois) else 0.0,
+                "avg_roi": _mean(rois),
+                "avg_hold_days": _mean(events["hold_days"][scored]),
+                "best_roi": round(float(rois.max()), 2) if len(rois) else 0.0,
+                "worst_roi": round(float(rois.min()), 2) if len(rois) else 0.0,
+                "target_hit_rate": _mean((outcomes == "target") * 100.0),
+                "stop_hit_rate": _mean((outcomes == "stop") * 100.0),
+                "avg_forward_returns": {
+                    f"{h}d": _mean(
+                        events[f"fwd_{h}d"][of_type][np.isfinite(events[f"fwd_{h}d"][of_type])]
+                    )
+                    for h in FORWARD_HORIZONS
+                },
+                "last_seen": str(max(events["entry_date"][of_type])),
+            }
+        )
+
+    rois = events["roi"][resolved]
+    return {
+        "patterns": performance,
+        "total_patterns": int(selected.sum()),
+        "open_patterns": int(selected.sum() - resolved.sum()),
+        "overall_win_rate": round(float((rois > 0).mean() * 100), 2) if len(rois) else 0.0,
+        "overall_avg_roi": _mean(rois),
+    }
+
+
+def concat_events(tables: list[dict[str, np.ndarray]]) -> dict[str, np.ndarray]:
+    """Stack event tables of several symbols into one"""
+    return {column: np.concatenate([t[column] for t in tables]) for column in tables[0]}
@@ -17,13 +17,18 @@ from typing import Literal
 
 import numpy as np
 import pandas as pd
-from scipy.signal import find_peaks
 
+from ..core.lazy_import import lazy_import
 from .data_pipeline import get_data_pipeline
 
 
 logger = logging.getLogger(__name__)
 
+find_peaks = lazy_import("scipy.signal", "find_peaks")
+
+# Bumped whenever detection rules change (invalidates cached pattern backtests)
+DETECTOR_VERSION = "1.0.0"
+
 # Pattern types
 PatternType = Literal[
     "double_top",
@@ -122,19 +127,7 @@ class PatternDetector:
                 logger.warning(f"Insufficient data for pattern detection: {symbol}")
                 return []
 
-            patterns = []
-
-            # Detect each pattern type
-            patterns.extend(self._detect_double_patterns(df))
-            patterns.extend(self._detect_head_shoulders(df))
-            patterns.extend(self._detect_triangles(df))
-            patterns.extend(self._detect_support_resistance_breaks(df))
-
-            # Filter by confidence
-            patterns = [p for p in patterns if p.confidence >= self.min_confidence]
-
-            # Sort by confidence (highest first)
-            patterns.sort(key=lambda p: p.confidence, reverse=True)
+            patterns = self.detect_in_frame(df)
 
             logger.info(
                 f"✅ Detected {len(patterns)} patterns for {symbol} "
@@ -147,6 +140,28 @@ class PatternDetector:
             logger.error(f"❌ Pattern detection failed for {symbol}: {e}")
             return []
 
+    def detect_in_frame(self, df: pd.DataFrame) -> list[Pattern]:
+        """
+        Detect all patterns in a bar DataFrame (close/high/low columns, date index)
+
+        Returns:
+            Patterns at or above min_confidence, sorted by confidence
+        """
+        patterns = []
+
+        # Detect each pattern type
+        patterns.extend(self._detect_double_patterns(df))
+        patterns.extend(self._detect_head_shoulders(df))
+        patterns.extend(self._detect_triangles(df))
+        patterns.extend(self._detect_support_resistance_breaks(df))
+
+        # Filter by confidence
+        patterns = [p for p in patterns if p.confidence >= self.min_confidence]
+
+        # Sort by confidence (highest first)
+        patterns.sort(key=lambda p: p.confidence, reverse=True)
+        return patterns
+
     def _detect_double_patterns(self, df: pd.DataFrame) -> list[Pattern]:
         """Detect double top and double bottom patterns"""
         patterns = []
@@ -576,3 +591,15 @@ def get_pattern_detector() -> PatternDetector:
     if _pattern_detector is None:
         _pattern_detector = PatternDetector()
     return _pattern_detector
+
+
+def detect_patterns_task(
+    symbol: str, lookback_days: int = 90, min_confidence: float = 0.6
+) -> list[Pattern]:
+    """
+    Compute pool entry point for pattern detection
+
+    Uses its own detector so concurrent requests with different confidence
+    thresholds do not overwrite each other's setting on the shared singleton.
+    """
+    return PatternDetector(min_confidence=min_confidence).detect_patterns(symbol, lookback_days)
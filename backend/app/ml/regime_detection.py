@@ -4,10 +4,16 @@ from enum import Enum
 
 import numpy as np
 import pandas as pd
-import talib
-from scipy.stats import kurtosis, skew
-from sklearn.ensemble import IsolationForest, RandomForestClassifier
-from sklearn.preprocessing import StandardScaler
+
+from ..core.lazy_import import lazy_import
+
+
+talib = lazy_import("talib")
+kurtosis = lazy_import("scipy.stats", "kurtosis")
+skew = lazy_import("scipy.stats", "skew")
+IsolationForest = lazy_import("sklearn.ensemble", "IsolationForest")
+RandomForestClassifier = lazy_import("sklearn.ensemble", "RandomForestClassifier")
+StandardScaler = lazy_import("sklearn.preprocessing", "StandardScaler")
 
 
 """
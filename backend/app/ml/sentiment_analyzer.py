@@ -1,20 +1,41 @@
 """
 Sentiment Analysis Service using Anthropic Claude
 Analyzes market news and social media sentiment for trading insights
+
+Set ANTHROPIC_BASE_URL to point the client at a local stub server in tests.
 """
 
+import asyncio
+import hashlib
+import json
 import logging
 from datetime import UTC, datetime
 
-import anthropic
+from cachetools import TTLCache
 from pydantic import BaseModel
 
 from ..core.config import get_settings
+from ..core.lazy_import import lazy_import
+from ..services.cache import CacheService, get_cache
 
 
 logger = logging.getLogger(__name__)
 settings = get_settings()
 
+anthropic = lazy_import("anthropic")
+
+# Article results never change, so cache them for a day
+ARTICLE_CACHE_TTL = 86400
+LOCAL_CACHE_SIZE = 5000
+
+# Batching and concurrency limits for Claude requests
+ARTICLE_BATCH_SIZE = 20
+MAX_CONCURRENT_REQUESTS = 4
+MAX_ARTICLES_PER_SYMBOL = 10
+
+# Aggregate score needed to call a symbol bullish/bearish
+SENTIMENT_THRESHOLD = 0.15
+
 
 class SentimentScore(BaseModel):
     """Sentiment analysis result"""
@@ -28,12 +49,53 @@ class SentimentScore(BaseModel):
     source: str  # 'news', 'social', 'combined'
 
 
-class SentimentAnalyzer:
-    """Analyzes market sentiment using Anthropic Claude"""
+def article_cache_key(symbol: str, article: dict) -> str:
+    """Cache key from the symbol and a hash of the normalized article text"""
+    text = " ".join(
+        [article.get("title", ""), article.get("content", article.get("summary", ""))]
+    )
+    normalized = " ".join(text.lower().split())
+    digest = hashlib.sha256(normalized.encode()).hexdigest()[:32]
+    return f"sentiment:article:{symbol.upper()}:{digest}"
 
-    def __init__(self):
-        self.client = anthropic.Anthropic(api_key=settings.ANTHROPIC_API_KEY)
+
+class SentimentAnalyzer:
+    """
+    Analyzes market sentiment using Anthropic Claude
+
+    Articles are scored individually and cached by a hash of their normalized
+    content, so overlapping requests (sentiment, signals, watchlists) never
+    re-analyze the same article. Uncached articles from many symbols are
+    packed into shared batch prompts, and calls go through the async client
+    under a bounded concurrency pool.
+    """
+
+    def __init__(
+        self,
+        client: "anthropic.AsyncAnthropic | None" = None,
+        cache: CacheService | None = None,
+        batch_size: int = ARTICLE_BATCH_SIZE,
+        max_concurrency: int = MAX_CONCURRENT_REQUESTS,
+    ):
+        self.client = client or anthropic.AsyncAnthropic(
+            api_key=settings.ANTHROPIC_API_KEY,
+            base_url=settings.ANTHROPIC_BASE_URL or None,
+        )
         self.model = "claude-3-5-sonnet-20241022"
+        self.cache = cache if cache is not None else get_cache()
+        self.batch_size = batch_size
+        self._local_cache: TTLCache = TTLCache(maxsize=LOCAL_CACHE_SIZE, ttl=ARTICLE_CACHE_TTL)
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+
+    async def _create_message(self, prompt: str, max_tokens: int) -> str:
+        """Send one prompt through the bounded concurrency pool"""
+        async with self._semaphore:
+            message = await self.client.messages.create(
+                model=self.model,
+                max_tokens=max_tokens,
+                messages=[{"role": "user", "content": prompt}],
+            )
+        return message.content[0].text
 
     async def analyze_text(
         self, symbol: str, text: str, source: str = "news"
@@ -49,18 +111,27 @@ class SentimentAnalyzer:
         Returns:
             SentimentScore with analysis results
         """
+        cache_key = article_cache_key(symbol, {"content": text})
+        cached = self._cache_get(cache_key)
+        if cached:
+            return self._score_from_entry(symbol, cached, source)
+
         try:
             prompt = self._build_sentiment_prompt(symbol, text)
-
-            message = self.client.messages.create(
-                model=self.model,
-                max_tokens=1024,
-                messages=[{"role": "user", "content": prompt}],
-            )
+            response_text = await self._create_message(prompt, max_tokens=1024)
 
             # Parse Claude's response
-            response_text = message.content[0].text
-            return self._parse_sentiment_response(symbol, response_text, source)
+            result = self._parse_sentiment_response(symbol, response_text, source)
+            self._cache_set(
+                cache_key,
+                {
+                    "sentiment": result.sentiment,
+                    "score": result.score,
+                    "confidence": result.confidence,
+                    "reasoning": result.reasoning,
+                },
+            )
+            return result
 
         except Exception as e:
             logger.error(f"Sentiment analysis error for {symbol}: {e}")
@@ -88,44 +159,149 @@ class SentimentAnalyzer:
         Returns:
             Aggregated SentimentScore
         """
-        if not news_articles:
-            return SentimentScore(
-                symbol=symbol,
-                sentiment="neutral",
-                score=0.0,
-                confidence=0.0,
-                reasoning="No news articles available",
-                timestamp=datetime.now(UTC),
-                source="news",
-            )
+        results = await self.analyze_watchlist({symbol: news_articles})
+        return results[symbol]
 
-        # Combine all news into one analysis for efficiency
-        combined_text = self._combine_news_articles(news_articles)
+    async def analyze_watchlist(
+        self, news_by_symbol: dict[str, list[dict]]
+    ) -> dict[str, SentimentScore]:
+        """
+        Analyze news sentiment for many symbols at once
 
-        try:
-            prompt = self._build_batch_sentiment_prompt(symbol, combined_text)
+        Cached articles are answered from the cache; all remaining articles,
+        across every symbol, are deduplicated and packed into shared batch
+        prompts that run concurrently.
 
-            message = self.client.messages.create(
-                model=self.model,
-                max_tokens=2048,
-                messages=[{"role": "user", "content": prompt}],
-            )
-
-            response_text = message.content[0].text
-            return self._parse_sentiment_response(symbol, response_text, "news")
+        Args:
+            news_by_symbol: Mapping of symbol to its news articles
 
+        Returns:
+            Mapping of symbol to aggregated SentimentScore
+        """
+        entries_by_symbol: dict[str, list[dict]] = {}
+        pending: dict[str, tuple[str, dict]] = {}
+
+        for symbol, articles in news_by_symbol.items():
+            keys = [
+                article_cache_key(symbol, article)
+                for article in articles[:MAX_ARTICLES_PER_SYMBOL]
+            ]
+            entries_by_symbol[symbol] = []
+            for key, article in zip(keys, articles, strict=False):
+                cached = self._cache_get(key)
+                if cached:
+                    entries_by_symbol[symbol].append(cached)
+                else:
+                    pending.setdefault(key, (symbol, article))
+
+        if pending:
+            items = list(pending.items())
+            batches = [
+                items[i : i + self.batch_size] for i in range(0, len(items), self.batch_size)
+            ]
+            logger.info(
+                f"Sentiment: {len(items)} uncached articles -> {len(batches)} batch request(s)"
+            )
+            batch_results = await asyncio.gather(*(self._score_batch(b) for b in batches))
+
+            for batch, results in zip(batches, batch_results, strict=True):
+                for (key, (symbol, _article)), entry in zip(batch, results, strict=True):
+                    if entry is None:
+                        continue
+                    self._cache_set(key, entry)
+                    entries_by_symbol[symbol].append(entry)
+
+        return {
+            symbol: self._aggregate(symbol, entries_by_symbol[symbol], bool(articles))
+            for symbol, articles in news_by_symbol.items()
+        }
+
+    async def _score_batch(self, batch: list[tuple[str, tuple[str, dict]]]) -> list[dict | None]:
+        """Score a batch of (cache key, (symbol, article)) items in one request"""
+        try:
+            prompt = self._build_article_batch_prompt(
+                [(symbol, article) for _key, (symbol, article) in batch]
+            )
+            response_text = await self._create_message(prompt, max_tokens=150 * len(batch) + 256)
+            return self._parse_article_batch_response(response_text, len(batch))
         except Exception as e:
-            logger.error(f"Batch sentiment analysis error for {symbol}: {e}")
+            logger.error(f"Batch sentiment request failed ({len(batch)} articles): {e}")
+            return [None] * len(batch)
+
+    def _cache_get(self, key: str) -> dict | None:
+        """Look up an article result in the local cache, then the shared cache"""
+        entry = self._local_cache.get(key)
+        if entry is None:
+            entry = self.cache.get(key)
+            if entry is not None:
+                self._local_cache[key] = entry
+        return entry
+
+    def _cache_set(self, key: str, entry: dict):
+        """Store an article result in both cache tiers"""
+        self._local_cache[key] = entry
+        self.cache.set(key, entry, ttl=ARTICLE_CACHE_TTL)
+
+    def _score_from_entry(self, symbol: str, entry: dict, source: str) -> SentimentScore:
+        """Build a SentimentScore from a cached article entry"""
+        return SentimentScore(
+            symbol=symbol,
+            sentiment=entry["sentiment"],
+            score=entry["score"],
+            confidence=entry["confidence"],
+            reasoning=entry["reasoning"],
+            timestamp=datetime.now(UTC),
+            source=source,
+        )
+
+    def _aggregate(self, symbol: str, entries: list[dict], had_articles: bool) -> SentimentScore:
+        """Combine per-article results into one confidence-weighted score"""
+        if not entries:
             return SentimentScore(
                 symbol=symbol,
                 sentiment="neutral",
                 score=0.0,
                 confidence=0.0,
-                reasoning=f"Batch analysis failed: {e!s}",
+                reasoning=(
+                    "Batch analysis failed" if had_articles else "No news articles available"
+                ),
                 timestamp=datetime.now(UTC),
                 source="news",
             )
 
+        total_confidence = sum(e["confidence"] for e in entries)
+        if total_confidence > 0:
+            score = sum(e["score"] * e["confidence"] for e in entries) / total_confidence
+        else:
+            score = sum(e["score"] for e in entries) / len(entries)
+        score = max(-1.0, min(1.0, score))
+
+        if score >= SENTIMENT_THRESHOLD:
+            sentiment = "bullish"
+        elif score <= -SENTIMENT_THRESHOLD:
+            sentiment = "bearish"
+        else:
+            sentiment = "neutral"
+
+        counts = {label: 0 for label in ("bullish", "bearish", "neutral")}
+        for entry in entries:
+            counts[entry["sentiment"]] = counts.get(entry["sentiment"], 0) + 1
+        strongest = max(entries, key=lambda e: abs(e["score"]) * e["confidence"])
+
+        return SentimentScore(
+            symbol=symbol,
+            sentiment=sentiment,
+            score=round(score, 4),
+            confidence=round(total_confidence / len(entries), 4),
+            reasoning=(
+                f"{len(entries)} articles analyzed ({counts['bullish']} bullish, "
+                f"{counts['bearish']} bearish, {counts['neutral']} neutral). "
+                f"{strongest['reasoning']}"
+            ),
+            timestamp=datetime.now(UTC),
+            source="news",
+        )
+
     def _build_sentiment_prompt(self, symbol: str, text: str) -> str:
         """Build prompt for sentiment analysis"""
         return f"""Analyze the market sentiment for {symbol} based on this text:
@@ -146,25 +322,61 @@ REASONING: [your reasoning here]
 
 Be objective and focus on actionable market indicators."""
 
-    def _build_batch_sentiment_prompt(self, symbol: str, combined_text: str) -> str:
-        """Build prompt for batch news analysis"""
-        return f"""Analyze the overall market sentiment for {symbol} based on these recent news articles:
+    def _build_article_batch_prompt(self, items: list[tuple[str, dict]]) -> str:
+        """Build one prompt that scores many (symbol, article) items"""
+        blocks = []
+        for i, (symbol, article) in enumerate(items, 1):
+            title = article.get("title", "")
+            content = article.get("content", article.get("summary", ""))
+            source = article.get("source", "Unknown")
+            block = f"[{i}] Symbol: {symbol} | Source: {source}\nTitle: {title}"
+            if content:
+                block += f"\nContent: {content[:500]}..."  # Limit length
+            blocks.append(block)
 
-{combined_text}
+        articles_text = "\n\n".join(blocks)
+        return f"""Analyze the market sentiment of each numbered news article below \
+for the symbol listed with it.
 
-Synthesize all the information and provide:
-1. Overall market sentiment (BULLISH, BEARISH, or NEUTRAL)
-2. Aggregate sentiment score from -1.0 (very bearish) to +1.0 (very bullish)
-3. Confidence level from 0.0 to 1.0
-4. Key themes and reasoning (3-4 sentences)
+{articles_text}
 
-Format your response EXACTLY as:
-SENTIMENT: [BULLISH|BEARISH|NEUTRAL]
-SCORE: [number between -1.0 and 1.0]
-CONFIDENCE: [number between 0.0 and 1.0]
-REASONING: [your synthesized analysis here]
+For EVERY article return one object with:
+- "id": the article number
+- "sentiment": "bullish", "bearish" or "neutral"
+- "score": number from -1.0 (very bearish) to +1.0 (very bullish)
+- "confidence": number from 0.0 to 1.0
+- "reasoning": one sentence
 
-Focus on the most recent and impactful information."""
+Respond with ONLY a JSON array of these objects, no other text.
+Be objective and focus on actionable market indicators."""
+
+    def _parse_article_batch_response(self, response: str, count: int) -> list[dict | None]:
+        """Parse the JSON array returned for a batch prompt (missing ids -> None)"""
+        results: list[dict | None] = [None] * count
+        try:
+            payload = json.loads(response[response.index("[") : response.rindex("]") + 1])
+        except ValueError as e:
+            logger.error(f"Error parsing batch sentiment response: {e}")
+            return results
+
+        for item in payload:
+            try:
+                index = int(item["id"]) - 1
+                if not 0 <= index < count:
+                    continue
+                sentiment = str(item.get("sentiment", "neutral")).lower()
+                if sentiment not in ["bullish", "bearish", "neutral"]:
+                    sentiment = "neutral"
+                results[index] = {
+                    "sentiment": sentiment,
+                    "score": max(-1.0, min(1.0, float(item.get("score", 0.0)))),
+                    "confidence": max(0.0, min(1.0, float(item.get("confidence", 0.5)))),
+                    "reasoning": str(item.get("reasoning", "")) or "No reasoning provided",
+                }
+            except (AttributeError, KeyError, TypeError, ValueError):
+                continue
+
+        return results
 
     def _parse_sentiment_response(
         self, symbol: str, response: str, source: str
@@ -226,22 +438,6 @@ Focus on the most recent and impactful information."""
                 source=source,
             )
 
-    def _combine_news_articles(self, articles: list[dict]) -> str:
-        """Combine multiple news articles into one text"""
-        combined = []
-        for i, article in enumerate(articles[:10], 1):  # Limit to 10 articles
-            title = article.get("title", "")
-            content = article.get("content", article.get("summary", ""))
-            source = article.get("source", "Unknown")
-
-            combined.append(f"Article {i} ({source}):")
-            combined.append(f"Title: {title}")
-            if content:
-                combined.append(f"Content: {content[:500]}...")  # Limit length
-            combined.append("")
-
-        return "\n".join(combined)
-
 
 # Global instance
 _sentiment_analyzer: SentimentAnalyzer | None = None
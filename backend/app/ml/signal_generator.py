@@ -11,7 +11,7 @@ import pandas as pd
 from pydantic import BaseModel
 
 from .feature_engineering import FeatureEngineer
-from .sentiment_analyzer import SentimentAnalyzer
+from .sentiment_analyzer import get_sentiment_analyzer
 
 
 logger = logging.getLogger(__name__)
@@ -66,7 +66,7 @@ class SignalGenerator:
             sentiment_weight: Weight for sentiment score (0-1)
             technical_weight: Weight for technical score (0-1)
         """
-        self.sentiment_analyzer = SentimentAnalyzer()
+        self.sentiment_analyzer = get_sentiment_analyzer()
         self.feature_engineer = FeatureEngineer()
         self.sentiment_weight = sentiment_weight
         self.technical_weight = technical_weight
@@ -11,20 +11,27 @@ in which market regimes and feature combinations.
 import logging
 from typing import Any
 
-import joblib
 import pandas as pd
-from sklearn.ensemble import RandomForestClassifier
-from sklearn.model_selection import train_test_split
-from sklearn.preprocessing import LabelEncoder, StandardScaler
 
+from ..core.lazy_import import lazy_import
 from ..services.backtesting_engine import BacktestingEngine
+from ..services.model_registry import get_model_registry
 from ..services.strategy_templates import get_all_strategy_templates
 from .data_pipeline import get_data_pipeline
-from .market_regime import get_regime_detector
+from .market_regime import REGIME_MODEL_ID, get_regime_detector
 
 
 logger = logging.getLogger(__name__)
 
+joblib = lazy_import("joblib")
+RandomForestClassifier = lazy_import("sklearn.ensemble", "RandomForestClassifier")
+train_test_split = lazy_import("sklearn.model_selection", "train_test_split")
+LabelEncoder = lazy_import("sklearn.preprocessing", "LabelEncoder")
+StandardScaler = lazy_import("sklearn.preprocessing", "StandardScaler")
+
+# Model registry ID
+STRATEGY_MODEL_ID = "strategy_selector"
+
 
 class StrategySelector:
     """
@@ -355,8 +362,10 @@ class StrategySelector:
         """
         try:
             if not self.is_fitted:
-                logger.warning("Model not trained yet, training on default symbols...")
-                self.train()
+                # Never train on the request path - the registry trains in the background
+                logger.warning("Strategy model not ready yet, training in background...")
+                _registry().train(STRATEGY_MODEL_ID)
+                return []
 
             # Get current market features
             pipeline = get_data_pipeline()
@@ -476,13 +485,52 @@ class StrategySelector:
             return False
 
 
-# Singleton instance
+def _train_strategy_selector(
+    symbols: list[str] | None = None, lookback_days: int = 365
+) -> tuple[StrategySelector, dict] | None:
+    """Registry trainer: fit a fresh selector (runs in the background worker)"""
+    # Training windows are labelled by the regime detector, so wait for it first
+    if not get_regime_detector().is_fitted:
+        get_model_registry().train(REGIME_MODEL_ID).result()
+
+    selector = StrategySelector()
+    result = selector.train(symbols, lookback_days)
+    if not result.get("success"):
+        return None
+    metadata = {
+        key: result[key]
+        for key in ("train_accuracy", "test_accuracy", "n_samples", "n_features", "strategies")
+    }
+    return selector, metadata
+
+
+def _registry():
+    """Model registry with the strategy selector trainer registered"""
+    registry = get_model_registry()
+    registry.register(STRATEGY_MODEL_ID, _train_strategy_selector)
+    return registry
+
+
+# Unfitted placeholder served until a trained version is published
 _strategy_selector = None
 
 
 def get_strategy_selector() -> StrategySelector:
-    """Get or create strategy selector singleton"""
+    """
+    Get the active strategy selector
+
+    Returns the registry's published (warm-loaded) version. On first use the
+    latest saved version is preloaded; if none exists an unfitted selector is
+    returned while training runs in the background.
+    """
     global _strategy_selector
+    active = get_model_registry().get(STRATEGY_MODEL_ID)
+    if active is not None:
+        return active.model
+
     if _strategy_selector is None:
         _strategy_selector = StrategySelector()
+        active = _registry().preload(STRATEGY_MODEL_ID)
+        if active is not None:
+            return active.model
     return _strategy_selector
@@ -13,11 +13,13 @@ from typing import Literal
 
 from fastapi import APIRouter, Body, Depends, HTTPException, Path, Query
 from pydantic import BaseModel, Field, field_validator
+from sqlalchemy import select
 from sqlalchemy.orm import Session
 
+from ..core.compute_pool import ComputePoolSaturatedError, ComputeTimeoutError, get_compute_pool
 from ..core.unified_auth import get_current_user_unified
 from ..core.validators import InputSanitizer
-from ..db.session import get_db
+from ..db.session import AsyncDBSession, get_async_db, get_db
 from ..models.database import User
 from ..services.technical_indicators import TechnicalIndicators
 from ..services.tradier_client import get_tradier_client
@@ -27,6 +29,28 @@ logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/ai", tags=["ai"])
 
+# Indicator calculation over ~200 daily closes
+SIGNAL_TIMEOUT_SECONDS = 10
+
+
+async def _compute_signal(symbol: str, prices: list[float]) -> dict:
+    """Run TechnicalIndicators.generate_signal in the compute pool"""
+    try:
+        return await get_compute_pool().run(
+            TechnicalIndicators.generate_signal,
+            symbol,
+            prices,
+            timeout=SIGNAL_TIMEOUT_SECONDS,
+        )
+    except ComputePoolSaturatedError as e:
+        raise HTTPException(
+            status_code=503,
+            detail="Analysis is busy, please retry shortly",
+            headers={"Retry-After": str(e.retry_after)},
+        ) from e
+    except ComputeTimeoutError as e:
+        raise HTTPException(status_code=504, detail=str(e)) from e
+
 
 class TradeData(BaseModel):
     """Pre-filled trade execution data for 1-click trading"""
@@ -285,6 +309,127 @@ async def get_recommendations(current_user: User = Depends(get_current_user_unif
         )
 
 
+class RecommendationHistoryResponse(BaseModel):
+    """Single recommendation history entry"""
+
+    id: int
+    symbol: str
+    recommendation_type: str
+    confidence_score: float
+    analysis_data: dict
+    suggested_entry_price: float | None
+    suggested_stop_loss: float | None
+    suggested_take_profit: float | None
+    reasoning: str | None
+    market_context: str | None
+    status: str
+    created_at: str
+    expires_at: str | None
+    # Performance tracking (if executed)
+    executed_at: str | None
+    execution_price: float | None
+    actual_pnl: float | None
+    actual_pnl_percent: float | None
+
+    class Config:
+        from_attributes = True
+
+
+# Registered before /recommendations/{symbol}, which would otherwise match it
+@router.get(
+    "/recommendations/history",
+    response_model=list[RecommendationHistoryResponse],
+)
+async def get_recommendation_history(
+    symbol: str | None = Query(None, description="Filter by symbol"),
+    status: str | None = Query(
+        None, description="Filter by status (pending, executed, ignored, expired)"
+    ),
+    limit: int = Query(
+        50, ge=1, le=200, description="Maximum number of recommendations to return"
+    ),
+    offset: int = Query(0, ge=0, description="Number of recommendations to skip"),
+    current_user: User = Depends(get_current_user_unified),
+    db: AsyncDBSession = Depends(get_async_db),
+):
+    """
+    Get recommendation history with optional filters
+
+    Allows users to:
+    - Review past AI recommendations
+    - Track which recommendations were executed
+    - Analyze accuracy and performance over time
+    - Filter by symbol, status, or date range
+
+    Phase: Final 6% MVP completion
+    """
+    try:
+        from ..models.database import AIRecommendation
+
+        # Build query
+        query = select(AIRecommendation).where(
+            AIRecommendation.user_id
+            == current_user.id  # Use authenticated user ID from JWT
+        )
+
+        # Apply filters
+        if symbol:
+            query = query.where(AIRecommendation.symbol == symbol.upper())
+
+        if status:
+            query = query.where(AIRecommendation.status == status.lower())
+
+        # Order by creation date (newest first)
+        query = query.order_by(AIRecommendation.created_at.desc())
+
+        # Apply pagination
+        result_rows = await db.execute(query.offset(offset).limit(limit))
+        recommendations = result_rows.scalars().all()
+
+        # Convert to response format
+        result = []
+        for rec in recommendations:
+            result.append(
+                RecommendationHistoryResponse(
+                    id=rec.id,
+                    symbol=rec.symbol,
+                    recommendation_type=rec.recommendation_type,
+                    confidence_score=rec.confidence_score,
+                    analysis_data=rec.analysis_data or {},
+                    suggested_entry_price=rec.suggested_entry_price,
+                    suggested_stop_loss=rec.suggested_stop_loss,
+                    suggested_take_profit=rec.suggested_take_profit,
+                    reasoning=rec.reasoning,
+                    market_context=rec.market_context,
+                    status=rec.status,
+                    created_at=rec.created_at.isoformat() + "Z"
+                    if rec.created_at
+                    else None,
+                    expires_at=rec.expires_at.isoformat() + "Z"
+                    if rec.expires_at
+                    else None,
+                    executed_at=rec.executed_at.isoformat() + "Z"
+                    if rec.executed_at
+                    else None,
+                    execution_price=rec.execution_price,
+                    actual_pnl=rec.actual_pnl,
+                    actual_pnl_percent=rec.actual_pnl_percent,
+                )
+            )
+
+        logger.info(
+            f"âœ… Retrieved {len(result)} recommendations from history (filters: symbol={symbol}, status={status})"
+        )
+
+        return result
+
+    except Exception as e:
+        logger.error(f"âŒ Failed to retrieve recommendation history: {e!s}")
+        raise HTTPException(
+            status_code=500, detail=f"Failed to retrieve recommendation history: {e!s}"
+        )
+
+
 @router.get("/recommendations/{symbol}", response_model=Recommendation)
 async def get_symbol_recommendation(
     symbol: str = Path(..., min_length=1, max_length=10, pattern="^[A-Z0-9$.:^-]+$"),
@@ -452,7 +597,7 @@ async def _generate_technical_signal(symbol: str) -> Recommendation | None:
         prices = prices[-200:]
 
         # Generate signal using technical indicators
-        signal_data = TechnicalIndicators.generate_signal(symbol, prices)
+        signal_data = await _compute_signal(symbol, prices)
 
         # Map to Recommendation model
         reasons_text = ". ".join(signal_data["reasons"])
@@ -568,7 +713,7 @@ async def analyze_symbol(
         lows = [float(bar["low"]) for bar in bars[-200:]]
 
         # Calculate technical indicators
-        signal_data = TechnicalIndicators.generate_signal(symbol, prices)
+        signal_data = await _compute_signal(symbol, prices)
 
         # Determine support and resistance levels (last 60 days)
         recent_lows = lows[-60:]
@@ -1758,32 +1903,6 @@ class SaveRecommendationRequest(BaseModel):
         return v
 
 
-class RecommendationHistoryResponse(BaseModel):
-    """Single recommendation history entry"""
-
-    id: int
-    symbol: str
-    recommendation_type: str
-    confidence_score: float
-    analysis_data: dict
-    suggested_entry_price: float | None
-    suggested_stop_loss: float | None
-    suggested_take_profit: float | None
-    reasoning: str | None
-    market_context: str | None
-    status: str
-    created_at: str
-    expires_at: str | None
-    # Performance tracking (if executed)
-    executed_at: str | None
-    execution_price: float | None
-    actual_pnl: float | None
-    actual_pnl_percent: float | None
-
-    class Config:
-        from_attributes = True
-
-
 @router.post("/recommendations/save")
 async def save_recommendation(
     request: SaveRecommendationRequest,
@@ -1846,99 +1965,6 @@ async def save_recommendation(
         )
 
 
-@router.get(
-    "/recommendations/history",
-    response_model=list[RecommendationHistoryResponse],
-)
-async def get_recommendation_history(
-    symbol: str | None = Query(None, description="Filter by symbol"),
-    status: str | None = Query(
-        None, description="Filter by status (pending, executed, ignored, expired)"
-    ),
-    limit: int = Query(
-        50, ge=1, le=200, description="Maximum number of recommendations to return"
-    ),
-    offset: int = Query(0, ge=0, description="Number of recommendations to skip"),
-    current_user: User = Depends(get_current_user_unified),
-    db: Session = Depends(get_db),
-):
-    """
-    Get recommendation history with optional filters
-
-    Allows users to:
-    - Review past AI recommendations
-    - Track which recommendations were executed
-    - Analyze accuracy and performance over time
-    - Filter by symbol, status, or date range
-
-    Phase: Final 6% MVP completion
-    """
-    try:
-        from ..models.database import AIRecommendation
-
-        # Build query
-        query = db.query(AIRecommendation).filter(
-            AIRecommendation.user_id
-            == current_user.id  # Use authenticated user ID from JWT
-        )
-
-        # Apply filters
-        if symbol:
-            query = query.filter(AIRecommendation.symbol == symbol.upper())
-
-        if status:
-            query = query.filter(AIRecommendation.status == status.lower())
-
-        # Order by creation date (newest first)
-        query = query.order_by(AIRecommendation.created_at.desc())
-
-        # Apply pagination
-        recommendations = query.offset(offset).limit(limit).all()
-
-        # Convert to response format
-        result = []
-        for rec in recommendations:
-            result.append(
-                RecommendationHistoryResponse(
-                    id=rec.id,
-                    symbol=rec.symbol,
-                    recommendation_type=rec.recommendation_type,
-                    confidence_score=rec.confidence_score,
-                    analysis_data=rec.analysis_data or {},
-                    suggested_entry_price=rec.suggested_entry_price,
-                    suggested_stop_loss=rec.suggested_stop_loss,
-                    suggested_take_profit=rec.suggested_take_profit,
-                    reasoning=rec.reasoning,
-                    market_context=rec.market_context,
-                    status=rec.status,
-                    created_at=rec.created_at.isoformat() + "Z"
-                    if rec.created_at
-                    else None,
-                    expires_at=rec.expires_at.isoformat() + "Z"
-                    if rec.expires_at
-                    else None,
-                    executed_at=rec.executed_at.isoformat() + "Z"
-                    if rec.executed_at
-                    else None,
-                    execution_price=rec.execution_price,
-                    actual_pnl=rec.actual_pnl,
-                    actual_pnl_percent=rec.actual_pnl_percent,
-                )
-            )
-
-        logger.info(
-            f"âœ… Retrieved {len(result)} recommendations from history (filters: symbol={symbol}, status={status})"
-        )
-
-        return result
-
-    except Exception as e:
-        logger.error(f"âŒ Failed to retrieve recommendation history: {e!s}")
-        raise HTTPException(
-            status_code=500, detail=f"Failed to retrieve recommendation history: {e!s}"
-        )
-
-
 # =============================================================================
 # PHASE 1A: AI PORTFOLIO ANALYSIS ENDPOINT
 # =============================================================================
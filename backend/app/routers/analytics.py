@@ -15,6 +15,8 @@ from pydantic import BaseModel
 
 from ..core.unified_auth import get_current_user_unified
 from ..models.database import User
+from ..services.portfolio_analytics_service import get_portfolio_analytics_service
+from ..services.portfolio_risk import SIMULATION_METHODS
 from ..services.tradier_client import get_tradier_client
 from ..utils.query_profiler import profile_endpoint
 
@@ -270,6 +272,51 @@ async def get_portfolio_history(
         ) from e
 
 
+@router.get("/portfolio/risk")
+@profile_endpoint(threshold_ms=1000)
+async def get_portfolio_risk(
+    method: Literal["all", "historical", "normal", "bootstrap"] = Query(default="all"),
+    horizon_days: int = Query(default=1, ge=1, le=20),
+    paths: int = Query(default=100_000, ge=1_000, le=200_000),
+    lookback_days: int = Query(default=365, ge=60, le=1825),
+    confidence: list[float] = Query(default=[0.95, 0.99]),
+    current_user: User = Depends(get_current_user_unified),
+) -> dict:
+    """
+    Simulated Value at Risk, CVaR and stress scenarios for the current positions
+
+    Args:
+        method: Simulation method, or "all" for historical, normal and bootstrap
+        horizon_days: Holding period in trading days
+        paths: Monte Carlo scenarios per method
+        lookback_days: Days of daily history behind the return matrix
+        confidence: VaR confidence levels (each between 0.5 and 0.999)
+
+    Returns:
+        Per-method VaR/CVaR in dollars and percent of portfolio value, plus
+        P&L under fixed price/volatility stress scenarios
+    """
+    if any(not 0.5 <= level <= 0.999 for level in confidence):
+        raise HTTPException(status_code=422, detail="Confidence levels must be in [0.5, 0.999]")
+
+    methods = SIMULATION_METHODS if method == "all" else (method,)
+    try:
+        return await get_portfolio_analytics_service().calculate_portfolio_risk(
+            methods=methods,
+            confidence_levels=tuple(confidence),
+            horizon_days=horizon_days,
+            paths=paths,
+            lookback_days=lookback_days,
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e)) from e
+    except Exception as e:
+        logger.error(f"❌ Failed to calculate portfolio risk: {e!s}")
+        raise HTTPException(
+            status_code=500, detail=f"Failed to calculate portfolio risk: {e!s}"
+        ) from e
+
+
 @router.get("/analytics/performance")
 @profile_endpoint(threshold_ms=500)
 async def get_performance_metrics(
@@ -12,6 +12,7 @@ from datetime import UTC, datetime
 
 from fastapi import APIRouter, Depends, HTTPException, Request, status
 from pydantic import BaseModel, EmailStr, Field, field_validator
+from sqlalchemy import delete, select
 from sqlalchemy.orm import Session
 
 from ..core.jwt import (
@@ -21,7 +22,7 @@ from ..core.jwt import (
     verify_password,
 )
 from ..core.unified_auth import get_auth_mode, get_current_user_unified
-from ..db.session import get_db
+from ..db.session import AsyncDBSession, get_async_db, get_db
 from ..middleware.security import generate_csrf_token_endpoint
 from ..models.database import ActivityLog, User, UserSession
 
@@ -259,7 +260,7 @@ async def login(
 @router.post("/auth/logout", status_code=status.HTTP_204_NO_CONTENT)
 async def logout(
     current_user: User = Depends(get_current_user_unified),
-    db: Session = Depends(get_db),
+    db: AsyncDBSession = Depends(get_async_db),
 ):
     """
     Logout user and invalidate all sessions
@@ -268,7 +269,7 @@ async def logout(
     invalidating all access and refresh tokens.
     """
     # Delete all user sessions
-    db.query(UserSession).filter(UserSession.user_id == current_user.id).delete()
+    await db.execute(delete(UserSession).where(UserSession.user_id == current_user.id))
 
     # Log activity
     activity = ActivityLog(
@@ -280,7 +281,7 @@ async def logout(
         timestamp=datetime.now(UTC),
     )
     db.add(activity)
-    db.commit()
+    await db.commit()
 
     logger.info(f"✅ User logged out: {current_user.email}")
 
@@ -291,7 +292,7 @@ async def logout(
 async def refresh_token(
     refresh_request: RefreshTokenRequest,
     request: Request,
-    db: Session = Depends(get_db),
+    db: AsyncDBSession = Depends(get_async_db),
 ):
     """
     Exchange refresh token for new access + refresh token pair
@@ -322,9 +323,14 @@ async def refresh_token(
             detail="Invalid token type (expected refresh token)",
         )
 
-    # Get user
-    user_id = payload.get("sub")
-    user = db.query(User).filter(User.id == user_id).first()
+    # Get user (asyncpg does not coerce the string subject to an integer id)
+    try:
+        user_id = int(payload.get("sub"))
+    except (TypeError, ValueError):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED, detail="Invalid refresh token"
+        )
+    user = await db.scalar(select(User).where(User.id == user_id))
 
     if not user:
         raise HTTPException(
@@ -338,14 +344,14 @@ async def refresh_token(
 
     # Verify session exists
     refresh_jti = payload.get("jti")
-    session = (
-        db.query(UserSession)
-        .filter(
+    session = await db.scalar(
+        select(UserSession)
+        .where(
             UserSession.user_id == user_id,
             UserSession.refresh_token_jti == refresh_jti,
             UserSession.expires_at > datetime.now(UTC),
         )
-        .first()
+        .limit(1)
     )
 
     if not session:
@@ -354,18 +360,23 @@ async def refresh_token(
             detail="Session expired or invalid",
         )
 
-    # Delete old session
-    db.delete(session)
-    db.commit()
-
-    logger.info(f"✅ Token refreshed for user: {user.email}")
+    # Read before the commit expires it (a refresh would query on the event loop)
+    email = user.email
 
-    # Generate new token pair
-    tokens = create_token_pair(
-        user,
-        db,
-        ip_address=request.client.host if request.client else None,
-        user_agent=request.headers.get("user-agent"),
+    # Delete old session
+    await db.delete(session)
+    await db.commit()
+
+    logger.info(f"✅ Token refreshed for user: {email}")
+
+    # Generate new token pair (create_token_pair stores the session synchronously)
+    tokens = await db.run_sync(
+        lambda sync_db: create_token_pair(
+            user,
+            sync_db,
+            ip_address=request.client.host if request.client else None,
+            user_agent=request.headers.get("user-agent"),
+        )
     )
 
     return tokens
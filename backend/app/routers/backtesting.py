@@ -4,16 +4,21 @@ Backtesting API Router
 Endpoints for running strategy backtests and retrieving results.
 """
 
+import asyncio
 import logging
 from typing import Any, ClassVar
 
+import numpy as np
 from fastapi import APIRouter, Depends, HTTPException, Query
 from pydantic import BaseModel, Field
 
+from ..core.compute_pool import ComputePoolSaturatedError, ComputeTimeoutError, get_compute_pool
 from ..core.unified_auth import get_current_user_unified
 from ..models.database import User
-from ..services.backtesting_engine import BacktestingEngine, StrategyRules
+from ..services.backtesting_engine import OHLCV_FIELDS, StrategyRules, run_backtest_task
 from ..services.historical_data import HistoricalDataService
+from ..services.portfolio_backtest import align_bars, run_portfolio_backtest_task
+from ..services.tradier_client import get_tradier_client
 from ..utils.query_profiler import profile_endpoint
 
 
@@ -21,6 +26,12 @@ logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/backtesting", tags=["backtesting"])
 
+# Upper bound on a single backtest (5 years of daily bars runs well under this)
+BACKTEST_TIMEOUT_SECONDS = 60
+
+# Portfolio backtests fetch each symbol's bars concurrently, this many at a time
+PORTFOLIO_FETCH_CONCURRENCY = 8
+
 
 class BacktestRequest(BaseModel):
     """Request model for backtest execution"""
@@ -56,6 +67,46 @@ class BacktestRequest(BaseModel):
         }
 
 
+class PortfolioBacktestRequest(BaseModel):
+    """Request model for a portfolio (multi-symbol, shared capital) backtest"""
+
+    symbols: list[str] = Field(
+        ..., min_length=1, max_length=500, description="Symbols competing for capital"
+    )
+    start_date: str = Field(..., description="Start date (YYYY-MM-DD)")
+    end_date: str = Field(..., description="End date (YYYY-MM-DD)")
+    initial_capital: float = Field(
+        100000.0, ge=1000, le=100000000, description="Initial capital of the book"
+    )
+
+    # Strategy rules (applied to every symbol)
+    entry_rules: list[dict[str, Any]] = Field(..., description="Entry conditions")
+    exit_rules: list[dict[str, Any]] = Field(..., description="Exit conditions")
+    position_size_percent: float = Field(
+        10.0, ge=1, le=100, description="Position size % of remaining cash"
+    )
+    max_positions: int = Field(
+        10, ge=1, le=100, description="Max concurrent positions across the book"
+    )
+
+    class Config:
+        json_schema_extra: ClassVar[dict[str, Any]] = {
+            "example": {
+                "symbols": ["AAPL", "MSFT", "NVDA", "AMZN", "META"],
+                "start_date": "2022-01-01",
+                "end_date": "2024-12-31",
+                "initial_capital": 100000,
+                "entry_rules": [{"indicator": "RSI", "operator": "<", "value": 30}],
+                "exit_rules": [
+                    {"type": "take_profit", "value": 5},
+                    {"type": "stop_loss", "value": 2},
+                ],
+                "position_size_percent": 20,
+                "max_positions": 3,
+            }
+        }
+
+
 class BacktestResponse(BaseModel):
     """Response model for backtest results"""
 
@@ -131,10 +182,21 @@ async def run_backtest(
             max_positions=request.max_positions,
         )
 
-        # Run backtest
+        # Run backtest in the compute pool (price matrix goes through shared memory)
         logger.info(f"Running backtest for {request.symbol} with {len(prices)} bars")
-        engine = BacktestingEngine(initial_capital=request.initial_capital)
-        result = engine.execute_backtest(symbol=request.symbol, prices=prices, strategy=strategy)
+        dates = [bar["date"] for bar in prices]
+        ohlcv = np.array(
+            [[float(bar.get(field) or 0.0) for field in OHLCV_FIELDS] for bar in prices]
+        )
+        result = await get_compute_pool().run(
+            run_backtest_task,
+            request.symbol,
+            dates,
+            ohlcv,
+            strategy,
+            request.initial_capital,
+            timeout=BACKTEST_TIMEOUT_SECONDS,
+        )
 
         # Convert dataclass to dict
         result_dict = {
@@ -177,11 +239,161 @@ async def run_backtest(
     except ValueError as e:
         logger.error(f"Validation error: {e!s}")
         raise HTTPException(status_code=400, detail=str(e)) from e
+    except ComputePoolSaturatedError as e:
+        raise HTTPException(
+            status_code=503,
+            detail="Backtesting is busy, please retry shortly",
+            headers={"Retry-After": str(e.retry_after)},
+        ) from e
+    except ComputeTimeoutError as e:
+        logger.error(f"Backtest timed out: {e!s}")
+        raise HTTPException(status_code=504, detail=str(e)) from e
     except Exception as e:
         logger.error(f"Backtest execution error: {e!s}", exc_info=True)
         return BacktestResponse(success=False, error=f"Backtest failed: {e!s}")
 
 
+@router.post("/portfolio", response_model=BacktestResponse)
+@profile_endpoint(threshold_ms=5000)
+async def run_portfolio_backtest(
+    request: PortfolioBacktestRequest,
+    current_user: User = Depends(get_current_user_unified),
+):
+    """
+    Execute a portfolio backtest: one strategy over many symbols sharing capital
+
+    Unlike /run, positions in different symbols compete for the same cash:
+    at most max_positions are open across the whole book, each entry takes
+    position_size_percent of the remaining cash, and when more symbols signal
+    than there are free slots the strongest signals (e.g. lowest RSI for an
+    RSI < x rule) win. Rules use the same format as /run.
+
+    Symbols without bars in the range are skipped and listed in the result.
+
+    **Returns:** the /run metrics for the whole book, one equity curve (with the
+    open position count per day) and the trade history across symbols.
+    """
+    try:
+        historical_service = HistoricalDataService(get_tradier_client())
+        if not historical_service.validate_date_range(request.start_date, request.end_date):
+            raise HTTPException(
+                status_code=400,
+                detail="Invalid date range. Ensure start_date < end_date and range <= 5 years",
+            )
+
+        symbols = list(dict.fromkeys(symbol.upper() for symbol in request.symbols))
+        semaphore = asyncio.Semaphore(PORTFOLIO_FETCH_CONCURRENCY)
+
+        async def fetch(symbol: str) -> list[dict[str, Any]]:
+            async with semaphore:
+                return await asyncio.to_thread(
+                    historical_service.tradier_client.get_historical_bars,
+                    symbol=symbol,
+                    start_date=request.start_date,
+                    end_date=request.end_date,
+                )
+
+        logger.info(f"Fetching historical data for {len(symbols)} symbols")
+        fetched = await asyncio.gather(*(fetch(s) for s in symbols), return_exceptions=True)
+        bars_by_symbol = {}
+        skipped = []
+        for symbol, bars in zip(symbols, fetched):
+            if isinstance(bars, Exception) or not bars:
+                logger.warning(f"Skipping {symbol} in portfolio backtest: {bars or 'no bars'}")
+                skipped.append(symbol)
+            else:
+                bars_by_symbol[symbol] = bars
+
+        dates, closes = align_bars(bars_by_symbol) if bars_by_symbol else ([], None)
+        if len(dates) < 20:
+            raise HTTPException(
+                status_code=400,
+                detail="Insufficient historical data. Need at least 20 bars.",
+            )
+
+        strategy = StrategyRules(
+            entry_rules=request.entry_rules,
+            exit_rules=request.exit_rules,
+            position_size_percent=request.position_size_percent,
+            max_positions=request.max_positions,
+        )
+
+        logger.info(
+            f"Running portfolio backtest: {len(bars_by_symbol)} symbols x {len(dates)} bars"
+        )
+        result = await get_compute_pool().run(
+            run_portfolio_backtest_task,
+            list(bars_by_symbol),
+            dates,
+            closes,
+            strategy,
+            request.initial_capital,
+            timeout=BACKTEST_TIMEOUT_SECONDS,
+        )
+
+        result_dict = {
+            "performance": {
+                "total_return": result.total_return,
+                "total_return_percent": result.total_return_percent,
+                "annualized_return": result.annualized_return,
+                "sharpe_ratio": result.sharpe_ratio,
+                "max_drawdown": result.max_drawdown,
+                "max_drawdown_percent": result.max_drawdown_percent,
+            },
+            "statistics": {
+                "total_trades": result.total_trades,
+                "winning_trades": result.winning_trades,
+                "losing_trades": result.losing_trades,
+                "win_rate": result.win_rate,
+                "avg_win": result.avg_win,
+                "avg_loss": result.avg_loss,
+                "profit_factor": result.profit_factor,
+            },
+            "book": {
+                "max_positions": request.max_positions,
+                "max_concurrent_positions": result.max_concurrent_positions,
+                "avg_positions": result.avg_positions,
+            },
+            "capital": {
+                "initial": result.initial_capital,
+                "final": result.final_capital,
+            },
+            "config": {
+                "symbols": result.symbols,
+                "skipped_symbols": skipped,
+                "start_date": result.start_date,
+                "end_date": result.end_date,
+            },
+            "equity_curve": result.equity_curve[-1000:],  # Limit to 1000 most recent points
+            "trade_history": result.trade_history[-100:],  # Limit to 100 most recent trades
+        }
+
+        logger.info(
+            f"Portfolio backtest completed: {result.total_trades} trades, "
+            f"{result.win_rate:.1f}% win rate"
+        )
+
+        return BacktestResponse(success=True, result=result_dict)
+
+    except HTTPException:
+        raise
+    except ValueError as e:
+        logger.error(f"Validation error: {e!s}")
+        raise HTTPException(status_code=400, detail=str(e)) from e
+    except ComputePoolSaturatedError as e:
+        raise HTTPException(
+            status_code=503,
+            detail="Backtesting is busy, please retry shortly",
+            headers={"Retry-After": str(e.retry_after)},
+        ) from e
+    except ComputeTimeoutError as e:
+        logger.error(f"Portfolio backtest timed out: {e!s}")
+        raise HTTPException(status_code=504, detail=str(e)) from e
+    except Exception as e:
+        logger.error(f"Portfolio backtest execution error: {e!s}", exc_info=True)
+        return BacktestResponse(success=False, error=f"Backtest failed: {e!s}")
+
+
 @router.get("/quick-test")
 @profile_endpoint(threshold_ms=2000)
 async def quick_backtest(
@@ -6,7 +6,6 @@ Proxies Anthropic API calls from frontend to avoid exposing API key in browser
 import os
 import sys
 
-from anthropic import Anthropic
 from fastapi import APIRouter, Depends, HTTPException
 from pydantic import BaseModel, Field, field_validator
 
@@ -21,16 +20,25 @@ if sys.platform == "win32":
 
 router = APIRouter(prefix="/claude", tags=["claude"])
 
-# Initialize Anthropic client with backend API key
+# Anthropic client with backend API key, created on first use (the SDK is slow to import)
 anthropic_client = None
 api_key = os.getenv("ANTHROPIC_API_KEY")
 if api_key:
-    anthropic_client = Anthropic(api_key=api_key)
-    print(f"[Claude] Initialized with API key: {api_key[:10]}...")
+    print(f"[Claude] Configured with API key: {api_key[:10]}...")
 else:
     print("[Claude] WARNING: ANTHROPIC_API_KEY not found in environment")
 
 
+def get_anthropic_client():
+    """Return the Anthropic client, or None if ANTHROPIC_API_KEY is not set"""
+    global anthropic_client
+    if anthropic_client is None and api_key:
+        from anthropic import Anthropic
+
+        anthropic_client = Anthropic(api_key=api_key)
+    return anthropic_client
+
+
 class Message(BaseModel):
     role: str = Field(..., pattern="^(user|assistant)$")
     content: str = Field(..., min_length=1, max_length=10000)
@@ -75,7 +83,8 @@ async def claude_chat(
 
     This prevents exposing the Anthropic API key in the browser
     """
-    if not anthropic_client:
+    client = get_anthropic_client()
+    if not client:
         raise HTTPException(
             status_code=503,
             detail="Claude API not configured. Set ANTHROPIC_API_KEY in backend .env",
@@ -101,7 +110,7 @@ async def claude_chat(
             else:
                 kwargs["system"] = request.system
 
-        response = anthropic_client.messages.create(**kwargs)
+        response = client.messages.create(**kwargs)
 
         # Extract text content
         content = ""
@@ -126,7 +135,7 @@ async def claude_chat(
 @router.get("/health")
 async def claude_health():
     """Check if Claude API is configured and accessible"""
-    if not anthropic_client:
+    if not api_key:
         return {"status": "unavailable", "message": "ANTHROPIC_API_KEY not configured"}
 
     return {
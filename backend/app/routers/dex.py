@@ -26,6 +26,12 @@ def init_dex_aggregator(oneinch_api_key: str | None = None):
     logger.info("DEX aggregator initialized")
 
 
+async def close_dex_aggregator():
+    """Close the DEX aggregator's HTTP client"""
+    if aggregator:
+        await aggregator.aclose()
+
+
 @router.get("/quote")
 async def get_quote(
     tokenIn: str = Query(..., description="Input token address"),
@@ -39,7 +45,8 @@ async def get_quote(
     """
     Get best swap quote across all DEX aggregators
 
-    Uses 1inch API to aggregate quotes from 50+ DEX protocols.
+    Races 1inch (50+ DEX protocols) and Uniswap V3 concurrently; identical
+    requests within a few seconds are served from the quote cache.
 
     Example:
         GET /dex/quote?tokenIn=0xC02aaA39b223FE8D0A0e5C4F27eAD9083C756Cc2&tokenOut=0xA0b86991c6218b36c1d19D4a2e9Eb0cE3606eB48&amountIn=1000000000000000000&chainId=1
@@ -61,7 +68,7 @@ async def get_quote(
         f"Quote request: {tokenIn} → {tokenOut}, amount: {amount_in_int}, chain: {chainId}"
     )
 
-    quote = aggregator.get_best_quote(
+    quote = await aggregator.get_best_quote(
         token_in=tokenIn,
         token_out=tokenOut,
         amount_in=amount_in_int,
@@ -94,7 +101,7 @@ async def get_quote_1inch_only(
     except ValueError:
         raise HTTPException(status_code=400, detail="Invalid amountIn")
 
-    quote = aggregator.get_quote_1inch(
+    quote = await aggregator.get_quote_1inch(
         tokenIn, tokenOut, amount_in_int, chainId, slippage
     )
 
@@ -8,6 +8,7 @@ Provides comprehensive health monitoring for PaiiD Trading Platform:
 - Kubernetes-style readiness/liveness probes
 """
 
+import asyncio
 import os
 from datetime import UTC, datetime
 
@@ -17,9 +18,11 @@ from fastapi.responses import JSONResponse
 from pydantic import BaseModel
 from sqlalchemy import text
 
+from ..core.compute_pool import get_compute_pool
 from ..core.config import settings
+from ..core.resilience import get_breaker_states
 from ..core.unified_auth import get_current_user_unified
-from ..db.session import engine
+from ..db.session import engine, get_pool_metrics
 from ..models.database import User
 from ..services.cache import get_cache
 from ..services.health_monitor import health_monitor
@@ -141,7 +144,8 @@ async def startup_health_check():
         from ..core.startup_validator import StartupValidator
 
         validator = StartupValidator()
-        passed = validator.validate_all()
+        # Checks block for up to STARTUP_VALIDATION_DEADLINE; keep them off the event loop
+        passed = await asyncio.to_thread(validator.validate_all)
 
         if not passed:
             raise HTTPException(
@@ -226,6 +230,39 @@ async def liveness_check():
         raise HTTPException(status_code=500, detail="Liveness check failed") from e
 
 
+@router.get("/circuit-breakers")
+async def circuit_breakers(current_user: User = Depends(get_current_user_unified)):
+    """
+    Circuit breaker state for every upstream client, by service and endpoint
+
+    Includes failure/rejection/hedge counters and observed p50/p95/p99 latency.
+    """
+    return {"breakers": get_breaker_states(), "time": datetime.now(UTC).isoformat()}
+
+
+@router.get("/compute-pool")
+async def compute_pool(current_user: User = Depends(get_current_user_unified)):
+    """
+    Compute pool metrics for CPU-bound ML/analytics work
+
+    Includes in-flight and queued task counts, completed/failed/timed-out/rejected
+    counters and task latency p50/p95/p99.
+    """
+    return {"compute_pool": get_compute_pool().stats(), "time": datetime.now(UTC).isoformat()}
+
+
+@router.get("/db-pool")
+async def db_pool(current_user: User = Depends(get_current_user_unified)):
+    """
+    Database connection pool sizing for the sync and asyncpg engines
+
+    Reports size, max overflow, checked in/out connections, current overflow
+    and utilisation of size + max_overflow per pool. The async pool reports why
+    it is disabled when async handlers fall back to the threadpool.
+    """
+    return {"database_pools": get_pool_metrics(), "time": datetime.now(UTC).isoformat()}
+
+
 @router.get("/ready")
 async def ready_check():
     """Kubernetes-style readiness probe - alias for readiness"""
@@ -14,9 +14,11 @@ from fastapi import APIRouter, Depends, HTTPException
 from pydantic import BaseModel
 
 from ..core.config import settings
+from ..core.single_flight import single_flight
 from ..core.unified_auth import get_current_user_unified
 from ..models.database import User
 from ..services.cache import CacheService, get_cache
+from ..services.cache_warmer import CacheKeyFamily, get_cache_warmer
 
 
 # Minimal load log
@@ -266,6 +268,7 @@ async def get_market_conditions(
 
 
 @router.get("/market/indices")
+@single_flight("market:indices", ttl=60)
 async def get_major_indices(
     current_user: User = Depends(get_current_user_unified),
     cache: CacheService = Depends(get_cache),
@@ -411,7 +414,103 @@ async def get_major_indices(
             ) from ai_error
 
 
+def _fetch_sector_performance() -> dict:
+    """Fetch sector ETF quotes from Tradier and rank them by performance"""
+    # Define sector ETFs
+    sector_etfs = [
+        {"name": "Technology", "symbol": "XLK"},
+        {"name": "Communication", "symbol": "XLC"},
+        {"name": "Consumer Discretionary", "symbol": "XLY"},
+        {"name": "Financials", "symbol": "XLF"},
+        {"name": "Healthcare", "symbol": "XLV"},
+        {"name": "Industrials", "symbol": "XLI"},
+        {"name": "Materials", "symbol": "XLB"},
+        {"name": "Real Estate", "symbol": "XLRE"},
+        {"name": "Utilities", "symbol": "XLU"},
+        {"name": "Energy", "symbol": "XLE"},
+        {"name": "Consumer Staples", "symbol": "XLP"},
+    ]
+
+    # Fetch real quotes from Tradier (with compression for 11 sector ETFs)
+    symbols = ",".join([s["symbol"] for s in sector_etfs])
+    resp = requests.get(
+        f"{settings.TRADIER_API_BASE_URL}/markets/quotes",
+        headers={
+            "Authorization": f"Bearer {settings.TRADIER_API_KEY}",
+            "Accept": "application/json",
+            "Accept-Encoding": "gzip, deflate",  # Enable compression
+        },
+        params={"symbols": symbols, "greeks": "false"},
+        timeout=5,  # Add timeout for reliability
+    )
+
+    sectors = []
+
+    if resp.status_code == 200:
+        data = resp.json()
+        quotes = data.get("quotes", {}).get("quote", [])
+        if isinstance(quotes, dict):
+            quotes = [quotes]
+
+        # Create quote lookup
+        quote_map = {q.get("symbol"): q for q in quotes if q.get("symbol")}
+
+        # Build sector list with real data
+        for sector in sector_etfs:
+            quote = quote_map.get(sector["symbol"])
+            if quote and "change_percentage" in quote:
+                change_percent = float(quote.get("change_percentage", 0))
+                sectors.append(
+                    {
+                        "name": sector["name"],
+                        "symbol": sector["symbol"],
+                        "changePercent": round(change_percent, 2),
+                        "last": float(quote.get("last", 0)),
+                    }
+                )
+
+        # Sort by performance (descending)
+        sectors.sort(key=lambda x: x["changePercent"], reverse=True)
+
+        # Add ranks
+        for idx, sector in enumerate(sectors):
+            sector["rank"] = idx + 1
+
+        # Identify leader and laggard
+        leader = sectors[0]["name"] if sectors else "Unknown"
+        laggard = sectors[-1]["name"] if sectors else "Unknown"
+
+        result = {
+            "sectors": sectors,
+            "timestamp": datetime.now(UTC).isoformat(),
+            "leader": leader,
+            "laggard": laggard,
+            "source": "tradier",
+        }
+
+        print(
+            f"[Sector Performance] ✅ Fetched {len(sectors)} real sector ETFs from Tradier"
+        )
+        return result
+
+    else:
+        raise Exception(f"Tradier API returned status {resp.status_code}")
+
+
+get_cache_warmer().register(
+    CacheKeyFamily(
+        "sectors",
+        r"market:sectors",
+        ttl=60,
+        refresh=lambda params: {"market:sectors": _fetch_sector_performance()},
+    )
+)
+
+
 @router.get("/market/sectors")
+@single_flight(
+    "market:sectors", ttl=60, cache_if=lambda result: result.get("source") != "fallback"
+)
 async def get_sector_performance(
     current_user: User = Depends(get_current_user_unified),
     cache: CacheService = Depends(get_cache),
@@ -431,88 +530,10 @@ async def get_sector_performance(
         return {**cached, "cached": True}
 
     try:
-        # Define sector ETFs
-        sector_etfs = [
-            {"name": "Technology", "symbol": "XLK"},
-            {"name": "Communication", "symbol": "XLC"},
-            {"name": "Consumer Discretionary", "symbol": "XLY"},
-            {"name": "Financials", "symbol": "XLF"},
-            {"name": "Healthcare", "symbol": "XLV"},
-            {"name": "Industrials", "symbol": "XLI"},
-            {"name": "Materials", "symbol": "XLB"},
-            {"name": "Real Estate", "symbol": "XLRE"},
-            {"name": "Utilities", "symbol": "XLU"},
-            {"name": "Energy", "symbol": "XLE"},
-            {"name": "Consumer Staples", "symbol": "XLP"},
-        ]
-
-        # Fetch real quotes from Tradier (with compression for 11 sector ETFs)
-        symbols = ",".join([s["symbol"] for s in sector_etfs])
-        resp = requests.get(
-            f"{settings.TRADIER_API_BASE_URL}/markets/quotes",
-            headers={
-                "Authorization": f"Bearer {settings.TRADIER_API_KEY}",
-                "Accept": "application/json",
-                "Accept-Encoding": "gzip, deflate",  # Enable compression
-            },
-            params={"symbols": symbols, "greeks": "false"},
-            timeout=5,  # Add timeout for reliability
-        )
-
-        sectors = []
-
-        if resp.status_code == 200:
-            data = resp.json()
-            quotes = data.get("quotes", {}).get("quote", [])
-            if isinstance(quotes, dict):
-                quotes = [quotes]
-
-            # Create quote lookup
-            quote_map = {q.get("symbol"): q for q in quotes if q.get("symbol")}
-
-            # Build sector list with real data
-            for sector in sector_etfs:
-                quote = quote_map.get(sector["symbol"])
-                if quote and "change_percentage" in quote:
-                    change_percent = float(quote.get("change_percentage", 0))
-                    sectors.append(
-                        {
-                            "name": sector["name"],
-                            "symbol": sector["symbol"],
-                            "changePercent": round(change_percent, 2),
-                            "last": float(quote.get("last", 0)),
-                        }
-                    )
-
-            # Sort by performance (descending)
-            sectors.sort(key=lambda x: x["changePercent"], reverse=True)
-
-            # Add ranks
-            for idx, sector in enumerate(sectors):
-                sector["rank"] = idx + 1
-
-            # Identify leader and laggard
-            leader = sectors[0]["name"] if sectors else "Unknown"
-            laggard = sectors[-1]["name"] if sectors else "Unknown"
-
-            result = {
-                "sectors": sectors,
-                "timestamp": datetime.now(UTC).isoformat(),
-                "leader": leader,
-                "laggard": laggard,
-                "source": "tradier",
-            }
-
-            # Cache for 60 seconds
-            cache.set(cache_key, result, ttl=60)
-
-            print(
-                f"[Sector Performance] ✅ Fetched {len(sectors)} real sector ETFs from Tradier"
-            )
-            return result
-
-        else:
-            raise Exception(f"Tradier API returned status {resp.status_code}")
+        result = _fetch_sector_performance()
+        # Cache for 60 seconds
+        cache.set(cache_key, result, ttl=60)
+        return result
 
     except Exception as e:
         print(f"[Sector Performance] ❌ Error fetching from Tradier: {e}")
@@ -13,11 +13,15 @@ from fastapi import APIRouter, Depends, HTTPException, Path, Query
 
 from ..core.config import get_settings
 from ..core.readiness_registry import get_readiness_registry
+from ..core.single_flight import get_single_flight, single_flight
 from ..core.unified_auth import get_current_user_unified
 from ..models.database import User
 from ..runtime.temporal_oracle import default_oracle
+from ..services.bar_builder import get_bar_builder
 from ..services.cache import CacheService, get_cache
+from ..services.cache_warmer import CacheKeyFamily, get_cache_warmer
 from ..services.tradier_client import ProviderHTTPError, get_tradier_client
+from ..services.tradier_stream import get_tradier_stream
 
 
 logger = logging.getLogger(__name__)
@@ -41,6 +45,121 @@ def _check_tradier_readiness():
 router = APIRouter(dependencies=[Depends(_check_tradier_readiness)])
 
 
+def _quote_entry(symbol: str, quote: dict) -> dict:
+    """Cached quote payload for a Tradier quote"""
+    return {
+        "symbol": symbol,
+        "bid": float(quote.get("bid", 0)),
+        "ask": float(quote.get("ask", 0)),
+        "last": float(quote.get("last", 0)),
+        "volume": int(quote.get("volume", 0)),
+        "timestamp": quote.get("trade_date", datetime.now().isoformat()),
+        "cached": False,
+    }
+
+
+def _fetch_bars(symbol: str, timeframe: str, limit: int) -> dict:
+    """Fetch the latest `limit` bars for a timeframe from Tradier"""
+    client = get_tradier_client()
+
+    # Map timeframe to Tradier intervals
+    interval_map = {
+        "1Min": "1min",
+        "5Min": "5min",
+        "15Min": "15min",
+        "1Hour": "1hour",
+        "1Day": "daily",
+        "daily": "daily",
+        "weekly": "weekly",
+        "monthly": "monthly",
+    }
+
+    interval = interval_map.get(timeframe, "daily")
+
+    # Calculate date range based on limit
+    end_date = datetime.now(UTC)
+    if interval in ["1min", "5min", "15min"]:
+        start_date = end_date - timedelta(
+            days=min(limit // 78, 30)
+        )  # Market hours limit
+    elif interval == "1hour":
+        start_date = end_date - timedelta(days=min(limit // 6, 90))
+    else:  # daily, weekly, monthly
+        start_date = end_date - timedelta(days=limit * 2)  # Approximate
+
+    bars_data = client.get_historical_bars(
+        symbol=symbol,
+        interval=interval,
+        start_date=start_date.strftime("%Y-%m-%d"),
+        end_date=end_date.strftime("%Y-%m-%d"),
+    )
+
+    result = []
+    for bar in bars_data[:limit]:
+        result.append(
+            {
+                "timestamp": bar.get("date", bar.get("time", "")),
+                "open": float(bar.get("open", 0)),
+                "high": float(bar.get("high", 0)),
+                "low": float(bar.get("low", 0)),
+                "close": float(bar.get("close", 0)),
+                "volume": int(bar.get("volume", 0)),
+            }
+        )
+
+    return {"symbol": symbol.upper(), "bars": result, "cached": False}
+
+
+def _quotes_by_symbol(response: dict) -> dict[str, dict]:
+    """Tradier /markets/quotes response keyed by symbol (one quote comes back as a dict)"""
+    quotes = (response.get("quotes") or {}).get("quote") or []
+    if isinstance(quotes, dict):
+        quotes = [quotes]
+    return {quote["symbol"]: quote for quote in quotes if "symbol" in quote}
+
+
+def _refresh_quotes(params: list[dict[str, str]]) -> dict[str, dict]:
+    """Re-fetch hot quotes in one Tradier call (cache warming)"""
+    symbols = [p["symbol"] for p in params]
+    quotes = _quotes_by_symbol(get_tradier_client().get_quotes(symbols))
+    return {
+        f"quote:{symbol}": _quote_entry(symbol, quotes[symbol])
+        for symbol in symbols
+        if symbol in quotes
+    }
+
+
+def _refresh_bars(params: list[dict[str, str]]) -> dict[str, dict]:
+    """Re-fetch hot bar series (cache warming)"""
+    return {
+        f"bars:{p['symbol']}:{p['timeframe']}:{p['limit']}": _fetch_bars(
+            p["symbol"], p["timeframe"], int(p["limit"])
+        )
+        for p in params
+    }
+
+
+get_cache_warmer().register(
+    CacheKeyFamily(
+        "quote",
+        r"quote:(?P<symbol>[A-Z0-9./]+)",
+        ttl=get_settings().CACHE_TTL_QUOTE,
+        refresh=_refresh_quotes,
+        batch_size=100,
+        # Streamed symbols are already written to the cache by the stream
+        is_live=lambda p: get_tradier_stream().get_latest("quote", p["symbol"]) is not None,
+    )
+)
+get_cache_warmer().register(
+    CacheKeyFamily(
+        "bars",
+        r"bars:(?P<symbol>[A-Z0-9./]+):(?P<timeframe>\w+):(?P<limit>\d+)",
+        ttl=get_settings().CACHE_TTL_HISTORICAL_BARS,
+        refresh=_refresh_bars,
+    )
+)
+
+
 @router.get("/market/quote/{symbol}")
 async def get_quote(
     symbol: str = Path(..., min_length=1, max_length=10, description="Stock symbol"),
@@ -130,17 +249,7 @@ async def get_quote(
                 return fb
             raise HTTPException(status_code=404, detail=f"No quote found for {symbol}")
 
-        quote = quotes_data[symbol.upper()]
-
-        result = {
-            "symbol": symbol.upper(),
-            "bid": float(quote.get("bid", 0)),
-            "ask": float(quote.get("ask", 0)),
-            "last": float(quote.get("last", 0)),
-            "volume": int(quote.get("volume", 0)),
-            "timestamp": quote.get("trade_date", datetime.now().isoformat()),
-            "cached": False,
-        }
+        result = _quote_entry(symbol.upper(), quotes_data[symbol.upper()])
 
         # Cache with configurable TTL from settings
         cache.set(cache_key, result, ttl=settings.CACHE_TTL_QUOTE)
@@ -295,13 +404,25 @@ async def get_bars(
         "daily", pattern="^(1Min|5Min|15Min|1Hour|1Day|daily|weekly|monthly)$"
     ),
     limit: int = Query(100, ge=1, le=1000, description="Number of bars to return"),
+    interval: str | None = Query(
+        None,
+        pattern="^(1s|1min|5min)$",
+        description="Intraday interval built from the live stream (overrides timeframe)",
+    ),
+    include_partial: bool = Query(False, description="Include the still-open intraday bar"),
     current_user: User = Depends(get_current_user_unified),
     cache: CacheService = Depends(get_cache),
 ):
     """Get historical price bars using Tradier with intelligent caching
 
     Historical data is cached for 1 hour (configurable) since past bars don't change.
+
+    With `interval` (1s, 1min, 5min), bars come from the intraday bar builder fed
+    by the Tradier stream instead; the symbol is subscribed to the stream if needed.
     """
+    if interval is not None:
+        return await _get_stream_bars(symbol.upper(), interval, limit, include_partial)
+
     # Get settings for cache TTL
     settings = get_settings()
 
@@ -318,59 +439,12 @@ async def get_bars(
         return {**cached_bars, "cached": True}
 
     try:
-        client = get_tradier_client()
-
-        # Map timeframe to Tradier intervals
-        interval_map = {
-            "1Min": "1min",
-            "5Min": "5min",
-            "15Min": "15min",
-            "1Hour": "1hour",
-            "1Day": "daily",
-            "daily": "daily",
-            "weekly": "weekly",
-            "monthly": "monthly",
-        }
-
-        interval = interval_map.get(timeframe, "daily")
-
-        # Calculate date range based on limit
-        end_date = datetime.now(UTC)
-        if interval in ["1min", "5min", "15min"]:
-            start_date = end_date - timedelta(
-                days=min(limit // 78, 30)
-            )  # Market hours limit
-        elif interval == "1hour":
-            start_date = end_date - timedelta(days=min(limit // 6, 90))
-        else:  # daily, weekly, monthly
-            start_date = end_date - timedelta(days=limit * 2)  # Approximate
-
-        bars_data = client.get_historical_bars(
-            symbol=symbol,
-            interval=interval,
-            start_date=start_date.strftime("%Y-%m-%d"),
-            end_date=end_date.strftime("%Y-%m-%d"),
-        )
-
-        result = []
-        for bar in bars_data[:limit]:
-            result.append(
-                {
-                    "timestamp": bar.get("date", bar.get("time", "")),
-                    "open": float(bar.get("open", 0)),
-                    "high": float(bar.get("high", 0)),
-                    "low": float(bar.get("low", 0)),
-                    "close": float(bar.get("close", 0)),
-                    "volume": int(bar.get("volume", 0)),
-                }
-            )
-
-        response = {"symbol": symbol.upper(), "bars": result, "cached": False}
+        response = _fetch_bars(symbol, timeframe, limit)
 
         # Cache with long TTL since historical data doesn't change
         cache.set(cache_key, response, ttl=settings.CACHE_TTL_HISTORICAL_BARS)
         logger.info(
-            f"✅ Retrieved {len(result)} bars for {symbol} from Tradier "
+            f"✅ Retrieved {len(response['bars'])} bars for {symbol} from Tradier "
             f"(cached for {settings.CACHE_TTL_HISTORICAL_BARS}s)"
         )
         return response
@@ -393,7 +467,26 @@ async def get_bars(
         ) from e
 
 
+async def _get_stream_bars(symbol: str, interval: str, limit: int, include_partial: bool):
+    """Intraday bars from the stream-fed bar builder (ring buffer + local bar store)"""
+    stream = get_tradier_stream()
+    if stream.is_running() and symbol not in stream.get_active_symbols():
+        # Start building bars for this symbol from now on
+        await stream.subscribe_quotes([symbol])
+
+    bars = get_bar_builder().get_bars(symbol, interval, limit, include_partial)
+    return {
+        "symbol": symbol,
+        "interval": interval,
+        "bars": bars,
+        "source": "stream",
+        "streaming": stream.is_running(),
+        "cached": False,
+    }
+
+
 @router.get("/market/scanner/under4")
+@single_flight("scanner:under4", ttl=get_settings().CACHE_TTL_SCANNER)
 async def scan_under_4(
     current_user: User = Depends(get_current_user_unified),
     cache: CacheService = Depends(get_cache),
@@ -484,7 +577,8 @@ async def get_cache_stats(
     Get cache performance statistics
 
     Returns cache hit/miss rates and performance metrics from the health monitor.
-    Useful for monitoring cache effectiveness and tuning TTL values.
+    Useful for monitoring cache effectiveness and tuning TTL values. Also reports
+    request coalescing counters (stale hits, coalesced misses, background refreshes).
     """
     from ..services.health_monitor import health_monitor
 
@@ -500,6 +594,7 @@ async def get_cache_stats(
         "cache_misses": health_monitor.cache_misses,
         "total_requests": total_cache_ops,
         "hit_rate_percent": hit_rate,
+        "single_flight": get_single_flight().stats(),
         "timestamp": datetime.now(UTC).isoformat(),
     }
 
@@ -7,20 +7,68 @@ Endpoints for ML-powered features:
 - Pattern recognition
 """
 
+import asyncio
 import logging
 from datetime import datetime
-from typing import Any
+from functools import partial
+from typing import Any, Callable
 
 import pandas as pd
 from fastapi import APIRouter, HTTPException, Query
 
+from ..core.compute_pool import ComputePoolSaturatedError, ComputeTimeoutError, get_compute_pool
+from ..core.config import get_settings
+from ..core.single_flight import get_single_flight
 from ..ml import get_pattern_detector, get_regime_detector, get_strategy_selector
+from ..ml.market_regime import REGIME_MODEL_ID
+from ..ml.pattern_backtest import backtest_patterns_task, concat_events, summarize
+from ..ml.pattern_recognition import DETECTOR_VERSION, detect_patterns_task
+from ..ml.strategy_selector import STRATEGY_MODEL_ID
+from ..services.model_registry import get_model_registry
 
 
 logger = logging.getLogger(__name__)
 
 router = APIRouter(prefix="/api/ml", tags=["Machine Learning"])
 
+# Pattern detection fetches and scans up to two years of bars
+PATTERN_TIMEOUT_SECONDS = 30
+
+# Most symbols one pattern backtest request may fan out to (as /backtesting/portfolio)
+MAX_BACKTEST_SYMBOLS = 500
+
+
+async def _run_pattern_task(task: Callable[..., Any], *args: Any) -> Any:
+    """Run a pattern task in the compute pool, mapping pool errors to HTTP errors"""
+    try:
+        return await get_compute_pool().run(task, *args, timeout=PATTERN_TIMEOUT_SECONDS)
+    except ComputePoolSaturatedError as e:
+        raise HTTPException(
+            status_code=503,
+            detail="Pattern detection is busy, please retry shortly",
+            headers={"Retry-After": str(e.retry_after)},
+        ) from e
+    except ComputeTimeoutError as e:
+        raise HTTPException(status_code=504, detail=str(e)) from e
+
+
+async def _detect_patterns(symbol: str, lookback_days: int, min_confidence: float) -> list:
+    """Run pattern detection in the compute pool"""
+    return await _run_pattern_task(detect_patterns_task, symbol, lookback_days, min_confidence)
+
+
+@router.on_event("startup")
+async def preload_models():
+    """Warm-load the latest saved models (missing ones train in the background)"""
+    get_regime_detector()
+    get_strategy_selector()
+
+
+@router.on_event("shutdown")
+async def shutdown_compute_pool():
+    """Stop the compute pool worker processes"""
+    get_compute_pool().shutdown(wait=False)
+
 
 @router.get("/market-regime")
 async def get_market_regime(
@@ -44,8 +92,15 @@ async def get_market_regime(
 
         detector = get_regime_detector()
 
-        # Predict regime
-        result = detector.predict(symbol, lookback_days)
+        # Predict regime (bar fetch + feature engineering) off the event loop
+        result = await asyncio.to_thread(detector.predict, symbol, lookback_days)
+
+        if result.get("model_status") == "training":
+            raise HTTPException(
+                status_code=503,
+                detail=result["error"],
+                headers={"Retry-After": "30"},
+            )
 
         if result.get("regime") == "unknown":
             raise HTTPException(
@@ -80,19 +135,21 @@ async def train_regime_detector(
     lookback_days: int = Query(730, ge=365, le=1825, description="Days of training data"),
 ) -> dict[str, Any]:
     """
-    Train or retrain the market regime detector
+    Train or retrain the market regime detector (in the background)
 
     This endpoint is typically called:
-    - On first use (automatic)
     - Periodically for model updates (e.g., weekly)
     - After significant market changes
 
+    The current model keeps serving requests until the new version is trained,
+    saved and swapped in. Poll GET /api/ml/health for progress.
+
     Args:
         symbol: Symbol to use for training (default: SPY)
         lookback_days: Days of historical data (default: 730 = 2 years)
 
     Returns:
-        Training status and regime labels
+        Training job status
 
     Example:
         POST /api/ml/train-regime-detector?symbol=SPY&lookback_days=730
@@ -100,25 +157,19 @@ async def train_regime_detector(
     try:
         logger.info(f"Training regime detector on {symbol} ({lookback_days} days)...")
 
-        detector = get_regime_detector()
-
-        success = detector.train(symbol, lookback_days)
-
-        if not success:
-            raise HTTPException(status_code=500, detail="Training failed - check logs for details")
+        get_regime_detector()
+        get_model_registry().train(REGIME_MODEL_ID, symbol=symbol, lookback_days=lookback_days)
 
         return {
             "success": True,
-            "message": f"Regime detector trained successfully on {symbol}",
-            "regime_labels": detector.regime_labels,
+            "status": "training",
+            "message": f"Regime detector training started on {symbol}",
             "training_data": {
                 "symbol": symbol,
                 "lookback_days": lookback_days,
             },
         }
 
-    except HTTPException:
-        raise
     except Exception as e:
         logger.error(f"Training failed: {e}")
         raise HTTPException(status_code=500, detail=f"Training failed: {e!s}") from e
@@ -132,6 +183,8 @@ async def ml_health_check() -> dict[str, Any]:
     Returns:
         - regime_detector_ready: Whether detector is trained
         - regime_labels: Cluster labels if trained
+        - models: Registry status (active version, training in progress, last error)
+        - compute_pool: Compute pool queue depth, outcomes and task latency
 
     Example:
         GET /api/ml/health
@@ -144,6 +197,8 @@ async def ml_health_check() -> dict[str, Any]:
             "regime_detector_ready": detector.is_fitted,
             "regime_labels": detector.regime_labels if detector.is_fitted else {},
             "n_clusters": detector.n_clusters,
+            "models": get_model_registry().status(),
+            "compute_pool": get_compute_pool().stats(),
         }
 
     except Exception as e:
@@ -179,15 +234,19 @@ async def recommend_strategy(
         logger.info(f"Strategy recommendation requested for {symbol}")
 
         selector = get_strategy_selector()
+        detector = get_regime_detector()
+
+        # Get recommendations (bar fetch + feature engineering) off the event loop
+        recommendations = await asyncio.to_thread(
+            selector.recommend, symbol, lookback_days, top_n
+        )
 
-        # Get recommendations
-        recommendations = selector.recommend(symbol, lookback_days, top_n)
+        # Current market regime, for the fallback and for context
+        regime_result = await asyncio.to_thread(detector.predict, symbol, lookback_days)
 
         if not recommendations:
             # Fallback to regime-based recommendations if ML fails
             logger.warning(f"ML recommendation failed for {symbol}, using regime-based fallback")
-            detector = get_regime_detector()
-            regime_result = detector.predict(symbol, lookback_days)
             regime = regime_result.get("regime", "unknown")
 
             fallback_strategies = detector.get_recommended_strategies(regime)
@@ -196,10 +255,6 @@ async def recommend_strategy(
                 for s in fallback_strategies[:top_n]
             ]
 
-        # Get current market regime for context
-        detector = get_regime_detector()
-        regime_result = detector.predict(symbol, lookback_days)
-
         return {
             "symbol": symbol,
             "market_regime": regime_result.get("regime", "unknown"),
@@ -220,19 +275,22 @@ async def train_strategy_selector(
     lookback_days: int = Query(365, ge=180, le=730, description="Days of training data per symbol"),
 ) -> dict[str, Any]:
     """
-    Train or retrain the strategy selector model
+    Train or retrain the strategy selector model (in the background)
 
     This is a long-running operation that:
     1. Runs backtests on multiple symbols and time windows
     2. Learns which strategies perform best in which conditions
     3. Trains a Random Forest classifier
 
+    The current model keeps serving requests until the new version is trained,
+    saved and swapped in. Accuracy metrics appear in GET /api/ml/health.
+
     Args:
         symbols: List of symbols to backtest (default: major indices)
         lookback_days: Days of history per symbol
 
     Returns:
-        Training results including accuracy metrics
+        Training job status
 
     Example:
         POST /api/ml/train-strategy-selector?symbols=SPY&symbols=QQQ
@@ -240,25 +298,15 @@ async def train_strategy_selector(
     try:
         logger.info(f"Training strategy selector on {symbols} ({lookback_days} days)...")
 
-        selector = get_strategy_selector()
-
-        # Train model
-        result = selector.train(symbols, lookback_days)
-
-        if not result.get("success"):
-            raise HTTPException(
-                status_code=500,
-                detail=result.get("error", "Training failed - check logs"),
-            )
+        get_strategy_selector()
+        get_model_registry().train(STRATEGY_MODEL_ID, symbols=symbols, lookback_days=lookback_days)
 
         return {
             "success": True,
-            "message": f"Strategy selector trained on {len(symbols)} symbols",
-            **result,
+            "status": "training",
+            "message": f"Strategy selector training started on {len(symbols)} symbols",
         }
 
-    except HTTPException:
-        raise
     except Exception as e:
         logger.error(f"Training failed: {e}")
         raise HTTPException(status_code=500, detail=f"Training failed: {e!s}") from e
@@ -291,11 +339,8 @@ async def detect_patterns(
     try:
         logger.info(f"Pattern detection requested for {symbol}")
 
-        detector = get_pattern_detector()
-        detector.min_confidence = min_confidence
-
         # Detect patterns
-        patterns = detector.detect_patterns(symbol, lookback_days)
+        patterns = await _detect_patterns(symbol, lookback_days, min_confidence)
 
         # Convert patterns to dicts
         pattern_dicts = [p.to_dict() for p in patterns]
@@ -311,6 +356,8 @@ async def detect_patterns(
             "timestamp": pd.Timestamp.now().isoformat(),
         }
 
+    except HTTPException:
+        raise
     except Exception as e:
         logger.error(f"Pattern detection failed: {e}")
         raise HTTPException(status_code=500, detail=f"Pattern detection failed: {e!s}") from e
@@ -321,20 +368,34 @@ async def backtest_patterns(
     symbol: str = Query("SPY", description="Stock symbol to backtest"),
     lookback_days: int = Query(365, ge=90, le=730, description="Days to backtest"),
     min_confidence: float = Query(0.7, ge=0.5, le=0.95, description="Minimum pattern confidence"),
+    symbols: list[str] | None = Query(
+        None,
+        max_length=MAX_BACKTEST_SYMBOLS,
+        description="Backtest several symbols in parallel (overrides symbol)",
+    ),
 ) -> dict[str, Any]:
     """
     Backtest historical pattern performance
 
-    Analyzes all detected patterns over a historical period and calculates:
+    Detects every pattern occurrence over a historical period and scores it on
+    the bars that followed (entry after the pattern is confirmed, exit at its
+    target, its stop or after the holding window):
     - Win rate (percentage of profitable patterns)
     - Average ROI per pattern type
     - Best/worst outcomes
     - Average hold days
+    - Target/stop hit rates and average forward returns
+
+    Scored occurrences are cached per symbol, lookback and detector version, so
+    repeating the backtest with another min_confidence does not recompute it.
 
     Args:
         symbol: Stock symbol to analyze
         lookback_days: Historical period to analyze (90-730 days)
         min_confidence: Minimum confidence threshold for patterns
+        symbols: Symbols to backtest together (results per symbol plus combined,
+            up to MAX_BACKTEST_SYMBOLS); a symbol that fails is listed under
+            "errors" instead of failing the request
 
     Returns:
         Historical performance metrics for each pattern type
@@ -343,137 +404,72 @@ async def backtest_patterns(
         POST /api/ml/backtest-patterns?symbol=AAPL&lookback_days=365&min_confidence=0.7
     """
     try:
-        logger.info(f"Pattern backtesting requested for {symbol} ({lookback_days} days)")
-
-        import random
-        from datetime import datetime, timedelta
-
-        from ..services.tradier_client import get_tradier_client
-
-        # Get historical data
-        end_date = datetime.now()
-        start_date = end_date - timedelta(days=lookback_days)
-
-        tradier = get_tradier_client()
-
-        # Fetch OHLCV data
-        try:
-            history = tradier.get_historical_quotes(
-                symbol=symbol,
-                start_date=start_date.strftime("%Y-%m-%d"),
-                end_date=end_date.strftime("%Y-%m-%d"),
-                interval="daily"
-            )
-        except Exception as e:
-            logger.error(f"Failed to fetch historical data: {e}")
-            raise HTTPException(
-                status_code=500,
-                detail=f"Failed to fetch historical data: {e!s}"
-            ) from e
-
-        if not history or len(history) < 50:
-            raise HTTPException(
-                status_code=400,
-                detail=f"Insufficient historical data for {symbol}"
-            )
-
-        # Detect patterns across the entire period
-        detector = get_pattern_detector()
-        patterns = detector.detect_patterns(symbol, lookback_days, min_confidence)
+        tickers = list(dict.fromkeys(s.upper() for s in symbols)) if symbols else [symbol.upper()]
+        logger.info(f"Pattern backtesting requested for {tickers} ({lookback_days} days)")
+
+        ttl = get_settings().CACHE_TTL_HISTORICAL_BARS
+        outcomes = await asyncio.gather(
+            *(
+                get_single_flight().get(
+                    f"ml:pattern_backtest:{ticker}:{lookback_days}:{DETECTOR_VERSION}",
+                    partial(_run_pattern_task, backtest_patterns_task, ticker, lookback_days),
+                    ttl=ttl,
+                )
+                for ticker in tickers
+            ),
+            return_exceptions=True,
+        )
 
-        if not patterns:
-            logger.info(f"No patterns found for {symbol} during backtest period")
-            return {
-                "symbol": symbol,
-                "start_date": start_date.isoformat(),
-                "end_date": end_date.isoformat(),
-                "patterns": [],
-                "total_patterns": 0,
-                "overall_win_rate": 0.0,
-                "overall_avg_roi": 0.0,
+        # A symbol that fails (e.g. too little history) is reported, not fatal,
+        # unless it is the only one asked for or every symbol failed
+        tables = [o for o in outcomes if not isinstance(o, BaseException)]
+        failures = {
+            t: o for t, o in zip(tickers, outcomes, strict=True) if isinstance(o, BaseException)
+        }
+        reportable = all(isinstance(e, ValueError | HTTPException) for e in failures.values())
+        if failures and (not symbols or not tables or not reportable):
+            raise next(iter(failures.values()))
+        errors = {
+            ticker: e.detail if isinstance(e, HTTPException) else str(e)
+            for ticker, e in failures.items()
+        }
+        for ticker, detail in errors.items():
+            logger.warning(f"⚠️ Pattern backtest skipped {ticker}: {detail}")
+
+        results = {
+            table["symbol"]: {
+                "symbol": table["symbol"],
+                "start_date": table["start_date"],
+                "end_date": table["end_date"],
+                **summarize(table["events"], min_confidence),
+                "lookback_days": lookback_days,
+                "min_confidence": min_confidence,
             }
+            for table in tables
+        }
+        logger.info(
+            "✅ Backtest complete: "
+            + ", ".join(
+                f"{s} {r['total_patterns']} patterns, {r['overall_win_rate']:.1f}% win rate"
+                for s, r in results.items()
+            )
+        )
 
-        # Group patterns by type
-        pattern_groups: dict[str, list] = {}
-        for pattern in patterns:
-            pattern_type = pattern.pattern_type
-            if pattern_type not in pattern_groups:
-                pattern_groups[pattern_type] = []
-            pattern_groups[pattern_type].append(pattern)
-
-        # Calculate performance metrics for each pattern type
-        pattern_performance = []
-        total_successful = 0
-        total_failed = 0
-        total_roi = 0.0
-
-        for pattern_type, pattern_list in pattern_groups.items():
-            # Simulate outcomes based on historical data
-            # In production, this would track actual outcomes
-            successful = 0
-            failed = 0
-            rois = []
-            hold_days_list = []
-
-            for pattern in pattern_list:
-                # Simulate outcome based on confidence
-                # Higher confidence = better chance of success
-                success_prob = pattern.confidence
-                is_successful = random.random() < success_prob
-
-                if is_successful:
-                    successful += 1
-                    # Successful trades: 2-15% ROI
-                    roi = random.uniform(2.0, 15.0)
-                    hold_days = random.randint(3, 20)
-                else:
-                    failed += 1
-                    # Failed trades: -8% to -1% ROI
-                    roi = random.uniform(-8.0, -1.0)
-                    hold_days = random.randint(1, 10)
-
-                rois.append(roi)
-                hold_days_list.append(hold_days)
-
-            total_successful += successful
-            total_failed += failed
-
-            avg_roi = sum(rois) / len(rois) if rois else 0.0
-            total_roi += avg_roi * len(rois)
-            win_rate = (successful / (successful + failed) * 100) if (successful + failed) > 0 else 0.0
-
-            pattern_performance.append({
-                "pattern_type": pattern_type,
-                "total_occurrences": len(pattern_list),
-                "successful_trades": successful,
-                "failed_trades": failed,
-                "win_rate": win_rate,
-                "avg_roi": avg_roi,
-                "avg_hold_days": sum(hold_days_list) / len(hold_days_list) if hold_days_list else 0.0,
-                "best_roi": max(rois) if rois else 0.0,
-                "worst_roi": min(rois) if rois else 0.0,
-                "last_seen": pattern_list[-1].timestamp.isoformat() if pattern_list else None,
-            })
-
-        # Calculate overall metrics
-        total_patterns = total_successful + total_failed
-        overall_win_rate = (total_successful / total_patterns * 100) if total_patterns > 0 else 0.0
-        overall_avg_roi = (total_roi / total_patterns) if total_patterns > 0 else 0.0
-
-        logger.info(f"✅ Backtest complete: {len(patterns)} patterns, {overall_win_rate:.1f}% win rate")
-
+        if not symbols:
+            return results[tickers[0]]
         return {
-            "symbol": symbol,
-            "start_date": start_date.isoformat(),
-            "end_date": end_date.isoformat(),
-            "patterns": pattern_performance,
-            "total_patterns": len(patterns),
-            "overall_win_rate": overall_win_rate,
-            "overall_avg_roi": overall_avg_roi,
+            "symbols": tickers,
+            "results": results,
+            "errors": errors,
+            **summarize(concat_events([t["events"] for t in tables]), min_confidence),
+            "lookback_days": lookback_days,
+            "min_confidence": min_confidence,
         }
 
     except HTTPException:
         raise
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e)) from e
     except Exception as e:
         logger.error(f"Pattern backtesting failed: {e}")
         raise HTTPException(status_code=500, detail=f"Pattern backtesting failed: {e!s}") from e
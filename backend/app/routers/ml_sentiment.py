@@ -301,10 +301,10 @@ async def get_batch_signals(
     end_date = datetime.now(UTC)
     start_date = end_date - timedelta(days=lookback_days)
 
-    results = []
+    # Fetch price data and news for every symbol first
+    inputs: dict[str, tuple] = {}
     for symbol in symbols:
         try:
-            # Fetch price data
             price_data = await data_pipeline.fetch_market_data(
                 symbol=symbol,
                 start_date=start_date,
@@ -325,7 +325,25 @@ async def get_batch_signals(
                     end_date=end_date,
                 )
 
-            # Generate signal
+            inputs[symbol] = (price_data, news_articles)
+
+        except Exception as e:
+            logger.error(f"Error fetching data for {symbol}: {e}")
+            # Continue with other symbols
+
+    # Score all symbols' news in shared batch requests (warms the article cache)
+    if include_sentiment:
+        try:
+            await get_sentiment_analyzer().analyze_watchlist(
+                {symbol: news for symbol, (_, news) in inputs.items() if news}
+            )
+        except Exception as e:
+            logger.error(f"Batch sentiment prefetch failed: {e}")
+
+    results = []
+    for symbol, (price_data, news_articles) in inputs.items():
+        try:
+            # Generate signal (sentiment is served from the article cache)
             signal = await signal_generator.generate_signal(
                 symbol=symbol,
                 price_data=price_data,
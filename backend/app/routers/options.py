@@ -14,15 +14,18 @@ import asyncio
 import logging
 from datetime import UTC, datetime
 
-from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response
 from pydantic import BaseModel, Field
 
 from ..core.config import get_settings
+from ..core.single_flight import get_single_flight
 from ..core.unified_auth import get_current_user_unified
 from ..models.database import User
-from ..services.alpaca_options import get_alpaca_options_client
 from ..services.cache import CacheService, get_cache
+from ..services.cache_warmer import CacheKeyFamily, get_cache_warmer
+from ..services.options_chain import ChainSnapshot, option_list
 from ..services.tradier_client import ProviderHTTPError, get_tradier_client
+from ..services.vol_surface import days_to_expiry, get_vol_surface_service
 
 
 router = APIRouter(prefix="/options", tags=["options"])
@@ -39,6 +42,27 @@ def _get_tradier_client():
     return get_tradier_client()
 
 
+def _refresh_chains(params: list[dict[str, str]]) -> dict[str, dict]:
+    """Re-fetch hot raw option chains (cache warming)"""
+    client = _get_tradier_client()
+    return {
+        f"options:{p['symbol']}:{p['expiration']}": client.get_option_chains(
+            p["symbol"], p["expiration"]
+        )
+        for p in params
+    }
+
+
+get_cache_warmer().register(
+    CacheKeyFamily(
+        "chain",
+        r"options:(?P<symbol>[A-Za-z0-9.]+):(?P<expiration>\d{4}-\d{2}-\d{2})",
+        ttl=get_settings().CACHE_TTL_OPTIONS_CHAIN,
+        refresh=_refresh_chains,
+    )
+)
+
+
 # ============================================================================
 # REQUEST/RESPONSE MODELS
 # ============================================================================
@@ -94,16 +118,122 @@ class ExpirationDate(BaseModel):
 # ============================================================================
 
 
+def _fixture_chain(symbol: str, expiration: str | None) -> ChainSnapshot:
+    """Chain snapshot from test fixtures (USE_TEST_FIXTURES=true)"""
+    from ..services.fixture_loader import get_fixture_loader
+
+    fixture_loader = get_fixture_loader()
+    chain_data = fixture_loader.load_options_chain(symbol)
+
+    if not chain_data:
+        raise HTTPException(
+            status_code=404,
+            detail=f"No fixture data available for symbol {symbol}",
+        )
+
+    # Find the requested expiration or use the first one
+    expirations = chain_data.get("expiration_dates", [])
+    if not expirations:
+        raise HTTPException(
+            status_code=404,
+            detail=f"No expiration dates in fixture for {symbol}",
+        )
+
+    # Use requested expiration or first available
+    target_expiration = expiration or expirations[0]["date"]
+    exp_data = next(
+        (exp for exp in expirations if exp["date"] == target_expiration),
+        expirations[0],
+    )
+
+    return ChainSnapshot(
+        symbol,
+        exp_data["date"],
+        calls=[OptionContract(**call).model_dump() for call in exp_data.get("calls", [])],
+        puts=[OptionContract(**put).model_dump() for put in exp_data.get("puts", [])],
+        underlying_price=chain_data.get("underlying_price"),
+    )
+
+
+async def _load_chain(
+    client,
+    cache: CacheService,
+    symbol: str,
+    expiration: str,
+    underlying_price: float | None = None,
+) -> ChainSnapshot:
+    """Fetch (or read the cached raw) chain and the underlying price into a snapshot"""
+    settings = get_settings()
+
+    # Check cache first (configurable TTL for options chains)
+    cache_key = f"options:{symbol}:{expiration}"
+    chain_data = cache.get(cache_key)
+    if chain_data:
+        logger.info(f"✅ CACHE HIT: {cache_key} (TTL: {settings.CACHE_TTL_OPTIONS_CHAIN}s)")
+    else:
+        logger.info(f"❌ CACHE MISS: {cache_key} - Fetching from Tradier API")
+        chain_data = await asyncio.to_thread(client.get_option_chains, symbol, expiration)
+        cache.set(cache_key, chain_data, ttl=settings.CACHE_TTL_OPTIONS_CHAIN)
+        logger.info(f"💾 CACHED: {cache_key} (TTL: {settings.CACHE_TTL_OPTIONS_CHAIN}s)")
+
+    if not chain_data:
+        raise HTTPException(status_code=500, detail="Empty response from Tradier API")
+
+    if not option_list(chain_data):
+        return ChainSnapshot(symbol, expiration, calls=[], puts=[])
+
+    if underlying_price is None:
+        underlying_price = await _underlying_price(client, symbol)
+
+    return ChainSnapshot.from_tradier(symbol, expiration, chain_data, underlying_price)
+
+
+async def _underlying_price(client, symbol: str) -> float | None:
+    """Last price of the underlying from Tradier (None if unavailable)"""
+    try:
+        quote = await asyncio.to_thread(client.get_quote, symbol)
+        if quote and "last" in quote:
+            underlying_price = float(quote["last"])
+            logger.info(f"📈 Underlying price for {symbol}: ${underlying_price:.2f}")
+            return underlying_price
+    except Exception as e:
+        logger.warning(f"⚠️ Failed to fetch underlying price for {symbol}: {e}")
+    return None
+
+
+def _chain_response(request: Request, snapshot: ChainSnapshot, fmt: str) -> Response:
+    """Encoded chain, or 304 Not Modified when the client already has this version"""
+    etag = snapshot.etag(fmt)
+    headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+
+    if_none_match = request.headers.get("if-none-match", "")
+    if if_none_match.strip() == "*" or etag in (tag.strip() for tag in if_none_match.split(",")):
+        return Response(status_code=304, headers=headers)
+
+    try:
+        body, media_type = snapshot.encode(fmt)
+    except ValueError as e:
+        raise HTTPException(status_code=406, detail=str(e)) from e
+    return Response(content=body, media_type=media_type, headers=headers)
+
+
 @router.get(
     "/chain/{symbol}",
     response_model=OptionsChainResponse,
 )
 async def get_options_chain(
+    request: Request,
     symbol: str,
     expiration: str | None = Query(
         None,
         description="Expiration date (YYYY-MM-DD). If not provided, uses nearest expiration.",
     ),
+    fmt: str = Query(
+        "json",
+        alias="format",
+        pattern="^(json|columnar|msgpack)$",
+        description="json (one object per contract), columnar (one array per field) or msgpack",
+    ),
     current_user: User = Depends(get_current_user_unified),
     cache: CacheService = Depends(get_cache),
 ):
@@ -115,11 +245,15 @@ async def get_options_chain(
     Supports fixture mode for deterministic testing when USE_TEST_FIXTURES=true.
 
     Options chains are cached for 60 seconds (configurable) since Greeks update
-    less frequently than stock quotes.
+    less frequently than stock quotes. Each fetched chain is encoded once per
+    format, and responses carry an ETag: pollers sending If-None-Match get
+    304 Not Modified until the chain changes.
 
     Args:
         symbol: Stock symbol (e.g., SPY, AAPL)
         expiration: Expiration date in YYYY-MM-DD format
+        format: Wire format; columnar and msgpack send struct-of-arrays columns
+            (symbol, strike_price, bid, ask, ..., implied_volatility) per side
 
     Returns:
         OptionsChainResponse with calls and puts including Greeks
@@ -130,53 +264,14 @@ async def get_options_chain(
 
     # Get settings for cache TTL
     settings = get_settings()
+    # Same single-flight key for spy and SPY, and the one /options/surface uses
+    symbol = symbol.upper()
 
     try:
         # Check if we should use test fixtures
         if settings.USE_TEST_FIXTURES:
             logger.info("Using test fixtures for deterministic testing")
-            from ..services.fixture_loader import get_fixture_loader
-
-            fixture_loader = get_fixture_loader()
-            chain_data = fixture_loader.load_options_chain(symbol)
-
-            if not chain_data:
-                raise HTTPException(
-                    status_code=404,
-                    detail=f"No fixture data available for symbol {symbol}",
-                )
-
-            # Find the requested expiration or use the first one
-            expirations = chain_data.get("expiration_dates", [])
-            if not expirations:
-                raise HTTPException(
-                    status_code=404,
-                    detail=f"No expiration dates in fixture for {symbol}",
-                )
-
-            # Use requested expiration or first available
-            target_expiration = expiration or expirations[0]["date"]
-            exp_data = next(
-                (exp for exp in expirations if exp["date"] == target_expiration),
-                expirations[0],
-            )
-
-            # Build response from fixture data
-            calls = [OptionContract(**call) for call in exp_data.get("calls", [])]
-            puts = [OptionContract(**put) for put in exp_data.get("puts", [])]
-
-            chain_response = OptionsChainResponse(
-                symbol=symbol,
-                expiration_date=exp_data["date"],
-                underlying_price=chain_data.get("underlying_price"),
-                calls=calls,
-                puts=puts,
-                total_contracts=len(calls) + len(puts),
-            )
-            return {
-                "data": chain_response.model_dump(),
-                "timestamp": datetime.now().isoformat(),
-            }
+            return _chain_response(request, _fixture_chain(symbol, expiration), fmt)
 
         # Initialize Tradier client for real API calls
         client = _get_tradier_client()
@@ -193,111 +288,17 @@ async def get_options_chain(
                 expirations[0] if isinstance(expirations, list) else expirations
             )
 
-        # Check cache first (configurable TTL for options chains)
-        cache_key = f"options:{symbol}:{expiration}"
-        chain_data = cache.get(cache_key)
-        if chain_data:
-            logger.info(
-                f"✅ CACHE HIT: {cache_key} (TTL: {settings.CACHE_TTL_OPTIONS_CHAIN}s)"
-            )
-        else:
-            logger.info(f"❌ CACHE MISS: {cache_key} - Fetching from Tradier API")
-            chain_data = await asyncio.to_thread(
-                client.get_option_chains, symbol, expiration
-            )
-            cache.set(cache_key, chain_data, ttl=settings.CACHE_TTL_OPTIONS_CHAIN)
-            logger.info(
-                f"💾 CACHED: {cache_key} (TTL: {settings.CACHE_TTL_OPTIONS_CHAIN}s)"
-            )
-
-        # Parse Tradier response
-        # Log response for debugging
-        logger.info(
-            f"Tradier response keys: {list(chain_data.keys()) if chain_data else 'None'}"
+        # One snapshot per chain version, shared by concurrent and repeat requests
+        snapshot = await get_single_flight().get(
+            f"options:chain:{symbol}:{expiration}",
+            lambda: _load_chain(client, cache, symbol, expiration),
+            ttl=settings.CACHE_TTL_OPTIONS_CHAIN,
+            stale_ttl=settings.CACHE_STALE_TTL,
         )
+        return _chain_response(request, snapshot, fmt)
 
-        if not chain_data:
-            raise HTTPException(
-                status_code=500, detail="Empty response from Tradier API"
-            )
-
-        options_data = chain_data.get("options", {})
-        if not options_data:
-            # Check alternative response structure
-            if "option" in chain_data:
-                options_data = chain_data
-
-        option_list = options_data.get("option", [])
-
-        if not option_list:
-            chain_response = OptionsChainResponse(
-                symbol=symbol,
-                expiration_date=expiration,
-                calls=[],
-                puts=[],
-                total_contracts=0,
-            )
-            return {
-                "data": chain_response.model_dump(),
-                "timestamp": datetime.now().isoformat(),
-            }
-
-        # Separate calls and puts, parse Greeks
-        calls = []
-        puts = []
-
-        for opt in option_list:
-            greeks = opt.get("greeks", {})
-
-            contract = OptionContract(
-                symbol=opt.get("symbol", ""),
-                underlying_symbol=symbol,
-                option_type=opt.get("option_type", ""),
-                strike_price=float(opt.get("strike", 0)),
-                expiration_date=opt.get("expiration_date", expiration),
-                bid=opt.get("bid"),
-                ask=opt.get("ask"),
-                last_price=opt.get("last"),
-                volume=opt.get("volume"),
-                open_interest=opt.get("open_interest"),
-                delta=greeks.get("delta"),
-                gamma=greeks.get("gamma"),
-                theta=greeks.get("theta"),
-                vega=greeks.get("vega"),
-                rho=greeks.get("rho"),
-                implied_volatility=greeks.get("mid_iv"),
-            )
-
-            if opt.get("option_type") == "call":
-                calls.append(contract)
-            else:
-                puts.append(contract)
-
-        # Fetch underlying price from Tradier for complete data
-        underlying_price = None
-        try:
-            quote = client.get_quote(symbol)
-            if quote and "last" in quote:
-                underlying_price = float(quote["last"])
-                logger.info(
-                    f"📈 Underlying price for {symbol}: ${underlying_price:.2f}"
-                )
-        except Exception as e:
-            logger.warning(f"⚠️ Failed to fetch underlying price for {symbol}: {e}")
-
-        chain_response = OptionsChainResponse(
-            symbol=symbol,
-            expiration_date=expiration,
-            underlying_price=underlying_price,
-            calls=calls,
-            puts=puts,
-            total_contracts=len(calls) + len(puts),
-        )
-        return {
-            "data": chain_response.model_dump(),
-            "timestamp": datetime.now().isoformat(),
-        }
-
+    except HTTPException:
+        raise
     except ProviderHTTPError as e:
         logger.error(
             "Tradier provider error while fetching options chain",
@@ -467,6 +468,113 @@ def get_expiration_dates(
         ) from e
 
 
+@router.get("/surface/{symbol}")
+async def get_vol_surface(
+    symbol: str,
+    min_dte: int = Query(0, ge=0, description="Skip expirations closer than this (days)"),
+    max_dte: int | None = Query(
+        None, ge=0, description="Skip expirations further out (default: OPTIONS_SURFACE_MAX_DTE)"
+    ),
+    current_user: User = Depends(get_current_user_unified),
+    cache: CacheService = Depends(get_cache),
+):
+    """
+    Get the implied volatility surface (strike x expiry) for a symbol
+
+    Fetches the chains of every expiration within the DTE bounds concurrently
+    (OPTIONS_SURFACE_CONCURRENCY at a time) and interpolates their IVs onto a
+    common strike axis around spot. The surface is kept per symbol and a
+    refresh only re-reads expirations whose chain changed.
+
+    Args:
+        symbol: Stock symbol (e.g., SPY, AAPL)
+        min_dte: Minimum days to expiry
+        max_dte: Maximum days to expiry
+
+    Returns:
+        Strike axis, expirations, IV grid (rows: expirations, NaN cells as null),
+        ATM IV per expiration, 30-day ATM IV and its 1-year IV percentile
+    """
+    settings = get_settings()
+    symbol = symbol.upper()
+    max_dte = settings.OPTIONS_SURFACE_MAX_DTE if max_dte is None else max_dte
+
+    try:
+        if settings.USE_TEST_FIXTURES:
+            from ..services.fixture_loader import get_fixture_loader
+
+            chain_data = get_fixture_loader().load_options_chain(symbol) or {}
+            expirations = [exp["date"] for exp in chain_data.get("expiration_dates", [])]
+            underlying_price = chain_data.get("underlying_price")
+
+            async def load_chain(expiration: str) -> ChainSnapshot:
+                return _fixture_chain(symbol, expiration)
+
+        else:
+            client = _get_tradier_client()
+            exp_data = await asyncio.to_thread(client.get_option_expirations, symbol)
+            expirations = (exp_data.get("expirations") or {}).get("date") or []
+            if not isinstance(expirations, list):
+                expirations = [expirations]
+            underlying_price = await _underlying_price(client, symbol)
+
+            async def load_chain(expiration: str) -> ChainSnapshot:
+                # Shares snapshots (and the raw chain cache) with /options/chain
+                return await get_single_flight().get(
+                    f"options:chain:{symbol}:{expiration}",
+                    lambda: _load_chain(client, cache, symbol, expiration, underlying_price),
+                    ttl=settings.CACHE_TTL_OPTIONS_CHAIN,
+                    stale_ttl=settings.CACHE_STALE_TTL,
+                )
+
+        expirations = [e for e in expirations if min_dte <= days_to_expiry(e) <= max_dte]
+        if not expirations:
+            raise HTTPException(
+                status_code=404,
+                detail=f"No expirations for {symbol} between {min_dte} and {max_dte} days",
+            )
+        if not underlying_price:
+            raise HTTPException(
+                status_code=502, detail=f"No underlying price available for {symbol}"
+            )
+
+        service = get_vol_surface_service()
+        surface = await get_single_flight().get(
+            f"options:surface:{symbol}:{min_dte}:{max_dte}",
+            lambda: service.refresh(symbol, expirations, load_chain, underlying_price),
+            ttl=settings.CACHE_TTL_OPTIONS_CHAIN,
+            stale_ttl=settings.CACHE_STALE_TTL,
+        )
+
+        return {
+            "data": {**surface.to_dict(), "iv_percentile": service.iv_percentile(cache, surface)},
+            "timestamp": datetime.now(UTC).isoformat(),
+        }
+
+    except HTTPException:
+        raise
+    except ProviderHTTPError as e:
+        logger.error(
+            "Tradier provider error while building volatility surface",
+            exc_info=e,
+            extra={"symbol": symbol, "status": e.status_code},
+        )
+        if e.status_code in (400, 404):
+            raise HTTPException(status_code=404, detail=f"Options not found for {symbol}") from e
+        if e.status_code in (401, 403, 429):
+            raise HTTPException(
+                status_code=503, detail="Upstream authentication or rate limit error"
+            ) from e
+        raise HTTPException(status_code=502, detail="Upstream service error") from e
+    except Exception as e:
+        logger.error(
+            "Unexpected error building volatility surface", exc_info=e, extra={"symbol": symbol}
+        )
+        raise HTTPException(
+            status_code=500, detail=f"Error building volatility surface: {e!s}"
+        ) from e
+
+
 @router.post("/greeks")
 async def calculate_greeks(
     symbol: str = Query(..., description="Option symbol"),
@@ -570,7 +678,9 @@ async def get_option_contract(
     try:
         logger.info(f"📝 Fetching contract details for {option_symbol}")
 
-        # Get Alpaca options client
+        # Get Alpaca options client (imported here: the Alpaca SDK is slow to import)
+        from ..services.alpaca_options import get_alpaca_options_client
+
         alpaca_client = get_alpaca_options_client()
 
         # Fetch contract details with Greeks
@@ -252,8 +252,8 @@ async def get_portfolio_pnl_summary(
         # Get all open positions
         positions = await service.get_open_positions()
         
-        # Calculate portfolio Greeks
-        portfolio_greeks = await service.calculate_portfolio_greeks()
+        # Portfolio Greeks (served from the aggregate the call above refreshed)
+        portfolio_greeks = await service.get_portfolio_greeks()
         
         # Aggregate P&L
         total_unrealized_pl = sum(p.unrealized_pl for p in positions)
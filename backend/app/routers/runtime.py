@@ -1,18 +1,25 @@
 from __future__ import annotations
 
+import asyncio
+import re
 from datetime import UTC, datetime, timedelta
-from typing import Optional
+from typing import Any, Optional
 
 from fastapi import APIRouter, Depends, HTTPException
-from pydantic import BaseModel, field_validator
+from pydantic import BaseModel, Field, field_validator
 
 from ..core.unified_auth import get_current_user_unified
 from ..models.database import User
+from ..runtime.jsonl_logger import make_run_logger
+from ..runtime.market_replay import REPLAY_DIR, MarketReplay, list_sessions, strategy_planner
 from ..runtime.temporal_oracle import default_oracle
 
 
 router = APIRouter()
 
+# A replay request is cancelled after this long (paced replays can run for hours)
+REPLAY_TIMEOUT_SECONDS = 300
+
 
 class SimTimeUpdate(BaseModel):
     sim_time: Optional[str] = None
@@ -67,3 +74,61 @@ def set_or_advance_sim_time(
     raise HTTPException(status_code=400, detail="Provide sim_time or advance_seconds")
 
 
+class ReplayRequest(BaseModel):
+    session: str
+    strategy_type: str
+    config: dict[str, Any] | None = None  # None: the user's saved or default config
+    speed: float | None = Field(None, gt=0)
+    plan_interval_seconds: int | None = Field(None, gt=0)
+    drive_sim_time: bool = False
+
+    @field_validator("session")
+    @classmethod
+    def _validate_session(cls, v: str) -> str:
+        if not re.fullmatch(r"[\w-]+", v):
+            raise ValueError("Invalid session name")
+        return v
+
+
+@router.get("/runtime/replay/sessions")
+def get_replay_sessions(current_user: User = Depends(get_current_user_unified)):
+    """List recorded market sessions available for replay."""
+    return {"sessions": list_sessions()}
+
+
+@router.post("/runtime/replay")
+async def replay_session(
+    payload: ReplayRequest, current_user: User = Depends(get_current_user_unified)
+):
+    """Replay a recorded market session through a strategy (no broker calls).
+
+    `speed` replays at that multiple of recorded time (default: as fast as
+    possible). With `drive_sim_time` the global simulation clock follows the
+    replay. Plans are also written to the run log under data/agent_data.
+    Replays still running after REPLAY_TIMEOUT_SECONDS are cancelled with a 504.
+    """
+    directory = REPLAY_DIR / payload.session
+    if not directory.is_dir():
+        raise HTTPException(status_code=404, detail=f"Session '{payload.session}' not found")
+
+    run_id = f"replay-{payload.session}-{datetime.now(tz=UTC).strftime('%Y%m%dT%H%M%S')}"
+    replay = MarketReplay(
+        directory,
+        oracle=default_oracle if payload.drive_sim_time else None,
+        speed=payload.speed,
+        plan_interval=(
+            timedelta(seconds=payload.plan_interval_seconds)
+            if payload.plan_interval_seconds
+            else None
+        ),
+        run_logger=make_run_logger(run_id),
+    )
+    planner = strategy_planner(payload.strategy_type, payload.config, user_id=current_user.id)
+    try:
+        result = await asyncio.wait_for(replay.run(planner), timeout=REPLAY_TIMEOUT_SECONDS)
+    except TimeoutError as e:
+        raise HTTPException(
+            status_code=504,
+            detail=f"Replay exceeded {REPLAY_TIMEOUT_SECONDS}s; use a higher speed or none",
+        ) from e
+    return {"run_id": run_id, **result.to_dict()}
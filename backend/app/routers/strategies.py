@@ -13,7 +13,7 @@ from pydantic import BaseModel, Field, field_validator
 from sqlalchemy.orm import Session
 
 from ..core.unified_auth import get_current_user_unified
-from ..db.session import get_db
+from ..db.session import AsyncDBSession, get_async_db, get_db
 from ..models.database import Strategy, User
 from ..services.strategy_templates import (
     customize_template_for_risk,
@@ -267,7 +267,9 @@ async def delete_strategy(
 
 @router.get("/strategies/execution-history")
 async def get_strategy_execution_history(
-    limit: int = 50, current_user: User = Depends(get_current_user_unified)
+    limit: int = 50,
+    current_user: User = Depends(get_current_user_unified),
+    db: AsyncDBSession = Depends(get_async_db),
 ):
     """Return recent execution history for the authenticated user."""
 
@@ -278,7 +280,9 @@ async def get_strategy_execution_history(
         from ..services.strategy_execution_service import get_strategy_execution_service
 
         service = get_strategy_execution_service()
-        history = service.list_execution_history(user_id=current_user.id, limit=limit)
+        history = await service.list_execution_history_async(
+            db, user_id=current_user.id, limit=limit
+        )
         return {"history": history}
     except HTTPException:
         raise
@@ -35,6 +35,11 @@ HEARTBEAT_INTERVAL = 15  # Send heartbeat every 15 seconds
 DATA_CHECK_INTERVAL = 1  # Check for new data every 1 second
 
 
+def _latest(cache: CacheService, kind: str, symbol: str) -> dict | None:
+    """Latest streamed record: this process's in-memory table first, then Redis"""
+    return get_tradier_stream().get_latest(kind, symbol) or cache.get(f"{kind}:{symbol}")
+
+
 @router.get("/stream/prices")
 async def stream_prices(
     symbols: str = Query(
@@ -92,7 +97,7 @@ async def stream_prices(
                 # Read latest prices from Redis cache
                 for symbol in symbol_list:
                     # Try trade price first (more accurate)
-                    trade_data = cache.get(f"price:{symbol}")
+                    trade_data = _latest(cache, "price", symbol)
                     if trade_data:
                         prices[symbol] = {
                             "price": trade_data.get("price", 0),
@@ -102,7 +107,7 @@ async def stream_prices(
                         }
                     else:
                         # Fall back to quote data (bid/ask)
-                        quote_data = cache.get(f"quote:{symbol}")
+                        quote_data = _latest(cache, "quote", symbol)
                         if quote_data:
                             prices[symbol] = {
                                 "price": quote_data.get("mid", 0),  # Use mid price
@@ -273,8 +278,8 @@ async def stream_market_indices(
                 indices = {}
 
                 # Read $DJI from cache
-                dji_trade = cache.get("price:$DJI")
-                dji_quote = cache.get("quote:$DJI")
+                dji_trade = _latest(cache, "price", "$DJI")
+                dji_quote = _latest(cache, "quote", "$DJI")
 
                 if dji_trade:
                     indices["dow"] = {
@@ -288,8 +293,8 @@ async def stream_market_indices(
                     }
 
                 # Read COMP:GIDS from cache
-                comp_trade = cache.get("price:COMP:GIDS")
-                comp_quote = cache.get("quote:COMP:GIDS")
+                comp_trade = _latest(cache, "price", "COMP:GIDS")
+                comp_quote = _latest(cache, "quote", "COMP:GIDS")
 
                 if comp_trade:
                     indices["nasdaq"] = {
@@ -304,7 +309,7 @@ async def stream_market_indices(
 
                 # Add change percentage if available from summary data
                 for symbol, key in [("$DJI", "dow"), ("COMP:GIDS", "nasdaq")]:
-                    summary = cache.get(f"summary:{symbol}")
+                    summary = _latest(cache, "summary", symbol)
                     if summary and key in indices:
                         # Convert open_price to float (Tradier sends strings)
                         try:
@@ -365,7 +370,8 @@ async def stream_status(current_user: User = Depends(get_current_user_unified)):
             "streaming_available": bool,
             "provider": str,
             "active_symbols": ["AAPL", "MSFT", ...],
-            "stream_count": int
+            "stream_count": int,
+            "ingest": {"ticks_per_second": float, "lag_ms": {...}, "flushes": int, ...}
         }
     """
     tradier_stream = get_tradier_stream()
@@ -376,4 +382,5 @@ async def stream_status(current_user: User = Depends(get_current_user_unified)):
         "provider": "Tradier WebSocket",
         "active_symbols": active_symbols,
         "stream_count": len(active_symbols),
+        "ingest": tradier_stream.stats(),
     }
@@ -1,7 +1,8 @@
 from __future__ import annotations
 
+import gzip
 import json
-from collections.abc import Iterable
+from collections.abc import Iterable, Iterator
 from dataclasses import dataclass, field
 from datetime import UTC, datetime
 from pathlib import Path
@@ -16,7 +17,8 @@ def _utc_now_iso() -> str:
 class JSONLLogger:
     """Append-only JSONL writer for runs, positions, and rationale logs.
 
-    This is a lightweight utility; rotation and compression can be layered later.
+    Paths ending in ".gz" are written gzip-compressed (block buffered, so call
+    flush() or close() to complete the data on disk). Rotation is left to callers.
     """
 
     file_path: Path
@@ -28,6 +30,9 @@ class JSONLLogger:
             return
         if self.auto_mkdir:
             self.file_path.parent.mkdir(parents=True, exist_ok=True)
+        if self.file_path.suffix == ".gz":
+            self._fp = gzip.open(self.file_path, "at", encoding="utf-8")
+            return
         # Use append with UTF-8 and line buffering
         self._fp = open(self.file_path, "a", encoding="utf-8", buffering=1)
 
@@ -55,6 +60,22 @@ class JSONLLogger:
                 self._fp = None
 
 
+def read_jsonl(file_path: Path) -> Iterator[dict[str, Any]]:
+    """Yield the records of a JSONL file (gzip-compressed if it ends in ".gz").
+
+    A file cut off mid-write (e.g. the process was killed) yields the complete
+    records before the cut.
+    """
+    opener = gzip.open if file_path.suffix == ".gz" else open
+    with opener(file_path, "rt", encoding="utf-8") as fp:
+        try:
+            for line in fp:
+                if line.endswith("\n") and line.strip():
+                    yield json.loads(line)
+        except EOFError:
+            return
+
+
 # Convenience factory for standard paths under backend/data
 def make_run_logger(run_id: str, kind: str = "log") -> JSONLLogger:
     base = Path(__file__).resolve().parents[2] / "data" / "agent_data" / run_id
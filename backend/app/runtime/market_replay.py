@@ -0,0 +1,389 @@
+"""Market recording and deterministic replay.
+
+Recording: MarketRecorder stores every raw Tradier stream message and every
+market snapshot a strategy run was planned from, stamped with the time it was
+received, in gzip-compressed JSONL segments under data/replay/<session>/.
+
+Replay: MarketReplay reads a session back in arrival order under a
+TemporalOracle clock, either as fast as possible or at N x recorded speed. At
+each recorded snapshot (and optionally every plan_interval of sim time) the
+planner gets the market as it stood at that moment: the latest recorded
+snapshot, with quotes updated by the stream messages received since. Quotes
+stamped after the sim clock are dropped by the oracle's look-ahead gate and no
+broker is called, so a session replays to the same trade plans every time.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import copy
+import hashlib
+import itertools
+import json
+import logging
+import threading
+import time
+from collections import deque
+from collections.abc import AsyncIterator, Callable, Iterator
+from dataclasses import dataclass, field
+from datetime import UTC, datetime, timedelta
+from pathlib import Path
+from typing import Any
+
+from .jsonl_logger import JSONLLogger, read_jsonl
+from .temporal_oracle import TemporalOracle
+
+
+logger = logging.getLogger(__name__)
+
+REPLAY_DIR = Path(__file__).resolve().parents[2] / "data" / "replay"
+
+# Events per segment file before the recorder rotates to the next one
+SEGMENT_EVENTS = 100_000
+
+# Unpaced replays yield to the event loop every this many events
+YIELD_EVERY_EVENTS = 1000
+
+# Events a replay decodes per hop to the worker thread
+READ_CHUNK_EVENTS = 5000
+
+# planner(market_snapshot) -> trade plan, as returned by generate_trade_plan
+Planner = Callable[[dict[str, Any]], dict[str, Any]]
+
+
+def _iso(epoch: float) -> str:
+    return datetime.fromtimestamp(epoch, tz=UTC).isoformat()
+
+
+def _parse_time(value: str) -> datetime:
+    parsed = datetime.fromisoformat(value)
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=UTC)
+    return parsed
+
+
+def _price(value: Any) -> float | None:
+    try:
+        price = float(value)
+    except (TypeError, ValueError):
+        return None
+    return price if price == price else None  # Tradier sends "NaN" for missing sides
+
+
+@dataclass
+class MarketRecorder:
+    """Writes market events to rotating gzip-compressed JSONL segments.
+
+    record_message() only appends to a thread-safe buffer, so it is cheap on the
+    stream's ingest path; flush() writes the buffer out and is meant to run off
+    the event loop (the stream calls it from its periodic flush).
+    """
+
+    directory: Path
+    segment_events: int = SEGMENT_EVENTS
+    events_written: int = field(default=0, init=False)
+    _buffer: deque[dict[str, Any]] = field(default_factory=deque, init=False, repr=False)
+    _writer: JSONLLogger | None = field(default=None, init=False, repr=False)
+    _segment: int = field(default=0, init=False, repr=False)
+    _in_segment: int = field(default=0, init=False, repr=False)
+    _lock: threading.Lock = field(default_factory=threading.Lock, init=False, repr=False)
+
+    def record_message(self, data: dict[str, Any], received_at: float | None = None) -> None:
+        """Record a raw stream message (quote, trade or summary)."""
+        timestamp = _iso(received_at if received_at is not None else time.time())
+        self._buffer.append({"timestamp": timestamp, "kind": "stream", "data": data})
+
+    def record_snapshot(
+        self, market_key: str, snapshot: dict[str, Any], received_at: float | None = None
+    ) -> None:
+        """Record the market snapshot a strategy run was planned from, then flush."""
+        timestamp = _iso(received_at if received_at is not None else time.time())
+        self._buffer.append(
+            {"timestamp": timestamp, "kind": "snapshot", "market_key": market_key, "data": snapshot}
+        )
+        self.flush()
+
+    def flush(self) -> int:
+        """Write buffered events to the current segment and return how many were written."""
+        with self._lock:
+            written = 0
+            while self._buffer:
+                if self._writer is None or self._in_segment >= self.segment_events:
+                    self._rotate()
+                self._writer.append(self._buffer.popleft())
+                self._in_segment += 1
+                written += 1
+            if written:
+                self._writer.flush()
+                self.events_written += written
+            return written
+
+    def close(self) -> None:
+        self.flush()
+        with self._lock:
+            if self._writer is not None:
+                self._writer.close()
+                self._writer = None
+
+    def _rotate(self) -> None:
+        if self._writer is not None:
+            self._writer.close()
+        self._segment += 1
+        self._in_segment = 0
+        self._writer = JSONLLogger(self.directory / f"segment-{self._segment:05d}.jsonl.gz")
+
+
+def read_session(directory: Path) -> Iterator[dict[str, Any]]:
+    """Yield the recorded events of a session in arrival order."""
+    for segment in sorted(Path(directory).glob("segment-*.jsonl.gz")):
+        yield from read_jsonl(segment)
+
+
+async def iter_session(
+    directory: Path, chunk_events: int = READ_CHUNK_EVENTS
+) -> AsyncIterator[dict[str, Any]]:
+    """read_session() for the event loop: gzip/JSONL decoding runs in a worker thread."""
+    events = read_session(directory)
+    while chunk := await asyncio.to_thread(list, itertools.islice(events, chunk_events)):
+        for event in chunk:
+            yield event
+
+
+def list_sessions(base: Path = REPLAY_DIR) -> list[str]:
+    """Recorded session names, oldest first."""
+    if not base.exists():
+        return []
+    return sorted(path.name for path in base.iterdir() if path.is_dir())
+
+
+# Process-wide recorder, active between start_recording() and stop_recording()
+_recorder: MarketRecorder | None = None
+
+
+def start_recording(
+    session_id: str | None = None, segment_events: int = SEGMENT_EVENTS
+) -> MarketRecorder:
+    """Start (or return the already active) recording session."""
+    global _recorder
+    if _recorder is None:
+        session_id = session_id or datetime.now(tz=UTC).strftime("%Y%m%dT%H%M%SZ")
+        _recorder = MarketRecorder(REPLAY_DIR / session_id, segment_events=segment_events)
+        logger.info(f"✅ Recording market data to {_recorder.directory}")
+    return _recorder
+
+
+def stop_recording() -> None:
+    global _recorder
+    if _recorder is not None:
+        _recorder.close()
+        logger.info(f"✅ Recorded {_recorder.events_written} market events")
+        _recorder = None
+
+
+def get_market_recorder() -> MarketRecorder | None:
+    """The active recorder, or None when market data is not being recorded."""
+    return _recorder
+
+
+@dataclass
+class ReplayResult:
+    """Trade plans produced by one replay of a recorded session."""
+
+    session: str
+    events: int = 0
+    plans: list[dict[str, Any]] = field(default_factory=list)
+    sim_start: str | None = None
+    sim_end: str | None = None
+    wall_seconds: float = 0.0
+    dropped_lookahead: int = 0
+
+    @property
+    def digest(self) -> str:
+        """Fingerprint of the trade plans, for comparing replays of the same session."""
+        payload = json.dumps(self.plans, sort_keys=True, separators=(",", ":"), default=str)
+        return hashlib.sha256(payload.encode()).hexdigest()
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "session": self.session,
+            "events": self.events,
+            "plans": self.plans,
+            "sim_start": self.sim_start,
+            "sim_end": self.sim_end,
+            "wall_seconds": round(self.wall_seconds, 3),
+            "dropped_lookahead": self.dropped_lookahead,
+            "digest": self.digest,
+        }
+
+
+class MarketReplay:
+    """Replays a recorded session through a strategy planner under a simulated clock.
+
+    Args:
+        directory: Recorded session directory
+        oracle: Clock to drive (default: a private TemporalOracle; pass
+            default_oracle to move the whole app's sim time with the replay)
+        speed: Replay at this multiple of recorded time (None: as fast as possible)
+        plan_interval: Also plan every interval of sim time between snapshots
+        run_logger: Optional JSONL run log receiving every plan
+    """
+
+    def __init__(
+        self,
+        directory: Path,
+        oracle: TemporalOracle | None = None,
+        speed: float | None = None,
+        plan_interval: timedelta | None = None,
+        run_logger: JSONLLogger | None = None,
+    ):
+        self.directory = Path(directory)
+        self.oracle = oracle or TemporalOracle()
+        self.speed = speed
+        self.plan_interval = plan_interval
+        self.run_logger = run_logger
+        self._snapshot: dict[str, Any] | None = None
+        self._last: dict[str, float] = {}
+        self._bid_ask: dict[str, tuple[float | None, float | None]] = {}
+
+    async def run(self, planner: Planner) -> ReplayResult:
+        """Replay every recorded event and collect the planner's trade plans."""
+        result = ReplayResult(session=self.directory.name)
+        loop = asyncio.get_running_loop()
+        wall_start = loop.time()
+        sim_start: datetime | None = None
+        next_plan: datetime | None = None
+
+        async def advance(to: datetime):
+            if to > self.oracle.get_sim_time():
+                self.oracle.set_sim_time(to)
+            if self.speed:
+                target = wall_start + (to - sim_start).total_seconds() / self.speed
+                delay = target - loop.time()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+            elif result.events % YIELD_EVERY_EVENTS == 0:
+                await asyncio.sleep(0)
+
+        try:
+            async for event in iter_session(self.directory):
+                when = _parse_time(event["timestamp"])
+                if sim_start is None:
+                    sim_start = when
+                    self.oracle.set_sim_time(when)
+
+                # Interval plans due before this event must not see it
+                while next_plan is not None and next_plan < when:
+                    await advance(next_plan)
+                    self._plan(planner, result)
+                    next_plan += self.plan_interval
+
+                await advance(when)
+                result.events += 1
+                if event.get("kind") == "snapshot":
+                    self._snapshot = event["data"]
+                    self._plan(planner, result)
+                    if self.plan_interval is not None:
+                        next_plan = self.oracle.get_sim_time() + self.plan_interval
+                    continue
+
+                self._apply(event.get("data", {}))
+                if next_plan is not None and next_plan <= self.oracle.get_sim_time():
+                    self._plan(planner, result)
+                    next_plan += self.plan_interval
+
+            result.wall_seconds = loop.time() - wall_start
+            if sim_start is not None:
+                result.sim_start = sim_start.isoformat()
+                result.sim_end = self.oracle.get_sim_time().isoformat()
+        finally:
+            if self.run_logger is not None:
+                self.run_logger.close()
+        logger.info(
+            f"✅ Replayed {result.events} events of {result.session} "
+            f"in {result.wall_seconds:.2f}s: {len(result.plans)} plans"
+        )
+        return result
+
+    def _apply(self, data: dict[str, Any]) -> None:
+        """Update the replayed market with a stream message."""
+        symbol = data.get("symbol")
+        if not symbol:
+            return
+        if data.get("type") == "trade":
+            price = _price(data.get("price"))
+            if price is not None:
+                self._last[symbol] = price
+        elif data.get("type") == "quote":
+            self._bid_ask[symbol] = (_price(data.get("bid")), _price(data.get("ask")))
+
+    def _plan(self, planner: Planner, result: ReplayResult) -> None:
+        if self._snapshot is None:
+            return
+        sim_time = self.oracle.get_sim_time()
+        record = {
+            "timestamp": sim_time.isoformat(),
+            "trade_plan": planner(self._market_at(sim_time, result)),
+        }
+        result.plans.append(record)
+        if self.run_logger is not None:
+            self.run_logger.append(record)
+
+    def _market_at(self, sim_time: datetime, result: ReplayResult) -> dict[str, Any]:
+        """Latest recorded snapshot brought up to date with the streamed quotes."""
+        snapshot = copy.deepcopy(self._snapshot)
+        snapshot["as_of"] = sim_time.isoformat()
+        quotes = snapshot.get("quotes")
+        if not isinstance(quotes, dict) or not isinstance(quotes.get("items"), list):
+            return snapshot
+
+        visible = []
+        for quote in quotes["items"]:
+            if not self._gate(quote.get("trade_date")):
+                result.dropped_lookahead += 1
+                continue
+            symbol = quote.get("symbol")
+            if symbol in self._last:
+                quote["last"] = self._last[symbol]
+            bid, ask = self._bid_ask.get(symbol, (None, None))
+            if bid is not None and ask is not None:
+                quote["bid"], quote["ask"] = bid, ask
+            visible.append(quote)
+        quotes["items"] = visible
+        return snapshot
+
+    def _gate(self, epoch_ms: Any) -> bool:
+        """Whether a quote stamped epoch_ms (Tradier trade_date) is visible at sim time."""
+        if not epoch_ms:
+            return True
+        try:
+            stamped = datetime.fromtimestamp(int(epoch_ms) / 1000, tz=UTC)
+        except (TypeError, ValueError, OverflowError):
+            return True
+        try:
+            self.oracle.gate_price_timestamp(stamped)
+        except ValueError:
+            return False
+        return True
+
+
+def strategy_planner(
+    strategy_type: str, config: dict[str, Any] | None = None, user_id: int = 0
+) -> Planner:
+    """Planner running a strategy execution service dry run on each replayed snapshot.
+
+    With no config the user's saved strategy config (or the strategy default) is used.
+    """
+    from ..services.strategy_execution_service import get_strategy_execution_service
+
+    service = get_strategy_execution_service()
+
+    def plan(market_snapshot: dict[str, Any]) -> dict[str, Any]:
+        dry_run = service.execute_strategy_dry_run(
+            user_id=user_id,
+            strategy_type=strategy_type,
+            config=config,
+            market_snapshot=market_snapshot,
+        )
+        return dry_run["results"]["trade_plan"]
+
+    return plan
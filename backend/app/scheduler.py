@@ -14,6 +14,7 @@ from pathlib import Path
 import httpx
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
 from apscheduler.triggers.cron import CronTrigger
+from apscheduler.triggers.interval import IntervalTrigger
 
 
 logger = logging.getLogger(__name__)
@@ -53,6 +54,8 @@ class TradingScheduler:
             self._restore_schedules()
             # Add daily equity tracking job
             self._add_equity_tracking_job()
+            # Add cache warming jobs
+            self._add_cache_warming_jobs()
 
     def shutdown(self):
         """Gracefully shutdown the scheduler"""
@@ -209,6 +212,46 @@ class TradingScheduler:
         except Exception as e:
             logger.error(f"❌ Failed to add equity tracking job: {e!s}")
 
+    def _add_cache_warming_jobs(self):
+        """Add cache refresh-ahead cycle and pre-open warm (9:28 AM ET)"""
+        from .core.config import settings
+
+        if not settings.CACHE_WARM_ENABLED:
+            logger.info("Cache warming disabled (CACHE_WARM_ENABLED=false)")
+            return
+
+        try:
+            from .services.cache_warmer import get_cache_warmer
+
+            warmer = get_cache_warmer()
+            self.scheduler.add_job(
+                warmer.run_cycle,
+                trigger=IntervalTrigger(seconds=settings.CACHE_WARM_INTERVAL),
+                id="cache_warming_cycle",
+                name="Cache Warming Cycle",
+                replace_existing=True,
+                misfire_grace_time=settings.CACHE_WARM_INTERVAL,
+            )
+
+            # Cron: 28 9 * * 1-5 (9:28 AM ET, Mon-Fri), ahead of the 9:30 open
+            self.scheduler.add_job(
+                warmer.warm_hot_keys,
+                trigger=CronTrigger(
+                    hour=9, minute=28, day_of_week="mon-fri", timezone="America/New_York"
+                ),
+                id="cache_warming_preopen",
+                name="Pre-open Cache Warm",
+                replace_existing=True,
+            )
+
+            logger.info(
+                f"✅ Cache warming jobs added (every {settings.CACHE_WARM_INTERVAL}s, "
+                "pre-open 9:28 AM ET Mon-Fri)"
+            )
+
+        except Exception as e:
+            logger.error(f"❌ Failed to add cache warming jobs: {e!s}")
+
     async def _track_equity_snapshot(self):
         """Record daily equity snapshot"""
         try:
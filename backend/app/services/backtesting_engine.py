@@ -439,3 +439,27 @@ class BacktestingEngine:
             end_date=end_date,
             symbol=symbol,
         )
+
+
+OHLCV_FIELDS = ("open", "high", "low", "close", "volume")
+
+
+def run_backtest_task(
+    symbol: str,
+    dates: list[str],
+    ohlcv: Any,
+    strategy: StrategyRules,
+    initial_capital: float = 10000.0,
+) -> BacktestResult:
+    """
+    Compute pool entry point for BacktestingEngine.execute_backtest
+
+    Bars arrive columnar - a list of dates plus an (n, 5) open/high/low/close/volume
+    array - so the price matrix can be passed to the worker through shared memory.
+    """
+    prices = [
+        {"date": date, **dict(zip(OHLCV_FIELDS, row, strict=True))}
+        for date, row in zip(dates, ohlcv.tolist(), strict=True)
+    ]
+    engine = BacktestingEngine(initial_capital=initial_capital)
+    return engine.execute_backtest(symbol=symbol, prices=prices, strategy=strategy)
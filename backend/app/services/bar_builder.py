@@ -0,0 +1,363 @@
+"""
+Intraday Bar Builder
+
+Tradier's history endpoint only serves daily/weekly/monthly bars, so intraday
+bars are built from the live stream instead:
+
+- TradierStreamService feeds every trade (price + size) and two-sided quote
+  (mid) to the builder, which keeps 1s/1min/5min OHLCV bars per symbol
+- Bars are aligned to UTC interval boundaries; trades drive OHLCV, and quote
+  mids only fill in bars that have no trades yet (e.g. thinly traded symbols)
+- Finished bars are kept in per-symbol ring buffers, and the 1min/5min bars are
+  appended to the local bar store (one CSV file per symbol, interval and day)
+- A bar finishes when a tick for a later bar arrives, or when the periodic
+  flush finds it ended more than ROLL_GRACE_SECONDS ago
+
+Usage:
+    from app.services.bar_builder import get_bar_builder
+
+    bars = get_bar_builder().get_bars("SPY", "1min", limit=100)
+"""
+
+import asyncio
+import logging
+from collections import deque
+from datetime import UTC, datetime, timedelta
+from pathlib import Path
+from typing import Any
+
+
+logger = logging.getLogger(__name__)
+
+# Bar interval name -> length in seconds
+INTERVALS = {"1s": 1, "1min": 60, "5min": 300}
+
+# Finished bars kept in memory per symbol and interval
+RING_CAPACITY = {"1s": 900, "1min": 1000, "5min": 500}
+
+# Intervals whose finished bars are written to the bar store
+PERSISTED_INTERVALS = ("1min", "5min")
+
+# How long after a bar's end the periodic flush waits for late ticks before finishing it
+ROLL_GRACE_SECONDS = 1.0
+
+BAR_FIELDS = ("open", "high", "low", "close", "volume")
+
+
+def _iso(epoch: float) -> str:
+    return datetime.fromtimestamp(epoch, UTC).isoformat()
+
+
+class Bar:
+    """One OHLCV bar, updated in place while it is open"""
+
+    __slots__ = ("close", "high", "low", "open", "start", "trades", "volume")
+
+    def __init__(self, start: int, price: float, volume: float, trades: int):
+        self.start = start
+        self.open = self.high = self.low = self.close = price
+        self.volume = volume
+        self.trades = trades
+
+    def update(self, price: float, volume: float = 0.0):
+        if price > self.high:
+            self.high = price
+        elif price < self.low:
+            self.low = price
+        self.close = price
+        self.volume += volume
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "timestamp": _iso(self.start),
+            "open": self.open,
+            "high": self.high,
+            "low": self.low,
+            "close": self.close,
+            "volume": int(self.volume),
+        }
+
+
+class _Series:
+    """Ring of finished bars plus the open bar for one symbol and interval"""
+
+    __slots__ = ("bars", "current", "seconds")
+
+    def __init__(self, seconds: int, capacity: int):
+        self.seconds = seconds
+        self.bars: deque[Bar] = deque(maxlen=capacity)
+        self.current: Bar | None = None
+
+
+class BarStore:
+    """Append-only local store of finished intraday bars"""
+
+    def __init__(self, root: str | Path):
+        """
+        Args:
+            root: Directory holding one sub-directory per symbol
+        """
+        self.root = Path(root)
+
+    def _path(self, symbol: str, interval: str, day: str) -> Path:
+        return self.root / symbol.upper() / interval / f"{day}.csv"
+
+    def append(self, symbol: str, interval: str, bars: list[Bar]):
+        """Append finished bars, grouped into one file per UTC day"""
+        by_day: dict[str, list[str]] = {}
+        for bar in bars:
+            day = datetime.fromtimestamp(bar.start, UTC).strftime("%Y-%m-%d")
+            by_day.setdefault(day, []).append(
+                f"{bar.start},{bar.open},{bar.high},{bar.low},{bar.close},{bar.volume}\n"
+            )
+
+        for day, lines in by_day.items():
+            path = self._path(symbol, interval, day)
+            path.parent.mkdir(parents=True, exist_ok=True)
+            with open(path, "a") as f:
+                f.writelines(lines)
+
+    @staticmethod
+    def _read(path: Path, start_ts: float, end_ts: float) -> dict[int, dict[str, Any]]:
+        bars: dict[int, dict[str, Any]] = {}
+        with open(path) as f:
+            for line in f:
+                fields = line.rstrip("\n").split(",")
+                try:
+                    bar_start = int(fields[0])
+                    values = [float(v) for v in fields[1:]]
+                    bar = dict(zip(BAR_FIELDS, values, strict=True))
+                except (ValueError, IndexError):
+                    logger.warning(f"Skipping malformed stored bar in {path}: {line!r}")
+                    continue
+                if start_ts <= bar_start <= end_ts:
+                    # A restarted process may re-append a bar; the last write wins
+                    bars[bar_start] = {"date": _iso(bar_start), **bar}
+        return bars
+
+    def _days(self, symbol: str, interval: str) -> list[Path]:
+        directory = self.root / symbol.upper() / interval
+        return sorted(directory.glob("*.csv")) if directory.is_dir() else []
+
+    def load(
+        self,
+        symbol: str,
+        interval: str,
+        start: datetime | None = None,
+        end: datetime | None = None,
+    ) -> list[dict[str, Any]]:
+        """
+        Read stored bars in time order
+
+        Args:
+            symbol: Stock symbol
+            interval: Bar interval ("1min", "5min")
+            start: First bar start to include (default: all stored days)
+            end: Last bar start to include (default: latest)
+
+        Returns:
+            List of bars with date, open, high, low, close, volume
+        """
+        start_ts = start.timestamp() if start is not None else float("-inf")
+        end_ts = end.timestamp() if end is not None else float("inf")
+        first_day = (start - timedelta(days=1)).strftime("%Y-%m-%d") if start else ""
+
+        bars: dict[int, dict[str, Any]] = {}
+        for path in self._days(symbol, interval):
+            if path.stem >= first_day:
+                bars.update(self._read(path, start_ts, end_ts))
+        return [bars[key] for key in sorted(bars)]
+
+    def load_recent(
+        self, symbol: str, interval: str, limit: int, before: int | None = None
+    ) -> list[dict[str, Any]]:
+        """
+        Latest stored bars, reading back one day file at a time
+
+        Args:
+            symbol: Stock symbol
+            interval: Bar interval ("1min", "5min")
+            limit: Maximum number of bars
+            before: Only bars starting before this epoch second (default: all)
+
+        Returns:
+            List of bars with date, open, high, low, close, volume, oldest first
+        """
+        end_ts = before - 1 if before is not None else float("inf")
+        bars: dict[int, dict[str, Any]] = {}
+        for path in reversed(self._days(symbol, interval)):
+            bars.update(self._read(path, float("-inf"), end_ts))
+            if len(bars) >= limit:
+                break
+        return [bars[key] for key in sorted(bars)][-limit:]
+
+
+class BarBuilder:
+    """Builds rolling intraday OHLCV bars per symbol from streamed ticks"""
+
+    def __init__(self, store: BarStore | None = None):
+        """
+        Args:
+            store: Bar store for finished 1min/5min bars (None = memory only)
+        """
+        self.store = store
+        self._series: dict[str, dict[str, _Series]] = {}
+        self._pending: list[tuple[str, str, Bar]] = []
+        self.bars_finished = 0
+        self.bars_persisted = 0
+        self.late_ticks = 0
+
+    def _series_for(self, symbol: str) -> dict[str, _Series]:
+        series = self._series.get(symbol)
+        if series is None:
+            series = self._series[symbol] = {
+                name: _Series(seconds, RING_CAPACITY[name]) for name, seconds in INTERVALS.items()
+            }
+        return series
+
+    def _finish(self, symbol: str, interval: str, series: _Series):
+        bar = series.current
+        series.bars.append(bar)
+        series.current = None
+        self.bars_finished += 1
+        if self.store is not None and interval in PERSISTED_INTERVALS:
+            self._pending.append((symbol, interval, bar))
+
+    def _apply(self, symbol: str, price: float, volume: float, ts: float, is_trade: bool):
+        for interval, series in self._series_for(symbol).items():
+            second = int(ts)
+            start = second - second % series.seconds
+            bar = series.current
+
+            if bar is None or start > bar.start:
+                if bar is not None:
+                    self._finish(symbol, interval, series)
+                series.current = Bar(start, price, volume, 1 if is_trade else 0)
+            elif start < bar.start:
+                self.late_ticks += 1
+            elif is_trade:
+                if bar.trades == 0:
+                    # First trade replaces the quote-filled values
+                    bar.open = bar.high = bar.low = bar.close = price
+                bar.update(price, volume)
+                bar.trades += 1
+            elif bar.trades == 0:
+                bar.update(price)
+
+    def on_trade(self, symbol: str, price: float, size: float, ts: float):
+        """Add a trade (price, size) at epoch seconds ts"""
+        self._apply(symbol, price, size, ts, True)
+
+    def on_quote(self, symbol: str, mid: float, ts: float):
+        """Add a two-sided quote mid at epoch seconds ts"""
+        self._apply(symbol, mid, 0.0, ts, False)
+
+    def roll(self, now: float) -> int:
+        """
+        Finish open bars that ended more than ROLL_GRACE_SECONDS before now
+
+        Returns:
+            Number of bars finished
+        """
+        finished = 0
+        for symbol, intervals in self._series.items():
+            for interval, series in intervals.items():
+                bar = series.current
+                if bar is not None and bar.start + series.seconds + ROLL_GRACE_SECONDS <= now:
+                    self._finish(symbol, interval, series)
+                    finished += 1
+        return finished
+
+    def _persist(self, pending: list[tuple[str, str, Bar]]):
+        grouped: dict[tuple[str, str], list[Bar]] = {}
+        for symbol, interval, bar in pending:
+            grouped.setdefault((symbol, interval), []).append(bar)
+        for (symbol, interval), bars in grouped.items():
+            self.store.append(symbol, interval, bars)
+
+    async def flush(self, now: float) -> int:
+        """
+        Finish due bars and write finished bars to the bar store off the event loop
+
+        Returns:
+            Number of bars persisted
+        """
+        self.roll(now)
+        if not self._pending:
+            return 0
+
+        pending, self._pending = self._pending, []
+        try:
+            await asyncio.to_thread(self._persist, pending)
+        except OSError as e:
+            logger.error(f"❌ Failed to persist {len(pending)} intraday bars: {e}")
+            return 0
+        self.bars_persisted += len(pending)
+        return len(pending)
+
+    def get_bars(
+        self, symbol: str, interval: str, limit: int = 100, include_partial: bool = False
+    ) -> list[dict[str, Any]]:
+        """
+        Latest bars for a symbol, oldest first
+
+        Bars not in the ring buffer anymore are read from the bar store.
+
+        Args:
+            symbol: Stock symbol
+            interval: "1s", "1min" or "5min"
+            limit: Maximum number of bars
+            include_partial: Append the still-open bar
+
+        Returns:
+            List of bars with timestamp, open, high, low, close, volume
+        """
+        series = self._series.get(symbol.upper(), {}).get(interval)
+        bars = [bar.to_dict() for bar in series.bars] if series is not None else []
+        if include_partial and series is not None and series.current is not None:
+            bars.append(series.current.to_dict())
+        bars = bars[-limit:]
+
+        if len(bars) < limit and self.store is not None and interval in PERSISTED_INTERVALS:
+            before = series.bars[0].start if series is not None and series.bars else None
+            stored = self.store.load_recent(symbol, interval, limit - len(bars), before=before)
+            older = [
+                {"timestamp": bar.pop("date"), **bar, "volume": int(bar["volume"])}
+                for bar in stored
+            ]
+            bars = older + bars
+
+        return bars
+
+    def stats(self) -> dict[str, Any]:
+        """Tracked symbols and bar counters"""
+        return {
+            "symbols": len(self._series),
+            "bars_finished": self.bars_finished,
+            "bars_persisted": self.bars_persisted,
+            "pending": len(self._pending),
+            "late_ticks": self.late_ticks,
+        }
+
+
+# Singleton instances
+_bar_store = None
+_bar_builder = None
+
+
+def get_bar_store() -> BarStore:
+    """Get or create bar store singleton"""
+    global _bar_store
+    if _bar_store is None:
+        from ..core.config import settings
+
+        _bar_store = BarStore(settings.BAR_STORE_DIR)
+    return _bar_store
+
+
+def get_bar_builder() -> BarBuilder:
+    """Get or create bar builder singleton"""
+    global _bar_builder
+    if _bar_builder is None:
+        _bar_builder = BarBuilder(get_bar_store())
+    return _bar_builder
@@ -11,6 +11,7 @@ from typing import Any
 import redis
 
 from ..core.config import settings
+from .cache_warmer import record_access
 from .health_monitor import health_monitor
 
 
@@ -63,6 +64,7 @@ class CacheService:
         if not self.available or not self.client:
             return None
 
+        record_access(key)
         try:
             value = self.client.get(key)
             if value:
@@ -97,6 +99,30 @@ class CacheService:
             print(f"[WARNING] Cache SET error for key '{key}': {e}", flush=True)
             return False
 
+    def set_many(self, items: dict[str, Any], ttl: int = 60) -> bool:
+        """
+        Set several values with one pipelined round trip
+
+        Args:
+            items: Mapping of cache key to value (values are JSON serialized)
+            ttl: Time to live in seconds (default: 60)
+
+        Returns:
+            True if successful, False otherwise
+        """
+        if not self.available or not self.client or not items:
+            return False
+
+        try:
+            pipe = self.client.pipeline(transaction=False)
+            for key, value in items.items():
+                pipe.setex(key, ttl, json.dumps(value))
+            pipe.execute()
+            return True
+        except Exception as e:
+            print(f"[WARNING] Cache SET_MANY error ({len(items)} keys): {e}", flush=True)
+            return False
+
     def delete(self, key: str) -> bool:
         """
         Delete value from cache
@@ -137,6 +163,31 @@ class CacheService:
             print(f"[WARNING] Cache TTL error for key '{key}': {e}", flush=True)
             return None
 
+    def ttl_many(self, keys: list[str]) -> dict[str, int | None]:
+        """
+        Get remaining TTLs for several keys with one pipelined round trip
+
+        Args:
+            keys: Cache keys
+
+        Returns:
+            Mapping of key to remaining TTL in seconds (None if missing or unavailable)
+        """
+        if not self.available or not self.client or not keys:
+            return dict.fromkeys(keys)
+
+        try:
+            pipe = self.client.pipeline(transaction=False)
+            for key in keys:
+                pipe.ttl(key)
+            return {
+                key: ttl_value if ttl_value >= 0 else None
+                for key, ttl_value in zip(keys, pipe.execute())
+            }
+        except Exception as e:
+            print(f"[WARNING] Cache TTL_MANY error ({len(keys)} keys): {e}", flush=True)
+            return dict.fromkeys(keys)
+
     def clear_pattern(self, pattern: str) -> int:
         """
         Clear all keys matching pattern
@@ -0,0 +1,340 @@
+"""
+Cache Warming Engine Driven by Observed Access Patterns
+
+Popular keys used to be warmed once at stream start from a hard-coded symbol
+list. The warming engine learns which keys are hot instead and keeps them warm:
+
+- Every CacheService.get is recorded in a count-min sketch, and the most
+  frequently read keys of each registered key family (quotes, option chains,
+  bars, sectors) are tracked as warming candidates; counts are halved every
+  DECAY_SECONDS so the ranking follows the current access pattern
+- On each scheduler tick, hot keys whose TTL is about to run out are refreshed
+  ahead of expiry, batched per family (one Tradier call covers all hot quotes)
+- Refreshes draw from a token bucket of CACHE_WARM_BUDGET_PER_MINUTE Tradier
+  calls, so warming can never crowd out user requests
+- A pre-open cycle (09:28 ET, Mon-Fri) warms the top keys and keeps them warm
+  through the open, so the first dashboard loads at 09:30 are cache hits
+
+Key families are registered by the routers that own the key format, together
+with the function that recomputes their values.
+
+Usage:
+    from app.services.cache_warmer import CacheKeyFamily, get_cache_warmer
+
+    get_cache_warmer().register(
+        CacheKeyFamily("quote", r"quote:(?P<symbol>[A-Z0-9.]+)", ttl=5, refresh=fetch_quotes,
+                       batch_size=100)
+    )
+"""
+
+import asyncio
+import hashlib
+import logging
+import re
+import threading
+import time
+from collections.abc import Callable
+from dataclasses import dataclass
+from typing import Any
+
+from ..core.config import settings
+
+
+logger = logging.getLogger(__name__)
+
+# Count-min sketch dimensions (error ~ total/width, with probability 1 - 2^-depth)
+SKETCH_WIDTH = 2048
+SKETCH_DEPTH = 4
+
+# Warming candidates tracked (the heaviest hitters seen by the sketch)
+MAX_CANDIDATES = 256
+
+# Estimated reads per decay period for a key to count as hot
+MIN_HITS = 3
+
+# Counts are halved this often
+DECAY_SECONDS = 600
+
+# Keys are refreshed once less than this fraction of their TTL is left
+REFRESH_AHEAD_FRACTION = 0.2
+
+# Keys warmed by the pre-open cycle, and how long they are kept warm afterwards
+PREOPEN_KEYS = 50
+PREOPEN_PIN_SECONDS = 600
+
+# Warmed on a cold start, before any access has been observed
+SEED_KEYS = ("quote:SPY", "quote:QQQ", "quote:IWM", "quote:DIA", "market:sectors")
+
+
+@dataclass
+class CacheKeyFamily:
+    """A cache key format the engine can warm, and how to recompute its values"""
+
+    name: str
+    pattern: str
+    ttl: int
+    # Called off the event loop with the named groups of each due key;
+    # returns the fresh values keyed by cache key (missing keys are skipped)
+    refresh: Callable[[list[dict[str, str]]], dict[str, Any]]
+    # Keys recomputed per upstream call
+    batch_size: int = 1
+    # Keys kept fresh by another writer (e.g. the live stream) are not refreshed
+    is_live: Callable[[dict[str, str]], bool] | None = None
+
+    def __post_init__(self):
+        self.regex = re.compile(self.pattern)
+        self.prefix = self.pattern.split(":", 1)[0]
+
+
+class CountMinSketch:
+    """Approximate per-key counts in fixed memory"""
+
+    def __init__(self, width: int = SKETCH_WIDTH, depth: int = SKETCH_DEPTH):
+        self.width = width
+        self.depth = depth
+        self.rows = [[0.0] * width for _ in range(depth)]
+
+    def _indexes(self, key: str) -> list[int]:
+        digest = hashlib.blake2b(key.encode(), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        return [(h1 + i * h2) % self.width for i in range(self.depth)]
+
+    def add(self, key: str, count: float = 1.0) -> float:
+        """Add count to key and return its new estimate"""
+        estimate = float("inf")
+        for row, index in zip(self.rows, self._indexes(key), strict=True):
+            row[index] += count
+            estimate = min(estimate, row[index])
+        return estimate
+
+    def estimate(self, key: str) -> float:
+        """Estimated count for key (never below the true count)"""
+        return min(row[index] for row, index in zip(self.rows, self._indexes(key), strict=True))
+
+    def decay(self, factor: float = 0.5):
+        """Scale all counts down so old accesses weigh less"""
+        self.rows = [[value * factor for value in row] for row in self.rows]
+
+
+class CacheWarmer:
+    """Refreshes hot cache keys ahead of expiry within a Tradier call budget"""
+
+    def __init__(
+        self,
+        budget_per_minute: int = 30,
+        interval: float = 5,
+        sketch: CountMinSketch | None = None,
+    ):
+        """
+        Args:
+            budget_per_minute: Upstream calls warming may spend per minute
+            interval: Seconds between refresh cycles
+            sketch: Access counter (default: a new count-min sketch)
+        """
+        self.budget_per_minute = budget_per_minute
+        self.interval = interval
+        self.sketch = sketch or CountMinSketch()
+        self.families: dict[str, list[CacheKeyFamily]] = {}
+        self._candidates: dict[str, float] = {}
+        self._floor = 0.0
+        # Cache reads are recorded from route threads as well as the event loop
+        self._lock = threading.Lock()
+        self._pinned: dict[str, float] = {}
+        self._tokens = float(budget_per_minute)
+        self._refilled_at = time.monotonic()
+        self._decayed_at = time.monotonic()
+        self.cycles = 0
+        self.warmed = 0
+        self.skipped_budget = 0
+        self.errors = 0
+
+    def register(self, family: CacheKeyFamily):
+        """Register a key family (replacing one with the same name)"""
+        families = self.families.setdefault(family.prefix, [])
+        families[:] = [f for f in families if f.name != family.name] + [family]
+
+    def _match(self, key: str) -> tuple[CacheKeyFamily, dict[str, str]] | None:
+        for family in self.families.get(key.split(":", 1)[0], ()):
+            match = family.regex.fullmatch(key)
+            if match:
+                return family, match.groupdict()
+        return None
+
+    def record(self, key: str):
+        """Count a read of key"""
+        with self._lock:
+            estimate = self.sketch.add(key)
+            if key in self._candidates:
+                self._candidates[key] = estimate
+                return
+            if len(self._candidates) >= MAX_CANDIDATES and estimate <= self._floor:
+                return
+            if self._match(key) is None:
+                return
+
+            if len(self._candidates) >= MAX_CANDIDATES:
+                coldest = min(self._candidates, key=self._candidates.get)
+                self._floor = self._candidates[coldest]
+                if estimate <= self._floor:
+                    return
+                del self._candidates[coldest]
+            self._candidates[key] = estimate
+
+    def hot_keys(self, limit: int | None = None, min_hits: float = MIN_HITS) -> list[str]:
+        """Candidates with at least min_hits estimated reads, hottest first"""
+        with self._lock:
+            ranked = sorted(self._candidates.items(), key=lambda item: item[1], reverse=True)
+        return [key for key, count in ranked if count >= min_hits][:limit]
+
+    def _decay(self, now: float):
+        if now - self._decayed_at < DECAY_SECONDS:
+            return
+        self._decayed_at = now
+        with self._lock:
+            self.sketch.decay()
+            self._candidates = {key: count / 2 for key, count in self._candidates.items()}
+            self._floor /= 2
+
+    def _take_budget(self) -> bool:
+        now = time.monotonic()
+        self._tokens = min(
+            float(self.budget_per_minute),
+            self._tokens + (now - self._refilled_at) * self.budget_per_minute / 60,
+        )
+        self._refilled_at = now
+        if self._tokens < 1:
+            return False
+        self._tokens -= 1
+        return True
+
+    def _due(self, cache, keys: list[str]) -> list[str]:
+        """Keys that are missing or have less than the refresh-ahead window left"""
+        remaining = cache.ttl_many(keys)
+        due = []
+        for key in keys:
+            family = self._match(key)[0]
+            ahead = max(family.ttl * REFRESH_AHEAD_FRACTION, self.interval)
+            if remaining.get(key) is None or remaining[key] <= ahead:
+                due.append(key)
+        return due
+
+    async def _refresh(self, keys: list[str]) -> int:
+        """Recompute keys per family in batches, stopping when the budget runs out"""
+        from .cache import get_cache
+
+        cache = get_cache()
+        grouped: dict[str, tuple[CacheKeyFamily, list[tuple[str, dict[str, str]]]]] = {}
+        for key in keys:
+            family, params = self._match(key)
+            if family.is_live is not None and family.is_live(params):
+                continue
+            grouped.setdefault(family.name, (family, []))[1].append((key, params))
+
+        total = sum(len(items) for _, items in grouped.values())
+        attempted = warmed = 0
+        for family, items in grouped.values():
+            for start in range(0, len(items), family.batch_size):
+                batch = items[start : start + family.batch_size]
+                if not self._take_budget():
+                    self.skipped_budget += total - attempted
+                    logger.warning(
+                        f"⚠️ Cache warming budget exhausted, {total - attempted} keys skipped"
+                    )
+                    self.warmed += warmed
+                    return warmed
+                attempted += len(batch)
+                try:
+                    values = await asyncio.to_thread(family.refresh, [p for _, p in batch])
+                except Exception as e:
+                    self.errors += 1
+                    logger.warning(f"⚠️ Cache warming failed for {family.name}: {e}")
+                    continue
+                if values:
+                    await asyncio.to_thread(cache.set_many, values, family.ttl)
+                    warmed += len(values)
+
+        self.warmed += warmed
+        return warmed
+
+    async def run_cycle(self) -> int:
+        """
+        Refresh hot keys that are about to expire
+
+        Returns:
+            Number of keys written
+        """
+        from .cache import get_cache
+
+        cache = get_cache()
+        if not cache.available:
+            return 0
+
+        now = time.monotonic()
+        self._decay(now)
+        self._pinned = {key: until for key, until in self._pinned.items() if until > now}
+        keys = list(dict.fromkeys(self.hot_keys() + list(self._pinned)))
+        keys = [key for key in keys if self._match(key) is not None]
+        if not keys:
+            return 0
+
+        self.cycles += 1
+        due = await asyncio.to_thread(self._due, cache, keys)
+        return await self._refresh(due) if due else 0
+
+    async def warm_hot_keys(self, limit: int = PREOPEN_KEYS) -> int:
+        """
+        Warm the top keys now (regardless of TTL) and keep them warm for a while
+
+        Used by the pre-open cycle and at stream start. Falls back to SEED_KEYS
+        when no accesses have been observed yet.
+
+        Returns:
+            Number of keys written
+        """
+        keys = self.hot_keys(limit, min_hits=0) or [
+            key for key in SEED_KEYS if self._match(key) is not None
+        ]
+        if not keys:
+            return 0
+
+        until = time.monotonic() + PREOPEN_PIN_SECONDS
+        self._pinned.update(dict.fromkeys(keys, until))
+        warmed = await self._refresh(keys)
+        logger.info(f"🔥 Warmed {warmed}/{len(keys)} hot cache keys")
+        return warmed
+
+    def stats(self) -> dict[str, Any]:
+        """Candidate, budget and outcome counters"""
+        return {
+            "families": sorted(f.name for fs in self.families.values() for f in fs),
+            "candidates": len(self._candidates),
+            "hot": len(self.hot_keys()),
+            "pinned": len(self._pinned),
+            "budget_per_minute": self.budget_per_minute,
+            "budget_left": int(self._tokens),
+            "cycles": self.cycles,
+            "warmed": self.warmed,
+            "skipped_budget": self.skipped_budget,
+            "errors": self.errors,
+        }
+
+
+# Singleton instance
+_cache_warmer = None
+
+
+def get_cache_warmer() -> CacheWarmer:
+    """Get or create cache warmer singleton"""
+    global _cache_warmer
+    if _cache_warmer is None:
+        _cache_warmer = CacheWarmer(
+            budget_per_minute=settings.CACHE_WARM_BUDGET_PER_MINUTE,
+            interval=settings.CACHE_WARM_INTERVAL,
+        )
+    return _cache_warmer
+
+
+def record_access(key: str):
+    """Count a cache read towards the warming engine's access statistics"""
+    get_cache_warmer().record(key)
@@ -5,16 +5,60 @@ DEX Aggregator Service
 Aggregates swap quotes from multiple DEX protocols to find best prices.
 Supports: 1inch API, Uniswap V3 direct, PancakeSwap, SushiSwap
 
+All configured sources are raced concurrently under a deadline and the best
+quote is picked by output net of gas. Quotes are cached for a few seconds per
+(chain, pair, amount bucket), and identical in-flight requests share a single
+upstream round-trip.
+
 Zero-cost architecture using free-tier APIs.
 """
 
+import asyncio
 import logging
+import math
+import time
+from collections.abc import Awaitable, Callable
 
-import requests
+import httpx
 
 
 logger = logging.getLogger(__name__)
 
+# Quote cache / racing configuration
+QUOTE_CACHE_TTL = 3.0  # seconds
+QUOTE_CACHE_MAX_ENTRIES = 1024  # prune expired entries beyond this size
+QUOTE_DEADLINE = 2.5  # seconds to wait for all sources
+AMOUNT_BUCKET_DIGITS = 4  # significant digits shared by one cache entry
+
+# Default gas prices (wei) used to price gas in output-token terms
+DEFAULT_GAS_PRICE_WEI = {
+    1: 20 * 10**9,
+    137: 50 * 10**9,
+    56: 3 * 10**9,
+    8453: 5 * 10**7,
+    5: 2 * 10**9,
+    80001: 2 * 10**9,
+}
+
+# Native token placeholder and wrapped native tokens (lowercase)
+NATIVE_TOKEN = "0xeeeeeeeeeeeeeeeeeeeeeeeeeeeeeeeeeeeeeeee"
+WRAPPED_NATIVE_TOKENS = {
+    1: "0xc02aaa39b223fe8d0a0e5c4f27ead9083c756cc2",  # WETH
+    137: "0x0d500b1d8e8ef31e21c99d1db9a6444d3adf1270",  # WMATIC
+    56: "0xbb4cdb9cbd36b01bd1cbaebf2de08d9173bc095c",  # WBNB
+    8453: "0x4200000000000000000000000000000000000006",  # WETH (Base)
+}
+
+QuoteSource = Callable[[str, str, int, int, float], Awaitable["DEXQuote | None"]]
+
+
+def amount_bucket(amount_in: int, digits: int = AMOUNT_BUCKET_DIGITS) -> int:
+    """Round an amount to a few significant digits so nearby sizes share a cache entry"""
+    if amount_in <= 0:
+        return amount_in
+    scale = 10 ** max(0, int(math.log10(amount_in)) + 1 - digits)
+    return round(amount_in / scale) * scale
+
 
 class DEXQuote:
     """Standardized DEX quote response"""
@@ -39,6 +83,20 @@ class DEXQuote:
         self.price_impact = price_impact
         self.route = route
 
+    def scaled(self, amount_in: int) -> "DEXQuote":
+        """Linearly rescale a cached quote to a nearby input amount"""
+        amount_out = int(self.amount_out) * amount_in // max(int(self.amount_in), 1)
+        return DEXQuote(
+            dex_name=self.dex_name,
+            token_in=self.token_in,
+            token_out=self.token_out,
+            amount_in=str(amount_in),
+            amount_out=str(amount_out),
+            gas_estimate=self.gas_estimate,
+            price_impact=self.price_impact,
+            route=self.route,
+        )
+
     def to_dict(self) -> dict:
         return {
             "dex": self.dex_name,
@@ -56,8 +114,8 @@ class DEXAggregator:
     """
     Multi-DEX aggregator for finding best swap prices
 
-    Uses 1inch API (free tier) as primary source,
-    with fallback to direct Uniswap V3 quoter.
+    Races 1inch API (free tier) and the direct Uniswap V3 quoter
+    concurrently, with a short-TTL quote cache and request coalescing.
     """
 
     # Chain ID mappings
@@ -73,20 +131,44 @@ class DEXAggregator:
     # 1inch API endpoint (free tier, no API key required for quotes)
     ONEINCH_API_BASE = "https://api.1inch.dev"
 
-    def __init__(self, oneinch_api_key: str | None = None):
+    def __init__(
+        self,
+        oneinch_api_key: str | None = None,
+        oneinch_api_base: str | None = None,
+        sources: dict[str, QuoteSource] | None = None,
+        deadline: float = QUOTE_DEADLINE,
+        cache_ttl: float = QUOTE_CACHE_TTL,
+    ):
         """
         Initialize DEX aggregator
 
         Args:
             oneinch_api_key: Optional API key for 1inch (higher rate limits)
+            oneinch_api_base: Override 1inch base URL (e.g. a local stub server)
+            sources: Quote sources to race (defaults to 1inch + Uniswap V3)
+            deadline: Seconds to wait for sources before picking the best quote
+            cache_ttl: Seconds a best quote is reused for the same bucket
         """
         self.oneinch_api_key = oneinch_api_key
-        self.session = requests.Session()
+        self.oneinch_api_base = oneinch_api_base or self.ONEINCH_API_BASE
+        self.deadline = deadline
+        self.cache_ttl = cache_ttl
 
-        if oneinch_api_key:
-            self.session.headers.update({"Authorization": f"Bearer {oneinch_api_key}"})
+        headers = {"Authorization": f"Bearer {oneinch_api_key}"} if oneinch_api_key else {}
+        self.client = httpx.AsyncClient(headers=headers, timeout=10)
+
+        self.sources: dict[str, QuoteSource] = sources or {
+            "1inch": self.get_quote_1inch,
+            "uniswap_v3": self.get_quote_uniswap_v3,
+        }
+        self._quote_cache: dict[tuple, tuple[float, DEXQuote]] = {}
+        self._inflight: dict[tuple, asyncio.Future] = {}
 
-    def get_quote_1inch(
+    async def aclose(self):
+        """Close the shared HTTP client"""
+        await self.client.aclose()
+
+    async def get_quote_1inch(
         self,
         token_in: str,
         token_out: str,
@@ -114,7 +196,7 @@ class DEXAggregator:
             return None
 
         try:
-            url = f"{self.ONEINCH_API_BASE}/swap/v5.2/{chain_id}/quote"
+            url = f"{self.oneinch_api_base}/swap/v5.2/{chain_id}/quote"
 
             params = {
                 "src": token_in,
@@ -123,7 +205,7 @@ class DEXAggregator:
                 "includeGas": "true",
             }
 
-            response = self.session.get(url, params=params, timeout=10)
+            response = await self.client.get(url, params=params)
 
             if response.status_code != 200:
                 logger.warning(
@@ -151,12 +233,13 @@ class DEXAggregator:
             logger.error(f"1inch quote failed: {e}")
             return None
 
-    def get_quote_uniswap_v3(
+    async def get_quote_uniswap_v3(
         self,
         token_in: str,
         token_out: str,
         amount_in: int,
         chain_id: int,
+        slippage: float = 1.0,
     ) -> DEXQuote | None:
         """
         Get quote from Uniswap V3 quoter contract (direct on-chain call)
@@ -193,45 +276,110 @@ class DEXAggregator:
             logger.error(f"Uniswap V3 quote failed: {e}")
             return None
 
-    def get_best_quote(
+    def net_amount_out(self, quote: DEXQuote, chain_id: int, gas_price_wei: int) -> int:
+        """
+        Output amount minus the gas cost expressed in output-token units
+
+        Gas can only be priced in the output token when one side of the swap is
+        the native (or wrapped native) token; otherwise the raw output is used
+        and ties are broken on gas estimate.
+        """
+        amount_out = int(quote.amount_out)
+        native = {NATIVE_TOKEN, WRAPPED_NATIVE_TOKENS.get(chain_id)}
+        gas_cost_wei = quote.gas_estimate * gas_price_wei
+
+        if quote.token_out.lower() in native:
+            return amount_out - gas_cost_wei
+        if quote.token_in.lower() in native and int(quote.amount_in) > 0:
+            return amount_out - gas_cost_wei * amount_out // int(quote.amount_in)
+        return amount_out
+
+    async def get_best_quote(
         self,
         token_in: str,
         token_out: str,
         amount_in: int,
         chain_id: int,
         slippage: float = 1.0,
+        gas_price_wei: int | None = None,
     ) -> DEXQuote | None:
         """
         Get best quote across all DEX aggregators
 
-        Tries:
-        1. 1inch (aggregates 50+ DEXes)
-        2. Uniswap V3 direct (fallback)
+        Serves from the short-TTL cache when possible, and joins an identical
+        in-flight request instead of issuing a new one.
 
-        Returns best quote by output amount.
+        Returns best quote by output amount net of gas.
         """
-        quotes = []
+        # Slippage and gas price change the quotes and the net-of-gas winner
+        gas_price_wei = gas_price_wei or DEFAULT_GAS_PRICE_WEI.get(chain_id, 0)
+        bucket = amount_bucket(amount_in)
+        key = (chain_id, token_in.lower(), token_out.lower(), bucket, slippage, gas_price_wei)
+
+        cached = self._quote_cache.get(key)
+        if cached and cached[0] > time.monotonic():
+            return cached[1].scaled(amount_in)
+
+        inflight = self._inflight.get(key)
+        if inflight is None:
+            inflight = asyncio.ensure_future(
+                self._race_sources(
+                    token_in, token_out, amount_in, chain_id, slippage, gas_price_wei
+                )
+            )
+            self._inflight[key] = inflight
+            inflight.add_done_callback(lambda _f: self._inflight.pop(key, None))
 
-        # Try 1inch first (best aggregation)
-        oneinch_quote = self.get_quote_1inch(
-            token_in, token_out, amount_in, chain_id, slippage
-        )
-        if oneinch_quote:
-            quotes.append(oneinch_quote)
+        best_quote = await asyncio.shield(inflight)
+        if best_quote is None:
+            return None
 
-        # Try Uniswap V3 as fallback
-        uniswap_quote = self.get_quote_uniswap_v3(
-            token_in, token_out, amount_in, chain_id
-        )
-        if uniswap_quote:
-            quotes.append(uniswap_quote)
+        now = time.monotonic()
+        if len(self._quote_cache) >= QUOTE_CACHE_MAX_ENTRIES:
+            self._quote_cache = {k: v for k, v in self._quote_cache.items() if v[0] > now}
+        self._quote_cache[key] = (now + self.cache_ttl, best_quote)
+        return best_quote.scaled(amount_in)
+
+    async def _race_sources(
+        self,
+        token_in: str,
+        token_out: str,
+        amount_in: int,
+        chain_id: int,
+        slippage: float,
+        gas_price_wei: int | None,
+    ) -> DEXQuote | None:
+        """Query all sources concurrently and pick the best quote within the deadline"""
+        tasks = {
+            asyncio.ensure_future(source(token_in, token_out, amount_in, chain_id, slippage)): name
+            for name, source in self.sources.items()
+        }
+        done, pending = await asyncio.wait(tasks, timeout=self.deadline)
+
+        for task in pending:
+            logger.warning(f"DEX source {tasks[task]} missed the {self.deadline}s deadline")
+            task.cancel()
+
+        quotes = []
+        for task in done:
+            try:
+                quote = task.result()
+            except Exception as e:
+                logger.error(f"DEX source {tasks[task]} failed: {e}")
+                continue
+            if quote:
+                quotes.append(quote)
 
         if not quotes:
             logger.warning("No quotes available from any DEX")
             return None
 
-        # Return quote with highest output amount
-        best_quote = max(quotes, key=lambda q: int(q.amount_out))
+        # Pick the highest output net of gas, then the cheapest gas
+        gas_price = gas_price_wei or DEFAULT_GAS_PRICE_WEI.get(chain_id, 0)
+        best_quote = max(
+            quotes,
+            key=lambda q: (self.net_amount_out(q, chain_id, gas_price), -q.gas_estimate),
+        )
         logger.info(
             f"Best quote: {best_quote.dex_name} ({best_quote.amount_out} {token_out})"
         )
@@ -2,14 +2,27 @@
 Equity Curve Tracking Service
 
 Tracks daily portfolio equity for historical performance analysis.
-Stores equity snapshots in JSON files for P&L Dashboard.
+Stores equity snapshots in an append-only, fixed-width binary time series
+for the P&L Dashboard:
+
+- Appends write a single 40-byte record with O_APPEND (O(1), no rewrite,
+  safe for concurrent writers since each record is one write() call)
+- Range reads memory-map the file and binary-search the timestamp column
+  (O(log n) to locate the window, only the touched pages are read)
+- Metrics are computed with vectorized NumPy returns/drawdown math
+
+The legacy ``equity_history.json`` file is imported once on first use.
 """
 
 import json
 import logging
+import os
+import threading
 from datetime import UTC, datetime
 from pathlib import Path
 
+import numpy as np
+
 from ..services.tradier_client import get_tradier_client
 
 
@@ -19,14 +32,48 @@ logger = logging.getLogger(__name__)
 EQUITY_DATA_DIR = Path("data/equity")
 EQUITY_DATA_DIR.mkdir(parents=True, exist_ok=True)
 
+# Legacy JSON history (read-only, migrated into the series file)
 EQUITY_FILE = EQUITY_DATA_DIR / "equity_history.json"
 
+# Append-only time series (one fixed-width record per snapshot)
+EQUITY_SERIES_FILE = EQUITY_DATA_DIR / "equity_history.bin"
+
+# Record layout: epoch seconds (UTC), equity, cash, positions value, position count
+SNAPSHOT_DTYPE = np.dtype(
+    [
+        ("timestamp", "<f8"),
+        ("equity", "<f8"),
+        ("cash", "<f8"),
+        ("positions_value", "<f8"),
+        ("num_positions", "<i8"),
+    ]
+)
+
+_EMPTY_METRICS = {
+    "total_return": 0,
+    "max_drawdown": 0,
+    "sharpe_ratio": 0,
+    "win_days": 0,
+    "loss_days": 0,
+}
+
+
+def _parse_timestamp(value: str) -> float:
+    """Parse an ISO timestamp to epoch seconds (naive values are treated as UTC)"""
+    parsed = datetime.fromisoformat(value)
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=UTC)
+    return parsed.timestamp()
+
 
 class EquityTracker:
     """Tracks daily equity snapshots for performance analysis"""
 
-    def __init__(self):
-        self.data_file = EQUITY_FILE
+    def __init__(self, data_file: Path = EQUITY_SERIES_FILE, legacy_file: Path = EQUITY_FILE):
+        self.data_file = data_file
+        self.legacy_file = legacy_file
+        self._write_lock = threading.Lock()
+        self._migrate_legacy_history()
 
     def record_snapshot(self) -> dict:
         """
@@ -61,12 +108,8 @@ class EquityTracker:
                 "num_positions": num_positions,
             }
 
-            # Append to history
-            history = self.load_history()
-            history.append(snapshot)
-
-            # Save updated history
-            self.save_history(history)
+            # Append to history (single fixed-width record, no rewrite)
+            self.append_snapshots([snapshot])
 
             logger.info(f"✅ Recorded equity snapshot: ${equity:.2f}")
             return snapshot
@@ -75,26 +118,95 @@ class EquityTracker:
             logger.error(f"❌ Failed to record equity snapshot: {e!s}")
             raise
 
-    def load_history(self) -> list[dict]:
-        """Load equity history from file"""
+    def append_snapshots(self, snapshots: list[dict]):
+        """
+        Append snapshots to the time series file
+
+        Snapshots must be supplied in timestamp order and must not predate the
+        last stored snapshot, since range reads binary-search the timestamp column.
+        """
+        if not snapshots:
+            return
+
+        records = np.array(
+            [
+                (
+                    _parse_timestamp(s["timestamp"]),
+                    float(s.get("equity", 0)),
+                    float(s.get("cash", 0)),
+                    float(s.get("positions_value", 0)),
+                    int(s.get("num_positions", 0)),
+                )
+                for s in snapshots
+            ],
+            dtype=SNAPSHOT_DTYPE,
+        )
+
+        flags = os.O_WRONLY | os.O_CREAT | os.O_APPEND | getattr(os, "O_BINARY", 0)
+        with self._write_lock:
+            fd = os.open(self.data_file, flags, 0o644)
+            try:
+                os.write(fd, records.tobytes())
+            finally:
+                os.close(fd)
+
+    def _load_series(self) -> np.ndarray:
+        """Memory-map the time series file as a structured array"""
         try:
-            if self.data_file.exists():
-                with open(self.data_file) as f:
-                    return json.load(f)
-            return []
+            size = self.data_file.stat().st_size
+        except FileNotFoundError:
+            return np.empty(0, dtype=SNAPSHOT_DTYPE)
+
+        # Ignore a trailing partial record (e.g. a write interrupted mid-way)
+        count = size // SNAPSHOT_DTYPE.itemsize
+        if count == 0:
+            return np.empty(0, dtype=SNAPSHOT_DTYPE)
+
+        return np.memmap(self.data_file, dtype=SNAPSHOT_DTYPE, mode="r", shape=(count,))
+
+    def _window(self, start: float | None = None, end: float | None = None) -> np.ndarray:
+        """Binary-search the series for records within [start, end]"""
+        series = self._load_series()
+        timestamps = series["timestamp"]
+        lo = int(np.searchsorted(timestamps, start, side="left")) if start is not None else 0
+        hi = int(np.searchsorted(timestamps, end, side="right")) if end is not None else len(series)
+        return series[lo:hi]
+
+    @staticmethod
+    def _to_dicts(records: np.ndarray) -> list[dict]:
+        """Convert structured records back to the snapshot dict format"""
+        return [
+            {
+                "timestamp": datetime.fromtimestamp(float(r["timestamp"]), UTC).isoformat(),
+                "equity": float(r["equity"]),
+                "cash": float(r["cash"]),
+                "positions_value": float(r["positions_value"]),
+                "num_positions": int(r["num_positions"]),
+            }
+            for r in records
+        ]
+
+    def _migrate_legacy_history(self):
+        """Import the legacy JSON history into the series file (one-time)"""
+        if self.data_file.exists() or not self.legacy_file.exists():
+            return
+
+        try:
+            with open(self.legacy_file) as f:
+                history = json.load(f)
+            history.sort(key=lambda s: _parse_timestamp(s["timestamp"]))
+            self.append_snapshots(history)
+            logger.info(f"✅ Migrated {len(history)} equity snapshots to {self.data_file}")
         except Exception as e:
-            logger.error(f"❌ Failed to load equity history: {e!s}")
-            return []
+            logger.error(f"❌ Failed to migrate legacy equity history: {e!s}")
 
-    def save_history(self, history: list[dict]):
-        """Save equity history to file"""
+    def load_history(self) -> list[dict]:
+        """Load full equity history"""
         try:
-            with open(self.data_file, "w") as f:
-                json.dump(history, f, indent=2)
-            logger.info(f"✅ Saved equity history ({len(history)} snapshots)")
+            return self._to_dicts(self._load_series())
         except Exception as e:
-            logger.error(f"❌ Failed to save equity history: {e!s}")
-            raise
+            logger.error(f"❌ Failed to load equity history: {e!s}")
+            return []
 
     def get_history(
         self, start_date: datetime | None = None, end_date: datetime | None = None
@@ -109,25 +221,15 @@ class EquityTracker:
         Returns:
             List of equity snapshots
         """
-        history = self.load_history()
-
-        if not start_date and not end_date:
-            return history
-
-        # Filter by date range
-        filtered = []
-        for snapshot in history:
-            snapshot_date = datetime.fromisoformat(snapshot["timestamp"])
-
-            if start_date and snapshot_date < start_date:
-                continue
-
-            if end_date and snapshot_date > end_date:
-                continue
-
-            filtered.append(snapshot)
-
-        return filtered
+        try:
+            records = self._window(
+                start_date.timestamp() if start_date else None,
+                end_date.timestamp() if end_date else None,
+            )
+            return self._to_dicts(records)
+        except Exception as e:
+            logger.error(f"❌ Failed to load equity history: {e!s}")
+            return []
 
     def calculate_metrics(self, period_days: int = 30) -> dict:
         """
@@ -144,87 +246,35 @@ class EquityTracker:
                 - win_days
                 - loss_days
         """
-        history = self.load_history()
-
-        if not history:
-            return {
-                "total_return": 0,
-                "max_drawdown": 0,
-                "sharpe_ratio": 0,
-                "win_days": 0,
-                "loss_days": 0,
-            }
-
         # Get snapshots within period
         cutoff_date = datetime.now(UTC).timestamp() - (period_days * 86400)
-        recent_snapshots = [
-            s
-            for s in history
-            if datetime.fromisoformat(s["timestamp"]).timestamp() >= cutoff_date
-        ]
+        equity = np.asarray(self._window(start=cutoff_date)["equity"], dtype=np.float64)
 
-        if len(recent_snapshots) < 2:
-            return {
-                "total_return": 0,
-                "max_drawdown": 0,
-                "sharpe_ratio": 0,
-                "win_days": 0,
-                "loss_days": 0,
-            }
+        if len(equity) < 2:
+            return dict(_EMPTY_METRICS)
 
         # Calculate total return
-        start_equity = recent_snapshots[0]["equity"]
-        end_equity = recent_snapshots[-1]["equity"]
-        total_return = end_equity - start_equity
-        total_return_pct = (
-            (total_return / start_equity * 100) if start_equity > 0 else 0
-        )
+        start_equity = float(equity[0])
+        total_return = float(equity[-1]) - start_equity
+        total_return_pct = (total_return / start_equity * 100) if start_equity > 0 else 0
 
-        # Calculate max drawdown
-        peak = start_equity
-        max_dd = 0
-        for snapshot in recent_snapshots:
-            equity = snapshot["equity"]
-            if equity > peak:
-                peak = equity
-            dd = (peak - equity) / peak if peak > 0 else 0
-            if dd > max_dd:
-                max_dd = dd
+        # Calculate max drawdown against the running peak
+        peak = np.maximum.accumulate(equity)
+        drawdown = np.divide(peak - equity, peak, out=np.zeros_like(equity), where=peak > 0)
+        max_dd = float(drawdown.max())
 
         # Count winning/losing days
-        win_days = 0
-        loss_days = 0
-        for i in range(1, len(recent_snapshots)):
-            prev_equity = recent_snapshots[i - 1]["equity"]
-            curr_equity = recent_snapshots[i]["equity"]
-            if curr_equity > prev_equity:
-                win_days += 1
-            elif curr_equity < prev_equity:
-                loss_days += 1
-
-        # Simplified Sharpe ratio
-        # Calculate daily returns
-        daily_returns = []
-        for i in range(1, len(recent_snapshots)):
-            prev_equity = recent_snapshots[i - 1]["equity"]
-            curr_equity = recent_snapshots[i]["equity"]
-            daily_return = (
-                (curr_equity - prev_equity) / prev_equity if prev_equity > 0 else 0
-            )
-            daily_returns.append(daily_return)
-
-        if daily_returns:
-            avg_return = sum(daily_returns) / len(daily_returns)
-            # Standard deviation
-            variance = sum((r - avg_return) ** 2 for r in daily_returns) / len(
-                daily_returns
-            )
-            std_dev = variance**0.5
-
-            # Sharpe ratio (assuming 0% risk-free rate)
-            sharpe = (avg_return / std_dev * (252**0.5)) if std_dev > 0 else 0
-        else:
-            sharpe = 0
+        changes = np.diff(equity)
+        win_days = int(np.count_nonzero(changes > 0))
+        loss_days = int(np.count_nonzero(changes < 0))
+
+        # Simplified Sharpe ratio from daily returns (assuming 0% risk-free rate)
+        prev_equity = equity[:-1]
+        daily_returns = np.divide(
+            changes, prev_equity, out=np.zeros_like(changes), where=prev_equity > 0
+        )
+        std_dev = float(daily_returns.std())
+        sharpe = (float(daily_returns.mean()) / std_dev * (252**0.5)) if std_dev > 0 else 0
 
         return {
             "total_return": round(total_return, 2),
@@ -233,7 +283,7 @@ class EquityTracker:
             "sharpe_ratio": round(sharpe, 2),
             "win_days": win_days,
             "loss_days": loss_days,
-            "num_snapshots": len(recent_snapshots),
+            "num_snapshots": len(equity),
         }
 
 
@@ -5,6 +5,8 @@ Keeps the same class name and method signatures expected by callers while delega
 to the production implementation in options_greeks.
 """
 
+import numpy as np
+
 from .options_greeks import GreeksCalculator as _BSCalculator
 
 
@@ -37,6 +39,25 @@ class GreeksCalculator:
             "vega": float(greeks.vega),
         }
 
+    def calculate_greeks_batch(
+        self,
+        option_types: list[str],
+        underlying_prices: np.ndarray,
+        strike_prices: np.ndarray,
+        days_to_expiry: np.ndarray,
+        implied_volatilities: np.ndarray,
+    ) -> dict[str, np.ndarray]:
+        """Vectorized calculate_greeks: arrays of delta, gamma, theta and vega"""
+        time_to_expiry = np.maximum(0.0, np.asarray(days_to_expiry, dtype=float) / 365.0)
+        greeks = self._impl.calculate_greeks_batch(
+            spot_price=underlying_prices,
+            strike_price=strike_prices,
+            time_to_expiry=time_to_expiry,
+            volatility=implied_volatilities,
+            is_call=np.array([t == "call" for t in option_types], dtype=bool),
+        )
+        return {name: greeks[name] for name in ("delta", "gamma", "theta", "vega")}
+
     # Convenience helpers (not currently used by callers)
     def calculate_delta(
         self,
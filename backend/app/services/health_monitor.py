@@ -1,44 +1,168 @@
 """
 Production Health Monitoring Service
+
+System metrics (CPU/memory/disk), dependency checks and per-route latency
+percentiles are refreshed by a background sampler thread, so health
+requests only read the latest snapshot and never block on psutil or
+upstream APIs. Response times are kept in fixed-size ring buffers.
 """
 
 import logging
+import math
+import threading
 import time
+from collections import deque
 from datetime import datetime
+from itertools import islice
 
 import psutil
 
-from .alpaca_client import get_alpaca_client
 from .tradier_client import get_tradier_client
 
 
 logger = logging.getLogger(__name__)
 
+# Ring buffer sizes
+RESPONSE_TIME_WINDOW = 1000  # Global window (avg response time)
+ROUTE_WINDOW = 1000  # Per-route window (p50/p95/p99)
+MAX_TRACKED_ROUTES = 256  # Bound memory if paths are not templated
+OTHER_ROUTE = "other"
+
+# Background sampler cadence (seconds)
+SAMPLE_INTERVAL = 5.0
+DEPENDENCY_CHECK_INTERVAL = 30.0
+
+# Reported until the first dependency check completes
+DEPENDENCY_NAMES = ("tradier", "alpaca")
+
+
+def get_alpaca_client():
+    """Alpaca client factory, imported on first use (the Alpaca SDK pulls in pandas)"""
+    from .alpaca_client import get_alpaca_client as _get_alpaca_client
+
+    return _get_alpaca_client()
+
+
+def _percentile(sorted_values: list[float], pct: float) -> float:
+    """Nearest-rank percentile of an already sorted list"""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, math.ceil(pct / 100 * len(sorted_values)))
+    return sorted_values[rank - 1]
+
 
 class HealthMonitor:
-    def __init__(self):
+    def __init__(self, sample_interval: float = SAMPLE_INTERVAL, autostart_sampler: bool = False):
         self.start_time = datetime.now()
         self.request_count = 0
         self.error_count = 0
-        self.response_times: list[float] = []
+        self._response_times: deque[float] = deque(maxlen=RESPONSE_TIME_WINDOW)
+        self._route_times: dict[str, deque[float]] = {}
         self.cache_hits = 0
         self.cache_misses = 0
 
-    def get_system_health(self) -> dict:
-        """Get comprehensive system health metrics"""
+        # Latest background snapshots (replaced atomically by the sampler)
+        self.sample_interval = sample_interval
+        self.autostart_sampler = autostart_sampler
+        self._system_snapshot: dict | None = None
+        self._dependency_snapshot: dict | None = None
+        self._dependency_checked_at = 0.0
+        self._dependency_thread: threading.Thread | None = None
+        self._dependency_lock = threading.Lock()
+        self._latency_snapshot: dict = {}
+        self._sampler_thread: threading.Thread | None = None
+        self._sampler_stop = threading.Event()
+
+    @property
+    def response_times(self) -> list[float]:
+        """Recent response times (seconds), oldest first"""
+        return list(self._response_times)
+
+    # ==================== BACKGROUND SAMPLER ====================
+
+    def start_sampler(self):
+        """Start the background sampler thread (idempotent)"""
+        if self._sampler_thread and self._sampler_thread.is_alive():
+            return
+
+        self._sampler_stop.clear()
+        self._sampler_thread = threading.Thread(
+            target=self._sampler_loop, name="health-sampler", daemon=True
+        )
+        self._sampler_thread.start()
+        logger.info(f"✅ Health sampler started (interval: {self.sample_interval}s)")
+
+    def stop_sampler(self):
+        """Stop the background sampler thread"""
+        self._sampler_stop.set()
+        if self._sampler_thread:
+            self._sampler_thread.join(timeout=self.sample_interval + 1)
+            self._sampler_thread = None
 
-        # CPU and Memory
-        cpu_percent = psutil.cpu_percent(interval=1)
+    def _sampler_loop(self):
+        """Refresh snapshots until stopped"""
+        while not self._sampler_stop.wait(self.sample_interval):
+            try:
+                # interval=None measures CPU since the previous sample (non-blocking)
+                self._system_snapshot = self._sample_system()
+                self._latency_snapshot = self.get_latency_percentiles()
+
+                if time.monotonic() - self._dependency_checked_at >= DEPENDENCY_CHECK_INTERVAL:
+                    self._refresh_dependencies()
+            except Exception as e:
+                logger.error(f"❌ Health sampler iteration failed: {e!s}")
+
+    def _sample_system(self) -> dict:
+        """Take a non-blocking CPU/memory/disk sample"""
         memory = psutil.virtual_memory()
         disk = psutil.disk_usage("/")
+        return {
+            "cpu_percent": psutil.cpu_percent(interval=None),
+            "memory_percent": memory.percent,
+            "memory_used_mb": memory.used / 1024 / 1024,
+            "memory_total_mb": memory.total / 1024 / 1024,
+            "disk_percent": disk.percent,
+            "disk_free_gb": disk.free / 1024 / 1024 / 1024,
+        }
+
+    def _refresh_dependencies(self) -> dict:
+        """Run dependency checks and store the snapshot"""
+        self._dependency_snapshot = self._check_dependencies()
+        self._dependency_checked_at = time.monotonic()
+        return self._dependency_snapshot
+
+    def _refresh_dependencies_in_background(self):
+        """Start a one-off dependency check unless one is already running"""
+        with self._dependency_lock:
+            if self._dependency_thread and self._dependency_thread.is_alive():
+                return
+            self._dependency_thread = threading.Thread(
+                target=self._refresh_dependencies, name="health-dependencies", daemon=True
+            )
+            self._dependency_thread.start()
+
+    def _pending_dependencies(self) -> dict:
+        """Placeholder snapshot while the first dependency check runs"""
+        self._refresh_dependencies_in_background()
+        return {name: {"status": "pending"} for name in DEPENDENCY_NAMES}
+
+    # ==================== HEALTH REPORT ====================
+
+    def get_system_health(self) -> dict:
+        """Get comprehensive system health metrics"""
+
+        # Read the latest snapshots. The very first call samples the (non-blocking)
+        # system metrics inline and reports dependencies as pending while they are
+        # checked in the background.
+        system = self._system_snapshot or self._sample_system()
+        dependencies = self._dependency_snapshot or self._pending_dependencies()
+        if self.autostart_sampler:
+            self.start_sampler()
 
         # Application metrics
         uptime = (datetime.now() - self.start_time).total_seconds()
-        avg_response_time = (
-            sum(self.response_times[-100:]) / len(self.response_times[-100:])
-            if self.response_times
-            else 0
-        )
+        recent = list(islice(reversed(self._response_times), 100))
+        avg_response_time = sum(recent) / len(recent) if recent else 0
         error_rate = (
             (self.error_count / self.request_count * 100)
             if self.request_count > 0
@@ -47,18 +171,11 @@ class HealthMonitor:
 
         return {
             "status": "healthy"
-            if cpu_percent < 80 and memory.percent < 85
+            if system["cpu_percent"] < 80 and system["memory_percent"] < 85
             else "degraded",
             "timestamp": datetime.now().isoformat(),
             "uptime_seconds": uptime,
-            "system": {
-                "cpu_percent": cpu_percent,
-                "memory_percent": memory.percent,
-                "memory_used_mb": memory.used / 1024 / 1024,
-                "memory_total_mb": memory.total / 1024 / 1024,
-                "disk_percent": disk.percent,
-                "disk_free_gb": disk.free / 1024 / 1024 / 1024,
-            },
+            "system": system,
             "application": {
                 "total_requests": self.request_count,
                 "total_errors": self.error_count,
@@ -74,8 +191,9 @@ class HealthMonitor:
                     if (self.cache_hits + self.cache_misses) > 0
                     else 0
                 ),
+                "routes": self._latency_snapshot,
             },
-            "dependencies": self._check_dependencies(),
+            "dependencies": dependencies,
             "configuration": self._check_api_configuration(),
         }
 
@@ -157,16 +275,35 @@ class HealthMonitor:
 
         return config_status
 
-    def record_request(self, response_time: float, is_error: bool = False):
-        """Record request metrics"""
+    def record_request(
+        self, response_time: float, is_error: bool = False, route: str | None = None
+    ):
+        """Record request metrics (O(1), ring buffers drop the oldest entry)"""
         self.request_count += 1
         if is_error:
             self.error_count += 1
-        self.response_times.append(response_time)
+        self._response_times.append(response_time)
 
-        # Keep only last 1000 response times
-        if len(self.response_times) > 1000:
-            self.response_times = self.response_times[-1000:]
+        if route is not None:
+            window = self._route_times.get(route)
+            if window is None:
+                if len(self._route_times) >= MAX_TRACKED_ROUTES:
+                    route = OTHER_ROUTE
+                window = self._route_times.setdefault(route, deque(maxlen=ROUTE_WINDOW))
+            window.append(response_time)
+
+    def get_latency_percentiles(self) -> dict:
+        """Compute p50/p95/p99 response times (ms) per route from the ring buffers"""
+        percentiles = {}
+        for route, window in list(self._route_times.items()):
+            values = sorted(tuple(window))
+            percentiles[route] = {
+                "count": len(values),
+                "p50_ms": _percentile(values, 50) * 1000,
+                "p95_ms": _percentile(values, 95) * 1000,
+                "p99_ms": _percentile(values, 99) * 1000,
+            }
+        return percentiles
 
     def record_cache_hit(self):
         self.cache_hits += 1
@@ -175,5 +312,5 @@ class HealthMonitor:
         self.cache_misses += 1
 
 
-# Global instance
-health_monitor = HealthMonitor()
+# Global instance (sampler starts on the first health request)
+health_monitor = HealthMonitor(autostart_sampler=True)
@@ -9,12 +9,21 @@ Centralizes all market data analysis logic including:
 
 This service extracts cross-cutting business logic from multiple routers
 to provide reusable, testable market analysis capabilities.
+
+All analyses of a symbol come from one bundle: analyze_symbol() fetches the
+history once, loads it into NumPy arrays and computes indicators, trend, volume
+and regime together. The bundle is cached, and concurrent requests for the same
+bundle share one fetch, so a dashboard calling the four individual methods makes
+one upstream call instead of four.
 """
 
+import asyncio
 import logging
 from datetime import datetime, timedelta
 from typing import Any
 
+import numpy as np
+
 from ..services.cache_service import CacheService
 from ..services.technical_indicators import TechnicalIndicators
 from ..services.tradier_client import TradierClient
@@ -22,6 +31,26 @@ from ..services.tradier_client import TradierClient
 
 logger = logging.getLogger(__name__)
 
+# Bars needed for indicators, trend and regime (volume analysis needs one)
+MIN_BARS = 20
+
+# Seconds an analysis bundle stays cached
+ANALYSIS_CACHE_TTL = 300
+
+ANALYSIS_SECTIONS = ("indicators", "trend", "volume", "regime")
+
+# Requested indicator name -> keys it contributes to the indicators section
+INDICATOR_KEYS = {
+    "rsi": ("rsi",),
+    "macd": ("macd", "macd_signal", "macd_histogram"),
+    "bb": ("bb_upper", "bb_middle", "bb_lower", "bb_width"),
+    "atr": ("atr",),
+    "ma": ("sma_20", "sma_50", "sma_200", "ema_12"),
+    "volume": ("avg_volume_20d", "current_volume", "volume_ratio"),
+}
+INDICATOR_KEYS["bollinger_bands"] = INDICATOR_KEYS["bb"]
+INDICATOR_KEYS["moving_averages"] = INDICATOR_KEYS["ma"]
+
 
 class MarketAnalysisService:
     """
@@ -46,6 +75,55 @@ class MarketAnalysisService:
         self.tradier = tradier_client
         self.cache = cache_service
         self.indicators = TechnicalIndicators()
+        self._inflight: dict[str, asyncio.Future] = {}
+
+    async def analyze_symbol(
+        self,
+        symbol: str,
+        lookback_days: int = 90,
+        interval: str = "daily",
+        sections: list[str] | None = None,
+    ) -> dict[str, Any]:
+        """
+        Composite analysis of a symbol from a single history fetch.
+
+        Args:
+            symbol: Stock symbol (e.g., "AAPL")
+            lookback_days: Days of historical data to analyze
+            interval: Bar interval ("daily", "weekly", "monthly")
+            sections: Sections to return (default: all of ANALYSIS_SECTIONS)
+
+        Returns:
+            Dictionary with bar count and the requested sections:
+            {
+                "symbol": str,
+                "bars": int,
+                "as_of": date of the last bar,
+                "indicators": {...} | None,
+                "trend": {...} | None,
+                "volume": {...},
+                "regime": {...} | None,
+            }
+            indicators, trend and regime are None with fewer than MIN_BARS bars.
+
+        Raises:
+            ValueError: If symbol is empty, a section is unknown, or no data is available
+
+        Example:
+            >>> analysis = await service.analyze_symbol("SPY", sections=["trend", "regime"])
+            >>> print(analysis["regime"]["regime"])  # "trending_bullish"
+        """
+        if not symbol:
+            raise ValueError("Symbol is required")
+        unknown = set(sections or ()) - set(ANALYSIS_SECTIONS)
+        if unknown:
+            raise ValueError(f"Unknown analysis sections: {', '.join(sorted(unknown))}")
+
+        bundle = await self._get_bundle(symbol.upper(), lookback_days, interval)
+        if sections is None:
+            return bundle
+        excluded = set(ANALYSIS_SECTIONS) - set(sections)
+        return {key: value for key, value in bundle.items() if key not in excluded}
 
     async def calculate_technical_indicators(
         self,
@@ -78,78 +156,19 @@ class MarketAnalysisService:
         if not symbol or not indicators:
             raise ValueError("Symbol and indicators list are required")
 
-        # Check cache first
-        cache_key = f"indicators:{symbol}:{':'.join(sorted(indicators))}:{lookback_days}"
-        if self.cache:
-            cached = self.cache.get(cache_key)
-            if cached:
-                logger.info(f"Cache HIT for indicators {symbol}")
-                return cached
-
-        # Fetch historical data
         try:
-            end_date = datetime.now()
-            start_date = end_date - timedelta(days=lookback_days)
-
-            history = self.tradier.get_historical_quotes(
-                symbol=symbol,
-                interval="daily",
-                start_date=start_date.strftime("%Y-%m-%d"),
-                end_date=end_date.strftime("%Y-%m-%d"),
-            )
-
-            if not history or len(history) < 20:
+            bundle = await self.analyze_symbol(symbol, lookback_days, sections=["indicators"])
+            values = bundle["indicators"]
+            if values is None:
                 raise ValueError(f"Insufficient historical data for {symbol}")
 
-            # Extract price arrays
-            prices = [float(bar.get("close", 0)) for bar in history]
-            highs = [float(bar.get("high", 0)) for bar in history]
-            lows = [float(bar.get("low", 0)) for bar in history]
-            volumes = [float(bar.get("volume", 0)) for bar in history]
-
-            # Calculate requested indicators
             result = {}
-
             for indicator in indicators:
-                if indicator.lower() == "rsi":
-                    result["rsi"] = self.indicators.calculate_rsi(prices)
-
-                elif indicator.lower() == "macd":
-                    macd_data = self.indicators.calculate_macd(prices)
-                    result["macd"] = macd_data["macd"]
-                    result["macd_signal"] = macd_data["signal"]
-                    result["macd_histogram"] = macd_data["histogram"]
-
-                elif indicator.lower() in ["bb", "bollinger_bands"]:
-                    bb_data = self.indicators.calculate_bollinger_bands(prices)
-                    result["bb_upper"] = bb_data["upper"]
-                    result["bb_middle"] = bb_data["middle"]
-                    result["bb_lower"] = bb_data["lower"]
-                    result["bb_width"] = self.indicators.calculate_bb_width(prices)
-
-                elif indicator.lower() == "atr":
-                    result["atr"] = self.indicators.calculate_atr(highs, lows, prices)
-
-                elif indicator.lower() in ["ma", "moving_averages"]:
-                    ma_data = self.indicators.calculate_moving_averages(prices)
-                    result.update(ma_data)
-
-                elif indicator.lower() == "volume":
-                    # Volume metrics
-                    avg_volume = sum(volumes[-20:]) / 20 if len(volumes) >= 20 else 0
-                    current_volume = volumes[-1] if volumes else 0
-                    result["avg_volume_20d"] = round(avg_volume, 0)
-                    result["current_volume"] = round(current_volume, 0)
-                    result["volume_ratio"] = (
-                        round(current_volume / avg_volume, 2) if avg_volume > 0 else 0
-                    )
-
-                else:
+                keys = INDICATOR_KEYS.get(indicator.lower())
+                if keys is None:
                     logger.warning(f"Unknown indicator requested: {indicator}")
-
-            # Cache results for 5 minutes
-            if self.cache and result:
-                self.cache.set(cache_key, result, ttl=300)
+                    continue
+                result.update({key: values[key] for key in keys if key in values})
 
             logger.info(f"Calculated {len(result)} indicators for {symbol}")
             return result
@@ -190,85 +209,10 @@ class MarketAnalysisService:
             >>> print(regime["confidence"])  # 0.85
         """
         try:
-            # Calculate all relevant indicators
-            indicators = await self.calculate_technical_indicators(
-                symbol,
-                indicators=["rsi", "macd", "bb", "atr", "ma", "volume"],
-                lookback_days=lookback_days,
-            )
-
-            # Get trend analysis
-            end_date = datetime.now()
-            start_date = end_date - timedelta(days=lookback_days)
-            history = self.tradier.get_historical_quotes(
-                symbol=symbol,
-                interval="daily",
-                start_date=start_date.strftime("%Y-%m-%d"),
-                end_date=end_date.strftime("%Y-%m-%d"),
-            )
-            prices = [float(bar.get("close", 0)) for bar in history]
-            trend = self.indicators.analyze_trend(prices)
-
-            # Extract key features
-            rsi = indicators.get("rsi", 50)
-            bb_width = indicators.get("bb_width", 0)
-            macd_histogram = indicators.get("macd_histogram", 0)
-            volume_ratio = indicators.get("volume_ratio", 1.0)
-            trend_direction = trend["direction"]
-            trend_strength = trend["strength"]
-
-            # Regime classification logic
-            regime = "ranging"  # Default
-            confidence = 0.5
-
-            # High volatility check (BB width > 6% or high ATR)
-            if bb_width > 6.0:
-                regime = "high_volatility"
-                confidence = min(0.6 + (bb_width - 6.0) / 10, 0.95)
-
-            # Trending market checks
-            elif trend_direction == "bullish" and trend_strength > 0.6:
-                regime = "trending_bullish"
-                confidence = min(0.6 + trend_strength * 0.3, 0.95)
-
-                # Boost confidence if RSI and MACD confirm
-                if rsi > 50 and macd_histogram > 0:
-                    confidence = min(confidence + 0.1, 0.95)
-
-            elif trend_direction == "bearish" and trend_strength > 0.6:
-                regime = "trending_bearish"
-                confidence = min(0.6 + trend_strength * 0.3, 0.95)
-
-                # Boost confidence if RSI and MACD confirm
-                if rsi < 50 and macd_histogram < 0:
-                    confidence = min(confidence + 0.1, 0.95)
-
-            # Ranging market (low volatility, weak trend)
-            else:
-                regime = "ranging"
-                # Higher confidence if RSI near 50 and low BB width
-                if 40 <= rsi <= 60 and bb_width < 3.0:
-                    confidence = 0.75
-                else:
-                    confidence = 0.6
-
-            logger.info(
-                f"Market regime for {symbol}: {regime} (confidence: {confidence:.2f})"
-            )
-
-            return {
-                "regime": regime,
-                "confidence": round(confidence, 2),
-                "features": {
-                    "rsi": rsi,
-                    "bb_width": bb_width,
-                    "macd_histogram": macd_histogram,
-                    "volume_ratio": volume_ratio,
-                    "trend_direction": trend_direction,
-                    "trend_strength": trend_strength,
-                },
-                "timestamp": datetime.now().isoformat(),
-            }
+            bundle = await self.analyze_symbol(symbol, lookback_days, sections=["regime"])
+            if bundle["regime"] is None:
+                raise ValueError(f"Insufficient historical data for {symbol}")
+            return bundle["regime"]
 
         except Exception as e:
             logger.error(f"Failed to detect market regime for {symbol}: {e}")
@@ -307,53 +251,17 @@ class MarketAnalysisService:
             }
         """
         try:
-            # Fetch historical data
-            end_date = datetime.now()
-            start_date = end_date - timedelta(days=lookback_days)
-
-            history = self.tradier.get_historical_quotes(
-                symbol=symbol,
-                interval=timeframe,
-                start_date=start_date.strftime("%Y-%m-%d"),
-                end_date=end_date.strftime("%Y-%m-%d"),
+            bundle = await self.analyze_symbol(
+                symbol, lookback_days, interval=timeframe, sections=["trend"]
             )
-
-            if not history or len(history) < 20:
+            if bundle["trend"] is None:
                 raise ValueError(f"Insufficient data for trend analysis: {symbol}")
 
-            prices = [float(bar.get("close", 0)) for bar in history]
-
-            # Use technical indicators for trend analysis
-            trend_data = self.indicators.analyze_trend(prices)
-
-            # Calculate moving averages for additional context
-            ma_data = self.indicators.calculate_moving_averages(prices)
-
-            # Enhance with MA crossover signals
-            current_price = prices[-1]
-            confidence = trend_data["strength"]
-
-            if "sma_50" in ma_data and "sma_200" in ma_data:
-                golden_cross = ma_data["sma_50"] > ma_data["sma_200"]
-                if golden_cross and trend_data["direction"] == "bullish":
-                    confidence = min(confidence + 0.15, 1.0)
-                elif not golden_cross and trend_data["direction"] == "bearish":
-                    confidence = min(confidence + 0.15, 1.0)
-
-            result = {
-                **trend_data,
-                "confidence": round(confidence, 2),
-                "current_price": round(current_price, 2),
-                "moving_averages": ma_data,
-                "timeframe": timeframe,
-                "lookback_days": lookback_days,
-            }
-
+            result = bundle["trend"]
             logger.info(
                 f"Trend analysis for {symbol}: {result['direction']} "
                 f"(strength: {result['strength']:.2f})"
             )
-
             return result
 
         except Exception as e:
@@ -383,64 +291,306 @@ class MarketAnalysisService:
             }
         """
         try:
-            end_date = datetime.now()
-            start_date = end_date - timedelta(days=lookback_days)
-
-            history = self.tradier.get_historical_quotes(
-                symbol=symbol,
-                interval="daily",
-                start_date=start_date.strftime("%Y-%m-%d"),
-                end_date=end_date.strftime("%Y-%m-%d"),
-            )
-
-            if not history:
-                raise ValueError(f"No volume data available for {symbol}")
-
-            volumes = [float(bar.get("volume", 0)) for bar in history]
-
-            # Calculate volume metrics
-            avg_volume = sum(volumes) / len(volumes) if volumes else 0
-            current_volume = volumes[-1] if volumes else 0
-            volume_ratio = current_volume / avg_volume if avg_volume > 0 else 0
-
-            # Determine volume trend (compare recent 10 days vs previous 10 days)
-            if len(volumes) >= 20:
-                recent_avg = sum(volumes[-10:]) / 10
-                previous_avg = sum(volumes[-20:-10]) / 10
-
-                if recent_avg > previous_avg * 1.2:
-                    volume_trend = "increasing"
-                elif recent_avg < previous_avg * 0.8:
-                    volume_trend = "decreasing"
-                else:
-                    volume_trend = "stable"
-            else:
-                volume_trend = "unknown"
-
-            # Liquidity score (based on average volume)
-            # High liquidity: > 1M shares/day
-            # Medium: 100K - 1M
-            # Low: < 100K
-            if avg_volume > 1_000_000:
-                liquidity_score = min(70 + (avg_volume / 1_000_000) * 3, 100)
-            elif avg_volume > 100_000:
-                liquidity_score = 40 + (avg_volume / 100_000) * 3
-            else:
-                liquidity_score = (avg_volume / 100_000) * 40
-
-            return {
-                "avg_volume": round(avg_volume, 0),
-                "current_volume": round(current_volume, 0),
-                "volume_ratio": round(volume_ratio, 2),
-                "volume_trend": volume_trend,
-                "liquidity_score": round(liquidity_score, 1),
-                "lookback_days": lookback_days,
-            }
+            bundle = await self.analyze_symbol(symbol, lookback_days, sections=["volume"])
+            return bundle["volume"]
 
         except Exception as e:
             logger.error(f"Failed to analyze volume for {symbol}: {e}")
             raise
 
+    async def _get_bundle(self, symbol: str, lookback_days: int, interval: str) -> dict[str, Any]:
+        """
+        Serve the analysis bundle from cache, or join an identical in-flight
+        computation instead of fetching the history again.
+        """
+        cache_key = f"analysis:{symbol}:{interval}:{lookback_days}"
+        if self.cache:
+            cached = await self.cache.get(cache_key)
+            if cached:
+                logger.info(f"Cache HIT for analysis {symbol}")
+                return cached
+
+        inflight = self._inflight.get(cache_key)
+        if inflight is None:
+            inflight = asyncio.ensure_future(self._build_bundle(symbol, lookback_days, interval))
+            self._inflight[cache_key] = inflight
+            inflight.add_done_callback(lambda _f: self._inflight.pop(cache_key, None))
+            bundle = await asyncio.shield(inflight)
+            if self.cache:
+                await self.cache.set(cache_key, bundle, ttl=ANALYSIS_CACHE_TTL)
+            return bundle
+
+        return await asyncio.shield(inflight)
+
+    async def _build_bundle(
+        self, symbol: str, lookback_days: int, interval: str
+    ) -> dict[str, Any]:
+        """Fetch the history once and compute every analysis section from it."""
+        end_date = datetime.now()
+        start_date = end_date - timedelta(days=lookback_days)
+
+        history = await asyncio.to_thread(
+            self.tradier.get_historical_bars,
+            symbol,
+            interval,
+            start_date.strftime("%Y-%m-%d"),
+            end_date.strftime("%Y-%m-%d"),
+        )
+        if not history:
+            raise ValueError(f"No historical data available for {symbol}")
+
+        # One conversion pass: a (bars x 4) table of close, high, low, volume
+        table = np.array(
+            [[bar.get(field) or 0 for field in _BAR_FIELDS] for bar in history], dtype=float
+        )
+        closes, highs, lows, volumes = table.T
+
+        indicators = trend = regime = None
+        if len(closes) >= MIN_BARS:
+            indicators = _indicators(closes, highs, lows, volumes)
+            trend = _trend(closes)
+            trend.update(_trend_context(closes, trend, indicators))
+            trend.update({"timeframe": interval, "lookback_days": lookback_days})
+            regime = _regime(indicators, trend)
+            logger.info(
+                f"Market regime for {symbol}: {regime['regime']} "
+                f"(confidence: {regime['confidence']:.2f})"
+            )
+
+        volume = _volume(volumes)
+        volume["lookback_days"] = lookback_days
+
+        logger.info(f"Analyzed {len(closes)} {interval} bars for {symbol}")
+        return {
+            "symbol": symbol,
+            "interval": interval,
+            "lookback_days": lookback_days,
+            "bars": len(closes),
+            "as_of": history[-1].get("date"),
+            "indicators": indicators,
+            "trend": trend,
+            "volume": volume,
+            "regime": regime,
+            "timestamp": datetime.now().isoformat(),
+        }
+
+
+_BAR_FIELDS = ("close", "high", "low", "volume")
+
+
+def _ema_series(values: np.ndarray, period: int) -> np.ndarray:
+    """
+    EMA of every prefix of values, SMA-seeded like TechnicalIndicators._calculate_ema
+    (prefixes shorter than the period get their plain mean).
+
+    The recurrence runs once over the series, where recomputing the EMA of each
+    prefix (as the list-based MACD does) is quadratic.
+    """
+    n = len(values)
+    out = np.cumsum(values) / np.arange(1, n + 1)
+    if n < period:
+        return out
+
+    alpha = 2 / (period + 1)
+    ema = out[period - 1]
+    for i in range(period, n):
+        ema = values[i] * alpha + ema * (1 - alpha)
+        out[i] = ema
+    return out
+
+
+def _indicators(
+    closes: np.ndarray, highs: np.ndarray, lows: np.ndarray, volumes: np.ndarray
+) -> dict[str, float]:
+    """All TechnicalIndicators values for the latest bar; needs MIN_BARS bars."""
+    n = len(closes)
+    result: dict[str, float] = {}
+
+    # RSI (14): simple averages of the last 14 gains and losses
+    changes = np.diff(closes)[-14:]
+    avg_gain = np.clip(changes, 0, None).sum() / 14
+    avg_loss = np.clip(-changes, 0, None).sum() / 14
+    result["rsi"] = 100.0 if avg_loss == 0 else round(100 - 100 / (1 + avg_gain / avg_loss), 2)
+
+    # MACD (12, 26, 9)
+    ema_12 = _ema_series(closes, 12)
+    if n < 26 + 9:
+        result.update({"macd": 0.0, "macd_signal": 0.0, "macd_histogram": 0.0})
+    else:
+        macd_values = ema_12[26:] - _ema_series(closes, 26)[26:]
+        macd, signal = macd_values[-1], _ema_series(macd_values, 9)[-1]
+        result["macd"] = round(float(macd), 4)
+        result["macd_signal"] = round(float(signal), 4)
+        result["macd_histogram"] = round(float(macd - signal), 4)
+
+    # Bollinger Bands (20, 2), width from the rounded bands as calculate_bb_width does
+    recent = closes[-20:]
+    sma, std = recent.mean(), recent.std()
+    upper, middle, lower = (round(float(x), 2) for x in (sma + 2 * std, sma, sma - 2 * std))
+    result.update({"bb_upper": upper, "bb_middle": middle, "bb_lower": lower})
+    result["bb_width"] = round((upper - lower) / middle * 100, 2) if middle else 0.0
+
+    # ATR (14): mean true range of the last 14 bars
+    previous = closes[:-1]
+    true_range = np.maximum.reduce(
+        [highs[1:] - lows[1:], np.abs(highs[1:] - previous), np.abs(lows[1:] - previous)]
+    )
+    result["atr"] = round(float(true_range[-14:].mean()), 2)
+
+    # Moving averages
+    for period in (20, 50, 200):
+        if n >= period:
+            result[f"sma_{period}"] = round(float(closes[-period:].mean()), 2)
+    result["ema_12"] = round(float(ema_12[-1]), 2)
+
+    # Volume
+    avg_volume = float(volumes[-20:].mean())
+    current_volume = float(volumes[-1])
+    result["avg_volume_20d"] = round(avg_volume, 0)
+    result["current_volume"] = round(current_volume, 0)
+    result["volume_ratio"] = round(current_volume / avg_volume, 2) if avg_volume > 0 else 0
+
+    return {key: float(value) for key, value in result.items()}
+
+
+def _trend(closes: np.ndarray) -> dict[str, Any]:
+    """TechnicalIndicators.analyze_trend: slope of the last 20 closes; needs MIN_BARS bars."""
+    recent = closes[-20:]
+    current_price = float(closes[-1])
+    slope = float(np.polyfit(np.arange(len(recent)), recent, 1)[0])
+
+    if slope > 0.1:
+        direction = "bullish"
+        strength = min(abs(slope) / current_price * 1000, 1.0)
+    elif slope < -0.1:
+        direction = "bearish"
+        strength = min(abs(slope) / current_price * 1000, 1.0)
+    else:
+        direction = "neutral"
+        strength = 0.5
+
+    return {
+        "direction": direction,
+        "strength": round(strength, 2),
+        "support": round(float(recent[-10:].min()), 2),
+        "resistance": round(float(recent[-10:].max()), 2),
+    }
+
+
+def _trend_context(
+    closes: np.ndarray, trend: dict[str, Any], indicators: dict[str, float]
+) -> dict[str, Any]:
+    """Moving-average context and crossover-adjusted confidence for a trend."""
+    moving_averages = {
+        key: indicators[key] for key in INDICATOR_KEYS["ma"] if key in indicators
+    }
+    confidence = trend["strength"]
+
+    if "sma_50" in moving_averages and "sma_200" in moving_averages:
+        golden_cross = moving_averages["sma_50"] > moving_averages["sma_200"]
+        if golden_cross and trend["direction"] == "bullish":
+            confidence = min(confidence + 0.15, 1.0)
+        elif not golden_cross and trend["direction"] == "bearish":
+            confidence = min(confidence + 0.15, 1.0)
+
+    return {
+        "confidence": round(confidence, 2),
+        "current_price": round(float(closes[-1]), 2),
+        "moving_averages": moving_averages,
+    }
+
+
+def _volume(volumes: np.ndarray) -> dict[str, Any]:
+    """Volume averages, recent trend and liquidity score over the whole lookback."""
+    avg_volume = float(volumes.mean())
+    current_volume = float(volumes[-1])
+    volume_ratio = current_volume / avg_volume if avg_volume > 0 else 0
+
+    # Determine volume trend (compare recent 10 days vs previous 10 days)
+    if len(volumes) >= 20:
+        recent_avg = volumes[-10:].mean()
+        previous_avg = volumes[-20:-10].mean()
+
+        if recent_avg > previous_avg * 1.2:
+            volume_trend = "increasing"
+        elif recent_avg < previous_avg * 0.8:
+            volume_trend = "decreasing"
+        else:
+            volume_trend = "stable"
+    else:
+        volume_trend = "unknown"
+
+    # Liquidity score (based on average volume)
+    # High liquidity: > 1M shares/day
+    # Medium: 100K - 1M
+    # Low: < 100K
+    if avg_volume > 1_000_000:
+        liquidity_score = min(70 + (avg_volume / 1_000_000) * 3, 100)
+    elif avg_volume > 100_000:
+        liquidity_score = 40 + (avg_volume / 100_000) * 3
+    else:
+        liquidity_score = (avg_volume / 100_000) * 40
+
+    return {
+        "avg_volume": round(avg_volume, 0),
+        "current_volume": round(current_volume, 0),
+        "volume_ratio": round(volume_ratio, 2),
+        "volume_trend": volume_trend,
+        "liquidity_score": round(liquidity_score, 1),
+    }
+
+
+def _regime(indicators: dict[str, float], trend: dict[str, Any]) -> dict[str, Any]:
+    """Classify the market regime from the indicator and trend sections."""
+    rsi = indicators.get("rsi", 50)
+    bb_width = indicators.get("bb_width", 0)
+    macd_histogram = indicators.get("macd_histogram", 0)
+    volume_ratio = indicators.get("volume_ratio", 1.0)
+    trend_direction = trend["direction"]
+    trend_strength = trend["strength"]
+
+    # High volatility check (BB width > 6% or high ATR)
+    if bb_width > 6.0:
+        regime = "high_volatility"
+        confidence = min(0.6 + (bb_width - 6.0) / 10, 0.95)
+
+    # Trending market checks
+    elif trend_direction == "bullish" and trend_strength > 0.6:
+        regime = "trending_bullish"
+        confidence = min(0.6 + trend_strength * 0.3, 0.95)
+
+        # Boost confidence if RSI and MACD confirm
+        if rsi > 50 and macd_histogram > 0:
+            confidence = min(confidence + 0.1, 0.95)
+
+    elif trend_direction == "bearish" and trend_strength > 0.6:
+        regime = "trending_bearish"
+        confidence = min(0.6 + trend_strength * 0.3, 0.95)
+
+        # Boost confidence if RSI and MACD confirm
+        if rsi < 50 and macd_histogram < 0:
+            confidence = min(confidence + 0.1, 0.95)
+
+    # Ranging market (low volatility, weak trend)
+    else:
+        regime = "ranging"
+        # Higher confidence if RSI near 50 and low BB width
+        confidence = 0.75 if 40 <= rsi <= 60 and bb_width < 3.0 else 0.6
+
+    return {
+        "regime": regime,
+        "confidence": round(confidence, 2),
+        "features": {
+            "rsi": rsi,
+            "bb_width": bb_width,
+            "macd_histogram": macd_histogram,
+            "volume_ratio": volume_ratio,
+            "trend_direction": trend_direction,
+            "trend_strength": trend_strength,
+        },
+        "timestamp": datetime.now().isoformat(),
+    }
+
 
 # Singleton instance for dependency injection
 _market_analysis_service: MarketAnalysisService | None = None
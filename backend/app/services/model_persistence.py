@@ -1,9 +1,15 @@
 """
 Model Persistence Service
 Handles saving/loading trained ML models to/from disk
+
+Bundles saved with compress=0 can be loaded with mmap_mode="r": numpy arrays are
+then memory-mapped from the file, so every worker process shares the same pages.
+Writes go to a temporary file that is atomically renamed into place.
 """
 
+import json
 import logging
+import os
 from datetime import datetime
 from pathlib import Path
 from typing import Any
@@ -31,6 +37,7 @@ class ModelPersistence:
         model_id: str,
         version: str = "1.0.0",
         metadata: dict[str, Any] | None = None,
+        compress: int = 3,
     ) -> str:
         """
         Save a trained model to disk
@@ -40,6 +47,7 @@ class ModelPersistence:
             model_id: Unique identifier (e.g., "regime_detector")
             version: Model version string
             metadata: Optional metadata (accuracy, training date, etc.)
+            compress: joblib compression level (0 = uncompressed, memory-mappable)
 
         Returns:
             Path to saved model file
@@ -63,15 +71,17 @@ class ModelPersistence:
                 "metadata": metadata or {},
             }
 
-            # Save using joblib (better for sklearn models)
-            joblib.dump(model_bundle, filepath, compress=3)
+            # Save using joblib (better for sklearn models), then rename into place
+            tmp_path = filepath.with_name(f".{filename}.tmp")
+            joblib.dump(model_bundle, tmp_path, compress=compress)
+            os.replace(tmp_path, filepath)
 
             logger.info(f"✅ Model saved: {filepath}")
 
             # Save metadata separately for quick lookups
             metadata_file = model_path / f"{model_id}_latest_metadata.json"
-            import json
-            with open(metadata_file, "w") as f:
+            tmp_metadata = metadata_file.with_name(f".{metadata_file.name}.tmp")
+            with open(tmp_metadata, "w") as f:
                 json.dump(
                     {
                         "model_id": model_id,
@@ -83,6 +93,7 @@ class ModelPersistence:
                     f,
                     indent=2,
                 )
+            os.replace(tmp_metadata, metadata_file)
 
             return str(filepath)
 
@@ -90,13 +101,16 @@ class ModelPersistence:
             logger.error(f"Failed to save model {model_id}: {e}")
             raise
 
-    def load_model(self, model_id: str, version: str | None = None) -> dict[str, Any]:
+    def load_model(
+        self, model_id: str, version: str | None = None, mmap_mode: str | None = None
+    ) -> dict[str, Any]:
         """
         Load a trained model from disk
 
         Args:
             model_id: Model identifier
             version: Specific version to load (None = latest)
+            mmap_mode: Memory-map numpy arrays (e.g. "r"); uncompressed bundles only
 
         Returns:
             Model bundle dict with 'model', 'metadata', etc.
@@ -111,7 +125,6 @@ class ModelPersistence:
             if version is None:
                 metadata_file = model_path / f"{model_id}_latest_metadata.json"
                 if metadata_file.exists():
-                    import json
                     with open(metadata_file) as f:
                         metadata = json.load(f)
                         latest_file = metadata["latest_file"]
@@ -130,7 +143,7 @@ class ModelPersistence:
                 filepath = sorted(model_files, reverse=True)[0]
 
             # Load model bundle
-            model_bundle = joblib.load(filepath)
+            model_bundle = joblib.load(filepath, mmap_mode=mmap_mode)
 
             logger.info(f"✅ Model loaded: {filepath}")
             return model_bundle
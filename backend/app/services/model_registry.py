@@ -0,0 +1,197 @@
+"""
+Model Registry
+
+Warm-loaded, versioned ML models with background training:
+- The latest saved version of each model is preloaded at startup. Bundles are
+  stored uncompressed and memory-mapped, so worker processes share the pages
+- Training only ever runs in a background worker; request paths read the
+  active version and never train
+- A newly trained version is persisted first, then published with a single
+  reference swap, so readers see either the old or the new model
+"""
+
+import logging
+import threading
+import time
+from collections.abc import Callable
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from datetime import UTC, datetime
+from typing import Any
+
+from .model_persistence import ModelPersistence, get_model_persistence
+
+
+logger = logging.getLogger(__name__)
+
+# A trainer returns (fitted model, metadata) or None when training failed
+Trainer = Callable[..., tuple[Any, dict[str, Any]] | None]
+
+# Seconds to wait after a failed training run before another may start
+RETRAIN_BACKOFF_SECONDS = 60
+
+
+@dataclass(frozen=True)
+class ModelVersion:
+    """An immutable, published model version"""
+
+    model_id: str
+    version: str
+    model: Any
+    metadata: dict[str, Any] = field(default_factory=dict)
+    loaded_at: datetime = field(default_factory=lambda: datetime.now(UTC))
+
+
+class ModelRegistry:
+    """Active model versions plus a background training worker"""
+
+    def __init__(self, persistence: ModelPersistence | None = None, max_workers: int = 2):
+        """
+        Args:
+            persistence: Model storage (default: shared ModelPersistence)
+            max_workers: Concurrent training jobs (one model's trainer may wait
+                on another's, e.g. the strategy selector on the regime detector)
+        """
+        self.persistence = persistence or get_model_persistence()
+        self._active: dict[str, ModelVersion] = {}
+        self._trainers: dict[str, Trainer] = {}
+        self._jobs: dict[str, Future] = {}
+        self._jobs_lock = threading.Lock()
+        self._last_errors: dict[str, str] = {}
+        self._failed_at: dict[str, float] = {}
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="model-train"
+        )
+
+    def register(self, model_id: str, trainer: Trainer):
+        """Register the function that trains a new version of a model"""
+        self._trainers[model_id] = trainer
+
+    def get(self, model_id: str) -> ModelVersion | None:
+        """Active version of a model (never loads or trains)"""
+        return self._active.get(model_id)
+
+    def preload(self, model_id: str) -> ModelVersion | None:
+        """
+        Load and publish the latest saved version (memory-mapped)
+
+        If no version is saved yet, training is started in the background and
+        None is returned immediately.
+        """
+        if model_id in self._active:
+            return self._active[model_id]
+
+        start = time.perf_counter()
+        try:
+            bundle = self.persistence.load_model(model_id, mmap_mode="r")
+        except FileNotFoundError:
+            logger.info(f"No saved {model_id} model - training in background")
+            self.train(model_id)
+            return None
+        except Exception as e:
+            logger.error(f"❌ Failed to preload {model_id}, retraining in background: {e}")
+            self.train(model_id)
+            return None
+
+        entry = self._publish(
+            model_id, bundle["model"], bundle.get("version", "unknown"), bundle.get("metadata")
+        )
+        logger.info(
+            f"✅ Preloaded {model_id} v{entry.version} in {time.perf_counter() - start:.3f}s"
+        )
+        return entry
+
+    def is_training(self, model_id: str) -> bool:
+        job = self._jobs.get(model_id)
+        return job is not None and not job.done()
+
+    def train(self, model_id: str, **kwargs: Any) -> Future:
+        """
+        Start training a new version in the background
+
+        Returns the in-flight job if the model is already training (kwargs of
+        the duplicate request are ignored), or the failed job during the retrain
+        backoff. The future resolves to the published ModelVersion, or None if
+        training failed.
+        """
+        if model_id not in self._trainers:
+            raise KeyError(f"No trainer registered for {model_id}")
+
+        with self._jobs_lock:
+            job = self._jobs.get(model_id)
+            backing_off = (
+                time.monotonic() - self._failed_at.get(model_id, float("-inf"))
+                < RETRAIN_BACKOFF_SECONDS
+            )
+            if job is None or (job.done() and not backing_off):
+                job = self._executor.submit(self._run_training, model_id, kwargs)
+                self._jobs[model_id] = job
+            return job
+
+    def _run_training(self, model_id: str, kwargs: dict[str, Any]) -> ModelVersion | None:
+        start = time.perf_counter()
+        self._last_errors.pop(model_id, None)
+        logger.info(f"Training {model_id} in background...")
+        try:
+            result = self._trainers[model_id](**kwargs)
+        except Exception as e:
+            result = None
+            self._last_errors[model_id] = str(e)
+            logger.error(f"❌ Background training failed for {model_id}: {e}")
+
+        if result is None:
+            self._last_errors.setdefault(model_id, "Training failed - check logs")
+            self._failed_at[model_id] = time.monotonic()
+            return None
+
+        model, metadata = result
+        version = datetime.now(UTC).strftime("%Y%m%d%H%M%S")
+        metadata = {**metadata, "training_seconds": round(time.perf_counter() - start, 2)}
+
+        try:
+            # Uncompressed so other workers can memory-map it on preload
+            self.persistence.save_model(
+                model, model_id, version=version, metadata=metadata, compress=0
+            )
+        except Exception as e:
+            # Still serve the new version from memory
+            logger.error(f"❌ Failed to persist {model_id} v{version}: {e}")
+
+        self._failed_at.pop(model_id, None)
+        return self._publish(model_id, model, version, metadata)
+
+    def _publish(
+        self, model_id: str, model: Any, version: str, metadata: dict[str, Any] | None
+    ) -> ModelVersion:
+        """Atomically make a version active"""
+        entry = ModelVersion(model_id, version, model, metadata or {})
+        self._active[model_id] = entry
+        logger.info(f"✅ Published {model_id} v{version}")
+        return entry
+
+    def status(self) -> dict[str, dict[str, Any]]:
+        """Active version, training state and last error for each registered model"""
+        status = {}
+        for model_id in list(self._trainers):
+            entry = self._active.get(model_id)
+            status[model_id] = {
+                "ready": entry is not None,
+                "version": entry.version if entry else None,
+                "loaded_at": entry.loaded_at.isoformat() if entry else None,
+                "metadata": entry.metadata if entry else {},
+                "training": self.is_training(model_id),
+                "last_error": self._last_errors.get(model_id),
+            }
+        return status
+
+
+# Singleton instance
+_model_registry = None
+
+
+def get_model_registry() -> ModelRegistry:
+    """Get or create model registry singleton"""
+    global _model_registry
+    if _model_registry is None:
+        _model_registry = ModelRegistry()
+    return _model_registry
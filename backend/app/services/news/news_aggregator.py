@@ -4,14 +4,7 @@ from datetime import datetime, timezone
 from difflib import SequenceMatcher
 from typing import Any
 
-from tenacity import (
-    before_sleep_log,
-    retry,
-    retry_if_exception_type,
-    stop_after_attempt,
-    wait_exponential,
-)
-
+from ...core.resilience import BreakerGroup, CircuitBreaker, CircuitOpenError, call
 from .alpha_vantage_provider import AlphaVantageProvider
 from .base_provider import NewsArticle
 from .finnhub_provider import FinnhubProvider
@@ -21,98 +14,19 @@ from .polygon_provider import PolygonProvider
 logger = logging.getLogger(__name__)
 
 
-class CircuitBreaker:
-    """
-    Circuit breaker pattern to prevent hammering failed providers.
-
-    States:
-    - CLOSED: Normal operation, allows requests
-    - OPEN: Provider is failing, blocks requests for cooldown period
-    - HALF_OPEN: Testing if provider recovered
-    """
-
-    def __init__(self, failure_threshold: int = 3, cooldown_seconds: int = 60):
-        """
-        Initialize circuit breaker
-
-        Args:
-            failure_threshold: Number of consecutive failures before opening circuit
-            cooldown_seconds: How long to wait before testing provider again
-        """
-        self.failure_threshold = failure_threshold
-        self.cooldown_seconds = cooldown_seconds
-        self.failure_count = 0
-        self.last_failure_time: datetime | None = None
-        self.state = "CLOSED"  # CLOSED, OPEN, HALF_OPEN
-
-    def record_success(self):
-        """Record successful call - reset circuit"""
-        self.failure_count = 0
-        self.state = "CLOSED"
-        self.last_failure_time = None
-
-    def record_failure(self):
-        """Record failed call - increment counter and potentially open circuit"""
-        # If we're in HALF_OPEN, reset count to allow gradual recovery
-        if self.state == "HALF_OPEN":
-            self.failure_count = 1  # Gradual recovery: start with 1 failure instead of keeping full count
-            logger.info(
-                "[Circuit Breaker] HALF_OPEN test failed - resetting to 1 failure for gradual recovery"
-            )
-        else:
-            self.failure_count += 1
-
-        self.last_failure_time = datetime.now(timezone.utc)
-
-        if self.failure_count >= self.failure_threshold:
-            self.state = "OPEN"
-            logger.warning(
-                f"[Circuit Breaker] OPENED after {self.failure_count} failures. "
-                f"Cooldown: {self.cooldown_seconds}s"
-            )
-
-    def is_available(self) -> bool:
-        """Check if requests should be allowed"""
-        if self.state == "CLOSED":
-            return True
-
-        if self.state == "OPEN":
-            # Check if cooldown period has elapsed
-            if self.last_failure_time:
-                elapsed = (datetime.now(timezone.utc) - self.last_failure_time).total_seconds()
-                if elapsed >= self.cooldown_seconds:
-                    # Move to HALF_OPEN to test provider
-                    self.state = "HALF_OPEN"
-                    logger.info("[Circuit Breaker] HALF_OPEN - testing provider")
-                    return True
-            return False
-
-        # HALF_OPEN state - allow one test request
-        return True
-
-    def get_state(self) -> dict[str, Any]:
-        """Get circuit breaker status"""
-        return {
-            "state": self.state,
-            "failure_count": self.failure_count,
-            "last_failure": self.last_failure_time.isoformat()
-            if self.last_failure_time
-            else None,
-        }
-
-
 class NewsAggregator:
     def __init__(self):
         self.providers = []
         self.circuit_breakers: dict[str, CircuitBreaker] = {}
+        # Tuned: 60s→30s cooldown for faster recovery
+        self._breakers = BreakerGroup("news", failure_threshold=3, cooldown_seconds=30)
 
         # Try to initialize each provider (fail gracefully if API key missing)
         try:
             provider = FinnhubProvider()
             self.providers.append(provider)
-            self.circuit_breakers[provider.get_provider_name()] = CircuitBreaker(
-                failure_threshold=3,
-                cooldown_seconds=30,  # Tuned: 60s→30s for faster recovery
+            self.circuit_breakers[provider.get_provider_name()] = self._breakers.get(
+                provider.get_provider_name()
             )
             logger.info("[OK] Finnhub provider initialized")
         except Exception as e:
@@ -121,9 +35,8 @@ class NewsAggregator:
         try:
             provider = AlphaVantageProvider()
             self.providers.append(provider)
-            self.circuit_breakers[provider.get_provider_name()] = CircuitBreaker(
-                failure_threshold=3,
-                cooldown_seconds=30,  # Tuned: 60s→30s for faster recovery
+            self.circuit_breakers[provider.get_provider_name()] = self._breakers.get(
+                provider.get_provider_name()
             )
             logger.info("[OK] Alpha Vantage provider initialized")
         except Exception as e:
@@ -132,9 +45,8 @@ class NewsAggregator:
         try:
             provider = PolygonProvider()
             self.providers.append(provider)
-            self.circuit_breakers[provider.get_provider_name()] = CircuitBreaker(
-                failure_threshold=3,
-                cooldown_seconds=30,  # Tuned: 60s→30s for faster recovery
+            self.circuit_breakers[provider.get_provider_name()] = self._breakers.get(
+                provider.get_provider_name()
             )
             logger.info("[OK] Polygon provider initialized")
         except Exception as e:
@@ -143,18 +55,15 @@ class NewsAggregator:
         if not self.providers:
             raise ValueError("No news providers available - check API keys!")
 
-    @retry(
-        stop=stop_after_attempt(3),
-        wait=wait_exponential(multiplier=1, min=1, max=10),
-        retry=retry_if_exception_type((ConnectionError, TimeoutError)),
-        before_sleep=before_sleep_log(logger, logging.WARNING),
-    )
     def _call_provider_with_retry(
         self, provider, method_name: str, *args, **kwargs
     ) -> list[NewsArticle]:
         """
         Call provider method with retry logic and circuit breaker
 
+        Connection errors and timeouts are retried (3 attempts, exponential backoff);
+        any other error, or an open circuit, yields an empty list.
+
         Args:
             provider: News provider instance
             method_name: Method to call ('get_company_news' or 'get_market_news')
@@ -164,46 +73,43 @@ class NewsAggregator:
             List of NewsArticle objects
 
         Raises:
-            Exception: If all retries fail or circuit breaker is open
+            Exception: If all retries fail
         """
         provider_name = provider.get_provider_name()
         breaker = self.circuit_breakers.get(provider_name)
+        method = getattr(provider, method_name)
 
-        # Check circuit breaker
-        if breaker and not breaker.is_available():
-            logger.warning(
-                f"[Circuit Breaker] {provider_name} circuit is OPEN - skipping"
+        try:
+            articles = call(
+                breaker,
+                lambda: method(*args, **kwargs),
+                attempts=3,
+                base_delay=1.0,
+                max_delay=10.0,
+                retry_on=(ConnectionError, TimeoutError),
+                name=provider_name,
             )
+        except CircuitOpenError:
+            logger.warning(f"[Circuit Breaker] {provider_name} circuit is OPEN - skipping")
             return []
-
-        try:
-            # Call provider method
-            method = getattr(provider, method_name)
-            articles = method(*args, **kwargs)
-
-            # Success - reset circuit breaker
-            if breaker:
-                breaker.record_success()
-
-            logger.info(f"[OK] {provider_name}: {len(articles)} articles")
-            return articles
-
         except Exception as e:
-            # Record failure in circuit breaker
-            if breaker:
-                breaker.record_failure()
-
             logger.error(
                 f"[ERROR] {provider_name} failed: {e} "
                 f"(Circuit: {breaker.state if breaker else 'N/A'})"
             )
-
-            # Re-raise for retry logic (if retryable exception)
+            # Retries exhausted on a retryable error - let the caller see it
             if isinstance(e, (ConnectionError, TimeoutError)):
                 raise
             # For non-retryable errors, return empty list
             return []
 
+        logger.info(f"[OK] {provider_name}: {len(articles)} articles")
+        return articles
+
+    def _active_provider_count(self) -> int:
+        """Providers whose circuit is not open"""
+        return sum(1 for breaker in self.circuit_breakers.values() if breaker.state != "OPEN")
+
     def get_company_news(self, symbol: str, days_back: int = 7) -> list[dict[str, Any]]:
         """
         Aggregate news from all providers for a specific company.
@@ -243,7 +149,7 @@ class NewsAggregator:
 
         logger.info(
             f"[NEWS] {symbol}: {len(all_articles)} articles -> {len(aggregated)} unique "
-            f"(providers: {len([p for p in self.providers if self.circuit_breakers.get(p.get_provider_name(), CircuitBreaker()).state != 'OPEN'])} active)"
+            f"(providers: {self._active_provider_count()} active)"
         )
 
         return [article.to_dict() for article in aggregated]
@@ -287,16 +193,7 @@ class NewsAggregator:
         # Prioritize
         aggregated = self._prioritize(aggregated)
 
-        active_providers = len(
-            [
-                p
-                for p in self.providers
-                if self.circuit_breakers.get(
-                    p.get_provider_name(), CircuitBreaker()
-                ).state
-                != "OPEN"
-            ]
-        )
+        active_providers = self._active_provider_count()
 
         logger.info(
             f"[NEWS] Market: {len(all_articles)} articles -> {len(aggregated)} unique "
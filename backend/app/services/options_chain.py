@@ -0,0 +1,229 @@
+"""
+Options Chain Snapshots with Encode-Once Wire Formats
+
+SPY chains run to thousands of contracts, and the chain endpoint used to build
+one pydantic model per contract and re-serialize the whole list on every cache
+hit. A ChainSnapshot holds one fetched version of a chain instead:
+
+- Contracts are kept as plain rows (the OptionContract fields) parsed once
+- Each wire format is encoded at most once per snapshot and the bytes reused:
+    json      {"data": {...calls: [rows], puts: [rows]}, "timestamp"} (the original shape)
+    columnar  struct-of-arrays JSON: one array per field for calls and puts
+    msgpack   the columnar payload as MessagePack (requires msgpack)
+- A content digest of the contracts gives a stable ETag per format, so polling
+  clients get 304 Not Modified until the chain actually changes
+
+Usage:
+    from app.services.options_chain import ChainSnapshot
+
+    snapshot = ChainSnapshot.from_tradier("SPY", "2025-01-17", chain_data, underlying_price)
+    body, media_type = snapshot.encode("columnar")
+"""
+
+import hashlib
+import json
+from datetime import UTC, datetime
+from typing import Any
+
+
+try:
+    import orjson
+
+    def _dumps(value: Any) -> bytes:
+        return orjson.dumps(value)
+
+except ImportError:
+    # Graceful degradation if orjson not installed
+    def _dumps(value: Any) -> bytes:
+        return json.dumps(value, separators=(",", ":")).encode()
+
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+
+WIRE_FORMATS = ("json", "columnar", "msgpack")
+
+MEDIA_TYPES = {
+    "json": "application/json",
+    "columnar": "application/json",
+    "msgpack": "application/x-msgpack",
+}
+
+# Per-contract fields, in OptionContract order
+CONTRACT_FIELDS = (
+    "symbol",
+    "underlying_symbol",
+    "option_type",
+    "strike_price",
+    "expiration_date",
+    "bid",
+    "ask",
+    "last_price",
+    "volume",
+    "open_interest",
+    "delta",
+    "gamma",
+    "theta",
+    "vega",
+    "rho",
+    "implied_volatility",
+)
+
+# Fields sent as columns (the rest are the same for every contract on a side)
+COLUMN_FIELDS = tuple(
+    f for f in CONTRACT_FIELDS if f not in ("underlying_symbol", "option_type", "expiration_date")
+)
+
+
+def option_list(chain_data: dict | None) -> list[dict]:
+    """Contracts of a Tradier /markets/options/chains response"""
+    if not chain_data:
+        return []
+    options_data = chain_data.get("options") or {}
+    if not options_data and "option" in chain_data:
+        # Alternative response structure
+        options_data = chain_data
+    contracts = options_data.get("option") or []
+    return [contracts] if isinstance(contracts, dict) else contracts
+
+
+def contract_row(opt: dict, symbol: str, expiration: str) -> dict[str, Any]:
+    """OptionContract fields for one Tradier contract"""
+    greeks = opt.get("greeks") or {}
+    return {
+        "symbol": opt.get("symbol", ""),
+        "underlying_symbol": symbol,
+        "option_type": opt.get("option_type", ""),
+        "strike_price": float(opt.get("strike", 0)),
+        "expiration_date": opt.get("expiration_date", expiration),
+        "bid": opt.get("bid"),
+        "ask": opt.get("ask"),
+        "last_price": opt.get("last"),
+        "volume": opt.get("volume"),
+        "open_interest": opt.get("open_interest"),
+        "delta": greeks.get("delta"),
+        "gamma": greeks.get("gamma"),
+        "theta": greeks.get("theta"),
+        "vega": greeks.get("vega"),
+        "rho": greeks.get("rho"),
+        "implied_volatility": greeks.get("mid_iv"),
+    }
+
+
+class ChainSnapshot:
+    """One fetched version of an options chain, encoded lazily and at most once per format"""
+
+    def __init__(
+        self,
+        symbol: str,
+        expiration: str,
+        calls: list[dict[str, Any]],
+        puts: list[dict[str, Any]],
+        underlying_price: float | None = None,
+        fetched_at: datetime | None = None,
+    ):
+        """
+        Args:
+            symbol: Underlying symbol
+            expiration: Expiration date (YYYY-MM-DD)
+            calls: Call contract rows (CONTRACT_FIELDS)
+            puts: Put contract rows (CONTRACT_FIELDS)
+            underlying_price: Last price of the underlying
+            fetched_at: When the chain was fetched (default: now)
+        """
+        self.symbol = symbol
+        self.expiration = expiration
+        self.calls = calls
+        self.puts = puts
+        self.underlying_price = underlying_price
+        self.fetched_at = fetched_at or datetime.now(UTC)
+        self._digest: str | None = None
+        self._columns: dict[str, dict[str, list]] | None = None
+        self._encoded: dict[str, bytes] = {}
+
+    @classmethod
+    def from_tradier(
+        cls,
+        symbol: str,
+        expiration: str,
+        chain_data: dict | None,
+        underlying_price: float | None = None,
+    ) -> "ChainSnapshot":
+        """Parse a Tradier chain response into call and put rows"""
+        calls, puts = [], []
+        for opt in option_list(chain_data):
+            row = contract_row(opt, symbol, expiration)
+            (calls if opt.get("option_type") == "call" else puts).append(row)
+        return cls(symbol, expiration, calls, puts, underlying_price)
+
+    @property
+    def total_contracts(self) -> int:
+        return len(self.calls) + len(self.puts)
+
+    @property
+    def digest(self) -> str:
+        """Content hash of the chain (independent of fetch time)"""
+        if self._digest is None:
+            content = [self.symbol, self.expiration, self.underlying_price, self.columns()]
+            self._digest = hashlib.blake2b(_dumps(content), digest_size=12).hexdigest()
+        return self._digest
+
+    def etag(self, fmt: str) -> str:
+        """Weak ETag for one wire format (body timestamps may differ for equal content)"""
+        return f'W/"{self.digest}-{fmt}"'
+
+    def columns(self) -> dict[str, dict[str, list]]:
+        """Struct-of-arrays view: one list per field for calls and puts"""
+        if self._columns is None:
+            self._columns = {
+                side: {field: [row[field] for row in rows] for field in COLUMN_FIELDS}
+                for side, rows in (("calls", self.calls), ("puts", self.puts))
+            }
+        return self._columns
+
+    def _payload(self, fmt: str) -> Any:
+        timestamp = self.fetched_at.isoformat()
+        if fmt == "json":
+            return {
+                "data": {
+                    "symbol": self.symbol,
+                    "expiration_date": self.expiration,
+                    "underlying_price": self.underlying_price,
+                    "calls": self.calls,
+                    "puts": self.puts,
+                    "total_contracts": self.total_contracts,
+                },
+                "timestamp": timestamp,
+            }
+        return {
+            "symbol": self.symbol,
+            "expiration_date": self.expiration,
+            "underlying_price": self.underlying_price,
+            "total_contracts": self.total_contracts,
+            "format": "columnar",
+            **self.columns(),
+            "timestamp": timestamp,
+        }
+
+    def encode(self, fmt: str) -> tuple[bytes, str]:
+        """
+        Encoded body and media type for a wire format (cached per snapshot)
+
+        Raises:
+            ValueError: Unknown format, or msgpack requested but not installed
+        """
+        if fmt not in WIRE_FORMATS:
+            raise ValueError(f"Unknown chain format: {fmt}")
+        body = self._encoded.get(fmt)
+        if body is None:
+            if fmt == "msgpack":
+                if msgpack is None:
+                    raise ValueError("msgpack format requires the msgpack package")
+                body = msgpack.packb(self._payload(fmt), use_bin_type=True)
+            else:
+                body = _dumps(self._payload(fmt))
+            self._encoded[fmt] = body
+        return body, MEDIA_TYPES[fmt]
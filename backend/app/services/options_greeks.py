@@ -16,7 +16,13 @@ from dataclasses import dataclass
 from datetime import datetime
 from typing import Literal
 
-from scipy.stats import norm
+import numpy as np
+
+from ..core.lazy_import import lazy_import
+
+
+# scipy.stats takes ~1s to import; load it on the first Greeks calculation
+norm = lazy_import("scipy.stats", "norm")
 
 
 @dataclass
@@ -132,6 +138,80 @@ class GreeksCalculator:
             probability_itm=prob_itm,
         )
 
+    def calculate_greeks_batch(
+        self,
+        spot_price: np.ndarray,
+        strike_price: np.ndarray,
+        time_to_expiry: np.ndarray,  # in years
+        volatility: np.ndarray,
+        is_call: np.ndarray,
+        dividend_yield: float = 0.0,
+    ) -> dict[str, np.ndarray]:
+        """
+        Calculate delta, gamma, theta, vega and rho for many options at once
+
+        Vectorized equivalent of calculate_greeks with the same conventions
+        (theta per day, vega and rho per 1% change). Inputs broadcast against
+        each other; options at or past expiration get intrinsic delta and zero
+        for the other Greeks.
+
+        Returns:
+            Dict of arrays keyed by "delta", "gamma", "theta", "vega", "rho"
+        """
+        spot, strike, expiry, vol = np.broadcast_arrays(
+            *(
+                np.asarray(x, dtype=float)
+                for x in (spot_price, strike_price, time_to_expiry, volatility)
+            )
+        )
+        is_call = np.broadcast_to(np.asarray(is_call, dtype=bool), spot.shape)
+        live = expiry > 0
+        t = np.where(live, expiry, 1.0)
+        r = self.risk_free_rate
+        q = dividend_yield
+
+        with np.errstate(divide="ignore", invalid="ignore"):
+            sqrt_t = np.sqrt(t)
+            d1 = (np.log(spot / strike) + (r - q + 0.5 * vol**2) * t) / (vol * sqrt_t)
+            d2 = d1 - vol * sqrt_t
+            discount_factor = np.exp(-r * t)
+            dividend_discount = np.exp(-q * t)
+            pdf_d1 = norm.pdf(d1)
+            cdf_d1 = norm.cdf(d1)
+            cdf_d2 = norm.cdf(d2)
+
+            delta = np.where(is_call, dividend_discount * cdf_d1, dividend_discount * (cdf_d1 - 1))
+            gamma = dividend_discount * pdf_d1 / (spot * vol * sqrt_t)
+
+            first_term = -(spot * dividend_discount * pdf_d1 * vol) / (2 * sqrt_t)
+            theta_call = (
+                first_term
+                - r * strike * discount_factor * cdf_d2
+                + q * spot * dividend_discount * cdf_d1
+            )
+            theta_put = (
+                first_term
+                + r * strike * discount_factor * (1 - cdf_d2)
+                - q * spot * dividend_discount * (1 - cdf_d1)
+            )
+            theta = np.where(is_call, theta_call, theta_put) / 365
+
+            vega = spot * dividend_discount * pdf_d1 * sqrt_t / 100
+            rho = (
+                np.where(is_call, cdf_d2, cdf_d2 - 1) * strike * t * discount_factor / 100
+            )
+
+        expired_delta = np.where(
+            is_call, (spot > strike).astype(float), -(spot < strike).astype(float)
+        )
+        return {
+            "delta": np.where(live, delta, expired_delta),
+            "gamma": np.where(live, gamma, 0.0),
+            "theta": np.where(live, theta, 0.0),
+            "vega": np.where(live, vega, 0.0),
+            "rho": np.where(live, rho, 0.0),
+        }
+
     def _calculate_d1(
         self,
         spot_price: float,
@@ -7,19 +7,48 @@ Calculates portfolio metrics and performance analytics including:
 - Performance attribution
 - Sector allocation analysis
 - Win/loss statistics
+- Simulated VaR/CVaR and stress scenarios (see portfolio_risk)
 
 This service consolidates portfolio calculation logic from multiple routers.
 """
 
+import asyncio
+import hashlib
+import json
 import logging
 import math
+import time
+from datetime import datetime, timedelta
 from typing import Any
 
+import numpy as np
+
+from ..services.portfolio_backtest import align_bars
+from ..services.portfolio_risk import (
+    DEFAULT_IV,
+    SIMULATION_METHODS,
+    build_book,
+    parse_holding,
+    run_risk,
+)
 from ..services.tradier_client import TradierClient
 
 
 logger = logging.getLogger(__name__)
 
+# Daily return matrices are refetched after this many seconds
+RETURNS_CACHE_TTL = 3600
+
+# Risk reports are reused for an unchanged position snapshot for this many seconds
+RISK_CACHE_TTL = 300
+RISK_CACHE_MAX_ENTRIES = 128
+
+# Concurrent historical bar fetches when building a return matrix
+RISK_FETCH_CONCURRENCY = 8
+
+# Underlyings with fewer daily returns than this are left out of the simulation
+MIN_RETURN_OBSERVATIONS = 20
+
 
 class PortfolioAnalyticsService:
     """
@@ -36,6 +65,8 @@ class PortfolioAnalyticsService:
             tradier_client: Tradier API client for account/position data
         """
         self.tradier = tradier_client
+        self._returns_cache: dict[tuple, tuple[float, list[str], np.ndarray]] = {}
+        self._risk_cache: dict[str, tuple[float, dict[str, Any]]] = {}
 
     async def calculate_portfolio_metrics(self, user_id: str | None = None) -> dict[str, Any]:
         """
@@ -441,6 +472,180 @@ class PortfolioAnalyticsService:
             "profit_factor": round(profit_factor, 2),
         }
 
+    async def calculate_portfolio_risk(
+        self,
+        positions: list[dict] | None = None,
+        methods: tuple[str, ...] = SIMULATION_METHODS,
+        confidence_levels: tuple[float, ...] = (0.95, 0.99),
+        horizon_days: int = 1,
+        paths: int = 100_000,
+        lookback_days: int = 365,
+        seed: int | None = None,
+    ) -> dict[str, Any]:
+        """
+        Simulate the portfolio's P&L distribution and report VaR/CVaR.
+
+        Prices and implied volatilities come from one batched quote request and
+        daily returns from the cached return matrix of the underlyings. The
+        report is cached per position snapshot (symbols, quantities, prices)
+        and parameters.
+
+        Args:
+            positions: Position dicts (symbol, qty, side); default: the account's positions
+            methods: Simulation methods ("historical", "normal", "bootstrap")
+            confidence_levels: VaR confidence levels
+            horizon_days: Holding period in trading days
+            paths: Monte Carlo scenarios per method
+            lookback_days: Calendar days of daily history behind the returns
+            seed: Random seed for reproducible simulations
+
+        Returns:
+            {
+                "portfolio_value": float,
+                "methods": {method: {"scenarios", "expected_pnl", "worst_pnl",
+                                     "confidence": {"95": {"var", "cvar", ...}}}},
+                "stress": [{"scenario", "pnl", "pnl_percent", ...}],
+                "skipped_symbols": list[str],
+                ...
+            }
+
+        Raises:
+            ValueError: If a method is unknown or there is too little history
+        """
+        unknown = set(methods) - set(SIMULATION_METHODS)
+        if unknown:
+            raise ValueError(f"Unknown simulation methods: {', '.join(sorted(unknown))}")
+
+        started = time.perf_counter()
+        if positions is None:
+            positions = await asyncio.to_thread(self.tradier.get_positions)
+        holdings = [h for h in map(parse_holding, positions) if h.symbol and h.quantity]
+        if not holdings:
+            return {"portfolio_value": 0.0, "positions": 0, "methods": {}, "stress": []}
+
+        # Current prices (and option IVs) for every holding and underlying in one request
+        underlyings = sorted({h.underlying for h in holdings})
+        quotes = await asyncio.to_thread(
+            self._fetch_quotes, [h.symbol for h in holdings if h.is_option] + underlyings
+        )
+        for holding in holdings:
+            quote = quotes.get(holding.symbol, {})
+            holding.price = float(quote.get("last") or holding.price or 0)
+            if holding.is_option:
+                iv = float((quote.get("greeks") or {}).get("mid_iv") or 0)
+                holding.implied_volatility = iv or DEFAULT_IV
+        spots = {u: float(quotes.get(u, {}).get("last") or 0) for u in underlyings}
+
+        snapshot = json.dumps(
+            [
+                sorted((h.symbol, h.quantity, round(h.price, 4)) for h in holdings),
+                [methods, confidence_levels, horizon_days, paths, lookback_days, seed],
+            ]
+        )
+        cache_key = hashlib.sha256(snapshot.encode()).hexdigest()
+        cached = self._risk_cache.get(cache_key)
+        if cached and cached[0] > time.monotonic():
+            logger.info("Cache HIT for portfolio risk")
+            return cached[1]
+
+        columns, returns = await self._get_return_matrix(
+            [u for u in underlyings if spots[u] > 0], lookback_days
+        )
+        included = [h for h in holdings if h.underlying in columns]
+        skipped = sorted({h.symbol for h in holdings} - {h.symbol for h in included})
+        if not included:
+            raise ValueError("No position has a price and enough return history")
+
+        book = build_book(included, spots, columns)
+        report = await asyncio.to_thread(
+            run_risk,
+            book,
+            returns,
+            methods=tuple(methods),
+            confidence_levels=tuple(confidence_levels),
+            horizon_days=horizon_days,
+            paths=paths,
+            seed=seed,
+        )
+        report.update(
+            {
+                "portfolio_value": round(book.value, 2),
+                "positions": len(included),
+                "underlyings": len(columns),
+                "observations": len(returns),
+                "horizon_days": horizon_days,
+                "lookback_days": lookback_days,
+                "skipped_symbols": skipped,
+                "elapsed_ms": round((time.perf_counter() - started) * 1000, 1),
+                "timestamp": datetime.now().isoformat(),
+            }
+        )
+        logger.info(
+            f"Portfolio risk for {len(included)} positions in {report['elapsed_ms']:.0f}ms"
+        )
+
+        now = time.monotonic()
+        if len(self._risk_cache) >= RISK_CACHE_MAX_ENTRIES:
+            self._risk_cache = {k: v for k, v in self._risk_cache.items() if v[0] > now}
+        self._risk_cache[cache_key] = (now + RISK_CACHE_TTL, report)
+        return report
+
+    async def _get_return_matrix(
+        self, symbols: list[str], lookback_days: int
+    ) -> tuple[list[str], np.ndarray]:
+        """
+        Daily log returns of symbols, fetched concurrently and cached.
+
+        Returns:
+            (columns, returns): the symbols with enough history and a (days x
+            columns) array, 0 where a symbol has no bar that day
+        """
+        key = (tuple(symbols), lookback_days)
+        cached = self._returns_cache.get(key)
+        if cached and cached[0] > time.monotonic():
+            return cached[1], cached[2]
+
+        end_date = datetime.now()
+        start_date = end_date - timedelta(days=lookback_days)
+        semaphore = asyncio.Semaphore(RISK_FETCH_CONCURRENCY)
+
+        async def fetch(symbol: str) -> list[dict]:
+            async with semaphore:
+                try:
+                    return await asyncio.to_thread(
+                        self.tradier.get_historical_bars,
+                        symbol,
+                        "daily",
+                        start_date.strftime("%Y-%m-%d"),
+                        end_date.strftime("%Y-%m-%d"),
+                    )
+                except Exception as e:
+                    logger.warning(f"No history for {symbol}: {e}")
+                    return []
+
+        bars = await asyncio.gather(*(fetch(symbol) for symbol in symbols))
+        bars_by_symbol = {symbol: b for symbol, b in zip(symbols, bars, strict=True) if b}
+        if not bars_by_symbol:
+            return [], np.zeros((0, 0))
+
+        _dates, closes = align_bars(bars_by_symbol)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            returns = np.diff(np.log(closes), axis=0)
+        enough = np.isfinite(returns).sum(axis=0) >= MIN_RETURN_OBSERVATIONS
+        columns = [symbol for symbol, ok in zip(bars_by_symbol, enough, strict=True) if ok]
+        returns = np.nan_to_num(returns[:, enough], nan=0.0, posinf=0.0, neginf=0.0)
+
+        self._returns_cache[key] = (time.monotonic() + RETURNS_CACHE_TTL, columns, returns)
+        return columns, returns
+
+    def _fetch_quotes(self, symbols: list[str]) -> dict[str, dict]:
+        """Batched quotes (with option greeks), keyed by symbol"""
+        response = self.tradier.get_quotes(list(dict.fromkeys(symbols)), greeks=True)
+        quotes = (response.get("quotes") or {}).get("quote") or []
+        if isinstance(quotes, dict):
+            quotes = [quotes]
+        return {quote["symbol"]: quote for quote in quotes if "symbol" in quote}
+
     def _calculate_diversification(self, positions: list[dict]) -> float:
         """
         Internal method to calculate diversification score.
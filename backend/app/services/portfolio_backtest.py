@@ -0,0 +1,395 @@
+"""
+Portfolio Backtesting Engine
+
+BacktestingEngine simulates one symbol with its own cash. The portfolio engine
+runs one strategy over a whole watchlist that shares a single book:
+
+- Bars arrive as an aligned closes panel (dates x symbols, NaN where a symbol
+  has no bar); indicators and entry signals for every symbol and date are
+  computed up front as whole-panel NumPy/pandas operations
+- Each step checks exits for all held positions at once, then fills the free
+  slots (max_positions across the book) with the strongest entry signals
+- Position sizing follows BacktestingEngine: each entry takes
+  position_size_percent of the cash left, in signal order
+- One portfolio equity curve and trade history come out, with the same
+  metrics as a single-symbol BacktestResult
+
+Only the date loop remains in Python, so 500 symbols x 10 years of daily bars
+runs in seconds.
+
+Usage:
+    from app.services.portfolio_backtest import PortfolioBacktestingEngine
+
+    engine = PortfolioBacktestingEngine(initial_capital=100000)
+    result = engine.execute_backtest(symbols, dates, closes, strategy)
+"""
+
+import logging
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any
+
+import numpy as np
+import pandas as pd
+
+from .backtesting_engine import StrategyRules
+
+
+logger = logging.getLogger(__name__)
+
+# Trading days per year (Sharpe annualization)
+TRADING_DAYS = 252
+
+
+@dataclass
+class PortfolioBacktestResult:
+    """Portfolio-level backtest results"""
+
+    # Performance metrics
+    total_return: float
+    total_return_percent: float
+    annualized_return: float
+    sharpe_ratio: float
+    max_drawdown: float
+    max_drawdown_percent: float
+
+    # Trade statistics
+    total_trades: int
+    winning_trades: int
+    losing_trades: int
+    win_rate: float
+    avg_win: float
+    avg_loss: float
+    profit_factor: float
+
+    # Book statistics
+    max_concurrent_positions: int
+    avg_positions: float
+
+    # Time series data
+    equity_curve: list[dict[str, Any]]  # [{date, value, drawdown, drawdown_percent, positions}]
+    trade_history: list[dict[str, Any]]
+
+    # Configuration
+    initial_capital: float
+    final_capital: float
+    start_date: str
+    end_date: str
+    symbols: list[str]
+
+
+def _rolling_mean(values: np.ndarray, period: int) -> np.ndarray:
+    """Column-wise trailing mean (NaN until period values are available)"""
+    return pd.DataFrame(values).rolling(period).mean().to_numpy()
+
+
+def rsi_panel(closes: np.ndarray, period: int = 14) -> np.ndarray:
+    """RSI of every column, matching BacktestingEngine.calculate_rsi (simple averages)"""
+    changes = np.diff(closes, axis=0, prepend=np.nan)
+    avg_gain = _rolling_mean(np.where(np.isnan(changes), np.nan, np.maximum(changes, 0)), period)
+    avg_loss = _rolling_mean(np.where(np.isnan(changes), np.nan, np.maximum(-changes, 0)), period)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        rsi = 100 - 100 / (1 + avg_gain / avg_loss)
+    return np.where(avg_loss == 0, 100.0, rsi)
+
+
+def _compare(values: np.ndarray, operator: str, threshold, tolerance: float = 0.0) -> np.ndarray:
+    if operator == "<":
+        return values < threshold
+    if operator == ">":
+        return values > threshold
+    if operator == "=" and tolerance:
+        return np.abs(values - threshold) < tolerance
+    # Other operators do not constrain (as in BacktestingEngine), but need the indicator
+    return np.isfinite(values)
+
+
+def entry_signals(
+    closes: np.ndarray, rules: list[dict[str, Any]], rsi_period: int = 14
+) -> tuple[np.ndarray, np.ndarray]:
+    """
+    Entry signal and ranking score for every date and symbol
+
+    Rules use the BacktestingEngine.check_entry_signal format and are all required.
+    The score ranks competing signals by the first rule: lowest value first for
+    "<" rules (most oversold), highest first for ">" rules.
+
+    Args:
+        closes: Forward-filled closes (dates x symbols)
+        rules: Entry rules, e.g. [{"indicator": "RSI", "operator": "<", "value": 30}]
+        rsi_period: RSI lookback
+
+    Returns:
+        (signals, scores) arrays shaped like closes; lower scores rank first
+    """
+    signals = np.full(closes.shape, bool(rules))
+    scores = np.zeros(closes.shape)
+
+    for position, rule in enumerate(rules):
+        indicator = rule.get("indicator", "").upper()
+        operator = rule.get("operator", "=")
+        value = rule.get("value", 0)
+
+        if indicator == "RSI":
+            measure = rsi_panel(closes, rsi_period)
+            signals &= _compare(measure, operator, value, tolerance=1)
+        elif indicator == "SMA":
+            sma = _rolling_mean(closes, rule.get("period", 20))
+            with np.errstate(invalid="ignore", divide="ignore"):
+                measure = closes / sma
+            signals &= _compare(measure, operator, 1.0)
+        elif indicator == "PRICE":
+            measure = closes
+            signals &= _compare(measure, operator, value)
+        else:
+            continue
+
+        if position == 0:
+            scores = -measure if operator == ">" else measure
+
+    return signals, np.nan_to_num(scores, nan=np.inf)
+
+
+def exit_mask(pnl_percent: np.ndarray, rules: list[dict[str, Any]]) -> np.ndarray:
+    """Positions to close, per BacktestingEngine.check_exit_signal"""
+    result = np.zeros(pnl_percent.shape, dtype=bool)
+    for rule in rules:
+        rule_type = rule.get("type", "")
+        value = rule.get("value", 0)
+        if rule_type == "take_profit":
+            result |= pnl_percent >= value
+        elif rule_type in ("stop_loss", "trailing_stop"):
+            # Trailing stop is simplified to a fixed stop, as in BacktestingEngine
+            result |= pnl_percent <= -value
+    return result
+
+
+class PortfolioBacktestingEngine:
+    """Backtests one strategy across many symbols sharing one book of capital"""
+
+    def __init__(self, initial_capital: float = 100000.0):
+        self.initial_capital = initial_capital
+
+    def execute_backtest(
+        self,
+        symbols: list[str],
+        dates: list[str],
+        closes: np.ndarray,
+        strategy: StrategyRules,
+    ) -> PortfolioBacktestResult:
+        """
+        Execute a portfolio backtest on an aligned closes panel
+
+        Args:
+            symbols: Panel columns
+            dates: Panel rows (ISO dates, ascending)
+            closes: Closes (dates x symbols), NaN where a symbol has no bar
+            strategy: Strategy rules; max_positions applies to the whole book
+
+        Returns:
+            PortfolioBacktestResult with one equity curve for the book
+        """
+        closes = np.asarray(closes, dtype=float)
+        if closes.ndim != 2 or closes.shape != (len(dates), len(symbols)):
+            raise ValueError("closes must be shaped (dates, symbols)")
+        if len(dates) < 20:
+            raise ValueError("Insufficient price data for backtesting")
+
+        has_bar = np.isfinite(closes) & (closes > 0)
+        prices = pd.DataFrame(np.where(has_bar, closes, np.nan)).ffill().to_numpy()
+        signals, scores = entry_signals(prices, strategy.entry_rules, strategy.rsi_period)
+        signals &= has_bar
+
+        n_dates, n_symbols = prices.shape
+        fraction = strategy.position_size_percent / 100
+        held = np.zeros(n_symbols, dtype=bool)
+        quantity = np.zeros(n_symbols)
+        entry_price = np.zeros(n_symbols)
+        entry_step = np.zeros(n_symbols, dtype=int)
+        cash = self.initial_capital
+        equity = np.empty(n_dates)
+        positions = np.empty(n_dates, dtype=int)
+        closed: list[tuple[np.ndarray, ...]] = []
+
+        def close_out(step: int, index: np.ndarray):
+            nonlocal cash
+            exit_price = prices[step, index]
+            cash += float((quantity[index] * exit_price).sum())
+            closed.append(
+                (
+                    index,
+                    entry_step[index],
+                    np.full(len(index), step),
+                    entry_price[index],
+                    exit_price,
+                    quantity[index],
+                )
+            )
+            held[index] = False
+
+        for step in range(n_dates):
+            price = prices[step]
+
+            if held.any():
+                with np.errstate(invalid="ignore", divide="ignore"):
+                    pnl_percent = (price / entry_price - 1) * 100
+                exiting = np.flatnonzero(
+                    held & has_bar[step] & exit_mask(pnl_percent, strategy.exit_rules)
+                )
+                if len(exiting):
+                    close_out(step, exiting)
+
+            free = strategy.max_positions - int(held.sum())
+            if free > 0:
+                candidates = np.flatnonzero(signals[step] & ~held)
+                if len(candidates):
+                    if len(candidates) > free:
+                        best = np.argpartition(scores[step, candidates], free - 1)[:free]
+                        candidates = candidates[best]
+                    candidates = candidates[np.argsort(scores[step, candidates], kind="stable")]
+
+                    # Each entry takes position_size_percent of the cash left
+                    allocation = cash * fraction * (1 - fraction) ** np.arange(len(candidates))
+                    shares = np.floor(allocation / price[candidates])
+                    buy = shares > 0
+                    candidates, shares = candidates[buy], shares[buy]
+                    cash -= float((shares * price[candidates]).sum())
+                    held[candidates] = True
+                    quantity[candidates] = shares
+                    entry_price[candidates] = price[candidates]
+                    entry_step[candidates] = step
+
+            equity[step] = cash + float((quantity[held] * price[held]).sum())
+            positions[step] = int(held.sum())
+
+        if held.any():
+            close_out(n_dates - 1, np.flatnonzero(held))
+
+        return self._calculate_metrics(symbols, dates, equity, positions, closed)
+
+    def _calculate_metrics(
+        self,
+        symbols: list[str],
+        dates: list[str],
+        equity: np.ndarray,
+        positions: np.ndarray,
+        closed: list[tuple[np.ndarray, ...]],
+    ) -> PortfolioBacktestResult:
+        """Performance, trade and book metrics from the equity curve and closed trades"""
+        peak = np.maximum.accumulate(np.maximum(equity, self.initial_capital))
+        drawdown = peak - equity
+        drawdown_percent = np.where(peak > 0, drawdown / peak * 100, 0.0)
+
+        final_capital = float(equity[-1])
+        total_return = final_capital - self.initial_capital
+        days = (datetime.fromisoformat(dates[-1]) - datetime.fromisoformat(dates[0])).days
+        years = days / 365.0 if days > 0 else 1.0
+        annualized_return = ((final_capital / self.initial_capital) ** (1 / years) - 1) * 100
+
+        returns = np.diff(equity) / equity[:-1]
+        std = returns.std() if len(returns) else 0.0
+        sharpe_ratio = returns.mean() / std * np.sqrt(TRADING_DAYS) if std > 0 else 0.0
+
+        if closed:
+            index, opened, exited, entry, exit_price, quantity = (
+                np.concatenate(column) for column in zip(*closed)
+            )
+        else:
+            index = opened = exited = np.array([], dtype=int)
+            entry = exit_price = quantity = np.array([])
+        pnl = (exit_price - entry) * quantity
+        wins, losses = pnl[pnl > 0], pnl[pnl < 0]
+        if len(losses):
+            profit_factor = wins.sum() / abs(losses.sum())
+        elif len(wins):
+            profit_factor = 999.99  # Same "infinite" marker as BacktestingEngine
+        else:
+            profit_factor = 0.0
+
+        order = np.lexsort((index, exited))
+        trade_history = [
+            {
+                "symbol": symbols[index[i]],
+                "entry_date": dates[opened[i]],
+                "exit_date": dates[exited[i]],
+                "entry_price": round(float(entry[i]), 2),
+                "exit_price": round(float(exit_price[i]), 2),
+                "quantity": int(quantity[i]),
+                "side": "long",
+                "pnl": round(float(pnl[i]), 2),
+                "pnl_percent": round(float((exit_price[i] / entry[i] - 1) * 100), 2),
+                "status": "closed",
+            }
+            for i in order
+        ]
+        equity_curve = [
+            {
+                "date": date,
+                "value": round(float(value), 2),
+                "drawdown": round(float(dd), 2),
+                "drawdown_percent": round(float(dd_pct), 2),
+                "positions": int(count),
+            }
+            for date, value, dd, dd_pct, count in zip(
+                dates, equity, drawdown, drawdown_percent, positions
+            )
+        ]
+
+        return PortfolioBacktestResult(
+            total_return=round(total_return, 2),
+            total_return_percent=round(total_return / self.initial_capital * 100, 2),
+            annualized_return=round(float(annualized_return), 2),
+            sharpe_ratio=round(float(sharpe_ratio), 2),
+            max_drawdown=round(float(drawdown.max()), 2),
+            max_drawdown_percent=round(float(drawdown_percent.max()), 2),
+            total_trades=len(pnl),
+            winning_trades=len(wins),
+            losing_trades=len(losses),
+            win_rate=round(len(wins) / len(pnl) * 100, 2) if len(pnl) else 0.0,
+            avg_win=round(float(wins.mean()), 2) if len(wins) else 0.0,
+            avg_loss=round(float(losses.mean()), 2) if len(losses) else 0.0,
+            profit_factor=round(float(profit_factor), 2),
+            max_concurrent_positions=int(positions.max()),
+            avg_positions=round(float(positions.mean()), 2),
+            equity_curve=equity_curve,
+            trade_history=trade_history,
+            initial_capital=self.initial_capital,
+            final_capital=round(final_capital, 2),
+            start_date=dates[0],
+            end_date=dates[-1],
+            symbols=list(symbols),
+        )
+
+
+def align_bars(bars_by_symbol: dict[str, list[dict[str, Any]]]) -> tuple[list[str], np.ndarray]:
+    """
+    Align per-symbol OHLCV bars into a closes panel
+
+    Returns:
+        (dates, closes): the union of bar dates and a (dates x symbols) array in
+        bars_by_symbol order, NaN where a symbol has no bar
+    """
+    series = {
+        symbol: pd.Series(
+            [bar["close"] for bar in bars], index=[bar["date"] for bar in bars], dtype=float
+        )
+        for symbol, bars in bars_by_symbol.items()
+    }
+    panel = pd.DataFrame(series).sort_index()
+    return [str(date) for date in panel.index], panel.to_numpy()
+
+
+def run_portfolio_backtest_task(
+    symbols: list[str],
+    dates: list[str],
+    closes: np.ndarray,
+    strategy: StrategyRules,
+    initial_capital: float = 100000.0,
+) -> PortfolioBacktestResult:
+    """
+    Compute pool entry point for PortfolioBacktestingEngine.execute_backtest
+
+    The closes panel is passed to the worker through shared memory.
+    """
+    engine = PortfolioBacktestingEngine(initial_capital=initial_capital)
+    return engine.execute_backtest(symbols, dates, closes, strategy)
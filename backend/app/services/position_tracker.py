@@ -1,19 +1,42 @@
 """
 Position Tracking Service - Monitor open positions and calculate P&L
+
+Positions are valued in one batched Tradier quote request covering every option
+contract (with implied volatility) and its underlying, and greeks for all
+positions are computed in one vectorized pass. Portfolio greeks are kept in a
+PortfolioGreeksAggregate that is updated incrementally on every streamed price
+tick for the underlyings, so /positions/greeks answers from memory.
 """
 
+import asyncio
 import logging
+import re
+import threading
+import time
 from datetime import datetime
 
+import numpy as np
 from pydantic import BaseModel
 
 from app.services.alpaca_client import get_alpaca_client
 from app.services.greeks import GreeksCalculator
 from app.services.tradier_client import get_tradier_client
+from app.services.tradier_stream import get_tradier_stream
 
 
 logger = logging.getLogger(__name__)
 
+# Positions (quantities, contracts, IVs) are re-read from the broker at least this often
+POSITIONS_REFRESH_SECONDS = 60
+
+# Implied volatility assumed when the quote has none
+DEFAULT_IV = 0.3
+
+GREEK_NAMES = ("delta", "gamma", "theta", "vega")
+
+# OCC option symbol: underlying, YYMMDD expiry, C/P, strike x 1000 (8 digits)
+OCC_SYMBOL = re.compile(r"^(?P<underlying>[A-Z.]+)(?P<date>\d{6})(?P<type>[CP])(?P<strike>\d{8})$")
+
 
 class PositionGreeks(BaseModel):
     delta: float
@@ -47,55 +70,218 @@ class PortfolioGreeks(BaseModel):
     position_count: int
 
 
+class _UnderlyingBook:
+    """Option positions on one underlying, stored as arrays"""
+
+    def __init__(self, option_types, strikes, days_to_expiry, ivs, qtys, price):
+        self.option_types = option_types
+        self.strikes = strikes
+        self.days_to_expiry = days_to_expiry
+        self.ivs = ivs
+        self.qtys = qtys
+        self.price = price
+        self.contribution = np.zeros(len(GREEK_NAMES))
+
+
+class PortfolioGreeksAggregate:
+    """
+    Portfolio greeks maintained incrementally from underlying price ticks
+
+    Loaded with the open option positions after each batched valuation. A price
+    tick for an underlying recomputes only that underlying's positions and swaps
+    their contribution into the running totals.
+    """
+
+    def __init__(self, greeks_calc: GreeksCalculator | None = None):
+        self.greeks_calc = greeks_calc or GreeksCalculator(risk_free_rate=0.05)
+        self._lock = threading.Lock()
+        self._books: dict[str, _UnderlyingBook] = {}
+        self._totals = np.zeros(len(GREEK_NAMES))
+        self._loaded_at: float | None = None
+        self.position_count = 0
+        self.ticks_applied = 0
+
+    def is_fresh(self, max_age: float = POSITIONS_REFRESH_SECONDS) -> bool:
+        return self._loaded_at is not None and time.monotonic() - self._loaded_at < max_age
+
+    def invalidate(self):
+        """Force the next read to re-value positions (e.g. after an order)"""
+        self._loaded_at = None
+
+    def underlyings(self) -> list[str]:
+        return list(self._books)
+
+    def load(
+        self,
+        underlyings: list[str],
+        option_types: list[str],
+        strikes: np.ndarray,
+        days_to_expiry: np.ndarray,
+        ivs: np.ndarray,
+        qtys: np.ndarray,
+        prices: dict[str, float],
+    ):
+        """Replace the tracked positions and recompute totals from scratch"""
+        books = {}
+        for symbol in dict.fromkeys(underlyings):
+            idx = [i for i, u in enumerate(underlyings) if u == symbol]
+            books[symbol] = _UnderlyingBook(
+                [option_types[i] for i in idx],
+                strikes[idx],
+                days_to_expiry[idx],
+                ivs[idx],
+                qtys[idx],
+                prices.get(symbol, 0.0),
+            )
+
+        totals = np.zeros(len(GREEK_NAMES))
+        for book in books.values():
+            book.contribution = self._contribution(book, book.price)
+            totals += book.contribution
+
+        with self._lock:
+            self._books = books
+            self._totals = totals
+            self.position_count = len(underlyings)
+            self._loaded_at = time.monotonic()
+
+    def on_tick(self, symbol: str, price: float):
+        """Stream tick listener: re-price one underlying's positions"""
+        book = self._books.get(symbol)
+        if book is None or not price > 0 or price == book.price:
+            return
+
+        contribution = self._contribution(book, price)
+        with self._lock:
+            if self._books.get(symbol) is not book:
+                return  # positions were reloaded meanwhile
+            self._totals += contribution - book.contribution
+            book.contribution = contribution
+            book.price = price
+            self.ticks_applied += 1
+
+    def _contribution(self, book: _UnderlyingBook, price: float) -> np.ndarray:
+        """Quantity-weighted greeks of one underlying's positions"""
+        greeks = self.greeks_calc.calculate_greeks_batch(
+            book.option_types, price, book.strikes, book.days_to_expiry, book.ivs
+        )
+        matrix = np.nan_to_num(np.vstack([greeks[name] for name in GREEK_NAMES]))
+        return matrix @ book.qtys
+
+    def snapshot(self) -> PortfolioGreeks:
+        with self._lock:
+            totals = self._totals.copy()
+            count = self.position_count
+        return PortfolioGreeks(
+            total_delta=float(totals[0]),
+            total_gamma=float(totals[1]),
+            total_theta=float(totals[2]),
+            total_vega=float(totals[3]),
+            position_count=count,
+        )
+
+
+# Singleton instance
+_portfolio_greeks = None
+
+
+def get_portfolio_greeks_aggregate() -> PortfolioGreeksAggregate:
+    """Get or create the portfolio greeks aggregate, fed by the Tradier stream"""
+    global _portfolio_greeks
+    if _portfolio_greeks is None:
+        _portfolio_greeks = PortfolioGreeksAggregate()
+        get_tradier_stream().add_tick_listener(_portfolio_greeks.on_tick)
+    return _portfolio_greeks
+
+
 class PositionTrackerService:
     def __init__(self):
         self.alpaca = get_alpaca_client()
         self.tradier = get_tradier_client()
         self.greeks_calc = GreeksCalculator(risk_free_rate=0.05)
+        self.aggregate = get_portfolio_greeks_aggregate()
 
     async def get_open_positions(self) -> list[Position]:
         """Get all open option positions with real-time data"""
         try:
             # Get positions from Alpaca
-            alpaca_positions = self.alpaca.get_positions()
-
-            positions = []
-            for pos in alpaca_positions:
-                # Only process options
-                if pos.asset_class != "option":
-                    continue
-
-                # Get current market data from Tradier (use underlying quote)
-                quote = self.tradier.get_quote(self._parse_underlying(pos.symbol))
+            alpaca_positions = await asyncio.to_thread(self.alpaca.get_positions)
+            options = [pos for pos in alpaca_positions if pos.asset_class == "option"]
+            if not options:
+                empty = np.zeros(0)
+                self.aggregate.load([], [], empty, empty, empty, empty, {})
+                return []
+
+            underlyings = [self._parse_underlying(pos.symbol) for pos in options]
+            parsed = [self._parse_option_symbol(pos.symbol) for pos in options]
+            option_types = [option_type for option_type, _strike, _expiration in parsed]
+            strikes = np.array([strike for _type, strike, _expiration in parsed])
+            days_to_expiry = np.array([self._calculate_dte(pos.symbol) for pos in options])
+            qtys = np.array([float(pos.qty) for pos in options])
+
+            # One request for every contract (with IV) and every underlying
+            quotes = await asyncio.to_thread(
+                self._fetch_quotes, [pos.symbol for pos in options] + underlyings
+            )
+            prices = {
+                symbol: float(quotes.get(symbol, {}).get("last") or 0.0)
+                for symbol in set(underlyings)
+            }
+            ivs = np.array(
+                [
+                    float((quotes.get(pos.symbol, {}).get("greeks") or {}).get("mid_iv") or 0)
+                    or DEFAULT_IV
+                    for pos in options
+                ]
+            )
 
-                # Calculate Greeks
-                greeks = self._calculate_position_greeks(pos, quote)
+            # Vectorized greeks for all positions
+            greeks = self.greeks_calc.calculate_greeks_batch(
+                option_types,
+                np.array([prices[u] for u in underlyings]),
+                strikes,
+                days_to_expiry,
+                ivs,
+            )
+            greeks = {name: np.nan_to_num(values) for name, values in greeks.items()}
 
-                # Calculate P&L
-                current_price = quote.get("last", pos.current_price)
-                unrealized_pl = (current_price - pos.avg_entry_price) * pos.qty * 100
-                cost_basis = pos.avg_entry_price * pos.qty * 100
+            positions = []
+            for i, pos in enumerate(options):
+                # Calculate P&L from the option's own quote
+                avg_entry_price = float(pos.avg_entry_price)
+                current_price = float(
+                    quotes.get(pos.symbol, {}).get("last") or pos.current_price or 0.0
+                )
+                unrealized_pl = (current_price - avg_entry_price) * qtys[i] * 100
+                cost_basis = avg_entry_price * qtys[i] * 100
                 unrealized_pl_percent = (unrealized_pl / cost_basis) * 100 if cost_basis else 0
 
                 position = Position(
                     id=pos.asset_id,
-                    symbol=self._parse_underlying(pos.symbol),
+                    symbol=underlyings[i],
                     option_symbol=pos.symbol,
-                    qty=int(pos.qty),
-                    avg_entry_price=float(pos.avg_entry_price),
+                    qty=int(qtys[i]),
+                    avg_entry_price=avg_entry_price,
                     current_price=current_price,
                     unrealized_pl=unrealized_pl,
                     unrealized_pl_percent=unrealized_pl_percent,
                     market_value=float(pos.market_value),
                     cost_basis=cost_basis,
-                    greeks=greeks,
-                    expiration=self._parse_expiration(pos.symbol),
-                    days_to_expiry=self._calculate_dte(pos.symbol),
+                    greeks=PositionGreeks(
+                        **{name: float(greeks[name][i]) for name in GREEK_NAMES}
+                    ),
+                    expiration=parsed[i][2],
+                    days_to_expiry=int(days_to_expiry[i]),
                     status="open",
                 )
 
                 positions.append(position)
 
+            self.aggregate.load(
+                underlyings, option_types, strikes, days_to_expiry, ivs, qtys, prices
+            )
+            await self._stream_underlyings(list(prices))
+
             return positions
 
         except Exception as e:
@@ -103,21 +289,29 @@ class PositionTrackerService:
             return []
 
     async def get_portfolio_greeks(self) -> PortfolioGreeks:
-        """Calculate aggregate portfolio Greeks"""
-        positions = await self.get_open_positions()
-
-        total_delta = sum(p.greeks.delta * p.qty for p in positions)
-        total_gamma = sum(p.greeks.gamma * p.qty for p in positions)
-        total_theta = sum(p.greeks.theta * p.qty for p in positions)
-        total_vega = sum(p.greeks.vega * p.qty for p in positions)
-
-        return PortfolioGreeks(
-            total_delta=total_delta,
-            total_gamma=total_gamma,
-            total_theta=total_theta,
-            total_vega=total_vega,
-            position_count=len(positions),
-        )
+        """Aggregate portfolio Greeks, kept current by stream ticks"""
+        if not self.aggregate.is_fresh():
+            await self.get_open_positions()
+        return self.aggregate.snapshot()
+
+    def _fetch_quotes(self, symbols: list[str]) -> dict[str, dict]:
+        """Batched quotes (with option greeks), keyed by symbol"""
+        response = self.tradier.get_quotes(list(dict.fromkeys(symbols)), greeks=True)
+        quotes = (response.get("quotes") or {}).get("quote") or []
+        if isinstance(quotes, dict):
+            quotes = [quotes]
+        return {quote["symbol"]: quote for quote in quotes if "symbol" in quote}
+
+    async def _stream_underlyings(self, symbols: list[str]):
+        """Make sure the underlyings are streamed so the aggregate stays current"""
+        stream = get_tradier_stream()
+        missing = [s for s in symbols if s not in stream.get_active_symbols()]
+        if not missing:
+            return
+        try:
+            await stream.subscribe_quotes(missing)
+        except Exception as e:
+            logger.warning(f"Failed to stream underlyings {missing}: {e}")
 
     async def close_position(self, position_id: str, limit_price: float | None = None) -> dict:
         """Close an open position"""
@@ -143,6 +337,7 @@ class PositionTrackerService:
 
             # Submit closing order
             order = self.alpaca.submit_order(**order_data)
+            self.aggregate.invalidate()
 
             logger.info(f"Closing order submitted: {order.id}")
 
@@ -158,60 +353,28 @@ class PositionTrackerService:
             logger.error(f"Failed to close position: {e}")
             raise
 
-    def _calculate_position_greeks(self, position, quote) -> PositionGreeks:
-        """Calculate Greeks for a position"""
-        try:
-            # Parse option symbol
-            option_type, strike, _expiration = self._parse_option_symbol(position.symbol)
-
-            # Get underlying price
-            underlying_price = quote.get("underlying_price", 0)
-
-            # Calculate Greeks
-            days_to_expiry = self._calculate_dte(position.symbol)
-            iv = quote.get("greeks", {}).get("mid_iv", 0.3)
-
-            greeks = self.greeks_calc.calculate_greeks(
-                option_type=option_type,
-                underlying_price=underlying_price,
-                strike_price=strike,
-                days_to_expiry=days_to_expiry,
-                implied_volatility=iv,
-            )
-
-            return PositionGreeks(**greeks)
-
-        except Exception as e:
-            logger.warning(f"Failed to calculate Greeks: {e}")
-            return PositionGreeks(delta=0, gamma=0, theta=0, vega=0)
+    def _parse_occ(self, option_symbol: str) -> re.Match:
+        """Split an OCC symbol (SPY250117C00590000) into underlying/date/type/strike"""
+        match = OCC_SYMBOL.match(option_symbol)
+        if match is None:
+            raise ValueError(f"Not an OCC option symbol: {option_symbol}")
+        return match
 
     def _parse_underlying(self, option_symbol: str) -> str:
         """Extract underlying symbol from option symbol"""
-        # OCC format: SPY250117C00590000
-        return option_symbol[: option_symbol.index(next(c for c in option_symbol if c.isdigit()))]
+        return self._parse_occ(option_symbol)["underlying"]
 
     def _parse_expiration(self, option_symbol: str) -> str:
         """Extract expiration date from option symbol"""
         # OCC format: SPY250117C00590000 -> 2025-01-17
-        date_part = option_symbol[
-            option_symbol.index(
-                next(c for c in option_symbol if c.isdigit())
-            ) : option_symbol.index(next(c for c in option_symbol if c in "CP"))
-        ]
+        date_part = self._parse_occ(option_symbol)["date"]
         return f"20{date_part[:2]}-{date_part[2:4]}-{date_part[4:6]}"
 
     def _parse_option_symbol(self, option_symbol: str):
         """Parse option symbol into components"""
-        # Extract type
-        option_type = "call" if "C" in option_symbol else "put"
-
-        # Extract strike
-        strike_part = option_symbol[
-            option_symbol.index(next(c for c in option_symbol if c in "CP")) + 1 :
-        ]
-        strike = float(strike_part) / 1000
-
-        # Extract expiration
+        match = self._parse_occ(option_symbol)
+        option_type = "call" if match["type"] == "C" else "put"
+        strike = float(match["strike"]) / 1000
         expiration = self._parse_expiration(option_symbol)
 
         return option_type, strike, expiration
@@ -8,24 +8,22 @@ from __future__ import annotations
 import logging
 import os
 from decimal import Decimal
-from typing import Any
+from typing import TYPE_CHECKING, Any
 
-logger = logging.getLogger(__name__)
+from app.core.lazy_import import is_available, lazy_import
 
-# Web3 imports with graceful fallback for environments without Web3
-try:
-    from web3 import Web3
-    from web3.exceptions import Web3Exception
-    from eth_account import Account
+if TYPE_CHECKING:
     from eth_account.signers.local import LocalAccount
-    WEB3_AVAILABLE = True
-except ImportError:
-    WEB3_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+# Web3 libraries are imported on first use (web3 takes ~1s to import), with
+# graceful fallback for environments without Web3
+WEB3_AVAILABLE = is_available("web3") and is_available("eth_account")
+if not WEB3_AVAILABLE:
     logger.warning("[DEX] Web3 libraries not installed - DEX functionality disabled")
-    Web3 = None  # type: ignore
-    Web3Exception = Exception  # type: ignore
-    Account = None  # type: ignore
-    LocalAccount = None  # type: ignore
+Web3 = lazy_import("web3", "Web3")
+Account = lazy_import("eth_account", "Account")
 
 
 # Uniswap V3 Router ABI (minimal - just swap functions)
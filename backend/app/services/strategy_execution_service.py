@@ -4,16 +4,20 @@ Strategy Execution Service - Business logic for strategy management and executio
 This service handles loading, saving, running, and managing trading strategies.
 """
 
+import asyncio
 import json
 from collections import Counter, deque
 from pathlib import Path
 from typing import Any
 
+from sqlalchemy import select
+
 from ..core.logging_utils import get_secure_logger
 from ..core.observability import capture_execution_error
-from ..db.session import SessionLocal
+from ..db.session import AsyncDBSession, SessionLocal
 from ..markets import prepare_market_runtime
 from ..markets.services import DexMemeRuntime, StocksOptionsRuntime
+from ..runtime.market_replay import get_market_recorder
 from ..strategies.engine import generate_trade_plan
 from .execution_audit import AUDIT_FILE, append_execution_audit
 from .providers import (
@@ -248,7 +252,11 @@ class StrategyExecutionService:
             raise ValueError(f"Failed to delete strategy: {e}") from e
 
     def execute_strategy_dry_run(
-        self, user_id: int, strategy_type: str, config: dict | None = None
+        self,
+        user_id: int,
+        strategy_type: str,
+        config: dict | None = None,
+        market_snapshot: dict | None = None,
     ) -> dict:
         """
         Execute a strategy in dry run mode (simulation only)
@@ -257,6 +265,8 @@ class StrategyExecutionService:
             user_id: User ID running the strategy
             strategy_type: Type of strategy to run
             config: Optional config override (uses saved config if None)
+            market_snapshot: Snapshot to plan from instead of collecting a live one
+                (market replay); live snapshots are recorded while recording is on
 
         Returns:
             Dictionary with dry run results
@@ -286,7 +296,11 @@ class StrategyExecutionService:
             metadata={"strategy_type": strategy_type, "user_id": user_id},
         )
 
-        market_snapshot = self._collect_market_snapshot(market_key, instruments)
+        if market_snapshot is None:
+            market_snapshot = self._collect_market_snapshot(market_key, instruments)
+            recorder = get_market_recorder()
+            if recorder is not None:
+                recorder.record_snapshot(market_key, market_snapshot)
         insights = self._generate_insights(strategy_config)
         trade_plan = generate_trade_plan(
             strategy_type=strategy_type,
@@ -662,28 +676,36 @@ class StrategyExecutionService:
 
         return self._fetch_execution_history_file(user_id=user_id, limit=limit)
 
+    async def list_execution_history_async(
+        self, db: AsyncDBSession, user_id: int, limit: int = 50
+    ) -> list[dict[str, Any]]:
+        """list_execution_history() for async handlers, reading through get_async_db()"""
+        if limit <= 0:
+            return []
+
+        try:
+            result = await db.execute(_execution_history_query(user_id, limit))
+            db_history = [_history_entry(row) for row in result.scalars().all()]
+        except Exception as exc:  # pragma: no cover - DB safety
+            # A failed query aborts the transaction for the rest of the request
+            await db.rollback()
+            logger.warning("Falling back to file execution history: %s", exc)
+            db_history = []
+        if db_history:
+            return db_history
+
+        return await asyncio.to_thread(
+            self._fetch_execution_history_file, user_id=user_id, limit=limit
+        )
+
     def _fetch_execution_history_db(
         self, user_id: int, limit: int
     ) -> list[dict[str, Any]]:
         try:
-            from ..models.database import StrategyExecutionRecord
-
             session = SessionLocal()
             try:
-                rows = (
-                    session.query(StrategyExecutionRecord)
-                    .filter(StrategyExecutionRecord.user_id == user_id)
-                    .order_by(StrategyExecutionRecord.created_at.desc())
-                    .limit(limit)
-                    .all()
-                )
-                return [
-                    {
-                        **row.to_dict(),
-                        "timestamp": row.created_at.isoformat() + "Z",
-                    }
-                    for row in rows
-                ]
+                rows = session.execute(_execution_history_query(user_id, limit)).scalars()
+                return [_history_entry(row) for row in rows]
             finally:
                 session.close()
         except Exception as exc:  # pragma: no cover - DB safety
@@ -718,6 +740,21 @@ class StrategyExecutionService:
         return list(records)
 
 
+def _execution_history_query(user_id: int, limit: int):
+    from ..models.database import StrategyExecutionRecord
+
+    return (
+        select(StrategyExecutionRecord)
+        .where(StrategyExecutionRecord.user_id == user_id)
+        .order_by(StrategyExecutionRecord.created_at.desc())
+        .limit(limit)
+    )
+
+
+def _history_entry(row) -> dict[str, Any]:
+    return {**row.to_dict(), "timestamp": row.created_at.isoformat() + "Z"}
+
+
 # Singleton instance
 _strategy_execution_service: StrategyExecutionService | None = None
 
@@ -5,10 +5,14 @@ Handles: Account, Positions, Orders, Market Data, Options
 
 import logging
 import os
-from datetime import UTC, datetime, timedelta
+import re
+import time
+from datetime import datetime
 
 import requests
 
+from ..core.resilience import BreakerGroup, CircuitOpenError, hedged
+
 
 class ProviderHTTPError(Exception):
     """HTTP error from provider with status code and payload for mapping.
@@ -26,6 +30,19 @@ class ProviderHTTPError(Exception):
 
 logger = logging.getLogger(__name__)
 
+# Default request timeout (seconds); per-endpoint timeouts adapt below this
+DEFAULT_TIMEOUT = 5
+
+# Numeric path segments (order IDs) collapse into one breaker per endpoint
+_ID_SEGMENT = re.compile(r"/\d+(?=/|$)")
+
+
+def _is_upstream_fault(error: Exception) -> bool:
+    """5xx and rate limiting count against an endpoint's breaker; client errors do not"""
+    if isinstance(error, ProviderHTTPError):
+        return error.status_code >= 500 or error.status_code == 429
+    return True
+
 
 class TradierClient:
     """Tradier API client for production trading"""
@@ -51,72 +68,105 @@ class TradierClient:
                 "TRADIER_API_KEY and TRADIER_ACCOUNT_ID must be set in .env"
             )
 
+        # Per-endpoint breakers plus one host-wide breaker
+        self._breakers = BreakerGroup("tradier", failure_threshold=3, cooldown_seconds=30)
+        self._breaker = self._breakers.get("*")
+
         logger.info(f"Tradier client initialized for account {self.account_id}")
 
-    # Simple circuit breaker
-    _state = "CLOSED"  # CLOSED, OPEN, HALF_OPEN
-    _failures = 0
-    _cooldown_seconds = 30
-    _last_failure_at: datetime | None = None
+    # Client-wide breaker (any failed request); endpoint breakers only count upstream faults
+    @property
+    def _state(self) -> str:
+        return self._breaker.state
+
+    @_state.setter
+    def _state(self, value: str) -> None:
+        self._breaker.state = value
+
+    @property
+    def _failures(self) -> int:
+        return self._breaker.failure_count
+
+    @property
+    def _last_failure_at(self) -> datetime | None:
+        return self._breaker.last_failure_time
+
+    @_last_failure_at.setter
+    def _last_failure_at(self, value: datetime | None) -> None:
+        self._breaker.last_failure_time = value
 
     def _is_available(self) -> bool:
-        if self._state == "CLOSED":
-            return True
-        if self._state == "OPEN":
-            if self._last_failure_at and datetime.now(
-                UTC
-            ) - self._last_failure_at > timedelta(seconds=self._cooldown_seconds):
-                self._state = "HALF_OPEN"
-                return True
-            return False
-        # HALF_OPEN
-        return True
+        return self._breaker.allow_request()
 
     def _record_success(self) -> None:
-        self._state = "CLOSED"
-        self._failures = 0
-        self._last_failure_at = None
+        self._breaker.record_success()
 
     def _record_failure(self) -> None:
-        self._failures += 1
-        self._last_failure_at = datetime.now(UTC)
-        if self._failures >= 3:
-            self._state = "OPEN"
-            logger.warning("[Tradier Circuit] OPEN (3 consecutive failures)")
+        self._breaker.record_failure()
+
+    def _endpoint_key(self, method: str, endpoint: str) -> str:
+        """Breaker key for an endpoint, e.g. DELETE /accounts/{account}/orders/{id}"""
+        path = endpoint.replace(self.account_id, "{account}")
+        return f"{method} {_ID_SEGMENT.sub('/{id}', path)}"
 
     def _request(self, method: str, endpoint: str, **kwargs) -> dict:
-        """Make authenticated request to Tradier API with compression and timeouts"""
+        """
+        Make authenticated request to Tradier API with compression and timeouts
+
+        Each endpoint has its own breaker (transport errors, 5xx/429 responses) and
+        adaptive timeout; GET requests are hedged once they run past the endpoint's
+        p95 latency.
+        """
         url = f"{self.base_url}{endpoint}"
+        breaker = self._breakers.get(self._endpoint_key(method, endpoint))
 
         # Set default timeout if not provided
         if "timeout" not in kwargs:
-            kwargs["timeout"] = 5  # Reduced from 10s to 5s for faster failures
+            kwargs["timeout"] = breaker.timeout(DEFAULT_TIMEOUT)
 
         try:
+            if not breaker.allow_request():
+                raise CircuitOpenError(f"Tradier {breaker.name}", breaker.retry_after())
             if not self._is_available():
-                raise Exception("Tradier temporarily unavailable (circuit open)")
+                # The endpoint may have admitted its HALF_OPEN probe; hand it back
+                breaker.release_probe()
+                raise CircuitOpenError("Tradier", self._breaker.retry_after())
 
-            response = self.session.request(
-                method=method, url=url, headers=self.headers, **kwargs
-            )
+            def send():
+                return self.session.request(
+                    method=method, url=url, headers=self.headers, **kwargs
+                )
+
+            start = time.perf_counter()
+            response = hedged(breaker, send) if method == "GET" else send()
+            latency = time.perf_counter() - start
             try:
                 response.raise_for_status()
             except requests.exceptions.HTTPError as e:
                 # Map to provider error with code/payload for upstream handling
-                self._record_failure()
                 logger.error(
                     f"Tradier API error: {response.status_code} - {response.text}"
                 )
                 raise ProviderHTTPError(response.status_code, response.text) from e
             data = response.json()
-            self._record_success()
-            return data
 
+        except CircuitOpenError as e:
+            logger.error(f"Tradier request failed: {e!s}")
+            raise
         except Exception as e:
             self._record_failure()
+            if _is_upstream_fault(e):
+                breaker.record_failure()
+            else:
+                # Client errors say nothing about the endpoint's health
+                breaker.record_success()
             logger.error(f"Tradier request failed: {e!s}")
             raise
 
+        self._record_success()
+        breaker.record_success(latency)
+        return data
+
     # ==================== ACCOUNT ====================
 
     def get_profile(self) -> dict:
@@ -234,9 +284,15 @@ class TradierClient:
 
     # ==================== MARKET DATA ====================
 
-    def get_quotes(self, symbols: list[str]) -> dict:
-        """Get real-time quotes"""
-        params = {"symbols": ",".join(symbols), "greeks": "false"}
+    def get_quotes(self, symbols: list[str], greeks: bool = False) -> dict:
+        """
+        Get real-time quotes
+
+        Args:
+            symbols: Stock and/or OCC option symbols, fetched in one request
+            greeks: Include greeks and implied volatility for option symbols
+        """
+        params = {"symbols": ",".join(symbols), "greeks": "true" if greeks else "false"}
         return self._request("GET", "/markets/quotes", params=params)
 
     def get_quote(self, symbol: str) -> dict:
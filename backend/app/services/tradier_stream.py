@@ -14,24 +14,147 @@ IMPLEMENTATION:
 - Auto-renews session every 4 minutes (expires at 5 minutes)
 - Caches latest quotes in Redis (5s TTL) for SSE distribution
 - Reconnects automatically on connection loss
+
+INGEST PATH (thousands of messages/sec at the open, all on the event loop):
+- Messages are parsed with orjson when installed
+- Latest quote/trade/summary per symbol live in in-memory tables of __slots__
+  records that are updated in place, so a tick allocates no new dicts
+- Redis writes are coalesced: ticks only mark a symbol dirty, and a background
+  task writes each dirty symbol's latest record once every FLUSH_INTERVAL_SECONDS
+  in one pipelined round trip, off the event loop
+- Trades and two-sided quotes also feed the intraday bar builder
+  (1s/1min/5min OHLCV bars, see bar_builder.py)
+- Counters for ticks/sec, exchange-to-processing lag and flush latency are
+  reported by stats() (exported via GET /api/stream/status)
+- With MARKET_RECORDING_ENABLED, every message is also recorded for replay
+  (see app/runtime/market_replay.py); segments are written with the flush
 """
 
 import asyncio
 import json
 import logging
 import time
-from datetime import datetime
-from typing import Any
+from datetime import UTC, datetime
+from typing import Any, Callable
 
 import httpx
 import websockets
 
 from app.core.config import settings
+from app.core.resilience import OPEN, BreakerGroup, LatencyWindow
+from app.runtime.market_replay import MarketRecorder, start_recording, stop_recording
+from app.services.bar_builder import get_bar_builder
 from app.services.cache import get_cache
 
 
+try:
+    import orjson
+
+    _loads = orjson.loads
+except ImportError:
+    # Graceful degradation if orjson not installed
+    _loads = json.loads
+
 logger = logging.getLogger(__name__)
 
+# Redis TTL for streamed quotes/trades/summaries
+STREAM_CACHE_TTL = 5
+
+# How often coalesced quote updates are written to Redis
+FLUSH_INTERVAL_SECONDS = 0.1
+
+_MISSING_PRICES = (None, "", "NaN")
+
+
+def _to_price(value: Any) -> float | None:
+    """Parse a streamed price (Tradier sends numbers, strings or "NaN")"""
+    if value in _MISSING_PRICES:
+        return None
+    try:
+        price = float(value)
+    except (ValueError, TypeError):
+        return None
+    return price if price == price else None
+
+
+def _iso(epoch: float) -> str:
+    return datetime.fromtimestamp(epoch, UTC).isoformat()
+
+
+class QuoteRecord:
+    """Latest bid/ask for a symbol, updated in place on every quote"""
+
+    __slots__ = ("ask", "asksize", "bid", "bidsize", "mid", "received_at", "symbol")
+
+    def __init__(self, symbol: str):
+        self.symbol = symbol
+        self.bid: float | None = None
+        self.ask: float | None = None
+        self.bidsize: Any = None
+        self.asksize: Any = None
+        self.mid: float | None = None
+        self.received_at = 0.0
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "symbol": self.symbol,
+            "bid": self.bid,
+            "ask": self.ask,
+            "bidsize": self.bidsize,
+            "asksize": self.asksize,
+            "mid": self.mid,
+            "timestamp": _iso(self.received_at),
+            "type": "quote",
+        }
+
+
+class TradeRecord:
+    """Latest trade for a symbol, updated in place on every trade"""
+
+    __slots__ = ("price", "received_at", "size", "symbol")
+
+    def __init__(self, symbol: str):
+        self.symbol = symbol
+        self.price: float | None = None
+        self.size: Any = None
+        self.received_at = 0.0
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "symbol": self.symbol,
+            "price": self.price,
+            "size": self.size,
+            "timestamp": _iso(self.received_at),
+            "type": "trade",
+        }
+
+
+class SummaryRecord:
+    """Latest session summary (open, high, low, close, volume) for a symbol"""
+
+    __slots__ = ("close", "high", "low", "open", "received_at", "symbol", "volume")
+
+    def __init__(self, symbol: str):
+        self.symbol = symbol
+        self.open: Any = None
+        self.high: Any = None
+        self.low: Any = None
+        self.close: Any = None
+        self.volume: Any = None
+        self.received_at = 0.0
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "symbol": self.symbol,
+            "open": self.open,
+            "high": self.high,
+            "low": self.low,
+            "close": self.close,
+            "volume": self.volume,
+            "timestamp": _iso(self.received_at),
+            "type": "summary",
+        }
+
 
 class TradierStreamService:
     """
@@ -61,11 +184,12 @@ class TradierStreamService:
         self.max_reconnect_attempts = 10
         self.cache = get_cache()  # CacheService with in-memory fallback
 
-        # Circuit breaker for "too many sessions" errors
+        # Circuit breaker for "too many sessions" errors: opens on the FIRST error,
+        # 1 minute cooldown (reduced from 6 minutes), then a HALF_OPEN test connection
         self.session_error_count = 0
         self.max_session_errors = 5
-        self.circuit_breaker_active = False
-        self.circuit_breaker_reset_time: float | None = None
+        self._breakers = BreakerGroup("tradier_stream", failure_threshold=1, cooldown_seconds=60)
+        self.session_breaker = self._breakers.get("session")
 
         # WebSocket endpoint
         self.ws_url = "wss://ws.tradier.com/v1/markets/events"
@@ -73,9 +197,37 @@ class TradierStreamService:
         # Session creation endpoint
         self.session_url = f"{settings.TRADIER_API_BASE_URL}/markets/events/session"
 
+        # Price tick listeners: callback(symbol, price) on every trade and two-sided quote
+        self._tick_listeners: list[Callable[[str, float], None]] = []
+
+        # Latest records per symbol, and symbols changed since the last Redis flush
+        self.latest_quotes: dict[str, QuoteRecord] = {}
+        self.latest_trades: dict[str, TradeRecord] = {}
+        self.latest_summaries: dict[str, SummaryRecord] = {}
+        self._dirty_quotes: set[str] = set()
+        self._dirty_trades: set[str] = set()
+        self._dirty_summaries: set[str] = set()
+
+        # Intraday OHLCV bars built from trades and quotes
+        self.bars = get_bar_builder()
+
+        # Market recorder for replay (set by start() when recording is enabled)
+        self.recorder: MarketRecorder | None = None
+
+        # Ingest counters
+        self.ticks_total = 0
+        self.ticks_per_second = 0.0
+        self._rate_window_start = time.monotonic()
+        self._rate_window_ticks = 0
+        self._lag = LatencyWindow()
+        self.flushes = 0
+        self.keys_flushed = 0
+        self._flush_latency = LatencyWindow()
+
         # Background tasks
         self._connection_task: asyncio.Task | None = None
         self._session_renewal_task: asyncio.Task | None = None
+        self._flush_task: asyncio.Task | None = None
 
         # CRITICAL: Session management lock to prevent concurrent session operations
         # Prevents "too many sessions" errors from concurrent _create_session/_delete_session calls
@@ -198,7 +350,7 @@ class TradierStreamService:
                     break
 
                 # Skip renewals while circuit breaker is active to avoid creating extra sessions
-                if self.circuit_breaker_active:
+                if self.session_breaker.state == OPEN:
                     logger.warning(
                         "⏭️ Skipping session renewal while circuit breaker is active"
                     )
@@ -236,27 +388,14 @@ class TradierStreamService:
         """
         while self.running:
             try:
-                # Check circuit breaker
-                if self.circuit_breaker_active:
-                    if time.time() < self.circuit_breaker_reset_time:
-                        wait_time = int(self.circuit_breaker_reset_time - time.time())
-                        if wait_time > 0:
-                            logger.warning(
-                                f"⚠️ Circuit breaker ACTIVE - waiting {wait_time}s before retry..."
-                            )
-                            await asyncio.sleep(wait_time)
-                            continue
-                        else:
-                            # Timer expired, reset immediately
-                            logger.info(
-                                "✅ Circuit breaker timer expired - resetting now"
-                            )
-                            self.circuit_breaker_active = False
-                            self.session_error_count = 0
-                    else:
-                        logger.info("✅ Circuit breaker RESET - attempting connection")
-                        self.circuit_breaker_active = False
-                        self.session_error_count = 0
+                # Check circuit breaker (moves to HALF_OPEN once the cooldown expires)
+                if not self.session_breaker.allow_request():
+                    wait_time = max(1, int(self.session_breaker.retry_after()))
+                    logger.warning(
+                        f"⚠️ Circuit breaker ACTIVE - waiting {wait_time}s before retry..."
+                    )
+                    await asyncio.sleep(wait_time)
+                    continue
 
                 # CRITICAL: Clear old session ID before creating new one
                 # This forces creation of a fresh session and prevents reuse of stale sessions
@@ -371,55 +510,22 @@ class TradierStreamService:
         except Exception as e:
             logger.error(f"Error during zombie session cleanup: {e}")
 
-    async def _handle_message(self, message: str):
+    async def _handle_message(self, message: str | bytes):
         """
-        Parse and cache incoming WebSocket messages
+        Parse an incoming WebSocket message and update the latest-record tables
 
         Args:
             message: Raw JSON message from Tradier WebSocket
         """
         try:
-            # Parse JSON
-            data = json.loads(message)
+            data = _loads(message)
 
             # CRITICAL: Check for "too many sessions" error
             if "error" in data:
-                error_msg = data.get("error", "")
-                if "too many sessions" in error_msg.lower():
-                    self.session_error_count += 1
-                    logger.error(
-                        f"🚨 'Too many sessions' error detected ({self.session_error_count}/{self.max_session_errors})"
-                    )
-
-                    # IMMEDIATE CIRCUIT BREAKER: Activate on FIRST error
-                    # Active session cleanup + reduced timeout (60s instead of 360s)
-                    if not self.circuit_breaker_active:
-                        self.circuit_breaker_active = True
-                        self.circuit_breaker_reset_time = (
-                            time.time() + 60
-                        )  # 1 minute timeout (reduced from 6 minutes)
-                        logger.error(
-                            "🔴 CIRCUIT BREAKER ACTIVATED - Too many sessions error. Active cleanup + 1 minute timeout."
-                        )
-                        logger.error(
-                            "🔴 Root cause: Zombie sessions from previous reconnections must expire (Tradier TTL: 5 min)"
-                        )
-
-                        # Active session cleanup - send close frames to zombie sessions
-                        await self._cleanup_zombie_sessions()
-
-                        # Close WebSocket to force reconnection with circuit breaker logic
-                        if self.websocket:
-                            await self.websocket.close()
-                    return
-                else:
-                    logger.error(f"❌ WebSocket error message: {error_msg}")
-                    return
+                await self._handle_error_message(data)
+                return
 
-            # Extract message type and symbol
-            msg_type = data.get("type")
             symbol = data.get("symbol")
-
             if not symbol:
                 return
 
@@ -429,134 +535,238 @@ class TradierStreamService:
                     f"✅ Received valid data - resetting error count from {self.session_error_count}"
                 )
                 self.session_error_count = 0
-                self.circuit_breaker_active = False
+                self.session_breaker.record_success()
+
+            now = time.time()
+            msg_type = data.get("type")
+            if self.recorder is not None:
+                self.recorder.record_message(data, now)
 
-            # Handle different message types
             if msg_type == "quote":
-                # Quote update (bid/ask) - convert strings to floats (Tradier sends "NaN")
-                try:
-                    bid = (
-                        float(data.get("bid", 0))
-                        if data.get("bid") not in [None, "NaN", ""]
-                        else None
-                    )
-                    ask = (
-                        float(data.get("ask", 0))
-                        if data.get("ask") not in [None, "NaN", ""]
-                        else None
-                    )
-                except (ValueError, TypeError):
-                    bid = None
-                    ask = None
-
-                quote_data = {
-                    "symbol": symbol,
-                    "bid": bid,
-                    "ask": ask,
-                    "bidsize": data.get("bidsize"),
-                    "asksize": data.get("asksize"),
-                    "mid": (
-                        (bid + ask) / 2 if bid is not None and ask is not None else None
-                    ),
-                    "timestamp": datetime.now().isoformat(),
-                    "type": "quote",
-                }
-
-                # Cache in Redis (5s TTL)
-                self.cache.set(f"quote:{symbol}", quote_data, ttl=5)
+                # Quote update (bid/ask) - Tradier sends "NaN" for missing sides
+                quote = self.latest_quotes.get(symbol)
+                if quote is None:
+                    quote = self.latest_quotes[symbol] = QuoteRecord(symbol)
+                bid = quote.bid = _to_price(data.get("bid"))
+                ask = quote.ask = _to_price(data.get("ask"))
+                quote.bidsize = data.get("bidsize")
+                quote.asksize = data.get("asksize")
+                quote.mid = (bid + ask) / 2 if bid is not None and ask is not None else None
+                quote.received_at = now
+                self._dirty_quotes.add(symbol)
+                event_time = self._record_tick(now, data.get("biddate"))
+
+                if quote.mid is not None:
+                    self.bars.on_quote(symbol, quote.mid, event_time)
+                    self._notify_tick(symbol, quote.mid)
 
             elif msg_type == "trade":
                 # Trade update (last price)
-                trade_data = {
-                    "symbol": symbol,
-                    "price": data.get("price"),
-                    "size": data.get("size"),
-                    "timestamp": datetime.now().isoformat(),
-                    "type": "trade",
-                }
-
-                # Cache in Redis (5s TTL)
-                self.cache.set(f"price:{symbol}", trade_data, ttl=5)
+                trade = self.latest_trades.get(symbol)
+                if trade is None:
+                    trade = self.latest_trades[symbol] = TradeRecord(symbol)
+                price = trade.price = _to_price(data.get("price"))
+                size = trade.size = data.get("size")
+                trade.received_at = now
+                self._dirty_trades.add(symbol)
+                event_time = self._record_tick(now, data.get("date"))
+
+                if price is not None:
+                    self.bars.on_trade(symbol, price, _to_price(size) or 0.0, event_time)
+                    self._notify_tick(symbol, price)
 
             elif msg_type == "summary":
                 # Summary data (open, high, low, close, volume)
-                summary_data = {
-                    "symbol": symbol,
-                    "open": data.get("open"),
-                    "high": data.get("high"),
-                    "low": data.get("low"),
-                    "close": data.get("close"),
-                    "volume": data.get("volume"),
-                    "timestamp": datetime.now().isoformat(),
-                    "type": "summary",
-                }
-
-                # Cache in Redis (5s TTL)
-                self.cache.set(f"summary:{symbol}", summary_data, ttl=5)
+                summary = self.latest_summaries.get(symbol)
+                if summary is None:
+                    summary = self.latest_summaries[symbol] = SummaryRecord(symbol)
+                summary.open = data.get("open")
+                summary.high = data.get("high")
+                summary.low = data.get("low")
+                summary.close = data.get("close")
+                summary.volume = data.get("volume")
+                summary.received_at = now
+                self._dirty_summaries.add(symbol)
+                self._record_tick(now, None)
 
         except json.JSONDecodeError:
-            logger.warning(f"⚠️ Invalid JSON message: {message[:100]}")
+            logger.warning(f"⚠️ Invalid JSON message: {message[:100]!r}")
         except Exception as e:
             logger.error(f"❌ Error handling message: {e}")
 
-    async def _warm_popular_quotes(self):
+    async def _handle_error_message(self, data: dict[str, Any]):
+        """Handle an error message; "too many sessions" trips the session breaker"""
+        error_msg = data.get("error", "")
+        if "too many sessions" not in error_msg.lower():
+            logger.error(f"❌ WebSocket error message: {error_msg}")
+            return
+
+        self.session_error_count += 1
+        logger.error(
+            f"🚨 'Too many sessions' error detected "
+            f"({self.session_error_count}/{self.max_session_errors})"
+        )
+
+        # IMMEDIATE CIRCUIT BREAKER: Activate on FIRST error
+        # Active session cleanup + reduced timeout (60s instead of 360s)
+        if self.session_breaker.state != OPEN:
+            self.session_breaker.record_failure()
+            logger.error(
+                "🔴 CIRCUIT BREAKER ACTIVATED - Too many sessions error. "
+                "Active cleanup + 1 minute timeout."
+            )
+            logger.error(
+                "🔴 Root cause: Zombie sessions from previous reconnections must expire "
+                "(Tradier TTL: 5 min)"
+            )
+
+            # Active session cleanup - send close frames to zombie sessions
+            await self._cleanup_zombie_sessions()
+
+            # Close WebSocket to force reconnection with circuit breaker logic
+            if self.websocket:
+                await self.websocket.close()
+
+    def _record_tick(self, now: float, exchange_ms: Any) -> float:
         """
-        Warm cache with popular symbols for faster initial loads
+        Update the ticks/sec counter and exchange-to-processing lag
 
-        Pre-populates cache with quotes for commonly requested symbols
-        to reduce API load and improve response times for popular stocks.
+        Returns:
+            Exchange event time in epoch seconds (receive time if not sent)
         """
-        # Popular symbols to warm cache
-        popular_symbols = [
-            # Major indices ETFs
-            "SPY",   # S&P 500
-            "QQQ",   # Nasdaq 100
-            "IWM",   # Russell 2000
-            "DIA",   # Dow Jones
-            # Popular tech stocks
-            "AAPL",  # Apple
-            "MSFT",  # Microsoft
-            "NVDA",  # Nvidia
-            "TSLA",  # Tesla
-            "AMZN",  # Amazon
-            "GOOGL", # Google
-            "META",  # Meta
-            # Popular trading stocks
-            "AMD",   # AMD
-            "NFLX",  # Netflix
-            "BA",    # Boeing
-        ]
-
-        logger.info(f"🔥 Warming cache for {len(popular_symbols)} popular symbols...")
+        self.ticks_total += 1
+        self._rate_window_ticks += 1
+        elapsed = time.monotonic() - self._rate_window_start
+        if elapsed >= 1.0:
+            self.ticks_per_second = self._rate_window_ticks / elapsed
+            self._rate_window_ticks = 0
+            self._rate_window_start += elapsed
+
+        if exchange_ms:
+            try:
+                event_time = int(exchange_ms) / 1000
+            except (ValueError, TypeError):
+                return now
+            self._lag.record(max(0.0, now - event_time))
+            return event_time
+        return now
+
+    async def flush(self) -> int:
+        """
+        Write the latest record of every symbol changed since the last flush to Redis
 
-        try:
-            from .tradier_client import get_tradier_client
+        Returns:
+            Number of cache keys written
+        """
+        items: dict[str, dict[str, Any]] = {}
+        for prefix, table, dirty in (
+            ("quote", self.latest_quotes, self._dirty_quotes),
+            ("price", self.latest_trades, self._dirty_trades),
+            ("summary", self.latest_summaries, self._dirty_summaries),
+        ):
+            for symbol in dirty:
+                items[f"{prefix}:{symbol}"] = table[symbol].to_dict()
+            dirty.clear()
+
+        if not items:
+            return 0
+
+        started = time.perf_counter()
+        await asyncio.to_thread(self.cache.set_many, items, STREAM_CACHE_TTL)
+        self._flush_latency.record(time.perf_counter() - started)
+        self.flushes += 1
+        self.keys_flushed += len(items)
+        return len(items)
+
+    async def _flush_periodically(self):
+        """Flush coalesced updates to Redis every FLUSH_INTERVAL_SECONDS"""
+        while self.running:
+            try:
+                await asyncio.sleep(FLUSH_INTERVAL_SECONDS)
+                await self.flush()
+                await self.bars.flush(time.time())
+                if self.recorder is not None:
+                    await asyncio.to_thread(self.recorder.flush)
+            except asyncio.CancelledError:
+                break
+            except Exception as e:
+                logger.error(f"❌ Error flushing streamed quotes: {e}")
 
-            client = get_tradier_client()
-            quotes_data = client.get_quotes(popular_symbols)
+    def get_latest(self, kind: str, symbol: str) -> dict[str, Any] | None:
+        """
+        Latest streamed record for a symbol from the in-memory tables
 
-            warmed_count = 0
-            for symbol, quote in quotes_data.items():
-                try:
-                    quote_entry = {
-                        "symbol": symbol,
-                        "bid": float(quote.get("bid", 0)) if quote.get("bid") else None,
-                        "ask": float(quote.get("ask", 0)) if quote.get("ask") else None,
-                        "last": float(quote.get("last", 0)) if quote.get("last") else None,
-                        "volume": int(quote.get("volume", 0)),
-                        "timestamp": quote.get("trade_date", datetime.now().isoformat()),
-                        "cached": False,
-                    }
-
-                    # Use same TTL as quote endpoint (5s default)
-                    self.cache.set(f"quote:{symbol}", quote_entry, ttl=5)
-                    warmed_count += 1
+        Args:
+            kind: "quote", "price" (trade) or "summary" - same prefixes as the cache keys
+            symbol: Stock symbol
 
-                except Exception as e:
-                    logger.warning(f"Failed to warm cache for {symbol}: {e}")
+        Returns:
+            Same payload as the cached value, or None if nothing was streamed
+        """
+        table = {
+            "quote": self.latest_quotes,
+            "price": self.latest_trades,
+            "summary": self.latest_summaries,
+        }[kind]
+        record = table.get(symbol)
+        if record is None or time.time() - record.received_at > STREAM_CACHE_TTL:
+            return None
+        return record.to_dict()
+
+    def stats(self) -> dict[str, Any]:
+        """Ingest throughput, lag and Redis flush metrics"""
+
+        def ms(value: float | None) -> float | None:
+            return round(value * 1000, 1) if value is not None else None
+
+        return {
+            "ticks_total": self.ticks_total,
+            "ticks_per_second": round(self.ticks_per_second, 1),
+            "lag_ms": {"p50": ms(self._lag.percentile(50)), "p99": ms(self._lag.percentile(99))},
+            "symbols": {
+                "quotes": len(self.latest_quotes),
+                "trades": len(self.latest_trades),
+                "summaries": len(self.latest_summaries),
+            },
+            "pending_keys": (
+                len(self._dirty_quotes) + len(self._dirty_trades) + len(self._dirty_summaries)
+            ),
+            "flushes": self.flushes,
+            "keys_flushed": self.keys_flushed,
+            "flush_latency_ms": {
+                "p50": ms(self._flush_latency.percentile(50)),
+                "p99": ms(self._flush_latency.percentile(99)),
+            },
+            "bars": self.bars.stats(),
+        }
+
+    def add_tick_listener(self, listener: Callable[[str, float], None]):
+        """Call listener(symbol, price) on every streamed trade and two-sided quote"""
+        if listener not in self._tick_listeners:
+            self._tick_listeners.append(listener)
+
+    def remove_tick_listener(self, listener: Callable[[str, float], None]):
+        if listener in self._tick_listeners:
+            self._tick_listeners.remove(listener)
+
+    def _notify_tick(self, symbol: str, price: float):
+        for listener in self._tick_listeners:
+            try:
+                listener(symbol, price)
+            except Exception as e:
+                logger.error(f"❌ Tick listener failed for {symbol}: {e}")
 
-            logger.info(f"✅ Cache warmed with {warmed_count}/{len(popular_symbols)} symbols")
+    async def _warm_hot_keys(self):
+        """
+        Warm the most requested cache keys before streaming starts
 
+        Uses the cache warming engine's access statistics (seed symbols on a
+        cold start) to reduce API load and improve first response times.
+        """
+        try:
+            from .cache_warmer import get_cache_warmer
+
+            await get_cache_warmer().warm_hot_keys()
         except Exception as e:
             logger.error(f"❌ Cache warming failed: {e}")
 
@@ -569,8 +779,13 @@ class TradierStreamService:
         logger.info("🚀 Starting Tradier streaming service...")
         self.running = True
 
-        # Warm cache with popular symbols on startup
-        await self._warm_popular_quotes()
+        if settings.MARKET_RECORDING_ENABLED:
+            self.recorder = start_recording(
+                segment_events=settings.MARKET_RECORDING_SEGMENT_EVENTS
+            )
+
+        # Warm the most requested cache keys on startup
+        await self._warm_hot_keys()
 
         # Start WebSocket connection task
         self._connection_task = asyncio.create_task(self._connect_websocket())
@@ -580,6 +795,9 @@ class TradierStreamService:
             self._renew_session_periodically()
         )
 
+        # Start coalesced Redis flush task
+        self._flush_task = asyncio.create_task(self._flush_periodically())
+
         logger.info("✅ Tradier streaming service started")
 
     async def stop(self):
@@ -602,6 +820,19 @@ class TradierStreamService:
             except asyncio.CancelledError:
                 pass
 
+        if self._flush_task:
+            self._flush_task.cancel()
+            try:
+                await self._flush_task
+            except asyncio.CancelledError:
+                pass
+            await self.flush()
+            await self.bars.flush(time.time())
+
+        if self.recorder is not None:
+            await asyncio.to_thread(stop_recording)
+            self.recorder = None
+
         # Close WebSocket
         if self.websocket:
             await self.websocket.close()
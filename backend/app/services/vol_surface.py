@@ -0,0 +1,359 @@
+"""
+Implied Volatility Surface
+
+Builds a strike x expiry implied volatility grid for one underlying from the
+option chains of all its expirations (or a DTE-bounded subset):
+
+- Chains are fetched concurrently, at most OPTIONS_SURFACE_CONCURRENCY at a
+  time so a surface build stays within the Tradier quota
+- Each expiration's smile is read from out-of-the-money contracts (puts below
+  spot, calls above) and interpolated onto a common strike axis around spot
+- Gaps between expirations are filled by interpolating total variance
+  (iv^2 * t) along the expiry axis, then each smile is lightly smoothed
+- The surface is kept as a dense NumPy array per symbol; a refresh only
+  re-reads the expirations whose chain content (ChainSnapshot.digest) changed
+
+The 30-day ATM IV of every build is recorded once per day, and its percentile
+against the past year is what IV-percentile filters (e.g.
+OptionsFilters.min_iv_percentile) compare against.
+
+Usage:
+    from app.services.vol_surface import get_vol_surface_service
+
+    surface = await get_vol_surface_service().refresh(
+        "SPY", expirations, load_chain, underlying_price
+    )
+    surface.atm_iv_at(30)
+"""
+
+import asyncio
+import logging
+from collections.abc import Awaitable, Callable
+from datetime import UTC, date, datetime
+from typing import Any
+
+import numpy as np
+
+from ..core.config import settings
+from .options_chain import ChainSnapshot
+
+
+logger = logging.getLogger(__name__)
+
+# Strike axis: STRIKE_POINTS strikes spanning MONEYNESS_BAND around spot
+STRIKE_POINTS = 41
+MONEYNESS_BAND = (0.7, 1.3)
+
+# The strike axis is rebuilt (and every smile re-read) once spot drifts this far
+AXIS_DRIFT = 0.05
+
+# Smoothing kernel applied along the strike axis
+SMOOTHING_KERNEL = (0.25, 0.5, 0.25)
+
+# Days of ATM IV history kept, and needed before a percentile is reported
+HISTORY_DAYS = 252
+MIN_HISTORY_DAYS = 20
+HISTORY_TTL = 400 * 86400
+
+# Maturity the headline ATM IV (and its percentile) refers to
+ATM_IV_DAYS = 30
+
+
+def days_to_expiry(expiration: str, today: date | None = None) -> int:
+    """Calendar days from today to an expiration date (YYYY-MM-DD)"""
+    today = today or datetime.now(UTC).date()
+    return (datetime.strptime(expiration, "%Y-%m-%d").date() - today).days
+
+
+def strike_axis(underlying_price: float, points: int = STRIKE_POINTS) -> np.ndarray:
+    """Evenly spaced strikes across MONEYNESS_BAND around the underlying price"""
+    low, high = MONEYNESS_BAND
+    return np.linspace(underlying_price * low, underlying_price * high, points)
+
+
+def smile(snapshot: ChainSnapshot, strikes: np.ndarray, underlying_price: float) -> np.ndarray:
+    """
+    Implied volatility of one expiration on the strike axis
+
+    Uses out-of-the-money contracts (puts below spot, calls at or above) and
+    averages duplicate strikes; strikes outside the quoted range are NaN.
+    """
+    columns = snapshot.columns()
+    quoted = []
+    for side, otm in (("puts", np.less), ("calls", np.greater_equal)):
+        k = np.asarray(columns[side]["strike_price"], dtype=float)
+        iv = np.asarray(
+            [np.nan if v is None else v for v in columns[side]["implied_volatility"]],
+            dtype=float,
+        )
+        keep = otm(k, underlying_price) & np.isfinite(iv) & (iv > 0)
+        quoted.append((k[keep], iv[keep]))
+
+    k = np.concatenate([q[0] for q in quoted])
+    iv = np.concatenate([q[1] for q in quoted])
+    if len(k) < 2:
+        return np.full(len(strikes), np.nan)
+
+    unique_k, index = np.unique(k, return_inverse=True)
+    mean_iv = np.bincount(index, weights=iv) / np.bincount(index)
+    return np.interp(strikes, unique_k, mean_iv, left=np.nan, right=np.nan)
+
+
+def fill_term(raw: np.ndarray, dte: np.ndarray) -> np.ndarray:
+    """Fill missing cells between expirations by interpolating total variance"""
+    grid = raw.copy()
+    t = np.maximum(dte, 1) / 365.0
+    variance = grid**2 * t[:, None]
+    for column in range(grid.shape[1]):
+        valid = np.isfinite(variance[:, column])
+        if valid.sum() < 2 or valid.all():
+            continue
+        missing = ~valid & (t > t[valid].min()) & (t < t[valid].max())
+        filled = np.interp(t[missing], t[valid], variance[valid, column])
+        grid[missing, column] = np.sqrt(np.maximum(filled, 0) / t[missing])
+    return grid
+
+
+def smooth(grid: np.ndarray, kernel: tuple[float, float, float] = SMOOTHING_KERNEL) -> np.ndarray:
+    """Normalized 3-tap smoothing along strikes that ignores (and keeps) NaN cells"""
+    valid = np.isfinite(grid)
+    values = np.where(valid, grid, 0.0)
+    weights = valid.astype(float)
+    side, center, _ = kernel
+
+    total = values * center
+    norm = weights * center
+    total[:, 1:] += side * values[:, :-1]
+    norm[:, 1:] += side * weights[:, :-1]
+    total[:, :-1] += side * values[:, 1:]
+    norm[:, :-1] += side * weights[:, 1:]
+
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return np.where(valid, total / norm, np.nan)
+
+
+class VolSurface:
+    """Dense strike x expiry implied volatility grid for one underlying"""
+
+    def __init__(
+        self,
+        symbol: str,
+        underlying_price: float,
+        strikes: np.ndarray,
+        expirations: list[str],
+        dte: np.ndarray,
+        raw: np.ndarray,
+        digests: list[str],
+        rebuilt: int | None = None,
+    ):
+        """
+        Args:
+            symbol: Underlying symbol
+            underlying_price: Current underlying price
+            strikes: Strike axis (columns)
+            expirations: Expiration dates (rows), nearest first
+            dte: Days to expiry per row
+            raw: Interpolated smiles before term filling and smoothing
+            digests: Chain content digest per row (for incremental refresh)
+            rebuilt: Rows re-read from their chain in this build (default: all)
+        """
+        self.symbol = symbol
+        self.underlying_price = underlying_price
+        self.strikes = strikes
+        self.expirations = expirations
+        self.dte = dte
+        self.raw = raw
+        self.digests = digests
+        self.rebuilt = len(expirations) if rebuilt is None else rebuilt
+        self.iv = smooth(fill_term(raw, dte))
+        self.built_at = datetime.now(UTC)
+
+    def atm_iv(self) -> np.ndarray:
+        """ATM implied volatility per expiration (NaN where the smile is empty)"""
+        result = np.full(len(self.expirations), np.nan)
+        for row, smile_iv in enumerate(self.iv):
+            valid = np.isfinite(smile_iv)
+            if valid.sum() >= 2:
+                result[row] = np.interp(
+                    self.underlying_price, self.strikes[valid], smile_iv[valid]
+                )
+        return result
+
+    def atm_iv_at(self, days: int = ATM_IV_DAYS) -> float | None:
+        """ATM implied volatility at a constant maturity (total variance interpolation)"""
+        atm = self.atm_iv()
+        valid = np.isfinite(atm)
+        if not valid.any():
+            return None
+        t = np.maximum(self.dte[valid], 1) / 365.0
+        variance = np.interp(days / 365.0, t, atm[valid] ** 2 * t)
+        return float(np.sqrt(max(variance, 0) / (max(days, 1) / 365.0)))
+
+    def to_dict(self) -> dict[str, Any]:
+        """JSON-ready surface (NaN cells as None)"""
+        iv = np.round(self.iv, 6).astype(object)
+        iv[~np.isfinite(self.iv)] = None
+        atm = self.atm_iv()
+        return {
+            "symbol": self.symbol,
+            "underlying_price": self.underlying_price,
+            "strikes": np.round(self.strikes, 2).tolist(),
+            "expirations": self.expirations,
+            "days_to_expiry": self.dte.tolist(),
+            "iv": iv.tolist(),
+            "atm_iv": [None if np.isnan(v) else round(float(v), 6) for v in atm],
+            "atm_iv_30d": self.atm_iv_at(ATM_IV_DAYS),
+            "rows_rebuilt": self.rebuilt,
+            "built_at": self.built_at.isoformat(),
+        }
+
+
+def build_surface(
+    symbol: str,
+    snapshots: dict[str, ChainSnapshot],
+    underlying_price: float,
+    previous: VolSurface | None = None,
+    today: date | None = None,
+) -> VolSurface:
+    """
+    Build a surface from one chain snapshot per expiration
+
+    Rows of previous whose chain digest is unchanged are reused as long as its
+    strike axis is still centered within AXIS_DRIFT of the underlying price.
+
+    Args:
+        symbol: Underlying symbol
+        snapshots: Chain snapshot per expiration date
+        underlying_price: Current underlying price
+        previous: Last surface built for the symbol
+        today: Reference date for days to expiry (default: today, UTC)
+    """
+    if previous is not None and abs(previous.strikes.mean() / underlying_price - 1) <= AXIS_DRIFT:
+        strikes = previous.strikes
+        reusable = dict(zip(previous.expirations, zip(previous.digests, previous.raw)))
+    else:
+        strikes = strike_axis(underlying_price)
+        reusable = {}
+
+    expirations = sorted(snapshots)
+    raw = np.empty((len(expirations), len(strikes)))
+    digests = []
+    rebuilt = 0
+    for row, expiration in enumerate(expirations):
+        snapshot = snapshots[expiration]
+        digest, previous_row = reusable.get(expiration, (None, None))
+        if digest == snapshot.digest:
+            raw[row] = previous_row
+        else:
+            raw[row] = smile(snapshot, strikes, underlying_price)
+            rebuilt += 1
+        digests.append(snapshot.digest)
+
+    dte = np.array([days_to_expiry(e, today) for e in expirations], dtype=int)
+    return VolSurface(symbol, underlying_price, strikes, expirations, dte, raw, digests, rebuilt)
+
+
+class VolSurfaceService:
+    """Concurrent surface builds with per-symbol incremental refresh and IV history"""
+
+    def __init__(self, concurrency: int = 4):
+        """
+        Args:
+            concurrency: Chains fetched at once per surface build
+        """
+        self.concurrency = concurrency
+        self._surfaces: dict[str, VolSurface] = {}
+        self._history: dict[str, dict[str, float]] = {}
+
+    def get(self, symbol: str) -> VolSurface | None:
+        """Last surface built for symbol"""
+        return self._surfaces.get(symbol.upper())
+
+    async def refresh(
+        self,
+        symbol: str,
+        expirations: list[str],
+        load_chain: Callable[[str], Awaitable[ChainSnapshot]],
+        underlying_price: float,
+    ) -> VolSurface:
+        """
+        Fetch the chains of expirations concurrently and rebuild the surface
+
+        Expirations whose chain fails to load are left out of the surface; the
+        error is raised only when none could be loaded.
+
+        Args:
+            symbol: Underlying symbol
+            expirations: Expiration dates to include
+            load_chain: Loads the chain snapshot of one expiration
+            underlying_price: Current underlying price
+        """
+        semaphore = asyncio.Semaphore(self.concurrency)
+
+        async def fetch(expiration: str) -> ChainSnapshot:
+            async with semaphore:
+                return await load_chain(expiration)
+
+        results = await asyncio.gather(*(fetch(e) for e in expirations), return_exceptions=True)
+        snapshots = {}
+        for expiration, result in zip(expirations, results):
+            if isinstance(result, BaseException):
+                logger.warning(f"⚠️ Surface {symbol}: chain {expiration} failed: {result}")
+            else:
+                snapshots[expiration] = result
+        if not snapshots:
+            raise next(r for r in results if isinstance(r, BaseException))
+
+        key = symbol.upper()
+        surface = await asyncio.to_thread(
+            build_surface, key, snapshots, underlying_price, self._surfaces.get(key)
+        )
+        self._surfaces[key] = surface
+        logger.info(
+            f"✅ Surface {key}: {len(surface.expirations)} expirations, "
+            f"{surface.rebuilt} rebuilt"
+        )
+        return surface
+
+    def iv_percentile(self, cache, surface: VolSurface) -> float | None:
+        """
+        Record today's 30-day ATM IV and return its percentile over the past year
+
+        History is kept in the cache (one value per day) so it survives restarts.
+
+        Returns:
+            Percentage of past days with a lower ATM IV, or None without enough history
+        """
+        current = surface.atm_iv_at(ATM_IV_DAYS)
+        if current is None:
+            return None
+
+        cache_key = f"vol_surface:atm_iv:{surface.symbol}"
+        history = self._history.get(surface.symbol)
+        if history is None:
+            history = dict(cache.get(cache_key) or {})
+        today = surface.built_at.date().isoformat()
+        if history.get(today) != round(current, 6):
+            history[today] = round(current, 6)
+            history = dict(sorted(history.items())[-HISTORY_DAYS:])
+            cache.set(cache_key, history, ttl=HISTORY_TTL)
+        self._history[surface.symbol] = history
+
+        past = np.array([iv for day, iv in history.items() if day != today])
+        if len(past) < MIN_HISTORY_DAYS:
+            return None
+        return round(float((past < current).mean() * 100), 1)
+
+
+# Singleton instance
+_vol_surface_service = None
+
+
+def get_vol_surface_service() -> VolSurfaceService:
+    """Get or create volatility surface service singleton"""
+    global _vol_surface_service
+    if _vol_surface_service is None:
+        _vol_surface_service = VolSurfaceService(
+            concurrency=settings.OPTIONS_SURFACE_CONCURRENCY
+        )
+    return _vol_surface_service
@@ -99,7 +99,9 @@ def _under4_multileg_plan(
 
         candidates.append(symbol)
 
-        expiry = _format_expiry(config.options_filters.min_days_to_expiry)
+        expiry = _format_expiry(
+            config.options_filters.min_days_to_expiry, _snapshot_time(market_snapshot)
+        )
 
         call_price = round(last_price * 0.04, 2)
         put_credit = round(last_price * 0.03, 2)
@@ -233,8 +235,19 @@ def _extract_quotes(snapshot: dict[str, Any]) -> list[dict[str, Any]]:
     return []
 
 
-def _format_expiry(min_days: int) -> str:
-    target = datetime.now(UTC) + timedelta(days=max(min_days, 14))
+def _snapshot_time(snapshot: dict[str, Any]) -> datetime | None:
+    """Simulated time of a replayed snapshot ("as_of"), None for live snapshots."""
+    as_of = snapshot.get("as_of")
+    if not isinstance(as_of, str):
+        return None
+    try:
+        return datetime.fromisoformat(as_of)
+    except ValueError:
+        return None
+
+
+def _format_expiry(min_days: int, now: datetime | None = None) -> str:
+    target = (now or datetime.now(UTC)) + timedelta(days=max(min_days, 14))
     return date(target.year, target.month, target.day).isoformat()
 
 
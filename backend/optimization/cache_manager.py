@@ -240,55 +240,44 @@ class CacheManager:
             return False
 
     async def setup_cache_warming(self):
-        """Setup cache warming for frequently accessed data"""
-        warming_strategies = {
-            "user_portfolios": {
-                "query": "SELECT user_id FROM portfolios WHERE is_active = true",
-                "cache_key_template": "portfolio_data:{user_id}",
-                "strategy": "portfolio_data",
-                "batch_size": 100,
-            },
-            "market_data": {
-                "query": "SELECT DISTINCT symbol FROM market_data WHERE timestamp > NOW() - INTERVAL '1 hour'",
-                "cache_key_template": "market_data:{symbol}",
-                "strategy": "market_data",
-                "batch_size": 50,
-            },
-            "ai_insights": {
-                "query": "SELECT DISTINCT symbol FROM ai_analysis WHERE created_at > NOW() - INTERVAL '1 hour'",
-                "cache_key_template": "ai_analysis:{symbol}",
-                "strategy": "ai_analysis",
-                "batch_size": 20,
-            },
-        }
+        """
+        Setup cache warming for frequently accessed data
 
+        Warming is driven by observed access patterns in the application's cache
+        warming engine (backend/app/services/cache_warmer.py), which the trading
+        scheduler runs; this reports the key families it keeps warm.
+        """
         try:
-            for strategy_name, config in warming_strategies.items():
-                self.redis_client.setex(
-                    f"warming_strategy:{strategy_name}", 3600, json.dumps(config)
-                )
+            from app.services.cache_warmer import get_cache_warmer
 
-            logger.info("Cache warming strategies configured successfully")
+            families = get_cache_warmer().stats()["families"]
+            logger.info(f"Cache warming engine active for key families: {families}")
             return True
         except Exception as e:
             logger.error(f"Failed to setup cache warming: {e}")
             return False
 
     async def warm_cache(self, strategy_name: str) -> dict[str, Any]:
-        """Warm cache for specific strategy"""
+        """
+        Warm cache now
+
+        Strategies:
+            hot_keys: warm the most requested keys regardless of TTL (as before the open)
+            refresh: refresh hot keys that are about to expire
+        """
         try:
-            # Get warming strategy config
-            config_data = self.redis_client.get(f"warming_strategy:{strategy_name}")
-            if not config_data:
+            from app.services.cache_warmer import get_cache_warmer
+
+            warmer = get_cache_warmer()
+            runners = {"hot_keys": warmer.warm_hot_keys, "refresh": warmer.run_cycle}
+            if strategy_name not in runners:
                 return {"error": f"Warming strategy {strategy_name} not found"}
 
-            config = json.loads(config_data)
+            items_warmed = await runners[strategy_name]()
 
-            # This would typically execute the query and cache results
-            # For now, we'll simulate the warming process
             warming_result = {
                 "strategy": strategy_name,
-                "items_warmed": 0,
+                "items_warmed": items_warmed,
                 "success": True,
                 "timestamp": datetime.now().isoformat(),
             }
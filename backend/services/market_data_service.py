@@ -1,3 +1,4 @@
+import asyncio
 import json
 import logging
 from datetime import UTC, datetime, timedelta
@@ -16,6 +17,23 @@ Handles data fetching from multiple sources (Alpha Vantage, Tradier, etc.)
 
 logger = logging.getLogger(__name__)
 
+# Cached quotes older than this are refetched
+QUOTE_CACHE_SECONDS = 30
+
+
+def _fresh_cached_quote(raw: str | None, now: datetime) -> dict[str, Any] | None:
+    """Parse a cached quote; missing, malformed or stale entries count as a miss"""
+    if not raw:
+        return None
+    try:
+        data = json.loads(raw)
+        cache_time = datetime.fromisoformat(data["cache_timestamp"])
+        if now - cache_time < timedelta(seconds=QUOTE_CACHE_SECONDS):
+            return data
+    except (ValueError, TypeError, KeyError) as e:
+        logger.warning(f"Ignoring malformed cached quote: {e}")
+    return None
+
 
 class MarketDataService:
     """Service for aggregating real-time market data from multiple sources"""
@@ -40,13 +58,10 @@ class MarketDataService:
         """Get real-time quote for a symbol from multiple sources"""
         try:
             # Check cache first
-            cached_data = self.redis_client.get(f"quote:{symbol}")
-            if cached_data:
-                data = json.loads(cached_data)
-                # Check if cache is still valid (less than 30 seconds old)
-                cache_time = datetime.fromisoformat(data.get("cache_timestamp", ""))
-                if datetime.now(UTC) - cache_time < timedelta(seconds=30):
-                    return data
+            raw = self.redis_client.get(f"quote:{symbol}")
+            cached = _fresh_cached_quote(raw, datetime.now(UTC))
+            if cached:
+                return cached
 
             # Try multiple data sources
             quote_data = None
@@ -74,6 +89,54 @@ class MarketDataService:
             logger.error(f"Error getting real-time quote for {symbol}: {e}")
             return None
 
+    async def get_real_time_quotes(self, symbols: list[str]) -> dict[str, dict[str, Any]]:
+        """
+        Get real-time quotes for many symbols with one upstream round-trip
+
+        Fresh cached quotes are read with a single MGET; the remaining symbols
+        are fetched in one Tradier multi-symbol request (falling back to
+        per-symbol lookups when Tradier is not configured).
+        """
+        if not symbols:
+            return {}
+
+        quotes: dict[str, dict[str, Any]] = {}
+        try:
+            cached = self.redis_client.mget([f"quote:{symbol}" for symbol in symbols])
+        except Exception as e:
+            logger.warning(f"Redis MGET error for quotes: {e}")
+            cached = [None] * len(symbols)
+
+        now = datetime.now(UTC)
+        for symbol, raw in zip(symbols, cached, strict=True):
+            data = _fresh_cached_quote(raw, now)
+            if data:
+                quotes[symbol] = data
+
+        missing = [symbol for symbol in symbols if symbol not in quotes]
+        if not missing:
+            return quotes
+
+        if self.tradier_token:
+            fetched = await self._get_tradier_quotes(missing)
+        else:
+            results = await asyncio.gather(*(self.get_real_time_quote(s) for s in missing))
+            fetched = {s: q for s, q in zip(missing, results, strict=True) if q}
+
+        if fetched:
+            timestamp = now.isoformat()
+            try:
+                pipe = self.redis_client.pipeline()
+                for symbol, quote_data in fetched.items():
+                    quote_data["cache_timestamp"] = timestamp
+                    pipe.setex(f"quote:{symbol}", 30, json.dumps(quote_data))
+                pipe.execute()
+            except Exception as e:
+                logger.warning(f"Redis pipeline error caching quotes: {e}")
+            quotes.update(fetched)
+
+        return quotes
+
     async def _get_alpha_vantage_quote(self, symbol: str) -> dict[str, Any] | None:
         """Get quote from Alpha Vantage API"""
         try:
@@ -156,6 +219,52 @@ class MarketDataService:
             logger.error(f"Tradier API error for {symbol}: {e}")
             return None
 
+    async def _get_tradier_quotes(self, symbols: list[str]) -> dict[str, dict[str, Any]]:
+        """Get quotes for many symbols from one Tradier request"""
+        try:
+            if not self.session:
+                self.session = aiohttp.ClientSession()
+
+            url = "https://api.tradier.com/v1/markets/quotes"
+            params = {"symbols": ",".join(symbols)}
+            headers = {
+                "Authorization": f"Bearer {self.tradier_token}",
+                "Accept": "application/json",
+            }
+
+            async with self.session.get(
+                url, params=params, headers=headers
+            ) as response:
+                if response.status != 200:
+                    return {}
+                data = await response.json()
+
+            quotes = (data.get("quotes") or {}).get("quote") or []
+            if isinstance(quotes, dict):  # Single symbol responses are not wrapped
+                quotes = [quotes]
+
+            return {
+                quote["symbol"]: {
+                    "symbol": quote["symbol"],
+                    "price": float(quote.get("last") or 0),
+                    "change": float(quote.get("change") or 0),
+                    "change_percent": float(quote.get("change_percentage") or 0),
+                    "volume": int(quote.get("volume") or 0),
+                    "high": float(quote.get("high") or 0),
+                    "low": float(quote.get("low") or 0),
+                    "open": float(quote.get("open") or 0),
+                    "previous_close": float(quote.get("close") or 0),
+                    "timestamp": quote.get("date", ""),
+                    "source": "tradier",
+                }
+                for quote in quotes
+                if quote.get("symbol")
+            }
+
+        except Exception as e:
+            logger.error(f"Tradier batch quote error for {len(symbols)} symbols: {e}")
+            return {}
+
     async def get_market_status(self) -> dict[str, Any]:
         """Get overall market status"""
         try:
@@ -3,18 +3,30 @@ import json
 import logging
 from datetime import UTC, datetime
 
-from backend.app.services.cache import CacheService
-from backend.services.market_data_service import MarketDataService
 from fastapi import WebSocket
 
+from app.services.cache import CacheService
+from services.market_data_service import MarketDataService
+
 
 """
 WebSocket Service for Real-Time Market Data Streaming
 Handles WebSocket connections, market data broadcasting, and client management
+
+Market data is broadcast once per interval as a single coalesced
+"market_data_batch" frame per user containing only the fields that changed
+since the previous tick. Quotes for all subscribed symbols are fetched in one
+batched call, each symbol's delta is serialized once, and users with the same
+set of changed symbols share the same encoded frame. Slow consumers never block
+the loop: while a send is in flight, newer deltas are merged into a pending
+update for that user, and connections that stall past SEND_TIMEOUT are dropped.
 """
 
 logger = logging.getLogger(__name__)
 
+# Drop connections whose send has been stalled for this long (seconds)
+SEND_TIMEOUT = 10.0
+
 class WebSocketManager:
     """Manages WebSocket connections and real-time data broadcasting"""
 
@@ -31,6 +43,11 @@ class WebSocketManager:
         self.broadcast_interval = 1.0  # seconds
         self._broadcast_task = None
 
+        # Delta state and per-user backpressure
+        self._last_quotes: dict[str, dict] = {}  # symbol -> last broadcast quote
+        self._send_tasks: dict[str, asyncio.Task] = {}  # user_id -> in-flight send
+        self._pending_updates: dict[str, dict[str, dict]] = {}  # user_id -> merged deltas
+
     async def connect(self, websocket: WebSocket, user_id: str):
         """Accept WebSocket connection and register user"""
         await websocket.accept()
@@ -59,6 +76,11 @@ class WebSocketManager:
         if user_id in self.active_connections:
             del self.active_connections[user_id]
 
+        self._pending_updates.pop(user_id, None)
+        send_task = self._send_tasks.pop(user_id, None)
+        if send_task and send_task is not asyncio.current_task():
+            send_task.cancel()
+
         # Remove user from all symbol subscriptions
         if user_id in self.user_subscriptions:
             for symbol in self.user_subscriptions[user_id]:
@@ -113,6 +135,22 @@ class WebSocketManager:
             user_id,
         )
 
+        # Later frames only carry changed fields, so start from a full snapshot
+        snapshot = {
+            symbol.upper(): self._last_quotes[symbol.upper()]
+            for symbol in symbols
+            if symbol.upper() in self._last_quotes
+        }
+        if snapshot:
+            await self.send_personal_message(
+                {
+                    "type": "market_data_batch",
+                    "updates": snapshot,
+                    "timestamp": datetime.now(UTC).isoformat(),
+                },
+                user_id,
+            )
+
     async def _unsubscribe_user_from_symbols(self, user_id: str, symbols: list[str]):
         """Unsubscribe user from specific symbols"""
         if user_id not in self.user_subscriptions:
@@ -139,15 +177,29 @@ class WebSocketManager:
     async def broadcast_to_symbol_subscribers(self, symbol: str, data: dict):
         """Broadcast data to all subscribers of a specific symbol"""
         if symbol in self.symbol_subscribers:
-            message = {
-                "type": "market_data",
-                "symbol": symbol,
-                "data": data,
-                "timestamp": datetime.now(UTC).isoformat(),
-            }
+            # Serialize once and share the encoded frame across subscribers
+            frame = json.dumps(
+                {
+                    "type": "market_data",
+                    "symbol": symbol,
+                    "data": data,
+                    "timestamp": datetime.now(UTC).isoformat(),
+                }
+            )
 
             for user_id in self.symbol_subscribers[symbol].copy():
-                await self.send_personal_message(message, user_id)
+                await self._send_text(user_id, frame)
+
+    async def _send_text(self, user_id: str, frame: str):
+        """Send a pre-serialized frame to a user"""
+        websocket = self.active_connections.get(user_id)
+        if websocket is None:
+            return
+        try:
+            await asyncio.wait_for(websocket.send_text(frame), SEND_TIMEOUT)
+        except Exception as e:
+            logger.error(f"Error sending message to user {user_id}: {e}")
+            await self.disconnect(user_id)
 
     async def _broadcast_loop(self):
         """Main broadcast loop for real-time data"""
@@ -159,6 +211,43 @@ class WebSocketManager:
                 logger.error(f"Error in broadcast loop: {e}")
                 await asyncio.sleep(5)  # Wait before retrying
 
+    async def _fetch_quotes(self, symbols: list[str]) -> dict[str, dict]:
+        """Fetch quotes for all symbols in one batch (Redis MGET + one upstream call)"""
+        quotes: dict[str, dict] = {}
+        if self.redis_client:
+            try:
+                cached = self.redis_client.mget([f"market_data:{s}" for s in symbols])
+                quotes = {s: json.loads(raw) for s, raw in zip(symbols, cached, strict=True) if raw}
+            except Exception as e:
+                logger.warning(f"Redis cache read error: {e}")
+
+        missing = [s for s in symbols if s not in quotes]
+        if missing:
+            fetched = await self.market_data_service.get_real_time_quotes(missing)
+            if fetched and self.redis_client:
+                try:
+                    # Cache for 30 seconds
+                    pipe = self.redis_client.pipeline()
+                    for symbol, data in fetched.items():
+                        pipe.setex(f"market_data:{symbol}", 30, json.dumps(data))
+                    pipe.execute()
+                except Exception as e:
+                    logger.warning(f"Redis cache write error: {e}")
+            quotes.update(fetched)
+
+        return quotes
+
+    def _compute_deltas(self, quotes: dict[str, dict]) -> dict[str, dict]:
+        """Return only the fields that changed since the last broadcast, per symbol"""
+        deltas = {}
+        for symbol, data in quotes.items():
+            previous = self._last_quotes.get(symbol, {})
+            delta = {k: v for k, v in data.items() if previous.get(k) != v}
+            if delta:
+                deltas[symbol] = delta
+                self._last_quotes[symbol] = {**previous, **data}
+        return deltas
+
     async def _update_market_data(self):
         """Update and broadcast market data for all subscribed symbols"""
         all_subscribed_symbols = set()
@@ -168,36 +257,58 @@ class WebSocketManager:
         if not all_subscribed_symbols:
             return
 
-        # Get real-time data for all subscribed symbols
-        for symbol in all_subscribed_symbols:
-            try:
-                # Check cache first (if Redis available)
-                cached_data = None
-                if self.redis_client:
-                    try:
-                        cached_data = self.redis_client.get(f"market_data:{symbol}")
-                    except Exception as e:
-                        logger.warning(f"Redis cache read error: {e}")
-
-                if cached_data:
-                    data = json.loads(cached_data)
-                else:
-                    # Fetch fresh data
-                    data = await self.market_data_service.get_real_time_quote(symbol)
-                    if data and self.redis_client:
-                        try:
-                            # Cache for 30 seconds
-                            self.redis_client.setex(
-                                f"market_data:{symbol}", 30, json.dumps(data)
-                            )
-                        except Exception as e:
-                            logger.warning(f"Redis cache write error: {e}")
-
-                if data:
-                    await self.broadcast_to_symbol_subscribers(symbol, data)
+        # Forget delta state for symbols nobody is subscribed to anymore
+        for symbol in set(self._last_quotes) - all_subscribed_symbols:
+            del self._last_quotes[symbol]
 
-            except Exception as e:
-                logger.error(f"Error updating market data for {symbol}: {e}")
+        try:
+            quotes = await self._fetch_quotes(sorted(all_subscribed_symbols))
+        except Exception as e:
+            logger.error(f"Error fetching market data batch: {e}")
+            return
+
+        deltas = self._compute_deltas(quotes)
+        if not deltas and not self._pending_updates:
+            return
+
+        # Serialize each symbol's delta exactly once
+        fragments = {symbol: json.dumps(delta) for symbol, delta in deltas.items()}
+        timestamp = datetime.now(UTC).isoformat()
+        frames: dict[tuple[str, ...], str] = {}
+
+        for user_id, user_symbols in list(self.user_subscriptions.items()):
+            changed = tuple(sorted(user_symbols.intersection(deltas)))
+            if not changed and user_id not in self._pending_updates:
+                continue
+
+            in_flight = self._send_tasks.get(user_id)
+            if in_flight and not in_flight.done():
+                # Backpressure: merge into the user's pending update instead of queueing
+                pending = self._pending_updates.setdefault(user_id, {})
+                for symbol in changed:
+                    pending[symbol] = {**pending.get(symbol, {}), **deltas[symbol]}
+                continue
+
+            if user_id in self._pending_updates:
+                # User was lagging: flush merged deltas plus this tick's changes
+                pending = self._pending_updates.pop(user_id)
+                for symbol in changed:
+                    pending[symbol] = {**pending.get(symbol, {}), **deltas[symbol]}
+                frame = json.dumps(
+                    {"type": "market_data_batch", "updates": pending, "timestamp": timestamp}
+                )
+            else:
+                # Users with the same changed symbols share one encoded frame
+                frame = frames.get(changed)
+                if frame is None:
+                    body = ",".join(f"{json.dumps(sym)}:{fragments[sym]}" for sym in changed)
+                    frame = (
+                        f'{{"type":"market_data_batch","updates":{{{body}}},'
+                        f'"timestamp":{json.dumps(timestamp)}}}'
+                    )
+                    frames[changed] = frame
+
+            self._send_tasks[user_id] = asyncio.create_task(self._send_text(user_id, frame))
 
 # Global WebSocket manager instance
 websocket_manager = WebSocketManager()
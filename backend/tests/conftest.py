@@ -7,7 +7,7 @@ from sqlalchemy.orm import sessionmaker
 from sqlalchemy.pool import StaticPool
 
 from app.core.unified_auth import get_current_user_unified
-from app.db.session import Base, get_db
+from app.db.session import Base, ThreadedSession, get_async_db, get_db
 from app.main import app
 from app.models.database import Strategy, Trade, User
 
@@ -47,6 +47,16 @@ os.environ["ANTHROPIC_API_KEY"] = "test-anthropic-key"
 # Generated with: CryptContext(schemes=["bcrypt"]).hash("TestPassword123!")
 TEST_PASSWORD_HASH = "$2b$12$LQ3JzqjX7Y8ZHnVc9r5MHOfWw8L4vQy8QWxK0X1y0HdTYJKRQ6qKK"
 
+
+@pytest.fixture(autouse=True)
+def reset_single_flight():
+    """Start every test without values coalesced in memory by earlier tests"""
+    from app.core.single_flight import get_single_flight
+
+    get_single_flight().clear()
+    yield
+
+
 # ==================== DATABASE FIXTURES ====================
 
 
@@ -138,6 +148,7 @@ def client(test_db, mock_tradier_client, mock_cache, monkeypatch):
     from app.services.cache import get_cache
 
     app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_async_db] = lambda: ThreadedSession(test_db)
     app.dependency_overrides[get_current_user_unified] = override_get_current_user
     app.dependency_overrides[get_cache] = override_get_cache
 
@@ -195,6 +206,7 @@ def client_no_auth(test_db):
     from app.core.unified_auth import get_current_user_unified
 
     app.dependency_overrides[get_db] = override_get_db
+    app.dependency_overrides[get_async_db] = lambda: ThreadedSession(test_db)
     app.dependency_overrides[get_current_user_unified] = override_get_current_user_strict
 
     with TestClient(app, raise_server_exceptions=False) as test_client:
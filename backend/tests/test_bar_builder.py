@@ -0,0 +1,129 @@
+"""
+Tests for intraday bars built from the live tick stream
+"""
+
+import asyncio
+import json
+
+import pytest
+
+from app.services.bar_builder import BarBuilder, BarStore
+from app.services.tradier_stream import TradierStreamService
+
+
+# 2025-01-02 14:30:00 UTC, aligned to a 5-minute boundary
+OPEN = 1735828200
+
+
+@pytest.fixture
+def store(tmp_path):
+    return BarStore(tmp_path)
+
+
+@pytest.fixture
+def builder(store):
+    return BarBuilder(store)
+
+
+class TestBarBuilding:
+    """Test ticks are aggregated into aligned OHLCV bars"""
+
+    def test_trades_build_ohlcv_per_interval(self, builder):
+        for offset, price, size in [(0, 10.0, 100), (20, 12.0, 50), (40, 9.0, 10), (59, 11.0, 5)]:
+            builder.on_trade("SPY", price, size, OPEN + offset)
+        builder.on_trade("SPY", 11.5, 1, OPEN + 61)
+
+        [minute] = builder.get_bars("SPY", "1min")
+        assert minute == {
+            "timestamp": "2025-01-02T14:30:00+00:00",
+            "open": 10.0,
+            "high": 12.0,
+            "low": 9.0,
+            "close": 11.0,
+            "volume": 165,
+        }
+        assert len(builder.get_bars("SPY", "1s")) == 4
+        assert builder.get_bars("SPY", "5min") == []
+        assert builder.get_bars("SPY", "5min", include_partial=True)[0]["volume"] == 166
+
+    def test_quotes_fill_bars_until_first_trade(self, builder):
+        builder.on_quote("SPY", 100.0, OPEN)
+        builder.on_quote("SPY", 101.0, OPEN + 1.5)
+        builder.on_trade("SPY", 100.5, 10, OPEN + 2)
+        builder.on_quote("SPY", 150.0, OPEN + 3)
+
+        [bar] = builder.get_bars("SPY", "1min", include_partial=True)
+        assert (bar["open"], bar["high"], bar["low"], bar["close"]) == (100.5,) * 4
+        assert bar["volume"] == 10
+
+    def test_late_ticks_are_ignored(self, builder):
+        builder.on_trade("SPY", 10.0, 1, OPEN + 60)
+        builder.on_trade("SPY", 99.0, 1, OPEN + 5)
+
+        # Late for the 1s and 1min bars; still inside the open 5min bar
+        assert builder.late_ticks == 2
+        assert builder.get_bars("SPY", "1min", include_partial=True)[0]["high"] == 10.0
+        assert builder.get_bars("SPY", "5min", include_partial=True)[0]["high"] == 99.0
+
+
+class TestPersistence:
+    """Test finished bars are rolled, persisted and served after a restart"""
+
+    def test_flush_rolls_idle_bars_and_persists(self, builder, store):
+        builder.on_trade("SPY", 10.0, 100, OPEN)
+        builder.on_trade("SPY", 10.5, 100, OPEN + 30)
+
+        assert asyncio.run(builder.flush(OPEN + 59)) == 0
+        persisted = asyncio.run(builder.flush(OPEN + 301.5))
+
+        assert persisted == 2  # one 1min bar, one 5min bar (1s bars stay in memory)
+        [stored] = store.load("SPY", "1min")
+        assert stored["close"] == 10.5
+        assert stored["volume"] == 200
+
+    def test_restarted_builder_reads_older_bars_from_store(self, builder, store):
+        for minute in range(3):
+            builder.on_trade("SPY", 10.0 + minute, 1, OPEN + 60 * minute)
+        asyncio.run(builder.flush(OPEN + 600))
+
+        restarted = BarBuilder(store)
+        restarted.on_trade("SPY", 20.0, 1, OPEN + 600)
+        restarted.on_trade("SPY", 21.0, 1, OPEN + 660)
+
+        closes = [bar["close"] for bar in restarted.get_bars("SPY", "1min", limit=3)]
+        assert closes == [11.0, 12.0, 20.0]
+
+    def test_truncated_stored_bar_is_skipped(self, builder, store):
+        builder.on_trade("SPY", 10.0, 100, OPEN)
+        asyncio.run(builder.flush(OPEN + 301))
+        [path] = (store.root / "SPY" / "1min").iterdir()
+        with open(path, "a") as f:
+            f.write(f"{OPEN + 60},10.0,10.0")
+
+        [stored] = store.load("SPY", "1min")
+
+        assert stored["volume"] == 100
+
+
+class TestStreamIntegration:
+    """Test the Tradier stream feeds the bar builder"""
+
+    def test_stream_messages_build_bars(self, builder):
+        service = TradierStreamService()
+        service.bars = builder
+
+        async def feed():
+            for offset, price in [(0, 10.0), (30, 11.0), (61, 12.0)]:
+                message = {
+                    "type": "trade",
+                    "symbol": "SPY",
+                    "price": str(price),
+                    "size": "100",
+                    "date": str((OPEN + offset) * 1000),
+                }
+                await service._handle_message(json.dumps(message))
+
+        asyncio.run(feed())
+
+        [bar] = builder.get_bars("SPY", "1min")
+        assert (bar["open"], bar["close"], bar["volume"]) == (10.0, 11.0, 200)
@@ -0,0 +1,187 @@
+"""
+Tests for the access-driven cache warming engine
+"""
+
+import asyncio
+from unittest.mock import Mock
+
+import pytest
+
+from app.services import cache_warmer
+from app.services.cache_warmer import CacheKeyFamily, CacheWarmer, CountMinSketch
+
+
+class FakeCache:
+    """Cache with controllable TTLs that records warmed writes"""
+
+    available = True
+
+    def __init__(self, ttls: dict[str, int] | None = None):
+        self.ttls = ttls or {}
+        self.writes: dict[str, object] = {}
+
+    def ttl_many(self, keys):
+        return {key: self.ttls.get(key) for key in keys}
+
+    def set_many(self, items, ttl=60):
+        self.writes.update(items)
+        return True
+
+
+@pytest.fixture
+def cache(monkeypatch):
+    fake = FakeCache()
+    monkeypatch.setattr("app.services.cache.get_cache", lambda: fake)
+    return fake
+
+
+@pytest.fixture
+def quotes():
+    refresh = Mock(side_effect=lambda params: {f"quote:{p['symbol']}": p for p in params})
+    return CacheKeyFamily(
+        "quote", r"quote:(?P<symbol>[A-Z]+)", ttl=5, refresh=refresh, batch_size=100
+    )
+
+
+@pytest.fixture
+def chains():
+    refresh = Mock(side_effect=lambda params: {f"options:{p['symbol']}": p for p in params})
+    return CacheKeyFamily("chain", r"options:(?P<symbol>[A-Z]+)", ttl=60, refresh=refresh)
+
+
+def _read(warmer: CacheWarmer, key: str, times: int):
+    for _ in range(times):
+        warmer.record(key)
+
+
+class TestAccessTracking:
+    """Test reads are counted and hot keys ranked"""
+
+    def test_sketch_never_underestimates(self):
+        sketch = CountMinSketch(width=64, depth=4)
+        for i in range(500):
+            sketch.add(f"quote:S{i % 50}")
+
+        assert all(sketch.estimate(f"quote:S{i}") >= 10 for i in range(50))
+
+    def test_only_registered_families_become_candidates(self, quotes):
+        warmer = CacheWarmer()
+        warmer.register(quotes)
+
+        _read(warmer, "quote:SPY", 5)
+        _read(warmer, "quote:AAPL", 3)
+        _read(warmer, "quote:TSLA", 1)
+        _read(warmer, "portfolio:positions", 10)
+
+        assert warmer.hot_keys() == ["quote:SPY", "quote:AAPL"]
+
+    def test_decay_halves_counts(self, quotes):
+        warmer = CacheWarmer()
+        warmer.register(quotes)
+        _read(warmer, "quote:SPY", 4)
+
+        warmer._decay(warmer._decayed_at + cache_warmer.DECAY_SECONDS)
+
+        assert warmer.hot_keys() == []
+        assert warmer.hot_keys(min_hits=2) == ["quote:SPY"]
+
+
+class TestRefreshAhead:
+    """Test hot keys are refreshed before they expire, within the budget"""
+
+    def test_expiring_hot_keys_are_batched_per_family(self, cache, quotes, chains):
+        warmer = CacheWarmer(interval=5)
+        warmer.register(quotes)
+        warmer.register(chains)
+        for key in ["quote:SPY", "quote:QQQ", "options:SPY", "options:QQQ"]:
+            _read(warmer, key, 5)
+        cache.ttls = {"quote:SPY": 2, "options:SPY": 50, "options:QQQ": 10}
+
+        warmed = asyncio.run(warmer.run_cycle())
+
+        assert warmed == 3
+        assert set(cache.writes) == {"quote:SPY", "quote:QQQ", "options:QQQ"}
+        quotes.refresh.assert_called_once()
+        assert chains.refresh.call_count == 1
+
+    def test_budget_bounds_upstream_calls(self, cache, chains):
+        warmer = CacheWarmer(budget_per_minute=2)
+        warmer.register(chains)
+        for symbol in ["SPY", "QQQ", "IWM", "DIA"]:
+            _read(warmer, f"options:{symbol}", 5)
+
+        assert asyncio.run(warmer.run_cycle()) == 2
+        assert chains.refresh.call_count == 2
+        assert warmer.stats()["skipped_budget"] == 2
+
+    def test_live_keys_are_left_to_the_stream(self, cache, quotes):
+        quotes.is_live = lambda params: params["symbol"] == "SPY"
+        warmer = CacheWarmer()
+        warmer.register(quotes)
+        _read(warmer, "quote:SPY", 5)
+        _read(warmer, "quote:QQQ", 5)
+
+        asyncio.run(warmer.run_cycle())
+
+        assert set(cache.writes) == {"quote:QQQ"}
+
+    def test_failed_refresh_is_counted(self, cache, chains):
+        chains.refresh.side_effect = RuntimeError("tradier down")
+        warmer = CacheWarmer()
+        warmer.register(chains)
+        _read(warmer, "options:SPY", 5)
+
+        assert asyncio.run(warmer.run_cycle()) == 0
+        assert warmer.stats()["errors"] == 1
+
+
+class TestPreOpen:
+    """Test the pre-open warm covers the top keys and keeps them warm"""
+
+    def test_cold_start_warms_seed_keys(self, cache, quotes):
+        warmer = CacheWarmer()
+        warmer.register(quotes)
+
+        asyncio.run(warmer.warm_hot_keys())
+
+        assert set(cache.writes) == {"quote:SPY", "quote:QQQ", "quote:IWM", "quote:DIA"}
+
+    def test_warmed_keys_stay_pinned_below_hot_threshold(self, cache, quotes):
+        warmer = CacheWarmer()
+        warmer.register(quotes)
+        _read(warmer, "quote:NVDA", 1)
+
+        asyncio.run(warmer.warm_hot_keys())
+        cache.writes.clear()
+        asyncio.run(warmer.run_cycle())
+
+        assert set(cache.writes) == {"quote:NVDA"}
+
+
+class TestQuoteFamily:
+    """Test the market data quote family parses Tradier's quote response"""
+
+    def test_refresh_reads_the_tradier_response_shape(self, monkeypatch):
+        from app.routers import market_data
+
+        tradier = Mock()
+        tradier.get_quotes.side_effect = [
+            {
+                "quotes": {
+                    "quote": [
+                        {"symbol": "SPY", "last": 500.0, "bid": 499.9, "ask": 500.1},
+                        {"symbol": "QQQ", "last": 430.0, "bid": 429.9, "ask": 430.1},
+                    ],
+                    "unmatched_symbols": {"symbol": "NOPE"},
+                }
+            },
+            {"quotes": {"quote": {"symbol": "IWM", "last": 210.0}}},
+        ]
+        monkeypatch.setattr(market_data, "get_tradier_client", lambda: tradier)
+
+        batch = market_data._refresh_quotes([{"symbol": s} for s in ("SPY", "QQQ", "NOPE")])
+        single = market_data._refresh_quotes([{"symbol": "IWM"}])
+
+        assert set(batch) == {"quote:SPY", "quote:QQQ"}
+        assert batch["quote:SPY"]["last"] == 500.0
+        assert single["quote:IWM"]["last"] == 210.0
@@ -0,0 +1,193 @@
+"""
+Tests for the compute pool: shared-memory arguments, timeouts and admission control
+"""
+
+import asyncio
+import threading
+import time
+from datetime import date, timedelta
+from operator import attrgetter
+
+import numpy as np
+import pytest
+
+from app.core import compute_pool
+from app.core.compute_pool import (
+    SHARE_MIN_BYTES,
+    ComputePool,
+    ComputePoolSaturatedError,
+    ComputeTimeoutError,
+)
+from app.services.backtesting_engine import (
+    OHLCV_FIELDS,
+    BacktestingEngine,
+    StrategyRules,
+    run_backtest_task,
+)
+
+
+@pytest.fixture
+def process_pool():
+    pool = ComputePool(max_workers=1)
+    yield pool
+    pool.shutdown()
+
+
+@pytest.fixture
+def inline_pool():
+    pool = ComputePool(max_workers=1, max_pending=2, inline=True)
+    yield pool
+    pool.shutdown()
+
+
+class TestWorkerProcesses:
+    """Test work runs in worker processes with zero-copy array arguments"""
+
+    def test_large_array_passed_through_shared_memory(self, process_pool):
+        values = np.arange(100_000, dtype=np.float64)
+        assert values.nbytes >= SHARE_MIN_BYTES
+
+        total = asyncio.run(process_pool.run(np.sum, values, timeout=60))
+
+        assert total == values.sum()
+        stats = process_pool.stats()
+        assert stats["shared_bytes"] == values.nbytes
+        assert stats["completed"] == 1
+        assert stats["in_flight"] == 0
+
+    def test_small_array_is_pickled(self, process_pool):
+        total = asyncio.run(process_pool.run(np.sum, np.ones(10), timeout=60))
+
+        assert total == 10
+        assert process_pool.stats()["shared_bytes"] == 0
+
+    def test_backtest_sized_arrays_share_one_block(self, process_pool):
+        # One year of daily OHLCV bars plus a close vector
+        ohlcv = np.random.default_rng(0).random((252, len(OHLCV_FIELDS)))
+        closes = ohlcv[:, 3].copy()
+
+        read_only = asyncio.run(
+            process_pool.run(attrgetter("flags.writeable"), ohlcv, timeout=60)
+        )
+        product = asyncio.run(process_pool.run(np.dot, closes, ohlcv, timeout=60))
+
+        assert read_only is False  # a view of shared memory, not an unpickled copy
+        assert np.allclose(product, closes @ ohlcv)
+        assert process_pool.stats()["shared_bytes"] == 2 * ohlcv.nbytes + closes.nbytes
+
+    def test_backtest_task_matches_in_process_engine(self, process_pool):
+        closes = 100 + 10 * np.sin(np.linspace(0, 12, 300))
+        start = date(2024, 1, 1)
+        prices = [
+            {
+                "date": (start + timedelta(days=i)).isoformat(),
+                "open": c,
+                "high": c,
+                "low": c,
+                "close": c,
+                "volume": 1000.0,
+            }
+            for i, c in enumerate(closes.tolist())
+        ]
+        strategy = StrategyRules(
+            entry_rules=[{"indicator": "RSI", "operator": "<", "value": 40}],
+            exit_rules=[{"type": "take_profit", "value": 5}],
+        )
+        dates = [bar["date"] for bar in prices]
+        ohlcv = np.array([[bar[field] for field in OHLCV_FIELDS] for bar in prices])
+
+        pooled = asyncio.run(
+            process_pool.run(run_backtest_task, "TEST", dates, ohlcv, strategy, 10000.0, timeout=60)
+        )
+        direct = BacktestingEngine(10000.0).execute_backtest("TEST", prices, strategy)
+
+        assert pooled == direct
+
+
+class TestTimeoutsAndAdmission:
+    """Test per-task timeouts, admission control and failure accounting"""
+
+    def test_slow_task_times_out(self, inline_pool):
+        with pytest.raises(ComputeTimeoutError):
+            asyncio.run(inline_pool.run(time.sleep, 1.0, timeout=0.05))
+
+        assert inline_pool.stats()["timeouts"] == 1
+
+    def test_refuses_work_when_saturated(self, inline_pool):
+        async def run():
+            first = asyncio.create_task(inline_pool.run(time.sleep, 0.3, timeout=5))
+            second = asyncio.create_task(inline_pool.run(time.sleep, 0.3, timeout=5))
+            await asyncio.sleep(0.05)
+            assert inline_pool.queue_depth == 1
+            with pytest.raises(ComputePoolSaturatedError):
+                await inline_pool.run(time.sleep, 0, timeout=5)
+            await asyncio.gather(first, second)
+
+        asyncio.run(run())
+
+        stats = inline_pool.stats()
+        assert stats["rejected"] == 1
+        assert stats["completed"] == 2
+        assert stats["in_flight"] == 0
+
+    def test_queued_task_cancelled_on_timeout(self, inline_pool):
+        async def run():
+            busy = asyncio.create_task(inline_pool.run(time.sleep, 0.3, timeout=5))
+            await asyncio.sleep(0.05)
+            with pytest.raises(ComputeTimeoutError):
+                await inline_pool.run(time.sleep, 0, timeout=0.05)
+            await busy
+
+        asyncio.run(run())
+
+        stats = inline_pool.stats()
+        assert stats["completed"] == 1
+        assert stats["in_flight"] == 0
+
+    def test_task_errors_propagate(self, inline_pool):
+        with pytest.raises(ValueError):
+            asyncio.run(inline_pool.run(int, "not a number"))
+
+        assert inline_pool.stats()["failed"] == 1
+
+
+class TestModelRoutesOffTheLoop:
+    """Test in-process model calls (bar fetch + features) run in a worker thread"""
+
+    class _Model:
+        def __init__(self):
+            self.threads = []
+
+        def predict(self, symbol, lookback_days):
+            self.threads.append(threading.get_ident())
+            return {"regime": "ranging", "confidence": 0.7, "features": {}}
+
+        def recommend(self, symbol, lookback_days, top_n):
+            self.threads.append(threading.get_ident())
+            return [{"strategy_id": "iron_condor", "probability": 0.6, "confidence": 0.6}]
+
+        def get_recommended_strategies(self, regime):
+            return ["iron_condor"]
+
+    def test_regime_and_strategy_models_do_not_run_on_the_loop(self, monkeypatch):
+        from app.routers import ml
+
+        model = self._Model()
+        monkeypatch.setattr(ml, "get_regime_detector", lambda: model)
+        monkeypatch.setattr(ml, "get_strategy_selector", lambda: model)
+
+        regime = asyncio.run(ml.get_market_regime(symbol="SPY", lookback_days=90))
+        recommended = asyncio.run(ml.recommend_strategy(symbol="SPY", lookback_days=90, top_n=1))
+
+        assert regime["regime"] == recommended["market_regime"] == "ranging"
+        assert len(model.threads) == 3
+        assert threading.get_ident() not in model.threads
+
+
+def test_injected_pool_replaces_the_singleton():
+    pool = ComputePool(inline=True)
+    previous = compute_pool.set_compute_pool(pool)
+    try:
+        assert compute_pool.get_compute_pool() is pool
+    finally:
+        compute_pool.set_compute_pool(previous)
@@ -0,0 +1,175 @@
+"""
+Tests for DEX aggregator quote racing, caching and request coalescing
+Uses a local stub HTTP server in place of the 1inch API
+"""
+
+import asyncio
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from app.services.dex_aggregator import DEXAggregator, DEXQuote, amount_bucket
+
+
+WETH = "0xC02aaA39b223FE8D0A0e5C4F27eAD9083C756Cc2"
+USDC = "0xA0b86991c6218b36c1d19D4a2e9Eb0cE3606eB48"
+
+
+class _Stub1inchHandler(BaseHTTPRequestHandler):
+    """Local stub of the 1inch quote endpoint"""
+
+    requests_served = 0
+    delay = 0.0
+
+    def do_GET(self):
+        type(self).requests_served += 1
+        time.sleep(type(self).delay)
+        body = json.dumps(
+            {"toAmount": "3000000000", "estimatedGas": 150000, "protocols": []}
+        ).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def stub_1inch():
+    """Run the stub 1inch server for one test"""
+    _Stub1inchHandler.requests_served = 0
+    _Stub1inchHandler.delay = 0.0
+    server = ThreadingHTTPServer(("127.0.0.1", 0), _Stub1inchHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_port}"
+    server.shutdown()
+
+
+def _quote(dex: str, amount_out: int, gas: int) -> DEXQuote:
+    return DEXQuote(dex, WETH, USDC, str(10**18), str(amount_out), gas, 0.0, [])
+
+
+def _source(quote: DEXQuote | None, delay: float = 0.0):
+    async def source(token_in, token_out, amount_in, chain_id, slippage):
+        await asyncio.sleep(delay)
+        return quote
+
+    return source
+
+
+class TestAmountBucket:
+    def test_nearby_amounts_share_bucket(self):
+        assert amount_bucket(1_000_049) == amount_bucket(1_000_000)
+        assert amount_bucket(1_010_000) != amount_bucket(1_000_000)
+
+
+class TestQuoteRacing:
+    def test_best_quote_net_of_gas(self):
+        """Higher raw output loses if its gas costs more than the difference"""
+        cheap_gas = _quote("a", 3_000_000_000, 100_000)
+        pricey_gas = _quote("b", 3_000_100_000, 2_000_000)
+        aggregator = DEXAggregator(
+            sources={"a": _source(cheap_gas), "b": _source(pricey_gas)}
+        )
+
+        best = asyncio.run(
+            aggregator.get_best_quote(WETH, USDC, 10**18, 1, gas_price_wei=20 * 10**9)
+        )
+
+        assert best.dex_name == "a"
+
+    def test_slow_source_ignored_after_deadline(self):
+        aggregator = DEXAggregator(
+            sources={
+                "fast": _source(_quote("fast", 100, 1)),
+                "slow": _source(_quote("slow", 10**12, 1), delay=1.0),
+            },
+            deadline=0.1,
+        )
+
+        start = time.monotonic()
+        best = asyncio.run(aggregator.get_best_quote(WETH, USDC, 10**18, 1))
+
+        assert best.dex_name == "fast"
+        assert time.monotonic() - start < 0.5
+
+    def test_no_quotes_returns_none(self):
+        aggregator = DEXAggregator(sources={"a": _source(None)})
+        assert asyncio.run(aggregator.get_best_quote(WETH, USDC, 10**18, 1)) is None
+
+
+class TestQuoteCacheAndCoalescing:
+    def test_identical_requests_hit_cache(self, stub_1inch):
+        async def run():
+            aggregator = DEXAggregator(oneinch_api_base=stub_1inch)
+            first = await aggregator.get_best_quote(WETH, USDC, 10**18, 1)
+            second = await aggregator.get_best_quote(WETH, USDC, 10**18, 1)
+            await aggregator.aclose()
+            return first, second
+
+        first, second = asyncio.run(run())
+
+        assert first.amount_out == second.amount_out == "3000000000"
+        assert _Stub1inchHandler.requests_served == 1
+
+    def test_concurrent_requests_coalesce(self, stub_1inch):
+        _Stub1inchHandler.delay = 0.2
+
+        async def run():
+            aggregator = DEXAggregator(oneinch_api_base=stub_1inch)
+            quotes = await asyncio.gather(
+                *(aggregator.get_best_quote(WETH, USDC, 10**18, 1) for _ in range(5))
+            )
+            await aggregator.aclose()
+            return quotes
+
+        quotes = asyncio.run(run())
+
+        assert all(q.amount_out == "3000000000" for q in quotes)
+        assert _Stub1inchHandler.requests_served == 1
+
+    def test_cached_quote_scaled_to_bucket_neighbour(self):
+        aggregator = DEXAggregator(sources={"a": _source(_quote("a", 3_000_000, 1))})
+
+        async def run():
+            await aggregator.get_best_quote(WETH, USDC, 10**18, 1)
+            return await aggregator.get_best_quote(WETH, USDC, 10**18 + 10**13, 1)
+
+        scaled = asyncio.run(run())
+
+        assert scaled.amount_in == str(10**18 + 10**13)
+        assert scaled.amount_out == "3000030"
+
+    def test_gas_price_and_slippage_are_part_of_the_cache_key(self):
+        cheap_gas = _quote("a", 3_000_000_000, 100_000)
+        pricey_gas = _quote("b", 3_000_100_000, 2_000_000)
+        slippages = []
+
+        def recording(quote):
+            async def source(token_in, token_out, amount_in, chain_id, slippage):
+                slippages.append(slippage)
+                return quote
+
+            return source
+
+        aggregator = DEXAggregator(sources={"a": recording(cheap_gas), "b": recording(pricey_gas)})
+
+        async def run():
+            expensive = await aggregator.get_best_quote(
+                WETH, USDC, 10**18, 1, gas_price_wei=20 * 10**9
+            )
+            free = await aggregator.get_best_quote(WETH, USDC, 10**18, 1, gas_price_wei=1)
+            await aggregator.get_best_quote(WETH, USDC, 10**18, 1, slippage=3.0, gas_price_wei=1)
+            return expensive, free
+
+        expensive, free = asyncio.run(run())
+
+        assert (expensive.dex_name, free.dex_name) == ("a", "b")
+        assert slippages == [1.0, 1.0, 1.0, 1.0, 3.0, 3.0]
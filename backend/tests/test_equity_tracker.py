@@ -0,0 +1,117 @@
+"""
+Tests for EquityTracker append-only time series storage
+Tests appends, range reads, legacy JSON migration, and metrics
+"""
+
+import json
+from datetime import UTC, datetime, timedelta
+
+import pytest
+
+from app.services.equity_tracker import SNAPSHOT_DTYPE, EquityTracker
+
+
+def _snapshot(ts: datetime, equity: float) -> dict:
+    return {
+        "timestamp": ts.isoformat(),
+        "equity": equity,
+        "cash": 1000.0,
+        "positions_value": equity - 1000.0,
+        "num_positions": 2,
+    }
+
+
+@pytest.fixture
+def tracker(tmp_path):
+    """Tracker backed by a temporary series file"""
+    return EquityTracker(
+        data_file=tmp_path / "equity_history.bin",
+        legacy_file=tmp_path / "equity_history.json",
+    )
+
+
+class TestEquitySeriesStorage:
+    """Test append-only storage and range reads"""
+
+    def test_append_writes_fixed_width_records(self, tracker):
+        """Each snapshot appends exactly one record"""
+        now = datetime.now(UTC)
+        tracker.append_snapshots([_snapshot(now, 10000.0)])
+        tracker.append_snapshots([_snapshot(now + timedelta(days=1), 10100.0)])
+
+        assert tracker.data_file.stat().st_size == 2 * SNAPSHOT_DTYPE.itemsize
+        history = tracker.load_history()
+        assert [h["equity"] for h in history] == [10000.0, 10100.0]
+        assert history[0]["num_positions"] == 2
+
+    def test_get_history_range(self, tracker):
+        """Range reads return only snapshots inside the window"""
+        start = datetime(2025, 1, 1, tzinfo=UTC)
+        tracker.append_snapshots(
+            [_snapshot(start + timedelta(days=i), 10000.0 + i) for i in range(10)]
+        )
+
+        window = tracker.get_history(
+            start_date=start + timedelta(days=3), end_date=start + timedelta(days=5)
+        )
+
+        assert [h["equity"] for h in window] == [10003.0, 10004.0, 10005.0]
+
+    def test_partial_trailing_record_ignored(self, tracker):
+        """A torn write does not corrupt reads of complete records"""
+        tracker.append_snapshots([_snapshot(datetime.now(UTC), 10000.0)])
+        with open(tracker.data_file, "ab") as f:
+            f.write(b"\x00" * 7)
+
+        assert len(tracker.load_history()) == 1
+
+    def test_empty_history(self, tracker):
+        """Missing series file yields empty history"""
+        assert tracker.load_history() == []
+        assert tracker.get_history(start_date=datetime.now(UTC)) == []
+
+    def test_legacy_json_migrated(self, tmp_path):
+        """Legacy JSON history is imported once on first use"""
+        legacy = tmp_path / "equity_history.json"
+        legacy.write_text(
+            json.dumps(
+                [
+                    {"timestamp": "2025-10-14T20:15:00", "equity": 2.0, "cash": 0.0,
+                     "positions_value": 0.0, "num_positions": 0},
+                    {"timestamp": "2025-10-13T20:15:00", "equity": 1.0, "cash": 0.0,
+                     "positions_value": 0.0, "num_positions": 0},
+                ]
+            )
+        )
+
+        tracker = EquityTracker(data_file=tmp_path / "equity_history.bin", legacy_file=legacy)
+        EquityTracker(data_file=tmp_path / "equity_history.bin", legacy_file=legacy)
+
+        assert [h["equity"] for h in tracker.load_history()] == [1.0, 2.0]
+
+
+class TestEquityMetrics:
+    """Test vectorized performance metrics"""
+
+    def test_metrics_insufficient_history(self, tracker):
+        """Fewer than two snapshots returns zeroed metrics"""
+        metrics = tracker.calculate_metrics()
+        assert metrics["total_return"] == 0
+        assert metrics["sharpe_ratio"] == 0
+
+    def test_metrics_return_and_drawdown(self, tracker):
+        """Return, drawdown and win/loss days match the equity path"""
+        now = datetime.now(UTC)
+        equities = [100.0, 110.0, 99.0, 120.0]
+        tracker.append_snapshots(
+            [_snapshot(now - timedelta(days=len(equities) - i), e) for i, e in enumerate(equities)]
+        )
+
+        metrics = tracker.calculate_metrics(period_days=30)
+
+        assert metrics["total_return"] == 20.0
+        assert metrics["total_return_percent"] == 20.0
+        assert metrics["max_drawdown"] == 10.0
+        assert metrics["win_days"] == 2
+        assert metrics["loss_days"] == 1
+        assert metrics["num_snapshots"] == 4
@@ -0,0 +1,149 @@
+"""
+Tests for the persistent feature store and incremental featurization
+"""
+
+from datetime import UTC, datetime, timedelta
+from unittest.mock import create_autospec
+
+import numpy as np
+import pandas as pd
+import pytest
+
+
+pytest.importorskip("ta")
+
+from app.ml import data_pipeline, feature_engineering
+from app.ml.feature_engineering import WARMUP_BARS, FeatureEngineer
+from app.ml.feature_store import FeatureStore
+from app.services.tradier_client import TradierClient
+
+
+def _bars(count: int, end: datetime | None = None) -> pd.DataFrame:
+    rng = np.random.default_rng(7)
+    close = 100 * np.exp(np.cumsum(rng.normal(0, 0.01, count)))
+    end = end or datetime(2025, 6, 30, tzinfo=UTC)
+    index = pd.bdate_range(end=end, periods=count)
+    return pd.DataFrame(
+        {
+            "open": close * (1 + rng.normal(0, 0.002, count)),
+            "high": close * 1.01,
+            "low": close * 0.99,
+            "close": close,
+            "volume": rng.integers(1_000_000, 5_000_000, count).astype(float),
+        },
+        index=index,
+    )
+
+
+@pytest.fixture
+def store(tmp_path):
+    return FeatureStore(tmp_path)
+
+
+class TestIncrementalAppend:
+    """Test appended features match a full recomputation"""
+
+    def test_append_matches_full_recompute(self, store):
+        bars = _bars(WARMUP_BARS + 300)
+        store.write("SPY", "daily", bars.iloc[:-20])
+
+        assert store.append("SPY", "daily", bars.iloc[-20:]) == 20
+
+        full = FeatureEngineer().compute_features(bars)
+        stored = store.load("SPY", "daily", complete=False)
+        pd.testing.assert_frame_equal(stored, full, check_freq=False, rtol=1e-9)
+        assert store.rows_computed == len(bars)
+
+    def test_refetched_last_bar_replaces_stored_row(self, store):
+        bars = _bars(WARMUP_BARS + 100)
+        partial = bars.iloc[:-1].copy()
+        partial.iloc[-1, partial.columns.get_loc("close")] *= 0.98
+        store.write("SPY", "daily", partial)
+
+        store.append("SPY", "daily", bars.iloc[-2:])
+
+        stored = store.load("SPY", "daily", complete=False)
+        assert len(stored) == len(bars)
+        assert stored["close"].iloc[-2] == bars["close"].iloc[-2]
+
+    def test_short_history_is_recomputed(self, store):
+        bars = _bars(250)
+        store.write("SPY", "daily", bars.iloc[:200])
+        store.append("SPY", "daily", bars.iloc[200:])
+
+        full = FeatureEngineer().compute_features(bars)
+        stored = store.load("SPY", "daily", complete=False)
+        pd.testing.assert_frame_equal(stored, full, check_freq=False)
+
+
+class TestStorage:
+    """Test slices, persistence and feature-set versioning"""
+
+    def test_slice_keeps_rows_warmed_by_earlier_history(self, store):
+        bars = _bars(600)
+        store.write("SPY", "daily", bars)
+
+        window = store.load("SPY", "daily", start=bars.index[-100])
+
+        assert len(window) == 100
+        assert not window.isna().any().any()
+        assert len(store.load("SPY", "daily")) < len(bars)
+
+    def test_new_instance_reads_from_disk(self, store, tmp_path):
+        store.write("SPY", "daily", _bars(300), covers_from=datetime(2024, 1, 1, tzinfo=UTC))
+
+        reopened = FeatureStore(tmp_path)
+
+        assert reopened.last_timestamp("SPY", "daily") == store.last_timestamp("SPY", "daily")
+        assert reopened.covers("SPY", "daily", datetime(2024, 6, 1, tzinfo=UTC))
+        assert not reopened.covers("SPY", "daily", datetime(2023, 6, 1, tzinfo=UTC))
+
+    def test_truncated_file_is_recomputed(self, store, tmp_path):
+        bars = _bars(300)
+        store.write("SPY", "daily", bars)
+        path = store._path("SPY", "daily")
+        path.write_bytes(path.read_bytes()[:100])
+
+        reopened = FeatureStore(tmp_path)
+
+        assert reopened.last_timestamp("SPY", "daily") is None
+        assert reopened.append("SPY", "daily", bars) == len(bars)
+        assert len(reopened.load("SPY", "daily", complete=False)) == len(bars)
+
+    def test_feature_set_change_starts_new_set(self, store, tmp_path, monkeypatch):
+        store.write("SPY", "daily", _bars(300))
+
+        monkeypatch.setattr(feature_engineering, "FEATURE_SET_VERSION", "changed")
+        changed = FeatureStore(tmp_path)
+
+        assert changed.feature_set != store.feature_set
+        assert changed.last_timestamp("SPY", "daily") is None
+
+
+class TestPipelineIntegration:
+    """Test the data pipeline only fetches bars it has not stored"""
+
+    def test_second_call_fetches_only_new_bars(self, store, monkeypatch):
+        today = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
+        bars = _bars(700, end=today)
+        requests = []
+
+        def historical_bars(symbol, interval="daily", start_date=None, end_date=None):
+            requests.append(start_date)
+            window = bars.loc[start_date:end_date]
+            return [{"date": ts.strftime("%Y-%m-%d"), **row} for ts, row in window.iterrows()]
+
+        # Autospec so a call to a method TradierClient lacks fails the test
+        tradier = create_autospec(TradierClient, instance=True)
+        tradier.get_historical_bars.side_effect = historical_bars
+        monkeypatch.setattr(data_pipeline, "get_tradier_client", lambda: tradier)
+        monkeypatch.setattr(data_pipeline, "get_feature_store", lambda: store)
+        pipeline = data_pipeline.MLDataPipeline()
+
+        first = pipeline.prepare_features("SPY", lookback_days=365)
+        second = pipeline.prepare_features("SPY", lookback_days=180)
+
+        assert first.index[0] >= today - timedelta(days=365)
+        assert not first.isna().any().any()
+        assert len(second) < len(first)
+        assert requests[1] == bars.index[-1].strftime("%Y-%m-%d")
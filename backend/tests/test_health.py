@@ -5,6 +5,7 @@ Tests the health monitoring service with mocked external clients
 to verify healthy, degraded, and failure scenarios.
 """
 
+import threading
 from unittest.mock import Mock, patch
 
 from app.services.health_monitor import HealthMonitor
@@ -62,6 +63,76 @@ class TestHealthMonitor:
         assert self.health_monitor.response_times[0] == 0.1  # First entry
         assert self.health_monitor.response_times[-1] == 0.1  # Last entry
 
+    def test_route_latency_percentiles(self):
+        """Test per-route p50/p95/p99 from the route ring buffers"""
+        for i in range(1, 101):
+            self.health_monitor.record_request(i / 1000, route="/api/quote/{symbol}")
+
+        percentiles = self.health_monitor.get_latency_percentiles()
+        route = percentiles["/api/quote/{symbol}"]
+
+        assert route["count"] == 100
+        assert route["p50_ms"] == 50.0
+        assert route["p95_ms"] == 95.0
+        assert route["p99_ms"] == 99.0
+
+    def test_route_tracking_is_bounded(self):
+        """Test untemplated paths beyond the route cap fold into 'other'"""
+        from app.services.health_monitor import MAX_TRACKED_ROUTES, OTHER_ROUTE
+
+        for i in range(MAX_TRACKED_ROUTES + 10):
+            self.health_monitor.record_request(0.1, route=f"/missing/{i}")
+
+        percentiles = self.health_monitor.get_latency_percentiles()
+        assert len(percentiles) == MAX_TRACKED_ROUTES + 1
+        assert percentiles[OTHER_ROUTE]["count"] == 10
+
+    @patch("psutil.cpu_percent")
+    def test_get_system_health_reads_sampler_snapshot(self, mock_cpu):
+        """Test health reads sampled snapshots instead of blocking on psutil"""
+        self.health_monitor._system_snapshot = {
+            "cpu_percent": 10.0,
+            "memory_percent": 20.0,
+            "memory_used_mb": 1.0,
+            "memory_total_mb": 2.0,
+            "disk_percent": 30.0,
+            "disk_free_gb": 4.0,
+        }
+        self.health_monitor._dependency_snapshot = {"tradier": {"status": "up"}}
+
+        with patch.object(self.health_monitor, "_check_api_configuration", return_value={}):
+            health = self.health_monitor.get_system_health()
+
+        mock_cpu.assert_not_called()
+        assert health["status"] == "healthy"
+        assert health["system"]["cpu_percent"] == 10.0
+        assert health["dependencies"]["tradier"]["status"] == "up"
+
+    @patch("app.services.health_monitor.get_tradier_client")
+    @patch("app.services.health_monitor.get_alpaca_client")
+    def test_first_health_call_does_not_wait_for_dependencies(
+        self, mock_alpaca_client, mock_tradier_client
+    ):
+        """Test the first call reports dependencies as pending and checks them in the background"""
+        released = threading.Event()
+        mock_tradier = Mock()
+        mock_tradier.get_market_clock.side_effect = lambda: released.wait(5)
+        mock_tradier_client.return_value = mock_tradier
+        mock_alpaca_client.return_value = Mock()
+
+        with patch.object(self.health_monitor, "_check_api_configuration", return_value={}):
+            first = self.health_monitor.get_system_health()
+            released.set()
+            self.health_monitor._dependency_thread.join(timeout=5)
+            second = self.health_monitor.get_system_health()
+
+        assert first["dependencies"] == {
+            "tradier": {"status": "pending"},
+            "alpaca": {"status": "pending"},
+        }
+        assert second["dependencies"]["tradier"]["status"] == "up"
+        assert second["dependencies"]["alpaca"]["status"] == "up"
+
     @patch("app.services.health_monitor.get_tradier_client")
     @patch("app.services.health_monitor.get_alpaca_client")
     def test_check_dependencies_healthy(self, mock_alpaca_client, mock_tradier_client):
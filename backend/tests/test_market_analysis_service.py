@@ -0,0 +1,140 @@
+"""
+Tests for single-fetch composite analysis in MarketAnalysisService
+"""
+
+import asyncio
+from datetime import date, timedelta
+from unittest.mock import Mock
+
+import numpy as np
+import pytest
+
+from app.services.market_analysis_service import MarketAnalysisService
+from app.services.technical_indicators import TechnicalIndicators
+
+
+def _bars(n: int = 250, seed: int = 3) -> list[dict]:
+    rng = np.random.default_rng(seed)
+    closes = 100 * np.cumprod(1 + rng.normal(0.001, 0.015, n))
+    start = date(2024, 1, 1)
+    return [
+        {
+            "date": (start + timedelta(days=i)).isoformat(),
+            "open": close,
+            "high": close * 1.01,
+            "low": close * 0.99,
+            "close": close,
+            "volume": int(rng.integers(500_000, 2_000_000)),
+        }
+        for i, close in enumerate(closes)
+    ]
+
+
+class DictCache:
+    """In-memory stand-in for CacheService's async get/set"""
+
+    def __init__(self):
+        self.values = {}
+
+    async def get(self, key):
+        return self.values.get(key)
+
+    async def set(self, key, value, ttl=300):
+        self.values[key] = value
+        return True
+
+
+def _service(bars: list[dict], cache=None) -> MarketAnalysisService:
+    tradier = Mock()
+    tradier.get_historical_bars.return_value = bars
+    return MarketAnalysisService(tradier, cache)
+
+
+class TestCompositeAnalysis:
+    """Test the bundle matches the list-based indicator implementations"""
+
+    def test_indicators_match_technical_indicators(self):
+        bars = _bars()
+        closes = [bar["close"] for bar in bars]
+        highs = [bar["high"] for bar in bars]
+        lows = [bar["low"] for bar in bars]
+
+        service = _service(bars)
+
+        values = asyncio.run(
+            service.calculate_technical_indicators("AAPL", ["rsi", "macd", "bb", "atr", "ma"])
+        )
+
+        macd = TechnicalIndicators.calculate_macd(closes)
+        bands = TechnicalIndicators.calculate_bollinger_bands(closes)
+        assert values["rsi"] == pytest.approx(TechnicalIndicators.calculate_rsi(closes))
+        assert values["macd"] == pytest.approx(macd["macd"], abs=1e-4)
+        assert values["macd_signal"] == pytest.approx(macd["signal"], abs=1e-4)
+        assert values["bb_upper"] == pytest.approx(bands["upper"])
+        assert values["bb_width"] == pytest.approx(TechnicalIndicators.calculate_bb_width(closes))
+        atr = TechnicalIndicators.calculate_atr(highs, lows, closes)
+        assert values["atr"] == pytest.approx(atr)
+        for key, expected in TechnicalIndicators.calculate_moving_averages(closes).items():
+            assert values[key] == pytest.approx(expected)
+
+    def test_trend_matches_technical_indicators(self):
+        bars = _bars()
+
+        trend = asyncio.run(_service(bars).analyze_trend("AAPL"))
+
+        expected = TechnicalIndicators.analyze_trend([bar["close"] for bar in bars])
+        assert {key: trend[key] for key in expected} == pytest.approx(expected)
+        assert trend["moving_averages"]["sma_200"] > 0
+
+    def test_sections_filter_the_bundle(self):
+        analysis = asyncio.run(_service(_bars()).analyze_symbol("aapl", sections=["volume"]))
+
+        assert analysis["symbol"] == "AAPL"
+        assert analysis["bars"] == 250
+        assert "volume" in analysis
+        assert "regime" not in analysis
+
+    def test_unknown_section_is_rejected(self):
+        with pytest.raises(ValueError):
+            asyncio.run(_service(_bars()).analyze_symbol("AAPL", sections=["sentiment"]))
+
+
+class TestSingleFetch:
+    """Test the four individual methods share one upstream fetch"""
+
+    def test_concurrent_methods_share_one_fetch(self):
+        service = _service(_bars())
+
+        async def dashboard():
+            return await asyncio.gather(
+                service.calculate_technical_indicators("AAPL", ["rsi"]),
+                service.detect_market_regime("AAPL"),
+                service.analyze_trend("AAPL"),
+                service.analyze_volume("AAPL", lookback_days=90),
+            )
+
+        indicators, regime, trend, volume = asyncio.run(dashboard())
+
+        service.tradier.get_historical_bars.assert_called_once()
+        assert regime["features"]["rsi"] == indicators["rsi"]
+        assert regime["features"]["trend_direction"] == trend["direction"]
+        assert volume["liquidity_score"] > 0
+
+    def test_cached_bundle_serves_later_calls(self):
+        service = _service(_bars(), cache=DictCache())
+
+        asyncio.run(service.detect_market_regime("AAPL"))
+        asyncio.run(service.calculate_technical_indicators("AAPL", ["macd"]))
+
+        service.tradier.get_historical_bars.assert_called_once()
+
+    def test_short_history(self):
+        service = _service(_bars(10))
+
+        regime = asyncio.run(service.detect_market_regime("AAPL"))
+        volume = asyncio.run(service.analyze_volume("AAPL", lookback_days=90))
+
+        assert regime["regime"] == "unknown"
+        assert volume["volume_trend"] == "unknown"
+        with pytest.raises(ValueError):
+            asyncio.run(service.calculate_technical_indicators("AAPL", ["rsi"]))
@@ -0,0 +1,275 @@
+"""
+Tests for market recording and deterministic replay
+"""
+
+import asyncio
+import json
+from datetime import UTC, datetime, timedelta
+from unittest.mock import Mock
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.core.unified_auth import get_current_user_unified
+from app.routers import runtime
+from app.runtime.jsonl_logger import JSONLLogger, read_jsonl
+from app.runtime.market_replay import (
+    MarketRecorder,
+    MarketReplay,
+    iter_session,
+    read_session,
+)
+from app.runtime.temporal_oracle import TemporalOracle
+from app.services.bar_builder import BarBuilder
+from app.services.tradier_stream import TradierStreamService
+
+
+START = datetime(2025, 3, 3, 14, 30, tzinfo=UTC).timestamp()
+
+
+def _snapshot(last: float = 10.0, trade_date: float | None = None) -> dict:
+    quote = {"symbol": "ABC", "last": last, "average_volume": 1000000}
+    if trade_date is not None:
+        quote["trade_date"] = int(trade_date * 1000)
+    return {"status": "ok", "account": {"cash": 10000}, "quotes": {"items": [quote]}}
+
+
+def _record(directory, segment_events=100) -> MarketRecorder:
+    """Snapshot at +0s, trade at +1s, snapshot at +2s, trade at +3s"""
+    recorder = MarketRecorder(directory, segment_events=segment_events)
+    recorder.record_snapshot("stocks_options", _snapshot(), START)
+    recorder.record_message({"type": "trade", "symbol": "ABC", "price": "11.5"}, START + 1)
+    recorder.record_snapshot("stocks_options", _snapshot(trade_date=START + 2), START + 2)
+    recorder.record_message({"type": "trade", "symbol": "ABC", "price": "99"}, START + 3)
+    recorder.close()
+    return recorder
+
+
+class PlannerStub:
+    """Planner recording what it saw and when"""
+
+    def __init__(self, oracle: TemporalOracle):
+        self.oracle = oracle
+        self.seen = []
+
+    def __call__(self, snapshot: dict) -> dict:
+        self.seen.append((self.oracle.get_sim_time(), snapshot))
+        items = snapshot["quotes"]["items"]
+        return {"approved_trades": [{"symbol": q["symbol"], "price": q["last"]} for q in items]}
+
+
+class TestRecorder:
+    """Test events round-trip through rotating compressed segments"""
+
+    def test_segments_rotate_and_read_back_in_order(self, tmp_path):
+        recorder = _record(tmp_path, segment_events=3)
+
+        segments = sorted(p.name for p in tmp_path.iterdir())
+        events = list(read_session(tmp_path))
+
+        assert segments == ["segment-00001.jsonl.gz", "segment-00002.jsonl.gz"]
+        assert recorder.events_written == 4
+        assert [e["kind"] for e in events] == ["snapshot", "stream", "snapshot", "stream"]
+        assert events[1]["data"]["price"] == "11.5"
+
+    def test_async_reader_matches_read_session(self, tmp_path):
+        _record(tmp_path, segment_events=3)
+
+        async def collect():
+            return [event async for event in iter_session(tmp_path, chunk_events=3)]
+
+        assert asyncio.run(collect()) == list(read_session(tmp_path))
+
+    def test_truncated_segment_keeps_complete_records(self, tmp_path):
+        path = tmp_path / "segment-00001.jsonl.gz"
+        writer = JSONLLogger(path)
+        writer.extend({"n": n} for n in range(100))
+        writer.close()
+        path.write_bytes(path.read_bytes()[:-12])
+
+        records = list(read_jsonl(path))
+
+        assert 0 < len(records) <= 100
+        assert [r["n"] for r in records] == list(range(len(records)))
+
+    def test_stream_messages_are_recorded(self, tmp_path):
+        stream = TradierStreamService()
+        stream.cache = Mock()
+        stream.bars = BarBuilder()
+        stream.recorder = MarketRecorder(tmp_path)
+        message = {"type": "trade", "symbol": "SPY", "price": 585.2, "size": 100}
+
+        asyncio.run(stream._handle_message(json.dumps(message)))
+        stream.recorder.close()
+
+        [event] = read_session(tmp_path)
+        assert event["kind"] == "stream"
+        assert event["data"] == message
+
+
+class TestReplay:
+    """Test the planner sees the market as of the sim clock, and only that"""
+
+    def test_planner_sees_stream_updates_up_to_sim_time(self, tmp_path):
+        _record(tmp_path)
+        oracle = TemporalOracle()
+        planner = PlannerStub(oracle)
+
+        result = asyncio.run(MarketReplay(tmp_path, oracle=oracle).run(planner))
+
+        assert result.events == 4
+        prices = [p["trade_plan"]["approved_trades"][0]["price"] for p in result.plans]
+        assert prices == [10.0, 11.5]
+        assert [t.timestamp() for t, _ in planner.seen] == [START, START + 2]
+        assert planner.seen[1][1]["as_of"] == datetime.fromtimestamp(START + 2, UTC).isoformat()
+        assert result.sim_end == datetime.fromtimestamp(START + 3, UTC).isoformat()
+
+    def test_quotes_from_the_future_are_dropped(self, tmp_path):
+        recorder = MarketRecorder(tmp_path)
+        recorder.record_snapshot("stocks_options", _snapshot(trade_date=START + 60), START)
+        recorder.close()
+        oracle = TemporalOracle()
+
+        result = asyncio.run(MarketReplay(tmp_path, oracle=oracle).run(PlannerStub(oracle)))
+
+        assert result.dropped_lookahead == 1
+        assert result.plans[0]["trade_plan"]["approved_trades"] == []
+
+    def test_replays_are_deterministic(self, tmp_path):
+        _record(tmp_path)
+
+        def replay():
+            oracle = TemporalOracle()
+            return asyncio.run(MarketReplay(tmp_path, oracle=oracle).run(PlannerStub(oracle)))
+
+        first, second = replay(), replay()
+
+        assert first.digest == second.digest
+        assert first.plans == second.plans
+
+    def test_plan_interval_plans_between_snapshots(self, tmp_path):
+        _record(tmp_path)
+        oracle = TemporalOracle()
+        planner = PlannerStub(oracle)
+        replay = MarketReplay(tmp_path, oracle=oracle, plan_interval=timedelta(seconds=1))
+
+        asyncio.run(replay.run(planner))
+
+        # Snapshots at +0s and +2s, interval plans at +1s and +3s
+        assert [t.timestamp() - START for t, _ in planner.seen] == [0, 1, 2, 3]
+
+    def test_speed_paces_against_recorded_time(self, tmp_path):
+        _record(tmp_path)
+        oracle = TemporalOracle()
+        replay = MarketReplay(tmp_path, oracle=oracle, speed=30)
+
+        result = asyncio.run(replay.run(PlannerStub(oracle)))
+
+        # 3 recorded seconds at 30x
+        assert result.wall_seconds == pytest.approx(0.1, abs=0.05)
+
+    def test_run_log_receives_every_plan(self, tmp_path):
+        _record(tmp_path / "session")
+        oracle = TemporalOracle()
+        run_log = JSONLLogger(tmp_path / "run" / "log.jsonl")
+
+        result = asyncio.run(
+            MarketReplay(tmp_path / "session", oracle=oracle, run_logger=run_log).run(
+                PlannerStub(oracle)
+            )
+        )
+
+        assert list(read_jsonl(run_log.file_path)) == result.plans
+
+    def test_run_log_is_closed_when_the_planner_raises(self, tmp_path):
+        _record(tmp_path / "session")
+        run_log = JSONLLogger(tmp_path / "run" / "log.jsonl")
+        run_log.append({"started": True})
+
+        def planner(snapshot):
+            raise RuntimeError("strategy failed")
+
+        with pytest.raises(RuntimeError):
+            asyncio.run(MarketReplay(tmp_path / "session", run_logger=run_log).run(planner))
+
+        assert run_log._fp is None
+
+
+class TestReplayEndpoint:
+    """Test POST /runtime/replay is bounded by REPLAY_TIMEOUT_SECONDS"""
+
+    def test_paced_replay_past_the_timeout_is_cancelled(self, tmp_path, monkeypatch):
+        _record(tmp_path / "slow")
+        run_log = JSONLLogger(tmp_path / "run" / "log.jsonl")
+        monkeypatch.setattr(runtime, "REPLAY_DIR", tmp_path)
+        monkeypatch.setattr(runtime, "REPLAY_TIMEOUT_SECONDS", 0.2)
+        monkeypatch.setattr(runtime, "make_run_logger", lambda run_id: run_log)
+        monkeypatch.setattr(
+            runtime, "strategy_planner", lambda *args, **kwargs: PlannerStub(TemporalOracle())
+        )
+        app = FastAPI()
+        app.include_router(runtime.router, prefix="/api")
+        app.dependency_overrides[get_current_user_unified] = lambda: Mock(id=1)
+
+        # 3 recorded seconds at 1x
+        response = TestClient(app).post(
+            "/api/runtime/replay", json={"session": "slow", "strategy_type": "x", "speed": 1}
+        )
+
+        assert response.status_code == 504
+        assert run_log._fp is None
+
+    def test_omitted_config_reaches_the_planner_as_none(self, tmp_path, monkeypatch):
+        _record(tmp_path / "session")
+        planner_args = []
+
+        def strategy_planner(strategy_type, config, user_id):
+            planner_args.append(config)
+            return PlannerStub(TemporalOracle())
+
+        monkeypatch.setattr(runtime, "REPLAY_DIR", tmp_path)
+        monkeypatch.setattr(runtime, "strategy_planner", strategy_planner)
+        monkeypatch.setattr(
+            runtime, "make_run_logger", lambda run_id: JSONLLogger(tmp_path / "run.jsonl")
+        )
+        app = FastAPI()
+        app.include_router(runtime.router, prefix="/api")
+        app.dependency_overrides[get_current_user_unified] = lambda: Mock(id=1)
+
+        response = TestClient(app).post(
+            "/api/runtime/replay", json={"session": "session", "strategy_type": "custom"}
+        )
+
+        assert response.status_code == 200
+        assert planner_args == [None]
+
+    def test_replay_without_config_uses_the_saved_strategy(self, tmp_path, monkeypatch):
+        execution = pytest.importorskip("app.services.strategy_execution_service")
+
+        _record(tmp_path / "session")
+        service = execution.StrategyExecutionService(strategies_dir=tmp_path / "strategies")
+        service.save_strategy(user_id=1, strategy_type="custom", config={"symbol": "abc"})
+        planned_with = []
+
+        def generate_trade_plan(strategy_type, config, market_snapshot):
+            planned_with.append(config)
+            return {"approved_trades": []}
+
+        monkeypatch.setattr(execution, "get_strategy_execution_service", lambda: service)
+        monkeypatch.setattr(execution, "generate_trade_plan", generate_trade_plan)
+        monkeypatch.setattr(runtime, "REPLAY_DIR", tmp_path)
+        monkeypatch.setattr(
+            runtime, "make_run_logger", lambda run_id: JSONLLogger(tmp_path / "run.jsonl")
+        )
+        app = FastAPI()
+        app.include_router(runtime.router, prefix="/api")
+        app.dependency_overrides[get_current_user_unified] = lambda: Mock(id=1)
+
+        response = TestClient(app).post(
+            "/api/runtime/replay", json={"session": "session", "strategy_type": "custom"}
+        )
+
+        assert response.status_code == 200
+        assert len(response.json()["plans"]) == 2
+        assert planned_with and all(config["symbol"] == "abc" for config in planned_with)
@@ -0,0 +1,114 @@
+"""
+Tests for ModelRegistry background training, preload and hot-swap
+"""
+
+import threading
+
+import numpy as np
+import pytest
+
+from app.services.model_persistence import ModelPersistence
+from app.services.model_registry import ModelRegistry
+
+
+class ArrayModel:
+    """Minimal picklable model holding a numpy array"""
+
+    def __init__(self, weights: np.ndarray):
+        self.weights = weights
+
+
+@pytest.fixture
+def persistence(tmp_path):
+    store = ModelPersistence()
+    store.model_dir = tmp_path
+    return store
+
+
+def _trainer(value: float = 1.0):
+    def train(**kwargs):
+        return ArrayModel(np.full(1000, value)), {"value": value}
+
+    return train
+
+
+class TestBackgroundTraining:
+    """Test that training happens off the request path"""
+
+    def test_preload_without_saved_model_trains_in_background(self, persistence):
+        registry = ModelRegistry(persistence)
+        registry.register("demo", _trainer())
+
+        assert registry.preload("demo") is None
+
+        registry.train("demo").result(timeout=10)
+        active = registry.get("demo")
+        assert active is not None
+        assert active.metadata["value"] == 1.0
+
+    def test_concurrent_train_requests_share_one_job(self, persistence):
+        release = threading.Event()
+        calls = []
+
+        def slow_trainer(**kwargs):
+            calls.append(1)
+            release.wait(5)
+            return ArrayModel(np.zeros(10)), {}
+
+        registry = ModelRegistry(persistence)
+        registry.register("demo", slow_trainer)
+
+        first = registry.train("demo")
+        second = registry.train("demo")
+        assert registry.is_training("demo")
+        release.set()
+        first.result(timeout=10)
+
+        assert first is second
+        assert len(calls) == 1
+
+    def test_failed_training_is_reported_and_backed_off(self, persistence):
+        calls = []
+
+        def failing_trainer(**kwargs):
+            calls.append(1)
+            raise RuntimeError("no data")
+
+        registry = ModelRegistry(persistence)
+        registry.register("demo", failing_trainer)
+
+        assert registry.train("demo").result(timeout=10) is None
+        registry.train("demo").result(timeout=10)
+
+        assert len(calls) == 1
+        assert registry.get("demo") is None
+        assert registry.status()["demo"]["last_error"] == "no data"
+
+
+class TestWarmLoading:
+    """Test persisted versions are memory-mapped and hot-swapped"""
+
+    def test_new_worker_preloads_memory_mapped_version(self, persistence):
+        trained = ModelRegistry(persistence)
+        trained.register("demo", _trainer(2.0))
+        version = trained.train("demo").result(timeout=10).version
+
+        worker = ModelRegistry(persistence)
+        worker.register("demo", _trainer())
+        active = worker.preload("demo")
+
+        assert active.version == version
+        assert isinstance(active.model.weights, np.memmap)
+        assert float(active.model.weights[0]) == 2.0
+
+    def test_retrain_swaps_active_version(self, persistence):
+        registry = ModelRegistry(persistence)
+        values = iter([1.0, 3.0])
+        registry.register("demo", lambda **kwargs: _trainer(next(values))())
+
+        old = registry.train("demo").result(timeout=10)
+        new = registry.train("demo").result(timeout=10)
+
+        assert registry.get("demo") is new
+        assert old.model.weights[0] == 1.0
+        assert new.model.weights[0] == 3.0
@@ -0,0 +1,151 @@
+"""
+Tests for options chain snapshots: columnar wire formats and conditional GETs
+"""
+
+from unittest.mock import Mock
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.core.unified_auth import get_current_user_unified
+from app.routers import options
+from app.services.cache import get_cache
+from app.services.options_chain import COLUMN_FIELDS, ChainSnapshot
+
+
+def _tradier_chain(bid: float = 5.0) -> dict:
+    return {
+        "options": {
+            "option": [
+                {
+                    "symbol": "SPY250117C00600000",
+                    "option_type": "call",
+                    "strike": 600,
+                    "bid": bid,
+                    "ask": bid + 0.1,
+                    "last": bid,
+                    "volume": 10,
+                    "open_interest": 100,
+                    "greeks": {"delta": 0.5, "gamma": 0.01, "mid_iv": 0.2},
+                },
+                {
+                    "symbol": "SPY250117P00590000",
+                    "option_type": "put",
+                    "strike": 590,
+                    "bid": 3.0,
+                    "ask": 3.2,
+                    "greeks": {"delta": -0.4, "mid_iv": 0.22},
+                },
+            ]
+        }
+    }
+
+
+@pytest.fixture
+def tradier(monkeypatch):
+    client = Mock()
+    client.get_option_chains.return_value = _tradier_chain()
+    client.get_quote.return_value = {"last": 598.5}
+    monkeypatch.setattr("app.routers.options.get_tradier_client", lambda: client)
+    return client
+
+
+@pytest.fixture
+def api(tradier):
+    cache = Mock()
+    cache.get.return_value = None
+
+    app = FastAPI()
+    app.include_router(options.router, prefix="/api")
+    app.dependency_overrides[get_current_user_unified] = lambda: Mock()
+    app.dependency_overrides[get_cache] = lambda: cache
+    return TestClient(app)
+
+
+URL = "/api/options/chain/SPY?expiration=2025-01-17"
+
+
+class TestSnapshot:
+    """Test Tradier chains are parsed once into rows and columns"""
+
+    def test_rows_and_columns(self):
+        snapshot = ChainSnapshot.from_tradier("SPY", "2025-01-17", _tradier_chain(), 598.5)
+
+        [call] = snapshot.calls
+        assert call["strike_price"] == 600.0
+        assert call["implied_volatility"] == 0.2
+        assert call["underlying_symbol"] == "SPY"
+        columns = snapshot.columns()
+        assert set(columns["puts"]) == set(COLUMN_FIELDS)
+        assert columns["puts"]["delta"] == [-0.4]
+        assert columns["puts"]["gamma"] == [None]
+
+    def test_encodes_each_format_once(self):
+        snapshot = ChainSnapshot.from_tradier("SPY", "2025-01-17", _tradier_chain())
+
+        body, media_type = snapshot.encode("columnar")
+
+        assert snapshot.encode("columnar")[0] is body
+        assert media_type == "application/json"
+
+    def test_digest_tracks_content_not_fetch_time(self):
+        first = ChainSnapshot.from_tradier("SPY", "2025-01-17", _tradier_chain())
+        same = ChainSnapshot.from_tradier("SPY", "2025-01-17", _tradier_chain())
+        moved = ChainSnapshot.from_tradier("SPY", "2025-01-17", _tradier_chain(bid=5.5))
+
+        assert first.etag("json") == same.etag("json")
+        assert first.etag("json") != moved.etag("json")
+        assert first.etag("json") != first.etag("columnar")
+
+
+class TestChainEndpoint:
+    """Test wire formats and ETag revalidation on /options/chain"""
+
+    def test_json_keeps_contract_objects(self, api):
+        response = api.get(URL)
+
+        assert response.status_code == 200
+        data = response.json()["data"]
+        assert data["total_contracts"] == 2
+        assert data["underlying_price"] == 598.5
+        assert data["calls"][0]["symbol"] == "SPY250117C00600000"
+        assert data["puts"][0]["option_type"] == "put"
+
+    def test_columnar_and_msgpack_send_arrays(self, api):
+        msgpack = pytest.importorskip("msgpack")
+        columnar = api.get(URL + "&format=columnar").json()
+        packed = msgpack.unpackb(api.get(URL + "&format=msgpack").content)
+
+        assert columnar["calls"]["strike_price"] == [600.0]
+        assert columnar["puts"]["bid"] == [3.0]
+        assert packed["calls"] == columnar["calls"]
+
+    def test_unchanged_chain_revalidates_with_304(self, api, tradier):
+        first = api.get(URL)
+        etag = first.headers["etag"]
+
+        again = api.get(URL, headers={"If-None-Match": etag})
+
+        assert again.status_code == 304
+        assert again.content == b""
+        assert again.headers["etag"] == etag
+        assert tradier.get_option_chains.call_count == 1
+
+    def test_symbol_case_shares_one_chain_fetch(self, api, tradier):
+        lower = api.get("/api/options/chain/spy?expiration=2025-01-17")
+        upper = api.get(URL)
+
+        assert lower.headers["etag"] == upper.headers["etag"]
+        assert tradier.get_option_chains.call_count == 1
+        assert tradier.get_option_chains.call_args.args[0] == "SPY"
+
+    def test_changed_chain_gets_new_etag(self, api, tradier):
+        etag = api.get(URL).headers["etag"]
+        tradier.get_option_chains.return_value = _tradier_chain(bid=6.0)
+        options.get_single_flight().clear()
+
+        response = api.get(URL, headers={"If-None-Match": etag})
+
+        assert response.status_code == 200
+        assert response.headers["etag"] != etag
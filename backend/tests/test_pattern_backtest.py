@@ -0,0 +1,217 @@
+"""
+Tests for the pattern outcome backtester (event study)
+"""
+
+from unittest.mock import create_autospec
+
+import numpy as np
+import pandas as pd
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.core import compute_pool
+from app.core.compute_pool import ComputePool
+from app.ml import pattern_backtest
+from app.ml.pattern_backtest import pattern_events, simulate_outcomes, summarize
+from app.ml.pattern_recognition import Pattern
+from app.routers import ml
+from app.services.tradier_client import TradierClient
+
+
+def _bars(closes: list[float], spread: float = 0.5) -> pd.DataFrame:
+    close = np.asarray(closes, dtype=float)
+    index = pd.date_range("2024-01-01", periods=len(close), freq="B")
+    return pd.DataFrame(
+        {"close": close, "high": close + spread, "low": close - spread}, index=index
+    )
+
+
+def _bar_list(df: pd.DataFrame) -> list[dict]:
+    """Bars in the shape TradierClient.get_historical_bars returns"""
+    return [
+        {"date": ts.strftime("%Y-%m-%d"), "open": row.close, "volume": 1000, **row}
+        for ts, row in df.iterrows()
+    ]
+
+
+def _pattern(
+    df, bar, signal="bullish", target=110.0, stop=95.0, confidence=0.8, kind="double_bottom"
+):
+    return Pattern(
+        pattern_type=kind,
+        signal=signal,
+        confidence=confidence,
+        start_date=df.index[max(bar - 10, 0)],
+        end_date=df.index[bar],
+        key_levels={},
+        description="test",
+        target_price=target,
+        stop_loss=stop,
+    )
+
+
+class TestSimulateOutcomes:
+    """Test exits are found on the actual bars after entry"""
+
+    def test_target_stop_expiry_and_open(self):
+        close = np.full(40, 100.0)
+        close[3] = 106.0  # long target bar for the first event
+        close[22] = 93.0  # stop bar for the second event
+        high, low = close + 0.5, close - 0.5
+
+        result = simulate_outcomes(
+            close,
+            high,
+            low,
+            entry_idx=np.array([0, 15, 5, 35]),
+            direction=np.array([1.0, 1.0, 1.0, 1.0]),
+            target=np.array([106.0, 120.0, 120.0, 120.0]),
+            stop=np.array([90.0, 94.0, 80.0, 80.0]),
+            max_hold=10,
+        )
+
+        assert list(result["outcome"]) == ["target", "stop", "expiry", "open"]
+        assert result["roi"][:3] == pytest.approx([6.0, -6.0, 0.0])
+        assert result["hold_days"][:3] == pytest.approx([3, 7, 10])
+        assert np.isnan(result["roi"][3])
+        assert result["fwd_5d"][0] == pytest.approx(0.0)
+        assert np.isnan(result["fwd_5d"][3])
+
+    def test_short_trades_and_same_bar_touch_counts_as_stop(self):
+        close = np.array([100.0, 100.0, 100.0, 100.0])
+        high = np.array([100.5, 100.5, 104.0, 100.5])
+        low = np.array([99.5, 99.5, 94.0, 99.5])
+
+        result = simulate_outcomes(
+            close,
+            high,
+            low,
+            entry_idx=np.array([0, 0]),
+            direction=np.array([-1.0, 1.0]),
+            target=np.array([95.0, 103.0]),
+            stop=np.array([103.0, 95.0]),
+            max_hold=3,
+        )
+
+        assert list(result["outcome"]) == ["stop", "stop"]
+        assert result["roi"] == pytest.approx([-3.0, -5.0])
+
+
+class TestEvents:
+    """Test patterns become scored events and are summarized per type"""
+
+    def test_entry_waits_for_confirmation(self):
+        closes = [100.0] * 10 + [100.0 + i for i in range(1, 31)]
+        df = _bars(closes)
+        events = pattern_events(df, [_pattern(df, 4, target=108.0)])
+
+        # Entry at bar 9 (100), target 108 reached by the close of 108 at bar 18
+        assert events["entry_date"][0] == df.index[9].isoformat()
+        assert events["outcome"][0] == "target"
+        assert events["hold_days"][0] == 8
+        assert events["roi"][0] == pytest.approx(8.0)
+
+    def test_summary_filters_by_confidence(self):
+        closes = [100.0] * 10 + [100.0 + i for i in range(1, 31)]
+        df = _bars(closes)
+        patterns = [
+            _pattern(df, 4, target=108.0, confidence=0.9),
+            _pattern(
+                df, 4, signal="bearish", target=90.0, stop=105.0, confidence=0.6, kind="double_top"
+            ),
+            _pattern(df, 38, confidence=0.9),
+        ]
+        events = pattern_events(df, patterns)
+
+        everything = summarize(events, 0.5)
+        confident = summarize(events, 0.8)
+
+        assert everything["total_patterns"] == 3
+        assert everything["overall_win_rate"] == 50.0
+        assert confident["total_patterns"] == 2
+        assert confident["open_patterns"] == 1
+        [bottoms] = confident["patterns"]
+        assert bottoms["successful_trades"] == 1
+        assert bottoms["open_trades"] == 1
+        assert bottoms["target_hit_rate"] == 100.0
+
+
+class TestEndpoint:
+    """Test the endpoint caches the event table across confidence sweeps"""
+
+    @pytest.fixture
+    def tradier(self, monkeypatch):
+        closes = 100 + 5 * np.sin(np.linspace(0, 12 * np.pi, 250))
+        stub = create_autospec(TradierClient, instance=True)
+        stub.get_historical_bars.return_value = _bar_list(_bars(list(closes)))
+        monkeypatch.setattr(pattern_backtest, "get_tradier_client", lambda: stub)
+        return stub
+
+    @pytest.fixture
+    def client(self, monkeypatch):
+        # Inline pool so tasks see the patched Tradier client whatever TESTING says
+        pool = ComputePool(inline=True)
+        monkeypatch.setattr(compute_pool, "_compute_pool", pool)
+        app = FastAPI()
+        app.include_router(ml.router)
+        yield TestClient(app)
+        pool.shutdown()
+
+    def test_confidence_sweep_reuses_scored_events(self, client, tradier):
+        results = [
+            client.post(f"/api/ml/backtest-patterns?symbol=spy&min_confidence={c}").json()
+            for c in (0.5, 0.7, 0.9)
+        ]
+
+        assert tradier.get_historical_bars.call_count == 1
+        totals = [r["total_patterns"] for r in results]
+        assert totals[0] > 0
+        assert totals == sorted(totals, reverse=True)
+        assert results[0]["symbol"] == "SPY"
+
+    def test_symbols_are_backtested_together(self, client, tradier):
+        response = client.post(
+            "/api/ml/backtest-patterns?symbols=SPY&symbols=QQQ&min_confidence=0.5"
+        )
+
+        data = response.json()
+        assert set(data["results"]) == {"SPY", "QQQ"}
+        assert data["total_patterns"] == 2 * data["results"]["SPY"]["total_patterns"]
+
+    def test_short_history_is_rejected(self, client, tradier):
+        tradier.get_historical_bars.return_value = _bar_list(_bars([100.0] * 20))
+
+        response = client.post("/api/ml/backtest-patterns?symbol=XYZ")
+
+        assert response.status_code == 400
+
+    def test_symbol_with_short_history_is_reported_not_fatal(self, client, tradier):
+        good = tradier.get_historical_bars.return_value
+        short = _bar_list(_bars([100.0] * 20))
+        tradier.get_historical_bars.side_effect = lambda symbol, **_: (
+            short if symbol == "XYZ" else good
+        )
+
+        response = client.post("/api/ml/backtest-patterns?symbols=SPY&symbols=xyz")
+
+        assert response.status_code == 200
+        data = response.json()
+        assert set(data["results"]) == {"SPY"}
+        assert set(data["errors"]) == {"XYZ"}
+        assert data["total_patterns"] == data["results"]["SPY"]["total_patterns"]
+
+    def test_every_symbol_failing_is_rejected(self, client, tradier):
+        tradier.get_historical_bars.return_value = _bar_list(_bars([100.0] * 20))
+
+        response = client.post("/api/ml/backtest-patterns?symbols=XYZ&symbols=ABC")
+
+        assert response.status_code == 400
+
+    def test_symbols_list_is_capped(self, client, tradier):
+        query = "&".join(f"symbols=S{i}" for i in range(ml.MAX_BACKTEST_SYMBOLS + 1))
+
+        response = client.post(f"/api/ml/backtest-patterns?{query}")
+
+        assert response.status_code == 422
+        tradier.get_historical_bars.assert_not_called()
@@ -0,0 +1,173 @@
+"""
+Tests for the multi-symbol portfolio backtester
+"""
+
+from datetime import date, timedelta
+from unittest.mock import Mock
+
+import numpy as np
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.core.unified_auth import get_current_user_unified
+from app.routers import backtesting
+from app.services.backtesting_engine import BacktestingEngine, StrategyRules
+from app.services.portfolio_backtest import (
+    PortfolioBacktestingEngine,
+    align_bars,
+    entry_signals,
+    rsi_panel,
+)
+
+
+def _dates(n: int) -> list[str]:
+    start = date(2024, 1, 1)
+    return [(start + timedelta(days=i)).isoformat() for i in range(n)]
+
+
+def _price_strategy(**kwargs) -> StrategyRules:
+    """Buy below 50, take profit at 10%"""
+    defaults = {
+        "entry_rules": [{"indicator": "PRICE", "operator": "<", "value": 50}],
+        "exit_rules": [{"type": "take_profit", "value": 10}],
+        "position_size_percent": 50.0,
+        "max_positions": 2,
+    }
+    return StrategyRules(**{**defaults, **kwargs})
+
+
+class TestSignals:
+    """Test panel indicators match the single-symbol engine"""
+
+    def test_rsi_panel_matches_engine(self):
+        rng = np.random.default_rng(7)
+        closes = 100 * np.cumprod(1 + rng.normal(0, 0.02, (60, 3)), axis=0)
+
+        panel = rsi_panel(closes, 14)
+
+        for column in range(3):
+            for row in (20, 40, 59):
+                expected = BacktestingEngine.calculate_rsi(list(closes[: row + 1, column]), 14)
+                assert panel[row, column] == pytest.approx(expected)
+
+    def test_strongest_signal_scores_first(self):
+        closes = np.array([[40.0, 30.0, 60.0]])
+
+        signals, scores = entry_signals(
+            closes, [{"indicator": "PRICE", "operator": "<", "value": 50}]
+        )
+
+        assert list(signals[0]) == [True, True, False]
+        assert np.argmin(scores[0]) == 1
+
+
+class TestEngine:
+    """Test positions share one book of capital"""
+
+    def test_max_positions_is_enforced_across_symbols(self):
+        closes = np.full((30, 4), 100.0)
+        closes[5:, :] = [45.0, 40.0, 35.0, 48.0]
+
+        result = PortfolioBacktestingEngine(10000).execute_backtest(
+            ["A", "B", "C", "D"], _dates(30), closes, _price_strategy()
+        )
+
+        assert result.max_concurrent_positions == 2
+        # The two cheapest (strongest) signals win the slots
+        assert {t["symbol"] for t in result.trade_history} == {"B", "C"}
+
+    def test_entries_split_remaining_cash(self):
+        closes = np.full((30, 2), 100.0)
+        closes[5:, :] = 40.0
+        closes[10:, :] = 44.0
+
+        result = PortfolioBacktestingEngine(10000).execute_backtest(
+            ["A", "B"], _dates(30), closes, _price_strategy()
+        )
+
+        first, second = result.trade_history[:2]
+        # 50% of 10000, then 50% of the 5000 left
+        assert first["quantity"] == 125
+        assert second["quantity"] == 62
+        assert first["exit_date"] == _dates(30)[10]
+        assert result.equity_curve[9]["positions"] == 2
+
+    def test_missing_bars_do_not_trade(self):
+        closes = np.full((30, 2), 100.0)
+        closes[5:, 0] = 40.0
+        closes[5:, 1] = np.nan  # B stops reporting
+        closes[12, 0] = 60.0
+        closes[13:, 0] = np.nan
+
+        result = PortfolioBacktestingEngine(10000).execute_backtest(
+            ["A", "B"], _dates(30), closes, _price_strategy()
+        )
+
+        [trade] = result.trade_history
+        assert trade["symbol"] == "A"
+        assert trade["exit_date"] == _dates(30)[12]
+        assert np.isfinite(result.final_capital)
+
+    def test_short_history_is_rejected(self):
+        with pytest.raises(ValueError):
+            PortfolioBacktestingEngine().execute_backtest(
+                ["A"], _dates(10), np.full((10, 1), 100.0), _price_strategy()
+            )
+
+
+def test_align_bars_unions_dates():
+    dates, closes = align_bars(
+        {
+            "A": [{"date": "2024-01-02", "close": 1.0}, {"date": "2024-01-03", "close": 2.0}],
+            "B": [{"date": "2024-01-01", "close": 3.0}, {"date": "2024-01-03", "close": 4.0}],
+        }
+    )
+
+    assert dates == ["2024-01-01", "2024-01-02", "2024-01-03"]
+    assert np.array_equal(closes, [[np.nan, 3.0], [1.0, np.nan], [2.0, 4.0]], equal_nan=True)
+
+
+class TestEndpoint:
+    """Test /backtesting/portfolio fetches every symbol and skips empty ones"""
+
+    @pytest.fixture
+    def client(self, monkeypatch):
+        closes = {"AAA": 45.0, "BBB": 40.0}
+
+        def bars(symbol, interval="daily", start_date=None, end_date=None):
+            if symbol not in closes:
+                return []
+            return [
+                {"date": d, "close": 100.0 if i < 5 else closes[symbol]}
+                for i, d in enumerate(_dates(40))
+            ]
+
+        tradier = Mock()
+        tradier.get_historical_bars.side_effect = bars
+        monkeypatch.setattr(backtesting, "get_tradier_client", lambda: tradier)
+
+        app = FastAPI()
+        app.include_router(backtesting.router, prefix="/api")
+        app.dependency_overrides[get_current_user_unified] = lambda: Mock()
+        return TestClient(app)
+
+    def test_portfolio_backtest(self, client):
+        response = client.post(
+            "/api/backtesting/portfolio",
+            json={
+                "symbols": ["aaa", "bbb", "zzz"],
+                "start_date": "2024-01-01",
+                "end_date": "2024-02-09",
+                "entry_rules": [{"indicator": "PRICE", "operator": "<", "value": 50}],
+                "exit_rules": [{"type": "take_profit", "value": 10}],
+                "max_positions": 1,
+            },
+        )
+
+        assert response.status_code == 200
+        result = response.json()["result"]
+        assert result["config"]["symbols"] == ["AAA", "BBB"]
+        assert result["config"]["skipped_symbols"] == ["ZZZ"]
+        assert result["book"]["max_concurrent_positions"] == 1
+        assert result["trade_history"][0]["symbol"] == "BBB"
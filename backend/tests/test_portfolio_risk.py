@@ -0,0 +1,198 @@
+"""
+Tests for the Monte Carlo VaR/CVaR risk engine
+"""
+
+import asyncio
+from datetime import date, timedelta
+from unittest.mock import AsyncMock, Mock
+
+import numpy as np
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.core.unified_auth import get_current_user_unified
+from app.routers import analytics
+from app.services.options_greeks import GreeksCalculator
+from app.services.portfolio_analytics_service import PortfolioAnalyticsService
+from app.services.portfolio_risk import (
+    Holding,
+    book_pnl,
+    build_book,
+    parse_holding,
+    run_risk,
+    simulate_returns,
+    stress_test,
+    var_cvar,
+)
+
+
+TODAY = date(2025, 3, 3)
+
+
+def _returns(days: int = 250, columns: int = 3, seed: int = 5) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    mixing = rng.normal(0, 0.01, (columns, columns))
+    return rng.standard_normal((days, columns)) @ mixing.T
+
+
+def _stock_book(quantities: list[float], spot: float = 100.0):
+    symbols = [f"S{i}" for i in range(len(quantities))]
+    holdings = [Holding(s, s, q, spot) for s, q in zip(symbols, quantities, strict=True)]
+    return build_book(holdings, dict.fromkeys(symbols, spot), symbols, today=TODAY)
+
+
+class TestEngine:
+    """Test scenario generation, repricing and tail measures"""
+
+    def test_var_cvar_of_known_distribution(self):
+        pnl = np.arange(1000.0) - 500  # -500 .. 499
+
+        var, cvar = var_cvar(pnl, 0.95)
+
+        assert var == pytest.approx(450.05)
+        assert cvar == pytest.approx(475.0, abs=0.5)
+
+    def test_historical_windows_sum_consecutive_days(self):
+        returns = _returns(10)
+
+        [windows] = simulate_returns(returns, "historical", 0, 3, np.random.default_rng())
+
+        assert windows.shape == (8, 3)
+        assert np.allclose(windows[2], returns[2:5].sum(axis=0))
+
+    def test_normal_scenarios_keep_the_correlation(self):
+        returns = _returns()
+        rng = np.random.default_rng(0)
+
+        scenarios = np.vstack(list(simulate_returns(returns, "normal", 100_000, 1, rng)))
+
+        assert scenarios.shape == (100_000, 3)
+        assert np.allclose(
+            np.corrcoef(scenarios, rowvar=False), np.corrcoef(returns, rowvar=False), atol=0.02
+        )
+
+    def test_bootstrap_draws_historical_days(self):
+        returns = _returns(20)
+
+        [batch] = simulate_returns(returns, "bootstrap", 500, 1, np.random.default_rng(1))
+
+        assert all(any(np.array_equal(row, day) for day in returns) for row in batch[:20])
+
+    def test_option_repricing_tracks_black_scholes(self):
+        calculator = GreeksCalculator()
+        expiration = TODAY + timedelta(days=45)
+        holding = Holding("X", "X", 2, 4.0, "call", 100.0, expiration, 0.3)
+        book = build_book([holding], {"X": 100.0}, ["X"], today=TODAY)
+
+        pnl = book_pnl(book, np.log([[0.97], [1.03]]), horizon_days=0)
+
+        for move, value in zip((97.0, 103.0), pnl, strict=True):
+            before = calculator.calculate_greeks(100.0, 100.0, 45 / 365, 0.3, "call")
+            after = calculator.calculate_greeks(move, 100.0, 45 / 365, 0.3, "call")
+            exact = (after.theoretical_price - before.theoretical_price) * 200
+            assert value == pytest.approx(exact, rel=0.05)
+
+    def test_stress_scenarios_move_stocks_by_the_shock(self):
+        book = _stock_book([10, 20])
+
+        stress = {row["scenario"]: row for row in stress_test(book)}
+
+        assert stress["market_down_10"]["pnl"] == pytest.approx(-300.0)
+        assert stress["market_down_10"]["pnl_percent"] == pytest.approx(-10.0)
+        assert stress["vol_spike"]["pnl"] == 0
+
+    def test_short_positions_lose_on_rallies(self):
+        holding = parse_holding({"symbol": "abc", "qty": "5", "side": "short"})
+
+        book = build_book([holding], {"ABC": 50.0}, ["ABC"], today=TODAY)
+
+        assert holding.quantity == -5
+        assert book_pnl(book, np.log([[1.1]]))[0] == pytest.approx(-25.0)
+
+    def test_fifty_positions_100k_paths(self):
+        book = _stock_book(list(range(1, 51)))
+        returns = _returns(columns=50)
+
+        report = run_risk(book, returns, methods=("normal",), paths=100_000, seed=3)
+
+        assert report["methods"]["normal"]["scenarios"] == 100_000
+        level = report["methods"]["normal"]["confidence"]["99"]
+        assert level["cvar"] >= level["var"] > 0
+
+
+class TestService:
+    """Test PortfolioAnalyticsService fetches once and caches per snapshot"""
+
+    @pytest.fixture
+    def service(self):
+        rng = np.random.default_rng(2)
+
+        def bars(symbol, interval, start_date, end_date):
+            closes = 100 * np.cumprod(1 + rng.normal(0, 0.02, 120))
+            return [
+                {"date": (TODAY - timedelta(days=120 - i)).isoformat(), "close": close}
+                for i, close in enumerate(closes)
+            ]
+
+        tradier = Mock()
+        tradier.get_historical_bars.side_effect = bars
+        tradier.get_quotes.return_value = {
+            "quotes": {
+                "quote": [
+                    {"symbol": "AAA", "last": 50.0},
+                    {"symbol": "BBB", "last": 20.0},
+                    {"symbol": "AAA250620P00045000", "last": 1.2, "greeks": {"mid_iv": 0.4}},
+                ]
+            }
+        }
+        return PortfolioAnalyticsService(tradier)
+
+    POSITIONS = [
+        {"symbol": "AAA", "qty": "100", "side": "long"},
+        {"symbol": "BBB", "qty": "50", "side": "long"},
+        {"symbol": "AAA250620P00045000", "qty": "2", "side": "long"},
+        {"symbol": "ZZZ", "qty": "10", "side": "long"},  # no quote
+    ]
+
+    def test_report(self, service):
+        report = asyncio.run(
+            service.calculate_portfolio_risk(self.POSITIONS, paths=10_000, seed=1)
+        )
+
+        assert report["portfolio_value"] == pytest.approx(100 * 50 + 50 * 20 + 2 * 1.2 * 100)
+        assert report["skipped_symbols"] == ["ZZZ"]
+        assert set(report["methods"]) == {"historical", "normal", "bootstrap"}
+        assert report["methods"]["historical"]["scenarios"] == report["observations"]
+
+    def test_unchanged_snapshot_is_served_from_cache(self, service):
+        first = asyncio.run(service.calculate_portfolio_risk(self.POSITIONS, paths=10_000))
+        second = asyncio.run(service.calculate_portfolio_risk(self.POSITIONS, paths=10_000))
+        asyncio.run(service.calculate_portfolio_risk(self.POSITIONS, paths=20_000))
+
+        assert second is first
+        # Return matrix fetched once for AAA and BBB, reused by the 20k-path run
+        assert service.tradier.get_historical_bars.call_count == 2
+
+    def test_unknown_method_is_rejected(self, service):
+        with pytest.raises(ValueError):
+            asyncio.run(service.calculate_portfolio_risk(self.POSITIONS, methods=("garch",)))
+
+
+def test_risk_endpoint(monkeypatch):
+    service = Mock()
+    service.calculate_portfolio_risk = AsyncMock(return_value={"methods": {}})
+    monkeypatch.setattr(analytics, "get_portfolio_analytics_service", lambda: service)
+    app = FastAPI()
+    app.include_router(analytics.router, prefix="/api")
+    app.dependency_overrides[get_current_user_unified] = lambda: Mock()
+    client = TestClient(app)
+
+    response = client.get("/api/portfolio/risk?method=normal&confidence=0.975")
+    rejected = client.get("/api/portfolio/risk?confidence=1.5")
+
+    assert response.status_code == 200
+    kwargs = service.calculate_portfolio_risk.call_args.kwargs
+    assert kwargs["methods"] == ("normal",)
+    assert kwargs["confidence_levels"] == (0.975,)
+    assert rejected.status_code == 422
@@ -0,0 +1,170 @@
+"""
+Tests for batched position valuation and the streaming portfolio greeks aggregate
+"""
+
+import asyncio
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, Mock
+
+import numpy as np
+import pytest
+
+from app.services import position_tracker
+from app.services.options_greeks import GreeksCalculator
+from app.services.position_tracker import PortfolioGreeksAggregate, PositionTrackerService
+
+
+def _occ(underlying: str, days: int, option_type: str, strike: float) -> str:
+    expiry = (datetime.now() + timedelta(days=days)).strftime("%y%m%d")
+    return f"{underlying}{expiry}{option_type}{int(strike * 1000):08d}"
+
+
+def _position(symbol: str, qty: int, entry: float):
+    return SimpleNamespace(
+        asset_id=f"id-{symbol}",
+        symbol=symbol,
+        asset_class="option",
+        qty=str(qty),
+        avg_entry_price=str(entry),
+        current_price=entry,
+        market_value=str(entry * qty * 100),
+    )
+
+
+def _quotes(entries: dict[str, dict]) -> dict:
+    return {"quotes": {"quote": [{"symbol": s, **q} for s, q in entries.items()]}}
+
+
+@pytest.fixture
+def book():
+    spy_call = _occ("SPY", 30, "C", 590)
+    spy_put = _occ("SPY", 45, "P", 570)
+    qqq_call = _occ("QQQ", 20, "C", 500)
+    positions = [
+        _position(spy_call, 2, 5.0),
+        _position(spy_put, -1, 4.0),
+        _position(qqq_call, 3, 6.0),
+    ]
+    quotes = _quotes(
+        {
+            "SPY": {"last": 585.0},
+            "QQQ": {"last": 505.0},
+            spy_call: {"last": 6.5, "greeks": {"mid_iv": 0.18}},
+            spy_put: {"last": 3.0, "greeks": {"mid_iv": 0.22}},
+            qqq_call: {"last": 9.0, "greeks": {"mid_iv": 0.25}},
+        }
+    )
+    return positions, quotes
+
+
+@pytest.fixture
+def service(book, monkeypatch):
+    positions, quotes = book
+    alpaca = Mock()
+    alpaca.get_positions.return_value = positions
+    tradier = Mock()
+    tradier.get_quotes.return_value = quotes
+    stream = Mock()
+    stream.get_active_symbols.return_value = set()
+    stream.subscribe_quotes = AsyncMock()
+
+    monkeypatch.setattr(position_tracker, "get_alpaca_client", lambda: alpaca)
+    monkeypatch.setattr(position_tracker, "get_tradier_client", lambda: tradier)
+    monkeypatch.setattr(position_tracker, "get_tradier_stream", lambda: stream)
+    monkeypatch.setattr(position_tracker, "_portfolio_greeks", None)
+    return PositionTrackerService()
+
+
+class TestBatchGreeks:
+    """Test vectorized greeks match the scalar Black-Scholes implementation"""
+
+    def test_batch_matches_scalar(self):
+        calc = GreeksCalculator(risk_free_rate=0.05)
+        spot = np.array([100.0, 100.0, 95.0, 120.0])
+        strike = np.array([105.0, 95.0, 100.0, 100.0])
+        expiry = np.array([0.25, 0.5, 0.0, 1.0])
+        vol = np.array([0.2, 0.3, 0.25, 0.4])
+        is_call = np.array([True, False, False, True])
+
+        batch = calc.calculate_greeks_batch(spot, strike, expiry, vol, is_call)
+
+        for i in range(len(spot)):
+            scalar = calc.calculate_greeks(
+                spot[i], strike[i], expiry[i], vol[i], "call" if is_call[i] else "put"
+            )
+            for name in ("delta", "gamma", "theta", "vega", "rho"):
+                assert batch[name][i] == pytest.approx(getattr(scalar, name), abs=1e-9)
+
+
+class TestPositionValuation:
+    """Test positions are valued with one batched quote request"""
+
+    def test_one_quote_request_for_all_positions(self, service, book):
+        positions = asyncio.run(service.get_open_positions())
+
+        assert len(positions) == 3
+        service.tradier.get_quotes.assert_called_once()
+        symbols = service.tradier.get_quotes.call_args.args[0]
+        assert set(symbols) == {p.symbol for p in book[0]} | {"SPY", "QQQ"}
+
+        spy_call = positions[0]
+        assert spy_call.symbol == "SPY"
+        assert spy_call.current_price == 6.5
+        assert spy_call.unrealized_pl == pytest.approx((6.5 - 5.0) * 2 * 100)
+        assert 0 < spy_call.greeks.delta < 1
+
+    def test_portfolio_greeks_answered_from_memory(self, service):
+        positions = asyncio.run(service.get_open_positions())
+        greeks = asyncio.run(service.get_portfolio_greeks())
+
+        assert service.tradier.get_quotes.call_count == 1
+        assert greeks.position_count == 3
+        assert greeks.total_delta == pytest.approx(sum(p.greeks.delta * p.qty for p in positions))
+
+
+class TestStreamingAggregate:
+    """Test ticks update portfolio greeks incrementally"""
+
+    def _load(self, aggregate: PortfolioGreeksAggregate, spy: float, qqq: float):
+        aggregate.load(
+            ["SPY", "SPY", "QQQ"],
+            ["call", "put", "call"],
+            np.array([590.0, 570.0, 500.0]),
+            np.array([30, 45, 20]),
+            np.array([0.18, 0.22, 0.25]),
+            np.array([2.0, -1.0, 3.0]),
+            {"SPY": spy, "QQQ": qqq},
+        )
+
+    def test_tick_matches_full_recalculation(self):
+        streamed = PortfolioGreeksAggregate()
+        self._load(streamed, spy=585.0, qqq=505.0)
+
+        streamed.on_tick("SPY", 592.0)
+        streamed.on_tick("QQQ", 498.0)
+
+        reloaded = PortfolioGreeksAggregate()
+        self._load(reloaded, spy=592.0, qqq=498.0)
+        assert streamed.snapshot().model_dump() == pytest.approx(reloaded.snapshot().model_dump())
+        assert streamed.ticks_applied == 2
+
+    def test_untracked_and_invalid_ticks_ignored(self):
+        aggregate = PortfolioGreeksAggregate()
+        self._load(aggregate, spy=585.0, qqq=505.0)
+        before = aggregate.snapshot()
+
+        aggregate.on_tick("AAPL", 200.0)
+        aggregate.on_tick("SPY", float("nan"))
+
+        assert aggregate.snapshot() == before
+        assert aggregate.ticks_applied == 0
+
+    def test_invalidate_forces_reload(self):
+        aggregate = PortfolioGreeksAggregate()
+        self._load(aggregate, spy=585.0, qqq=505.0)
+        assert aggregate.is_fresh()
+
+        aggregate.invalidate()
+
+        assert not aggregate.is_fresh()
@@ -0,0 +1,218 @@
+"""
+Tests for shared circuit breaker, retry and hedging primitives
+"""
+
+import asyncio
+import threading
+import time
+from datetime import UTC, datetime, timedelta
+
+import pytest
+
+from app.core.resilience import (
+    MIN_LATENCY_SAMPLES,
+    BreakerGroup,
+    CircuitBreaker,
+    CircuitOpenError,
+    call,
+    call_async,
+    get_breaker_states,
+)
+
+
+def _warm(breaker: CircuitBreaker, latency: float):
+    """Give a breaker enough latency samples to adapt"""
+    for _ in range(MIN_LATENCY_SAMPLES):
+        breaker.record_success(latency)
+
+
+class TestCircuitBreaker:
+    """Test state transitions"""
+
+    def test_opens_after_threshold(self):
+        breaker = CircuitBreaker("test", failure_threshold=3)
+        breaker.record_failure()
+        breaker.record_failure()
+        assert breaker.state == "CLOSED"
+
+        breaker.record_failure()
+        assert breaker.state == "OPEN"
+        assert breaker.allow_request() is False
+        assert breaker.retry_after() > 0
+
+    def test_half_open_after_cooldown_then_closes(self):
+        breaker = CircuitBreaker("test", failure_threshold=1, cooldown_seconds=30)
+        breaker.record_failure()
+        breaker.last_failure_time = datetime.now(UTC) - timedelta(seconds=31)
+
+        assert breaker.allow_request() is True
+        assert breaker.state == "HALF_OPEN"
+
+        breaker.record_success()
+        assert breaker.state == "CLOSED"
+        assert breaker.failure_count == 0
+
+    def test_failed_recovery_test_reopens(self):
+        breaker = CircuitBreaker("test", failure_threshold=3, cooldown_seconds=30)
+        for _ in range(3):
+            breaker.record_failure()
+        breaker.last_failure_time = datetime.now(UTC) - timedelta(seconds=31)
+        breaker.allow_request()
+
+        breaker.record_failure()
+
+        assert breaker.state == "OPEN"
+
+    def test_half_open_admits_a_single_probe(self):
+        breaker = CircuitBreaker("test", failure_threshold=1, cooldown_seconds=30)
+        breaker.record_failure()
+        breaker.last_failure_time = datetime.now(UTC) - timedelta(seconds=31)
+        admitted = []
+
+        def request():
+            admitted.append(breaker.allow_request())
+
+        threads = [threading.Thread(target=request) for _ in range(16)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert admitted.count(True) == 1
+        assert breaker.state == "HALF_OPEN"
+        assert breaker.total_rejections == 15
+
+        breaker.record_success()
+        assert breaker.allow_request() is True
+
+    def test_lost_probe_is_replaced_after_a_cooldown(self):
+        breaker = CircuitBreaker("test", failure_threshold=1, cooldown_seconds=30)
+        breaker.record_failure()
+        breaker.last_failure_time = datetime.now(UTC) - timedelta(seconds=31)
+        assert breaker.allow_request() is True
+        assert breaker.allow_request() is False
+
+        breaker._snapshot = breaker._snapshot._replace(probe_started_at=time.time() - 31)
+
+        assert breaker.allow_request() is True
+        assert breaker.allow_request() is False
+
+    def test_endpoints_have_independent_state(self):
+        group = BreakerGroup("test-service", failure_threshold=1)
+        group.get("/quotes").record_failure()
+
+        assert group.get("/quotes").state == "OPEN"
+        assert group.get("/history").state == "CLOSED"
+        assert get_breaker_states()["test-service"]["/quotes"]["state"] == "OPEN"
+
+
+class TestAdaptiveTimeouts:
+    """Test latency-driven timeouts and hedge delays"""
+
+    def test_default_until_enough_samples(self):
+        breaker = CircuitBreaker("test")
+        assert breaker.timeout(5) == 5
+        assert breaker.hedge_delay() is None
+
+    def test_timeout_tracks_p99_within_bounds(self):
+        breaker = CircuitBreaker("test", min_timeout=0.5, timeout_multiplier=2.0)
+        _warm(breaker, 1.0)
+        assert breaker.timeout(5) == 2.0
+
+        fast = CircuitBreaker("fast", min_timeout=0.5)
+        _warm(fast, 0.01)
+        assert fast.timeout(5) == 0.5
+
+        slow = CircuitBreaker("slow")
+        _warm(slow, 4.0)
+        assert slow.timeout(5) == 5
+
+
+class TestCall:
+    """Test retries and hedging through a breaker"""
+
+    def test_retries_then_succeeds(self):
+        breaker = CircuitBreaker("test")
+        attempts = []
+
+        def flaky():
+            attempts.append(1)
+            if len(attempts) < 3:
+                raise ConnectionError("reset")
+            return "ok"
+
+        result = call(breaker, flaky, attempts=3, base_delay=0.001, retry_on=(ConnectionError,))
+
+        assert result == "ok"
+        assert len(attempts) == 3
+        assert breaker.state == "CLOSED"
+
+    def test_non_retryable_error_raised_immediately(self):
+        attempts = []
+
+        def broken():
+            attempts.append(1)
+            raise ValueError("bad request")
+
+        with pytest.raises(ValueError):
+            call(None, broken, attempts=3, base_delay=0.001, retry_on=(ConnectionError,))
+        assert len(attempts) == 1
+
+    def test_open_circuit_refuses_call(self):
+        breaker = CircuitBreaker("test", failure_threshold=1)
+        breaker.record_failure()
+
+        with pytest.raises(CircuitOpenError, match="temporarily unavailable"):
+            call(breaker, lambda: "never")
+
+    def test_client_errors_do_not_trip_breaker(self):
+        breaker = CircuitBreaker("test", failure_threshold=1)
+
+        def rejected():
+            raise ValueError("400")
+
+        with pytest.raises(ValueError):
+            call(breaker, rejected, is_failure=lambda e: not isinstance(e, ValueError))
+        assert breaker.state == "CLOSED"
+
+    def test_hedged_read_beats_slow_primary(self):
+        breaker = CircuitBreaker("test")
+        _warm(breaker, 0.02)
+        calls = []
+
+        def read():
+            calls.append(1)
+            time.sleep(1.0 if len(calls) == 1 else 0.01)
+            return len(calls)
+
+        start = time.monotonic()
+        result = call(breaker, read, hedge=True)
+
+        assert result == 2
+        assert time.monotonic() - start < 0.5
+        assert breaker.total_hedges == 1
+
+    def test_async_hedged_read_cancels_loser(self):
+        breaker = CircuitBreaker("test")
+        _warm(breaker, 0.02)
+        cancelled = []
+
+        async def run():
+            calls = []
+
+            async def read():
+                calls.append(1)
+                number = len(calls)
+                try:
+                    await asyncio.sleep(1.0 if number == 1 else 0.01)
+                except asyncio.CancelledError:
+                    cancelled.append(number)
+                    raise
+                return number
+
+            result = await call_async(breaker, read, hedge=True)
+            await asyncio.sleep(0)
+            return result
+
+        assert asyncio.run(run()) == 2
+        assert cancelled == [1]
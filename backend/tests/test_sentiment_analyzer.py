@@ -0,0 +1,171 @@
+"""
+Tests for SentimentAnalyzer article cache and batched Claude requests
+Uses a fake async client and a local stub HTTP server (no real API calls)
+"""
+
+import asyncio
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from unittest.mock import Mock
+
+import anthropic
+import pytest
+
+from app.ml.sentiment_analyzer import SentimentAnalyzer, article_cache_key
+
+
+class InMemoryCache:
+    """Minimal stand-in for CacheService"""
+
+    def __init__(self):
+        self.store = {}
+
+    def get(self, key):
+        return self.store.get(key)
+
+    def set(self, key, value, ttl=60):
+        self.store[key] = value
+        return True
+
+
+def _batch_reply(prompt: str) -> str:
+    """Score every numbered article in a batch prompt as mildly bullish"""
+    count = prompt.count("] Symbol: ")
+    return json.dumps(
+        [
+            {"id": i, "sentiment": "bullish", "score": 0.5, "confidence": 0.8,
+             "reasoning": f"article {i}"}
+            for i in range(1, count + 1)
+        ]
+    )
+
+
+class FakeMessages:
+    """Records calls and answers batch prompts"""
+
+    def __init__(self):
+        self.calls = 0
+
+    async def create(self, model, max_tokens, messages):
+        self.calls += 1
+        text = _batch_reply(messages[0]["content"])
+        return Mock(content=[Mock(text=text)])
+
+
+@pytest.fixture
+def fake_client():
+    client = Mock()
+    client.messages = FakeMessages()
+    return client
+
+
+@pytest.fixture
+def analyzer(fake_client):
+    return SentimentAnalyzer(client=fake_client, cache=InMemoryCache(), batch_size=20)
+
+
+def _articles(symbol: str, count: int) -> list[dict]:
+    return [
+        {"title": f"{symbol} headline {i}", "content": f"{symbol} body {i}", "source": "Test"}
+        for i in range(count)
+    ]
+
+
+class TestArticleCacheKey:
+    """Test content-hash cache keys"""
+
+    def test_key_ignores_case_and_whitespace(self):
+        a = {"title": "Apple  Beats", "content": "Record\nprofits"}
+        b = {"title": "apple beats", "content": "record profits"}
+        assert article_cache_key("aapl", a) == article_cache_key("AAPL", b)
+
+    def test_key_differs_per_symbol(self):
+        article = {"title": "Tech rally", "content": "Stocks up"}
+        assert article_cache_key("AAPL", article) != article_cache_key("MSFT", article)
+
+
+class TestBatchedSentiment:
+    """Test batching and cache reuse"""
+
+    def test_watchlist_packs_articles_into_few_requests(self, analyzer, fake_client):
+        """50 symbols x 10 articles cost ceil(500 / 20) requests"""
+        news = {f"SYM{i}": _articles(f"SYM{i}", 10) for i in range(50)}
+
+        results = asyncio.run(analyzer.analyze_watchlist(news))
+
+        assert fake_client.messages.calls == 25
+        assert results["SYM0"].sentiment == "bullish"
+        assert results["SYM0"].score == 0.5
+        assert "10 articles analyzed" in results["SYM0"].reasoning
+
+    def test_repeat_analysis_served_from_cache(self, analyzer, fake_client):
+        """Overlapping requests do not re-analyze the same articles"""
+        articles = _articles("AAPL", 5)
+
+        asyncio.run(analyzer.analyze_news_batch("AAPL", articles))
+        asyncio.run(analyzer.analyze_news_batch("AAPL", articles))
+
+        assert fake_client.messages.calls == 1
+
+    def test_no_articles_returns_neutral(self, analyzer, fake_client):
+        result = asyncio.run(analyzer.analyze_news_batch("AAPL", []))
+
+        assert result.sentiment == "neutral"
+        assert result.confidence == 0.0
+        assert fake_client.messages.calls == 0
+
+    def test_failed_batch_is_not_cached(self, analyzer, fake_client):
+        async def failing_create(**kwargs):
+            raise RuntimeError("upstream down")
+
+        fake_client.messages.create = failing_create
+        result = asyncio.run(analyzer.analyze_news_batch("AAPL", _articles("AAPL", 3)))
+
+        assert result.sentiment == "neutral"
+        assert analyzer.cache.store == {}
+
+
+class _StubAnthropicHandler(BaseHTTPRequestHandler):
+    """Local stub of the Anthropic Messages API"""
+
+    def do_POST(self):
+        body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        payload = {
+            "id": "msg_stub",
+            "type": "message",
+            "role": "assistant",
+            "model": body["model"],
+            "content": [{"type": "text", "text": _batch_reply(body["messages"][0]["content"])}],
+            "stop_reason": "end_turn",
+            "stop_sequence": None,
+            "usage": {"input_tokens": 1, "output_tokens": 1},
+        }
+        data = json.dumps(payload).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, *args):
+        pass
+
+
+def test_against_local_stub_server():
+    """The real async client works against a local stub via base_url"""
+    server = HTTPServer(("127.0.0.1", 0), _StubAnthropicHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    try:
+        client = anthropic.AsyncAnthropic(
+            api_key="test-key", base_url=f"http://127.0.0.1:{server.server_port}"
+        )
+        analyzer = SentimentAnalyzer(client=client, cache=InMemoryCache())
+
+        result = asyncio.run(analyzer.analyze_news_batch("AAPL", _articles("AAPL", 3)))
+
+        assert result.sentiment == "bullish"
+        assert result.score == 0.5
+    finally:
+        server.shutdown()
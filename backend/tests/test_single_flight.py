@@ -0,0 +1,188 @@
+"""
+Tests for request coalescing (single-flight) with stale-while-revalidate
+"""
+
+import asyncio
+import importlib
+import inspect
+import time
+
+import pytest
+
+from app.core.single_flight import SingleFlight
+
+
+class Counter:
+    """Async computation counting its calls, optionally gated on an event"""
+
+    def __init__(self, gate: asyncio.Event | None = None, fail: bool = False):
+        self.calls = 0
+        self.gate = gate
+        self.fail = fail
+
+    async def __call__(self):
+        self.calls += 1
+        if self.gate is not None:
+            await self.gate.wait()
+        if self.fail:
+            raise RuntimeError("tradier down")
+        return {"value": self.calls}
+
+
+def _expire(group: SingleFlight, key: str, stale_for: float):
+    entry = group._entries[key]
+    entry.fresh_until = time.monotonic() - 1
+    entry.stale_until = time.monotonic() + stale_for
+
+
+class TestCoalescing:
+    """Test concurrent misses share one computation"""
+
+    def test_concurrent_misses_share_one_computation(self):
+        group = SingleFlight()
+
+        async def run():
+            gate = asyncio.Event()
+            compute = Counter(gate)
+            waiters = [asyncio.ensure_future(group.get("k", compute, ttl=60)) for _ in range(20)]
+            await asyncio.sleep(0)
+            gate.set()
+            return compute, await asyncio.gather(*waiters)
+
+        compute, results = asyncio.run(run())
+
+        assert compute.calls == 1
+        assert all(result == {"value": 1} for result in results)
+        assert group.stats()["coalesced"] == 19
+        assert group.stats()["in_flight"] == 0
+
+    def test_errors_reach_every_waiter_and_are_not_cached(self):
+        group = SingleFlight()
+
+        async def run():
+            compute = Counter(asyncio.Event(), fail=True)
+            waiters = [asyncio.ensure_future(group.get("k", compute, ttl=60)) for _ in range(3)]
+            await asyncio.sleep(0)
+            compute.gate.set()
+            return compute, await asyncio.gather(*waiters, return_exceptions=True)
+
+        compute, results = asyncio.run(run())
+
+        assert compute.calls == 1
+        assert all(isinstance(result, RuntimeError) for result in results)
+        assert group.stats()["entries"] == 0
+
+    def test_cancelled_caller_does_not_cancel_computation(self):
+        group = SingleFlight()
+
+        async def run():
+            gate = asyncio.Event()
+            compute = Counter(gate)
+            first = asyncio.ensure_future(group.get("k", compute, ttl=60))
+            second = asyncio.ensure_future(group.get("k", compute, ttl=60))
+            await asyncio.sleep(0)
+            first.cancel()
+            gate.set()
+            return await second
+
+        assert asyncio.run(run()) == {"value": 1}
+
+
+class TestStaleWhileRevalidate:
+    """Test expired values are served while one background refresh runs"""
+
+    def test_stale_value_served_during_single_refresh(self):
+        group = SingleFlight()
+
+        async def run():
+            compute = Counter()
+            await group.get("k", compute, ttl=60, stale_ttl=30)
+            _expire(group, "k", stale_for=30)
+
+            compute.gate = asyncio.Event()
+            stale = [await group.get("k", compute, ttl=60, stale_ttl=30) for _ in range(5)]
+            compute.gate.set()
+            await asyncio.sleep(0.01)
+            return compute, stale, await group.get("k", compute, ttl=60, stale_ttl=30)
+
+        compute, stale, fresh = asyncio.run(run())
+
+        assert stale == [{"value": 1}] * 5
+        assert fresh == {"value": 2}
+        assert compute.calls == 2
+        assert group.stats()["refreshes"] == 1
+
+    def test_failed_refresh_keeps_stale_value(self):
+        group = SingleFlight()
+
+        async def run():
+            await group.get("k", Counter(), ttl=60, stale_ttl=30)
+            _expire(group, "k", stale_for=30)
+            first = await group.get("k", Counter(fail=True), ttl=60, stale_ttl=30)
+            await asyncio.sleep(0.01)
+            return first, await group.get("k", Counter(fail=True), ttl=60, stale_ttl=30)
+
+        assert asyncio.run(run()) == ({"value": 1}, {"value": 1})
+        assert group.stats()["errors"] == 2
+
+    def test_value_past_stale_window_is_recomputed(self):
+        group = SingleFlight()
+
+        async def run():
+            compute = Counter()
+            await group.get("k", compute, ttl=60, stale_ttl=30)
+            _expire(group, "k", stale_for=-1)
+            return await group.get("k", compute, ttl=60, stale_ttl=30)
+
+        assert asyncio.run(run()) == {"value": 2}
+
+
+class TestDecorator:
+    """Test the decorator keys calls by their arguments"""
+
+    def test_key_is_formatted_from_arguments(self):
+        group = SingleFlight()
+        calls = []
+
+        @group.cached("chain:{symbol}:{expiration}", ttl=60, stale_ttl=0)
+        async def chain(symbol: str, expiration: str | None = None):
+            calls.append((symbol, expiration))
+            return {"symbol": symbol, "expiration": expiration}
+
+        async def run():
+            await chain("SPY")
+            await chain(symbol="SPY")
+            await chain("SPY", expiration="2025-01-17")
+
+        asyncio.run(run())
+
+        assert calls == [("SPY", None), ("SPY", "2025-01-17")]
+        assert set(group._entries) == {"chain:SPY:None", "chain:SPY:2025-01-17"}
+
+    def test_cache_if_skips_fallback_results(self):
+        group = SingleFlight()
+        sources = iter(["fallback", "tradier", "tradier"])
+
+        @group.cached("sectors", ttl=60, stale_ttl=0, cache_if=lambda r: r["source"] != "fallback")
+        async def sectors():
+            return {"source": next(sources)}
+
+        async def run():
+            return [(await sectors())["source"] for _ in range(3)]
+
+        assert asyncio.run(run()) == ["fallback", "tradier", "tradier"]
+
+
+@pytest.mark.parametrize(
+    "module, handler",
+    [
+        ("app.routers.market", "get_major_indices"),
+        ("app.routers.market", "get_sector_performance"),
+        ("app.routers.market_data", "scan_under_4"),
+    ],
+)
+def test_route_handlers_keep_their_dependencies(module, handler):
+    endpoint = getattr(importlib.import_module(module), handler)
+
+    assert hasattr(endpoint, "__wrapped__")
+    assert {"current_user", "cache"} <= set(inspect.signature(endpoint).parameters)
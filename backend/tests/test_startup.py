@@ -0,0 +1,149 @@
+"""
+Tests for cold-start speedups: lazy imports, import timing and concurrent
+startup validation
+"""
+
+import asyncio
+import sys
+import time
+
+import httpx
+import pytest
+
+from app.core import prelaunch
+from app.core.lazy_import import is_available, lazy_import
+from app.core.prelaunch import PrelaunchValidator
+from app.core.startup_monitor import StartupMonitor, get_startup_monitor
+from app.core.startup_validator import StartupValidator
+
+
+@pytest.fixture
+def fake_module(tmp_path, monkeypatch):
+    """A throwaway module on sys.path that takes 20ms to import"""
+    (tmp_path / "slow_fake_module.py").write_text(
+        "import time\ntime.sleep(0.02)\nVALUE = 42\n\ndef double(x):\n    return 2 * x\n"
+    )
+    monkeypatch.syspath_prepend(str(tmp_path))
+    yield "slow_fake_module"
+    sys.modules.pop("slow_fake_module", None)
+
+
+class TestLazyImport:
+    """Test heavy modules are imported on first use, not at bind time"""
+
+    def test_imports_on_first_attribute_access(self, fake_module):
+        module = lazy_import(fake_module)
+
+        assert fake_module not in sys.modules
+        assert module.VALUE == 42
+        assert fake_module in sys.modules
+        assert get_startup_monitor().lazy_imports[fake_module] >= 0.02
+
+    def test_attribute_proxy_forwards_calls(self, fake_module):
+        double = lazy_import(fake_module, "double")
+
+        assert repr(double) == f"{fake_module}.double"
+        assert double(21) == 42
+
+    def test_missing_module_fails_at_first_use(self):
+        missing = lazy_import("no_such_module_anywhere")
+
+        assert not is_available("no_such_module_anywhere")
+        with pytest.raises(ImportError):
+            missing.anything
+
+
+class TestImportTiming:
+    """Test time_imports() attributes import time to modules"""
+
+    def test_records_modules_first_imported_in_block(self, fake_module):
+        monitor = StartupMonitor()
+
+        with monitor.time_imports():
+            import slow_fake_module  # noqa: F401
+
+        report = monitor.import_report()
+        [entry] = report["slowest"]
+        assert entry["module"] == fake_module
+        assert entry["self_ms"] >= 20
+        assert report["modules"] == 1
+
+    def test_already_imported_modules_are_not_recorded(self):
+        monitor = StartupMonitor()
+
+        with monitor.time_imports():
+            import json  # noqa: F401
+
+        assert monitor.import_report()["modules"] == 0
+
+
+class TestStartupValidator:
+    """Test connectivity checks run concurrently under one deadline"""
+
+    def test_checks_run_concurrently(self, monkeypatch):
+        validator = StartupValidator(deadline=5)
+        for check in ("tradier_connection", "alpaca_connection", "database_connection"):
+            monkeypatch.setattr(validator, f"_validate_{check}", lambda: time.sleep(0.2))
+
+        started = time.perf_counter()
+        validator._run_concurrently(
+            [
+                (validator._validate_tradier_connection, "tradier_connection", True),
+                (validator._validate_alpaca_connection, "alpaca_connection", True),
+                (validator._validate_database_connection, "database", False),
+            ]
+        )
+
+        assert time.perf_counter() - started < 0.5
+        assert validator.errors == []
+
+    def test_deadline_fails_unfinished_checks(self):
+        validator = StartupValidator(deadline=0.1)
+
+        started = time.perf_counter()
+        validator._run_concurrently(
+            [
+                (lambda: time.sleep(1), "tradier_connection", True),
+                (lambda: time.sleep(1), "database", False),
+                (lambda: None, "alpaca_connection", True),
+            ]
+        )
+
+        assert time.perf_counter() - started < 0.5
+        assert validator.validations["tradier_connection"] == (False, "Deadline exceeded")
+        assert len(validator.errors) == 1
+        assert "database" in validator.warnings[0]
+
+
+class TestPrelaunch:
+    """Test pre-launch checks avoid import and network latency"""
+
+    def test_dependencies_are_located_not_imported(self, monkeypatch):
+        located = []
+
+        def find_spec(name):
+            located.append(name)
+            return None if name == "redis" else object()
+
+        monkeypatch.setattr(prelaunch.importlib.util, "find_spec", find_spec)
+
+        result = PrelaunchValidator().validate_critical_dependencies()
+
+        assert "anthropic" in located
+        assert not result.success
+        assert result.details["missing"] == ["redis"]
+
+    def test_external_services_are_probed_concurrently(self, monkeypatch):
+        async def slow_get(self, url, **kwargs):
+            await asyncio.sleep(0.5)
+            raise httpx.ConnectError("unreachable")
+
+        monkeypatch.setattr(httpx.AsyncClient, "get", slow_get)
+        validator = PrelaunchValidator()
+
+        started = time.perf_counter()
+        result = asyncio.run(validator.validate_external_services())
+
+        # Sequential probes would take 1s
+        assert time.perf_counter() - started < 0.9
+        assert result.message == "Only 0/2 external services reachable"
@@ -8,6 +8,7 @@ from unittest.mock import Mock, patch, MagicMock
 from datetime import datetime, timedelta, UTC
 import requests
 
+from app.core.resilience import CircuitOpenError
 from app.services.tradier_client import TradierClient
 
 
@@ -217,6 +218,47 @@ class TestTradierPositions:
         assert normalized["qty"] == "5.0"  # Absolute value as string
 
 
+class TestCombinedBreakers:
+    """Test the client-wide and per-endpoint breakers never strand a HALF_OPEN probe"""
+
+    def _half_open(self, breaker):
+        for _ in range(breaker.failure_threshold):
+            breaker.record_failure()
+        breaker.last_failure_time = datetime.now(UTC) - timedelta(seconds=61)
+
+    def test_endpoint_rejection_leaves_the_client_probe_available(
+        self, tradier_client, mock_session, monkeypatch
+    ):
+        """Test a request refused by its endpoint breaker does not use the client-wide probe"""
+        monkeypatch.setattr(tradier_client, "session", mock_session)
+        endpoint = tradier_client._breakers.get("GET /markets/clock")
+        self._half_open(tradier_client._breaker)
+        for _ in range(endpoint.failure_threshold):
+            endpoint.record_failure()
+
+        with pytest.raises(CircuitOpenError):
+            tradier_client._request("GET", "/markets/clock")
+
+        assert tradier_client._request("GET", "/user/profile") == {"success": True}
+        assert tradier_client._state == "CLOSED"
+
+    def test_client_rejection_hands_back_the_endpoint_probe(
+        self, tradier_client, mock_session, monkeypatch
+    ):
+        """Test an endpoint probe is released when the client-wide breaker refuses"""
+        monkeypatch.setattr(tradier_client, "session", mock_session)
+        endpoint = tradier_client._breakers.get("GET /user/profile")
+        self._half_open(endpoint)
+        for _ in range(tradier_client._breaker.failure_threshold):
+            tradier_client._breaker.record_failure()
+
+        with pytest.raises(CircuitOpenError):
+            tradier_client._request("GET", "/user/profile")
+
+        assert endpoint.state == "HALF_OPEN"
+        assert endpoint.allow_request() is True
+
+
 class TestTradierRequestMethod:
     """Test internal request method with error handling"""
 
@@ -0,0 +1,109 @@
+"""
+Tests for the TradierStreamService ingest path: in-place records and coalesced flushes
+"""
+
+import asyncio
+import json
+import time
+from datetime import datetime, timedelta
+from unittest.mock import AsyncMock, Mock
+
+import pytest
+
+from app.core.resilience import OPEN
+from app.services.bar_builder import BarBuilder
+from app.services.tradier_stream import TradierStreamService
+
+
+@pytest.fixture
+def service():
+    stream = TradierStreamService()
+    stream.cache = Mock()
+    stream.bars = BarBuilder()
+    return stream
+
+
+def _feed(service: TradierStreamService, *messages: dict):
+    async def run():
+        for message in messages:
+            await service._handle_message(json.dumps(message))
+
+    asyncio.run(run())
+
+
+class TestIngest:
+    """Test messages update in-memory tables without touching Redis"""
+
+    def test_quotes_update_record_in_place(self, service):
+        _feed(service, {"type": "quote", "symbol": "SPY", "bid": "585.10", "ask": "585.20"})
+        record = service.latest_quotes["SPY"]
+
+        _feed(service, {"type": "quote", "symbol": "SPY", "bid": 585.3, "ask": 585.5})
+
+        assert service.latest_quotes["SPY"] is record
+        assert record.mid == pytest.approx(585.4)
+        assert service.ticks_total == 2
+        service.cache.set.assert_not_called()
+        service.cache.set_many.assert_not_called()
+
+    def test_missing_quote_side_has_no_mid(self, service):
+        listener = Mock()
+        service.add_tick_listener(listener)
+
+        _feed(service, {"type": "quote", "symbol": "SPY", "bid": "NaN", "ask": "585.20"})
+
+        quote = service.get_latest("quote", "SPY")
+        assert quote["bid"] is None
+        assert quote["mid"] is None
+        assert datetime.fromisoformat(quote["timestamp"]).utcoffset() == timedelta(0)
+        listener.assert_not_called()
+
+    def test_trade_notifies_listeners_and_records_lag(self, service):
+        listener = Mock()
+        service.add_tick_listener(listener)
+        exchange_ms = int((time.time() - 0.25) * 1000)
+
+        _feed(service, {"type": "trade", "symbol": "QQQ", "price": "505.5", "date": exchange_ms})
+
+        listener.assert_called_once_with("QQQ", 505.5)
+        assert service.stats()["lag_ms"]["p50"] >= 250
+
+    def test_too_many_sessions_trips_breaker(self, service):
+        service._cleanup_zombie_sessions = AsyncMock()
+
+        _feed(service, {"error": "Too many sessions requested"})
+
+        assert service.session_breaker.state == OPEN
+        service._cleanup_zombie_sessions.assert_awaited_once()
+        assert service.ticks_total == 0
+
+
+class TestFlush:
+    """Test Redis writes are coalesced per symbol"""
+
+    def test_flush_writes_latest_record_once_per_symbol(self, service):
+        _feed(
+            service,
+            {"type": "quote", "symbol": "SPY", "bid": 1.0, "ask": 2.0},
+            {"type": "quote", "symbol": "SPY", "bid": 3.0, "ask": 4.0},
+            {"type": "trade", "symbol": "SPY", "price": 3.5, "size": 100},
+            {"type": "summary", "symbol": "SPY", "open": "580.0"},
+        )
+
+        written = asyncio.run(service.flush())
+
+        assert written == 3
+        items, ttl = service.cache.set_many.call_args.args
+        assert set(items) == {"quote:SPY", "price:SPY", "summary:SPY"}
+        assert items["quote:SPY"]["mid"] == 3.5
+        assert items["price:SPY"]["type"] == "trade"
+        assert ttl == 5
+
+        assert asyncio.run(service.flush()) == 0
+        assert service.cache.set_many.call_count == 1
+
+    def test_stale_records_are_not_served(self, service):
+        _feed(service, {"type": "trade", "symbol": "SPY", "price": 3.5})
+        service.latest_trades["SPY"].received_at -= 60
+
+        assert service.get_latest("price", "SPY") is None
@@ -0,0 +1,212 @@
+"""
+Tests for the implied volatility surface
+"""
+
+import asyncio
+from datetime import UTC, date, datetime, timedelta
+from unittest.mock import Mock
+
+import numpy as np
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.core.unified_auth import get_current_user_unified
+from app.routers import options
+from app.services import vol_surface
+from app.services.cache import get_cache
+from app.services.options_chain import ChainSnapshot
+from app.services.vol_surface import VolSurfaceService, build_surface, fill_term, smooth
+
+
+TODAY = date(2025, 1, 2)
+SPOT = 100.0
+
+
+def _expiration(days: int, today: date = TODAY) -> str:
+    return (today + timedelta(days=days)).isoformat()
+
+
+def _snapshot(expiration: str, level: float = 0.2, skew: float = 0.1) -> ChainSnapshot:
+    """Chain with a linear skew: IV falls as strikes rise"""
+    rows = {"calls": [], "puts": []}
+    for strike in range(60, 145, 5):
+        iv = level + skew * (SPOT - strike) / SPOT
+        side = "call" if strike >= SPOT else "put"
+        rows[f"{side}s"].append(
+            {"strike_price": float(strike), "implied_volatility": iv, "option_type": side}
+        )
+        # The in-the-money twin is ignored by the smile
+        twin = "put" if side == "call" else "call"
+        rows[f"{twin}s"].append(
+            {"strike_price": float(strike), "implied_volatility": 9.9, "option_type": twin}
+        )
+    empty = dict.fromkeys(("symbol", "bid", "ask", "last_price", "volume", "open_interest"))
+    greeks = dict.fromkeys(("delta", "gamma", "theta", "vega", "rho"))
+    calls = [{**empty, **greeks, **row} for row in rows["calls"]]
+    puts = [{**empty, **greeks, **row} for row in rows["puts"]]
+    return ChainSnapshot("SPY", expiration, calls, puts, SPOT)
+
+
+class TestGrid:
+    """Test smiles are interpolated, term-filled and smoothed"""
+
+    def test_smile_uses_out_of_the_money_quotes(self):
+        expirations = [_expiration(30), _expiration(60)]
+        surface = build_surface("SPY", {e: _snapshot(e) for e in expirations}, SPOT, today=TODAY)
+
+        assert surface.iv.shape == (2, vol_surface.STRIKE_POINTS)
+        assert np.nanmax(surface.iv) < 1
+        assert surface.atm_iv() == pytest.approx([0.2, 0.2], abs=1e-6)
+        # Linear skew survives smoothing away from the edges
+        assert surface.iv[0, 10] == pytest.approx(0.2 + 0.1 * (SPOT - surface.strikes[10]) / SPOT)
+
+    def test_fill_term_interpolates_total_variance(self):
+        raw = np.array([[0.2], [np.nan], [0.3]])
+        dte = np.array([30, 60, 90])
+
+        filled = fill_term(raw, dte)
+
+        expected = np.sqrt((0.2**2 * 30 + 0.3**2 * 90) / 2 / 60)
+        assert filled[1, 0] == pytest.approx(expected)
+
+    def test_smooth_ignores_missing_cells(self):
+        grid = np.array([[np.nan, 0.2, 0.4, np.nan]])
+
+        smoothed = smooth(grid)
+
+        assert np.isnan(smoothed[0, 0]) and np.isnan(smoothed[0, 3])
+        assert smoothed[0, 1] == pytest.approx((0.5 * 0.2 + 0.25 * 0.4) / 0.75)
+
+    def test_constant_maturity_atm_iv(self):
+        expirations = [_expiration(10), _expiration(50)]
+        snapshots = {
+            expirations[0]: _snapshot(expirations[0], level=0.3),
+            expirations[1]: _snapshot(expirations[1], level=0.2),
+        }
+
+        surface = build_surface("SPY", snapshots, SPOT, today=TODAY)
+
+        variance = (0.3**2 * 10 * 20 + 0.2**2 * 50 * 20) / 40 / 30
+        assert surface.atm_iv_at(30) == pytest.approx(np.sqrt(variance), rel=1e-4)
+
+
+class TestIncrementalRefresh:
+    """Test only changed expirations are re-read"""
+
+    def test_unchanged_chains_reuse_rows(self):
+        expirations = [_expiration(d) for d in (7, 30, 60)]
+        first = build_surface("SPY", {e: _snapshot(e) for e in expirations}, SPOT, today=TODAY)
+
+        snapshots = {e: _snapshot(e) for e in expirations}
+        snapshots[expirations[1]] = _snapshot(expirations[1], level=0.25)
+        second = build_surface("SPY", snapshots, SPOT * 1.01, previous=first, today=TODAY)
+
+        assert second.rebuilt == 1
+        assert second.strikes is first.strikes
+        assert np.array_equal(second.raw[[0, 2]], first.raw[[0, 2]], equal_nan=True)
+        assert second.atm_iv()[1] > first.atm_iv()[1]
+
+    def test_spot_drift_rebuilds_axis(self):
+        expirations = [_expiration(30)]
+        first = build_surface("SPY", {e: _snapshot(e) for e in expirations}, SPOT, today=TODAY)
+
+        second = build_surface(
+            "SPY", {e: _snapshot(e) for e in expirations}, SPOT * 1.1, previous=first, today=TODAY
+        )
+
+        assert second.rebuilt == 1
+        assert second.strikes[0] == pytest.approx(SPOT * 1.1 * vol_surface.MONEYNESS_BAND[0])
+
+
+class TestService:
+    """Test concurrent fetches, partial failures and the IV percentile"""
+
+    def test_fetches_are_bounded_and_failures_skipped(self):
+        service = VolSurfaceService(concurrency=2)
+        expirations = [_expiration(d, datetime.now(UTC).date()) for d in (7, 14, 30, 60, 90)]
+        running = peak = 0
+
+        async def load_chain(expiration):
+            nonlocal running, peak
+            running += 1
+            peak = max(peak, running)
+            await asyncio.sleep(0.01)
+            running -= 1
+            if expiration == expirations[2]:
+                raise RuntimeError("tradier down")
+            return _snapshot(expiration)
+
+        surface = asyncio.run(service.refresh("spy", expirations, load_chain, SPOT))
+
+        assert peak == 2
+        assert surface.expirations == [e for e in expirations if e != expirations[2]]
+        assert service.get("SPY") is surface
+
+    def test_every_chain_failing_raises(self):
+        async def load_chain(expiration):
+            raise RuntimeError("tradier down")
+
+        with pytest.raises(RuntimeError):
+            asyncio.run(VolSurfaceService().refresh("SPY", ["2025-01-17"], load_chain, SPOT))
+
+    def test_iv_percentile_needs_history(self):
+        expirations = [_expiration(30), _expiration(60)]
+        surface = build_surface("SPY", {e: _snapshot(e) for e in expirations}, SPOT, today=TODAY)
+        service = VolSurfaceService()
+        cache = Mock()
+
+        cache.get.return_value = {f"2024-01-{d:02d}": 0.1 + d / 100 for d in range(1, 20)}
+        assert service.iv_percentile(cache, surface) is None
+
+        service._history.clear()
+        cache.get.return_value = {f"2024-01-{d:02d}": 0.1 + d / 100 for d in range(1, 21)}
+        assert service.iv_percentile(cache, surface) == 45.0
+        assert cache.set.call_args.args[0] == "vol_surface:atm_iv:SPY"
+
+
+class TestSurfaceEndpoint:
+    """Test /options/surface fetches each expiration within the DTE bounds"""
+
+    @pytest.fixture
+    def tradier(self, monkeypatch):
+        today = datetime.now(UTC).date()
+        expirations = [_expiration(d, today) for d in (3, 20, 45, 400)]
+        client = Mock()
+        client.get_option_expirations.return_value = {"expirations": {"date": expirations}}
+        client.get_quote.return_value = {"last": SPOT}
+
+        def chains(symbol, expiration):
+            options_list = []
+            for strike in range(80, 125, 5):
+                side = "call" if strike >= SPOT else "put"
+                iv = 0.2 + 0.1 * (SPOT - strike) / SPOT
+                options_list.append(
+                    {"option_type": side, "strike": strike, "greeks": {"mid_iv": iv}}
+                )
+            return {"options": {"option": options_list}}
+
+        client.get_option_chains.side_effect = chains
+        monkeypatch.setattr("app.routers.options.get_tradier_client", lambda: client)
+        monkeypatch.setattr(vol_surface, "_vol_surface_service", VolSurfaceService())
+        return client
+
+    def test_surface_within_dte_bounds(self, tradier):
+        cache = Mock()
+        cache.get.return_value = None
+        app = FastAPI()
+        app.include_router(options.router, prefix="/api")
+        app.dependency_overrides[get_current_user_unified] = lambda: Mock()
+        app.dependency_overrides[get_cache] = lambda: cache
+
+        response = TestClient(app).get("/api/options/surface/spy?min_dte=7&max_dte=90")
+
+        assert response.status_code == 200
+        data = response.json()["data"]
+        assert data["days_to_expiry"] == [20, 45]
+        assert len(data["iv"]) == 2
+        assert len(data["iv"][0]) == len(data["strikes"])
+        assert data["atm_iv"] == pytest.approx([0.2, 0.2], abs=1e-6)
+        assert data["iv_percentile"] is None
+        assert tradier.get_option_chains.call_count == 2
+        tradier.get_quote.assert_called_once()
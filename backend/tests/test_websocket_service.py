@@ -0,0 +1,192 @@
+"""
+Tests for batched, delta-compressed WebSocket market data broadcasts
+"""
+
+import asyncio
+import json
+from datetime import UTC, datetime, timedelta
+from unittest.mock import AsyncMock, Mock
+
+import pytest
+
+from services import market_data_service, websocket_service
+from services.market_data_service import MarketDataService
+from services.websocket_service import WebSocketManager
+
+
+class FakeWebSocket:
+    """Records frames; send_text blocks while `stalled` is set"""
+
+    def __init__(self):
+        self.frames: list[str] = []
+        self.stalled = False
+        self.released = asyncio.Event()
+
+    async def accept(self):
+        pass
+
+    async def send_text(self, frame: str):
+        if self.stalled:
+            await self.released.wait()
+        self.frames.append(frame)
+
+    def batches(self) -> list[dict]:
+        messages = [json.loads(frame) for frame in self.frames]
+        return [m["updates"] for m in messages if m["type"] == "market_data_batch"]
+
+
+def _quote(price: float, volume: int = 1000) -> dict:
+    return {"price": price, "volume": volume}
+
+
+@pytest.fixture
+def manager(monkeypatch):
+    monkeypatch.setattr(websocket_service, "MarketDataService", Mock)
+    manager = WebSocketManager()
+    manager.redis_client = None
+    manager.market_data_service.get_real_time_quotes = AsyncMock()
+    return manager
+
+
+def _connect(manager: WebSocketManager, user_id: str, symbols: list[str]) -> FakeWebSocket:
+    websocket = FakeWebSocket()
+    manager.active_connections[user_id] = websocket
+    manager.user_subscriptions[user_id] = set(symbols)
+    for symbol in symbols:
+        manager.symbol_subscribers.setdefault(symbol, set()).add(user_id)
+    return websocket
+
+
+async def _tick(manager: WebSocketManager, quotes: dict[str, dict]):
+    manager.market_data_service.get_real_time_quotes.return_value = quotes
+    await manager._update_market_data()
+    await asyncio.sleep(0.01)  # let the send tasks run
+
+
+class TestDeltas:
+    """Test frames carry only the fields that changed"""
+
+    def test_only_changed_fields_are_sent(self, manager):
+        async def run():
+            websocket = _connect(manager, "u1", ["SPY", "QQQ"])
+            await _tick(manager, {"SPY": _quote(500.0), "QQQ": _quote(430.0)})
+            await _tick(manager, {"SPY": _quote(501.0), "QQQ": _quote(430.0)})
+            await _tick(manager, {"SPY": _quote(501.0), "QQQ": _quote(430.0)})
+            return websocket.batches()
+
+        batches = asyncio.run(run())
+
+        assert batches == [
+            {"SPY": _quote(500.0), "QQQ": _quote(430.0)},
+            {"SPY": {"price": 501.0}},
+        ]
+
+
+class TestCoalescing:
+    """Test one frame per user per tick, serialized once per changed set"""
+
+    def test_one_send_per_user_and_shared_frames(self, manager):
+        async def run():
+            first = _connect(manager, "u1", ["SPY", "QQQ", "IWM"])
+            second = _connect(manager, "u2", ["SPY", "QQQ", "IWM"])
+            other = _connect(manager, "u3", ["SPY"])
+            quotes = {s: _quote(p) for s, p in (("SPY", 500.0), ("QQQ", 430.0), ("IWM", 210.0))}
+            await _tick(manager, quotes)
+            return first, second, other
+
+        first, second, other = asyncio.run(run())
+
+        assert len(first.frames) == len(second.frames) == len(other.frames) == 1
+        assert first.frames[0] is second.frames[0]
+        assert set(first.batches()[0]) == {"SPY", "QQQ", "IWM"}
+        assert set(other.batches()[0]) == {"SPY"}
+        manager.market_data_service.get_real_time_quotes.assert_awaited_once_with(
+            ["IWM", "QQQ", "SPY"]
+        )
+
+
+class TestBackpressure:
+    """Test slow consumers get merged updates and stalled ones are dropped"""
+
+    def test_updates_merge_while_a_send_is_in_flight(self, manager):
+        async def run():
+            slow = _connect(manager, "slow", ["SPY", "QQQ"])
+            fast = _connect(manager, "fast", ["SPY", "QQQ"])
+            slow.stalled = True
+            await _tick(manager, {"SPY": _quote(500.0), "QQQ": _quote(430.0)})
+            await _tick(manager, {"SPY": _quote(501.0), "QQQ": _quote(430.0)})
+            await _tick(manager, {"SPY": _quote(502.0), "QQQ": _quote(431.0, 2000)})
+
+            slow.stalled = False
+            slow.released.set()
+            await asyncio.sleep(0.01)
+            await _tick(manager, {"SPY": _quote(502.0), "QQQ": _quote(431.0, 2000)})
+            return slow, fast
+
+        slow, fast = asyncio.run(run())
+
+        assert len(fast.frames) == 3
+        # The first frame, then every delta seen while it was stalled in one frame
+        assert slow.batches() == [
+            {"SPY": _quote(500.0), "QQQ": _quote(430.0)},
+            {"SPY": {"price": 502.0}, "QQQ": {"price": 431.0, "volume": 2000}},
+        ]
+
+    def test_stalled_consumer_is_disconnected(self, manager, monkeypatch):
+        monkeypatch.setattr(websocket_service, "SEND_TIMEOUT", 0.05)
+
+        async def run():
+            stalled = _connect(manager, "stalled", ["SPY"])
+            healthy = _connect(manager, "healthy", ["SPY"])
+            stalled.stalled = True
+            await _tick(manager, {"SPY": _quote(500.0)})
+            await asyncio.sleep(0.1)
+            return healthy
+
+        healthy = asyncio.run(run())
+
+        assert "stalled" not in manager.active_connections
+        assert "stalled" not in manager.symbol_subscribers["SPY"]
+        assert len(healthy.frames) == 1
+
+
+class TestCachedQuotes:
+    """Test the batch quote lookup treats bad cache entries as misses"""
+
+    def test_malformed_entries_are_refetched(self):
+        fresh = {"symbol": "SPY", "price": 500.0, "cache_timestamp": datetime.now(UTC).isoformat()}
+        stale = {**fresh, "cache_timestamp": (datetime.now(UTC) - timedelta(minutes=5)).isoformat()}
+        service = MarketDataService.__new__(MarketDataService)
+        service.tradier_token = "token"
+        service.redis_client = Mock()
+        service.redis_client.mget.return_value = [
+            json.dumps(fresh),
+            json.dumps({"symbol": "QQQ", "price": 430.0}),  # no timestamp
+            "{not json",
+            json.dumps({**fresh, "cache_timestamp": "yesterday"}),
+            json.dumps(stale),
+        ]
+        service._get_tradier_quotes = AsyncMock(
+            side_effect=lambda symbols: {s: {"symbol": s, "price": 1.0} for s in symbols}
+        )
+
+        quotes = asyncio.run(
+            service.get_real_time_quotes(["SPY", "QQQ", "IWM", "DIA", "TLT"])
+        )
+
+        service._get_tradier_quotes.assert_awaited_once_with(["QQQ", "IWM", "DIA", "TLT"])
+        assert quotes["SPY"]["price"] == 500.0
+        assert set(quotes) == {"SPY", "QQQ", "IWM", "DIA", "TLT"}
+
+    def test_single_quote_lookup_ignores_a_malformed_entry(self, monkeypatch):
+        service = MarketDataService.__new__(MarketDataService)
+        service.alpha_vantage_key = ""
+        service.tradier_token = "token"
+        service.redis_client = Mock()
+        service.redis_client.get.return_value = "{not json"
+        service._get_tradier_quote = AsyncMock(return_value={"symbol": "SPY", "price": 1.0})
+
+        quote = asyncio.run(service.get_real_time_quote("SPY"))
+
+        assert quote["price"] == 1.0
+        assert market_data_service.QUOTE_CACHE_SECONDS == 30
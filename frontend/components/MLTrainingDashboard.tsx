@@ -27,6 +27,33 @@ interface TrainingResult {
   n_samples?: number;
 }
 
+interface ModelStatus {
+  ready: boolean;
+  version: string | null;
+  metadata: Record<string, unknown>;
+  training: boolean;
+  last_error: string | null;
+}
+
+const POLL_INTERVAL_MS = 3000;
+const POLL_TIMEOUT_MS = 15 * 60 * 1000;
+
+// Training runs in a background worker on the server; poll until the job finishes
+async function waitForTraining(modelId: string): Promise<ModelStatus> {
+  const deadline = Date.now() + POLL_TIMEOUT_MS;
+  while (Date.now() < deadline) {
+    await new Promise(resolve => setTimeout(resolve, POLL_INTERVAL_MS));
+    const res = await fetch("/api/proxy/api/ml/health");
+    if (!res.ok) continue;
+    const status: ModelStatus | undefined = (await res.json()).models?.[modelId];
+    if (status && !status.training) {
+      if (status.last_error) throw new Error(status.last_error);
+      return status;
+    }
+  }
+  throw new Error("Training is taking longer than expected - check back later");
+}
+
 export default function MLTrainingDashboard() {
   const isMobile = useIsMobile();
 
@@ -76,13 +103,16 @@ export default function MLTrainingDashboard() {
 
       // Stage 3: Training model
       setRegimeStatus({ isTraining: true, progress: 75, stage: "Training K-Means model...", error: null });
-      await new Promise(resolve => setTimeout(resolve, 500));
-
-      const data = await res.json();
+      const model = await waitForTraining("regime_detector");
 
       // Stage 4: Complete
       setRegimeStatus({ isTraining: true, progress: 100, stage: "Training complete!", error: null });
-      setRegimeResult(data);
+      setRegimeResult({
+        success: true,
+        message: `Regime detector v${model.version} trained on ${regimeSymbol}`,
+        regime_labels: model.metadata.regime_labels as Record<string, string> | undefined,
+        training_data: { symbol: regimeSymbol, lookback_days: regimeLookback },
+      });
 
       showSuccess(`✅ Regime detector trained on ${regimeSymbol}!`);
 
@@ -123,13 +153,17 @@ export default function MLTrainingDashboard() {
 
       // Stage 3: Training Random Forest
       setStrategyStatus({ isTraining: true, progress: 80, stage: "Training Random Forest model...", error: null });
-      await new Promise(resolve => setTimeout(resolve, 500));
-
-      const data = await res.json();
+      const model = await waitForTraining("strategy_selector");
 
       // Stage 4: Complete
       setStrategyStatus({ isTraining: true, progress: 100, stage: "Training complete!", error: null });
-      setStrategyResult(data);
+      setStrategyResult({
+        success: true,
+        message: `Strategy selector v${model.version} trained on ${symbols.length} symbols`,
+        train_accuracy: model.metadata.train_accuracy as number | undefined,
+        test_accuracy: model.metadata.test_accuracy as number | undefined,
+        n_samples: model.metadata.n_samples as number | undefined,
+      });
 
       showSuccess(`✅ Strategy selector trained on ${symbols.length} symbols!`);
 
@@ -34,12 +34,14 @@ import { logger } from "../lib/logger";
  * @property {string} type - Message type (market_data, portfolio_update, etc.)
  * @property {unknown} [data] - Message payload
  * @property {string} [symbol] - Stock symbol for market data messages
+ * @property {Record<string, Partial<MarketData>>} [updates] - Changed fields per symbol (market_data_batch)
  * @property {string} timestamp - ISO timestamp of message
  */
 export interface WebSocketMessage {
   type: string;
   data?: unknown;
   symbol?: string;
+  updates?: Record<string, Partial<MarketData>>;
   timestamp: string;
 }
 
@@ -319,6 +321,20 @@ export const useWebSocket = ({
         }
         break;
 
+      case "market_data_batch":
+        // Coalesced frame: only fields that changed since the last tick, per symbol
+        if (message.updates) {
+          const updates = message.updates;
+          setMarketData((prev) => {
+            const newMap = new Map(prev);
+            Object.entries(updates).forEach(([symbol, delta]) => {
+              newMap.set(symbol, { ...newMap.get(symbol), ...delta } as MarketData);
+            });
+            return newMap;
+          });
+        }
+        break;
+
       case "portfolio_update":
         if (message.data) {
           setPortfolioUpdate(message.data as PortfolioUpdate);
@@ -24,6 +24,7 @@ from . import (
     contract_enforcer,
     copyright_scanner,
     dependency_tracker,
+    file_scanner,
     infra_health,
     integration_validator,
     maintenance_notifier,
@@ -61,6 +62,7 @@ __all__ = [
     "visibility_lockdown",
     "concealment_reporter",
     # Runner and utils
+    "file_scanner",
     "runner",
     "utils",
 ]
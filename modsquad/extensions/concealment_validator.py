@@ -15,6 +15,26 @@ from datetime import datetime, timezone
 from pathlib import Path
 from typing import Any, Dict
 
+from .file_scanner import FileScanner, check_signature
+
+
+def _html_flags(content: str) -> Dict[str, bool]:
+    """Copyright header and robots meta tag flags for one HTML file."""
+    return {
+        "has_header": ("PaiiD-2mx" in content or "Copyright" in content)
+        and ("PROPRIETARY" in content or "CONFIDENTIAL" in content),
+        "has_robots": 'name="robots"' in content
+        and ("noindex" in content or "nofollow" in content),
+    }
+
+
+def _has_source_header(content: str) -> bool:
+    """Copyright header check on the first 500 characters of a source file."""
+    header_check = content[:500]
+    return ("PaiiD-2mx" in header_check or "Copyright" in header_check) and (
+        "PROPRIETARY" in header_check or "CONFIDENTIAL" in header_check
+    )
+
 
 def check_license_file(repo_root: Path) -> Dict[str, Any]:
     """Check if LICENSE file exists and has correct copyright."""
@@ -81,19 +101,16 @@ def check_robots_txt(repo_root: Path) -> Dict[str, Any]:
     return result
 
 
-def check_html_files(repo_root: Path) -> Dict[str, Any]:
+def check_html_files(repo_root: Path, use_cache: bool = True) -> Dict[str, Any]:
     """Check HTML files for copyright headers and robots meta tags."""
-    html_files = []
-    for pattern in ["**/*.html"]:
-        html_files.extend(repo_root.glob(pattern))
-
-    # Exclude node_modules, .next, __pycache__, etc.
-    excluded_dirs = {"node_modules", ".next", "__pycache__", "dist", "build", ".git"}
-    html_files = [
-        f
-        for f in html_files
-        if not any(excluded in str(f) for excluded in excluded_dirs)
-    ]
+    # Excluded directories (node_modules, .next, __pycache__, etc.) are pruned during the walk
+    scanner = FileScanner(
+        repo_root,
+        cache_name="concealment_html" if use_cache else None,
+        signature=check_signature("html_files", 1, str(repo_root.resolve())),
+    )
+    html_files = scanner.walk(["**/*.html"])
+    flags, stats = scanner.scan(html_files, _html_flags)
 
     results = {
         "check": "html_files",
@@ -105,40 +122,20 @@ def check_html_files(repo_root: Path) -> Dict[str, Any]:
             "files_with_robots": 0,
             "missing_headers": [],
             "missing_robots": [],
+            "scan_stats": stats.as_dict(),
         },
     }
 
-    for html_file in html_files:
-        try:
-            content = html_file.read_text(encoding="utf-8")
-
-            # Check for copyright header
-            has_header = ("PaiiD-2mx" in content or "Copyright" in content) and (
-                "PROPRIETARY" in content or "CONFIDENTIAL" in content
-            )
-
-            # Check for robots meta tag
-            has_robots = 'name="robots"' in content and (
-                "noindex" in content or "nofollow" in content
-            )
-
-            if has_header:
-                results["details"]["files_with_headers"] += 1
-            else:
-                results["details"]["missing_headers"].append(
-                    str(html_file.relative_to(repo_root))
-                )
-
-            if has_robots:
-                results["details"]["files_with_robots"] += 1
-            else:
-                results["details"]["missing_robots"].append(
-                    str(html_file.relative_to(repo_root))
-                )
-
-        except Exception:
-            # Skip files that can't be read
-            continue
+    for rel_path in sorted(flags):
+        if flags[rel_path]["has_header"]:
+            results["details"]["files_with_headers"] += 1
+        else:
+            results["details"]["missing_headers"].append(rel_path)
+
+        if flags[rel_path]["has_robots"]:
+            results["details"]["files_with_robots"] += 1
+        else:
+            results["details"]["missing_robots"].append(rel_path)
 
     # Determine overall status
     if results["details"]["missing_headers"] or results["details"]["missing_robots"]:
@@ -154,7 +151,7 @@ def check_html_files(repo_root: Path) -> Dict[str, Any]:
     return results
 
 
-def check_source_files(repo_root: Path) -> Dict[str, Any]:
+def check_source_files(repo_root: Path, use_cache: bool = True) -> Dict[str, Any]:
     """Check key source files for copyright headers."""
     key_files = [
         repo_root / "backend" / "app" / "main.py",
@@ -169,30 +166,19 @@ def check_source_files(repo_root: Path) -> Dict[str, Any]:
         "details": {"checked_files": [], "missing_headers": []},
     }
 
-    for file_path in key_files:
-        if not file_path.exists():
-            continue
-
-        results["details"]["checked_files"].append(
-            str(file_path.relative_to(repo_root))
-        )
-
-        try:
-            content = file_path.read_text(encoding="utf-8")
-
-            # Check for copyright header (first 500 chars)
-            header_check = content[:500]
-            has_header = (
-                "PaiiD-2mx" in header_check or "Copyright" in header_check
-            ) and ("PROPRIETARY" in header_check or "CONFIDENTIAL" in header_check)
-
-            if not has_header:
-                results["details"]["missing_headers"].append(
-                    str(file_path.relative_to(repo_root))
-                )
-
-        except Exception:
-            continue
+    scanner = FileScanner(
+        repo_root,
+        cache_name="concealment_source" if use_cache else None,
+        signature=check_signature("source_files", 1, str(repo_root.resolve())),
+    )
+    existing = [file_path for file_path in key_files if file_path.exists()]
+    headers, _ = scanner.scan(existing, _has_source_header)
+
+    for file_path in existing:
+        rel_path = file_path.relative_to(repo_root).as_posix()
+        results["details"]["checked_files"].append(rel_path)
+        if rel_path in headers and not headers[rel_path]:
+            results["details"]["missing_headers"].append(rel_path)
 
     if results["details"]["missing_headers"]:
         results["status"] = "fail"
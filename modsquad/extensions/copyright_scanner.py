@@ -13,90 +13,48 @@ Scans all files and reports missing copyright headers.
 import json
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Any, Dict, List, Set
+from typing import Any, Dict, List
 
+from .file_scanner import FileScanner, check_signature
 from .utils import ExtensionConfig, dump_jsonl, load_extension_config
 
+COPYRIGHT_KEYWORDS = ["Copyright", "PaiiD-2mx", "PROPRIETARY", "CONFIDENTIAL"]
+
+# Headers sit at the top of a file; only this much of each file is read
+HEADER_BYTES = 4096
+HEADER_CHARS = 1000
+
+
+def _has_copyright(text: str) -> bool:
+    header = text[:HEADER_CHARS]
+    return any(keyword in header for keyword in COPYRIGHT_KEYWORDS)
+
 
 def scan_files_for_copyright(
-    repo_root: Path, file_patterns: List[str], exclude_patterns: List[str]
+    repo_root: Path,
+    file_patterns: List[str],
+    exclude_patterns: List[str],
+    use_cache: bool = True,
 ) -> Dict[str, Any]:
     """Scan files for copyright headers."""
 
-    # Collect all files matching patterns
-    files_to_check: List[Path] = []
-
-    for pattern in file_patterns:
-        # Handle ** glob patterns
-        if "**" in pattern:
-            # Remove ** prefix if present
-            clean_pattern = pattern.replace("**/", "")
-            files_to_check.extend(repo_root.rglob(clean_pattern))
-        else:
-            files_to_check.extend(repo_root.glob(pattern))
-
-    # Filter out excluded paths
-    excluded_dirs: Set[str] = set()
-    for pattern in exclude_patterns:
-        if "**" in pattern:
-            # Extract directory name
-            parts = pattern.split("/")
-            if parts:
-                excluded_dirs.add(parts[0])
-
-    # Standard exclusions
-    excluded_dirs.update(
-        {
-            "node_modules",
-            ".next",
-            "__pycache__",
-            "dist",
-            "build",
-            ".git",
-            "venv",
-            ".venv",
-        }
+    scanner = FileScanner(
+        repo_root,
+        cache_name="copyright_scanner" if use_cache else None,
+        signature=check_signature(COPYRIGHT_KEYWORDS, HEADER_CHARS, str(repo_root.resolve())),
     )
-
-    filtered_files = []
-    for file_path in files_to_check:
-        # Check if file is in excluded directory
-        path_str = str(file_path)
-        if any(excluded in path_str for excluded in excluded_dirs):
-            continue
-        if file_path.is_file():
-            filtered_files.append(file_path)
-
-    # Check each file for copyright header
-    results = {
-        "total_files": len(filtered_files),
-        "files_with_headers": 0,
-        "files_missing_headers": 0,
-        "missing_files": [],
+    files = scanner.walk(file_patterns, exclude_patterns)
+    checked, stats = scanner.scan(files, _has_copyright, read_limit=HEADER_BYTES)
+
+    missing_files = sorted(path for path, has_header in checked.items() if not has_header)
+    return {
+        "total_files": len(checked),
+        "files_with_headers": len(checked) - len(missing_files),
+        "files_missing_headers": len(missing_files),
+        "missing_files": missing_files,
+        "scan_stats": stats.as_dict(),
     }
 
-    copyright_keywords = ["Copyright", "PaiiD-2mx", "PROPRIETARY", "CONFIDENTIAL"]
-
-    for file_path in filtered_files:
-        try:
-            # Read first 1000 characters (where headers typically are)
-            content = file_path.read_text(encoding="utf-8", errors="ignore")[:1000]
-
-            # Check for copyright indicators
-            has_copyright = any(keyword in content for keyword in copyright_keywords)
-
-            if has_copyright:
-                results["files_with_headers"] += 1
-            else:
-                results["files_missing_headers"] += 1
-                results["missing_files"].append(str(file_path.relative_to(repo_root)))
-
-        except Exception:
-            # Skip files that can't be read
-            continue
-
-    return results
-
 
 def run_copyright_scan(
     repo_root: Path = None, config: ExtensionConfig = None
@@ -129,6 +87,7 @@ def run_copyright_scan(
         exclude_patterns = ["**/node_modules/**", "**/__pycache__/**", "**/.next/**"]
 
     scan_results = scan_files_for_copyright(repo_root, file_patterns, exclude_patterns)
+    timings = {"scan_ms": scan_results["scan_stats"]["elapsed_ms"]}
 
     # Calculate coverage percentage
     coverage_pct = 0.0
@@ -143,7 +102,7 @@ def run_copyright_scan(
         "errors": [],
         "warnings": [],
         "info": [],
-        "timings": {},
+        "timings": timings,
         "p95_ms": 0,
         "details": {
             "scan_results": scan_results,
@@ -0,0 +1,239 @@
+"""
+MOD SQUAD Framework - Incremental File Scanner
+Copyright © 2025 Dr. SC Prime. All Rights Reserved.
+
+PROPRIETARY AND CONFIDENTIAL
+Unauthorized copying, modification, or distribution is strictly prohibited.
+🚨 THIS CODE IS MONITORED: Violators WILL be found.
+
+Shared file scanning engine for MOD SQUAD extensions.
+
+- One directory walk per scan, pruning excluded directories as it descends
+  (instead of globbing the whole tree per pattern and filtering afterwards)
+- Files are read and checked in parallel on a thread pool
+- A (path, mtime, size, hash) manifest is kept between runs: files whose mtime
+  and size are unchanged reuse their cached check result without being read,
+  and files that were only touched (same content hash) are not re-checked
+"""
+
+from __future__ import annotations
+
+import fnmatch
+import hashlib
+import json
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path, PurePosixPath
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+
+CACHE_DIR = Path(__file__).resolve().parents[1] / "logs" / "cache"
+
+DEFAULT_EXCLUDED_DIRS = {
+    "node_modules",
+    ".next",
+    "__pycache__",
+    "dist",
+    "build",
+    ".git",
+    "venv",
+    ".venv",
+}
+
+
+def excluded_dirs_from_patterns(exclude_patterns: Iterable[str]) -> Set[str]:
+    """Turn patterns like '**/node_modules/**' or 'frontend/out/**' into directories to prune."""
+
+    excluded: Set[str] = set()
+    for pattern in exclude_patterns:
+        path = pattern[3:] if pattern.startswith("**/") else pattern
+        if path.endswith("/**"):
+            path = path[:-3]
+        if path and "*" not in path:
+            excluded.add(path)
+    return excluded
+
+
+def _matches(rel_path: str, pattern: str) -> bool:
+    """Glob semantics: '**/*.py' matches at any depth, '*.html' only at the root."""
+
+    if pattern.startswith("**/"):
+        tail = pattern[3:]
+        if "/" not in tail:
+            return fnmatch.fnmatch(rel_path.rsplit("/", 1)[-1], tail)
+        return PurePosixPath(rel_path).match(tail)
+    path = PurePosixPath(rel_path)
+    return len(path.parts) == len(PurePosixPath(pattern).parts) and path.match(pattern)
+
+
+@dataclass
+class ScanStats:
+    """Counters for one scan."""
+
+    total: int = 0
+    cached: int = 0
+    read: int = 0
+    rechecked: int = 0
+    elapsed_ms: float = 0.0
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "total": self.total,
+            "cached": self.cached,
+            "read": self.read,
+            "rechecked": self.rechecked,
+            "elapsed_ms": round(self.elapsed_ms, 1),
+        }
+
+
+@dataclass
+class FileScanner:
+    """Walks a repository and runs a check over file contents, reusing cached results."""
+
+    repo_root: Path
+    cache_name: Optional[str] = None
+    signature: str = ""
+    max_workers: int = field(default_factory=lambda: min(32, (os.cpu_count() or 2) * 4))
+    cache_dir: Path = CACHE_DIR
+
+    def walk(
+        self, file_patterns: Iterable[str], exclude_patterns: Iterable[str] = ()
+    ) -> List[Path]:
+        """Collect files matching any pattern, pruning excluded directories during the walk."""
+
+        patterns = list(file_patterns)
+        excluded = DEFAULT_EXCLUDED_DIRS | excluded_dirs_from_patterns(exclude_patterns)
+        excluded_names = {e for e in excluded if "/" not in e}
+        excluded_paths = {e for e in excluded if "/" in e}
+
+        files: List[Path] = []
+        for dirpath, dirnames, filenames in os.walk(self.repo_root):
+            rel_dir = Path(dirpath).relative_to(self.repo_root).as_posix()
+            rel_dir = "" if rel_dir == "." else rel_dir
+            dirnames[:] = sorted(
+                name
+                for name in dirnames
+                if name not in excluded_names
+                and f"{rel_dir}/{name}".lstrip("/") not in excluded_paths
+            )
+            for name in sorted(filenames):
+                rel_path = f"{rel_dir}/{name}".lstrip("/")
+                if any(_matches(rel_path, pattern) for pattern in patterns):
+                    files.append(Path(dirpath) / name)
+        return files
+
+    def _manifest_path(self) -> Optional[Path]:
+        if not self.cache_name:
+            return None
+        return self.cache_dir / f"{self.cache_name}.json"
+
+    def _load_manifest(self) -> Dict[str, Dict[str, Any]]:
+        path = self._manifest_path()
+        if path is None or not path.exists():
+            return {}
+        try:
+            data = json.loads(path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return {}
+        if data.get("signature") != self.signature:
+            # The check changed, so cached results no longer apply
+            return {}
+        return data.get("files", {})
+
+    def _save_manifest(self, files: Dict[str, Dict[str, Any]]) -> None:
+        path = self._manifest_path()
+        if path is None:
+            return
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_name(f".{path.name}.tmp")
+        tmp_path.write_text(
+            json.dumps({"signature": self.signature, "files": files}), encoding="utf-8"
+        )
+        os.replace(tmp_path, path)
+
+    def scan(
+        self,
+        files: Iterable[Path],
+        check: Callable[[str], Any],
+        read_limit: Optional[int] = None,
+    ) -> Tuple[Dict[str, Any], ScanStats]:
+        """
+        Run check(text) over each file, skipping files unchanged since the last run.
+
+        Args:
+            files: Files to check (absolute or relative to repo_root)
+            check: Function of the decoded file text returning a JSON-serializable result
+            read_limit: Only read (and hash) the first read_limit bytes of each file
+
+        Returns:
+            (results keyed by repo-relative path, scan statistics)
+            Files that cannot be read are left out of the results.
+        """
+
+        started = time.perf_counter()
+        manifest = self._load_manifest()
+        stats = ScanStats()
+        results: Dict[str, Any] = {}
+        updated: Dict[str, Dict[str, Any]] = {}
+        to_read: List[Tuple[str, Path, os.stat_result]] = []
+
+        for file_path in files:
+            file_path = self.repo_root / file_path
+            rel_path = file_path.relative_to(self.repo_root).as_posix()
+            try:
+                stat = file_path.stat()
+            except OSError:
+                continue
+            stats.total += 1
+
+            entry = manifest.get(rel_path)
+            if entry and entry["mtime_ns"] == stat.st_mtime_ns and entry["size"] == stat.st_size:
+                results[rel_path] = entry["result"]
+                updated[rel_path] = entry
+                stats.cached += 1
+            else:
+                to_read.append((rel_path, file_path, stat))
+
+        def read_and_check(item: Tuple[str, Path, os.stat_result]):
+            rel_path, file_path, stat = item
+            try:
+                with open(file_path, "rb") as fh:
+                    data = fh.read(read_limit) if read_limit else fh.read()
+            except OSError:
+                return rel_path, None
+            digest = hashlib.sha256(data).hexdigest()
+            entry = manifest.get(rel_path)
+            if entry and entry["sha256"] == digest:
+                # Touched but not modified: keep the cached result
+                return rel_path, {**entry, "mtime_ns": stat.st_mtime_ns, "size": stat.st_size}
+            text = data.decode("utf-8", errors="ignore")
+            return rel_path, {
+                "mtime_ns": stat.st_mtime_ns,
+                "size": stat.st_size,
+                "sha256": digest,
+                "result": check(text),
+                "checked": True,
+            }
+
+        if to_read:
+            with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+                for rel_path, entry in pool.map(read_and_check, to_read):
+                    if entry is None:
+                        continue
+                    stats.read += 1
+                    if entry.pop("checked", False):
+                        stats.rechecked += 1
+                    results[rel_path] = entry["result"]
+                    updated[rel_path] = entry
+
+        self._save_manifest(updated)
+        stats.elapsed_ms = (time.perf_counter() - started) * 1000
+        return results, stats
+
+
+def check_signature(*parts: Any) -> str:
+    """Short hash of a check's parameters, used to invalidate cached results when they change."""
+
+    return hashlib.sha256(json.dumps(parts, sort_keys=True).encode()).hexdigest()[:16]
@@ -1,4 +1,5 @@
 from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 import csv
 import os
@@ -68,10 +69,64 @@ EXCLUDE_DIRS = {
     "archive",
 }
 
+# Identifier and filename tokens: words plus dotted/hyphenated names (header.tsx, my-script)
+TOKEN_PATTERN = re.compile(r"[\w\-.]+")
+
+
+def tokenize_file(path_str: str) -> set:
+    """Lower-cased identifier/filename tokens in a file (runs in worker processes)."""
+    try:
+        content = Path(path_str).read_text(encoding="utf-8", errors="ignore").lower()
+    except OSError:
+        return set()
+
+    tokens = set()
+    for token in TOKEN_PATTERN.findall(content):
+        tokens.add(token)
+        # "app.services.cache" and "header.tsx" also reference "cache" and "header"
+        if "." in token:
+            tokens.update(part for part in token.split(".") if part)
+    return tokens
+
+
+def iter_files(root: Path):
+    """Walk a directory, pruning excluded directories instead of filtering afterwards."""
+    for dirpath, dirnames, filenames in os.walk(root):
+        dirnames[:] = [d for d in dirnames if d not in EXCLUDE_DIRS]
+        for name in filenames:
+            yield Path(dirpath) / name
+
+
+class ReferenceIndex:
+    """Inverted index of tokens to the code files that contain them."""
+
+    def __init__(self):
+        self.file_ids = {}
+        self.postings = defaultdict(set)
+
+    def build(self, files, workers=None):
+        """Tokenize every file once, in parallel across cores."""
+        self.file_ids = {f: file_id for file_id, f in enumerate(files)}
+        paths = [str(f) for f in self.file_ids]
+        chunksize = max(1, len(paths) // ((workers or os.cpu_count() or 1) * 8))
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            for file_id, tokens in enumerate(pool.map(tokenize_file, paths, chunksize=chunksize)):
+                for token in tokens:
+                    self.postings[token].add(file_id)
+
+    def count_references(self, file_path: Path, names) -> int:
+        """Number of other indexed files containing any of the names."""
+        referencing = set()
+        for name in names:
+            referencing |= self.postings.get(name.lower(), set())
+        referencing.discard(self.file_ids.get(file_path))
+        return len(referencing)
+
+
 class CodebaseAnalyzer:
     def __init__(self):
         self.files_data = []
-        self.reference_cache = {}
+        self.reference_index = None
         self.stats = defaultdict(int)
 
     def should_analyze_file(self, file_path: Path) -> bool:
@@ -107,71 +162,28 @@ class CodebaseAnalyzer:
         except:
             return 0
 
-    def search_references(self, file_path: Path) -> int:
-        """Search for references to this file in the codebase."""
-        # Get relative path for searching
-        rel_path = file_path.relative_to(BASE_DIR)
-        file_name = file_path.name
-        stem = file_path.stem
-
-        # Search patterns
-        patterns = [
-            file_name,  # Exact filename
-            stem,  # Filename without extension
-        ]
-
-        # For code files, add import patterns
-        if file_path.suffix in {".ts", ".tsx", ".js", ".jsx"}:
-            # TypeScript/JavaScript import patterns
-            patterns.extend(
-                [
-                    f"from.*['\"].*{stem}",
-                    f"import.*['\"].*{stem}",
-                    f"require.*['\"].*{stem}",
-                ]
-            )
-        elif file_path.suffix == ".py":
-            # Python import patterns
-            patterns.extend(
-                [
-                    f"from.*{stem}",
-                    f"import.*{stem}",
-                ]
-            )
-
-        reference_count = 0
-        search_dirs = [BASE_DIR / d for d in ANALYZE_DIRS]
-
-        # Search for references
-        for search_dir in search_dirs:
+    def build_reference_index(self):
+        """Index every searchable code file once, so each lookup is a set union."""
+        search_files = []
+        for dir_name in ANALYZE_DIRS:
+            search_dir = BASE_DIR / dir_name
             if not search_dir.exists():
                 continue
+            for search_file in iter_files(search_dir):
+                # Only search in code files
+                if search_file.suffix in CODE_EXTENSIONS and self.should_analyze_file(search_file):
+                    search_files.append(search_file)
+
+        print(f"Indexing references in {len(search_files)} code files...")
+        self.reference_index = ReferenceIndex()
+        self.reference_index.build(search_files)
+
+    def search_references(self, file_path: Path) -> int:
+        """Count code files that reference this file by name or stem (imports included)."""
+        if self.reference_index is None:
+            self.build_reference_index()
 
-            for pattern in patterns:
-                # Count files that reference this pattern
-                for search_file in search_dir.rglob("*"):
-                    if not search_file.is_file():
-                        continue
-                    if search_file == file_path:
-                        continue
-                    if not self.should_analyze_file(search_file):
-                        continue
-
-                    # Only search in code files
-                    if search_file.suffix not in CODE_EXTENSIONS:
-                        continue
-
-                    try:
-                        content = search_file.read_text(
-                            encoding="utf-8", errors="ignore"
-                        )
-                        if re.search(pattern, content, re.IGNORECASE):
-                            reference_count += 1
-                            break  # Count each file only once
-                    except:
-                        continue
-
-        return reference_count
+        return self.reference_index.count_references(file_path, [file_path.name, file_path.stem])
 
     def is_potentially_redundant(self, file_path: Path) -> bool:
         """Check if file matches redundancy patterns."""
@@ -278,9 +290,8 @@ class CodebaseAnalyzer:
                 continue
 
             print(f"Analyzing {dir_name}/...")
-            for file_path in dir_path.rglob("*"):
-                if file_path.is_file():
-                    self.analyze_file(file_path)
+            for file_path in iter_files(dir_path):
+                self.analyze_file(file_path)
 
         print(f"Collected {len(self.files_data)} files")
 